@@ -4,12 +4,35 @@ _example module - Reference implementation.
 Copy this module to create new modules.
 """
 
-from .models import ExampleModel
+from .durable import DurabilityError, DurableExampleRepository
+from .models import BulkResult, ExampleModel, ExamplePage
+from .repository import (
+    ExampleRepository,
+    InMemoryExampleRepository,
+    ShardedExampleRepository,
+    SQLiteExampleRepository,
+)
 from .services import ExampleService
+from .write_behind import (
+    DuplicateIdError,
+    WriteBehindClosedError,
+    WriteBehindRepository,
+)
 from .api import example_router
 
 __all__ = [
+    "BulkResult",
+    "DuplicateIdError",
+    "DurabilityError",
+    "DurableExampleRepository",
     "ExampleModel",
+    "ExamplePage",
+    "ExampleRepository",
     "ExampleService",
+    "InMemoryExampleRepository",
+    "SQLiteExampleRepository",
+    "ShardedExampleRepository",
+    "WriteBehindClosedError",
+    "WriteBehindRepository",
     "example_router",
 ]
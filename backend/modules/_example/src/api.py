@@ -5,18 +5,84 @@ Replace with your actual endpoints.
 Uncomment FastAPI code when using FastAPI.
 """
 
-# from fastapi import APIRouter, HTTPException
-# from typing import List, Optional
-# from .services import ExampleService
+from typing import AsyncIterator, Optional
+
+from shared.serialization import get_encoder, iter_ndjson
+
+from .models import ExampleModel
+from .services import ExampleService
+
+# Fields exposed by the API; encodes listings straight from the models.
+PUBLIC_ENCODER = get_encoder(ExampleModel, ("id", "name", "status"))
+
+# from datetime import datetime
+# from fastapi import APIRouter, HTTPException, Response
+# from fastapi.responses import StreamingResponse
 
 # example_router = APIRouter(prefix="/api/v1/examples", tags=["examples"])
 
 # @example_router.get("/")
-# async def list_examples(status: Optional[str] = None) -> List[dict]:
-#     """List all examples."""
+# async def list_examples(
+#     status: Optional[str] = None,
+#     created_after: Optional[datetime] = None,
+#     created_before: Optional[datetime] = None,
+#     order: str = "asc",
+#     limit: Optional[int] = None,
+# ) -> Response:
+#     """List examples; created_at bounds, order or limit sort by created_at."""
+#     service = ExampleService()
+#     try:
+#         items = await service.list_items(
+#             status,
+#             created_after=created_after,
+#             created_before=created_before,
+#             order=order,
+#             limit=limit,
+#         )
+#     except ValueError as e:
+#         raise HTTPException(status_code=400, detail=str(e))
+#     return Response(PUBLIC_ENCODER.json(items), media_type="application/json")
+
+# @example_router.get("/msgpack")
+# async def list_examples_msgpack(status: Optional[str] = None) -> Response:
+#     """List all examples as a MessagePack array of maps."""
 #     service = ExampleService()
 #     items = await service.list_items(status)
-#     return [{"id": i.id, "name": i.name, "status": i.status} for i in items]
+#     return Response(PUBLIC_ENCODER.msgpack(items), media_type="application/msgpack")
+
+# @example_router.get("/search")
+# async def search_examples(q: str, limit: int = 20) -> Response:
+#     """Search examples by name (prefix first, then words)."""
+#     service = ExampleService()
+#     try:
+#         items = await service.search_items(q, limit)
+#     except ValueError as e:
+#         raise HTTPException(status_code=400, detail=str(e))
+#     return Response(PUBLIC_ENCODER.json(items), media_type="application/json")
+
+# @example_router.get("/page")
+# async def list_examples_page(
+#     cursor: Optional[str] = None, limit: int = 100, status: Optional[str] = None
+# ) -> dict:
+#     """List one page of examples; pass next_cursor back for the next page."""
+#     service = ExampleService()
+#     try:
+#         page = await service.list_items_page(cursor, limit, status)
+#     except ValueError as e:
+#         raise HTTPException(status_code=400, detail=str(e))
+#     return {
+#         "items": PUBLIC_ENCODER.to_dicts(page.items),
+#         "next_cursor": page.next_cursor,
+#     }
+
+# @example_router.get("/stream")
+# async def stream_examples(status: Optional[str] = None) -> StreamingResponse:
+#     """Stream all examples as NDJSON without building the full list."""
+#     service = ExampleService()
+#     return StreamingResponse(
+#         stream_examples_ndjson(service, status),
+#         media_type="application/x-ndjson",
+#     )
 
 # @example_router.post("/")
 # async def create_example(name: str) -> dict:
@@ -25,5 +91,21 @@ Uncomment FastAPI code when using FastAPI.
 #     item = await service.create_item(name)
 #     return {"id": item.id, "name": item.name}
 
+# @example_router.get("/metrics")
+# async def example_metrics() -> dict:
+#     """Latency/call metrics of instrumented code (APP_METRICS=1 to record)."""
+#     from shared.instrumentation import REGISTRY
+#     return REGISTRY.to_dict()
+
+
+async def stream_examples_ndjson(
+    service: ExampleService, status: Optional[str] = None, chunk_size: int = 500
+) -> AsyncIterator[bytes]:
+    """Encode items as NDJSON, one bytes chunk per service chunk."""
+    chunks = service.iter_items(status=status, chunk_size=chunk_size)
+    async for data in iter_ndjson(PUBLIC_ENCODER, chunks):
+        yield data
+
+
 # Placeholder for non-FastAPI projects
 example_router = None
@@ -1,27 +1,27 @@
 """
 CLI plugin for _example module.
 
-Demonstrates CLI auto-registration pattern.
-Uncomment decorators when shared.cli is available.
+Demonstrates CLI auto-registration pattern. Run with:
+    python -m shared.cli example list --status all
 """
 
-# from shared.cli import CLIPlugin, register_command
+from shared.cli import CLIPlugin, register_command
 
 
-class ExamplePlugin:
+class ExamplePlugin(CLIPlugin):
     """CLI commands for example module."""
 
     namespace = "example"
     version = "1.0.0"
     description = "Example module commands"
 
-    # @register_command(
-    #     name="list",
-    #     description="List examples",
-    #     params=[
-    #         {"name": "status", "type": "choice", "choices": ["active", "all"]},
-    #     ]
-    # )
+    @register_command(
+        name="list",
+        description="List examples",
+        params=[
+            {"name": "status", "type": "choice", "choices": ["active", "all"]},
+        ],
+    )
     async def list_cmd(self, status: str = "active") -> dict:
         """List examples."""
         return {
@@ -30,13 +30,13 @@ class ExamplePlugin:
             "status_filter": status,
         }
 
-    # @register_command(
-    #     name="create",
-    #     description="Create an example",
-    #     params=[
-    #         {"name": "name", "type": "string", "required": True},
-    #     ]
-    # )
+    @register_command(
+        name="create",
+        description="Create an example",
+        params=[
+            {"name": "name", "type": "string", "required": True},
+        ],
+    )
     async def create_cmd(self, name: str) -> dict:
         """Create an example."""
         return {
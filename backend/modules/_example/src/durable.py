@@ -0,0 +1,706 @@
+"""
+Snapshot + write-ahead log durability for the in-memory repository.
+
+DurableExampleRepository keeps InMemoryExampleRepository's resident layout
+(and its read speed) and survives restarts. Every write is appended to a
+log and fsynced before it is acknowledged; writes that arrive while an
+fsync is running share the next one (group commit). Snapshots write the
+live items column-wise to one file and start a fresh log, so recovery maps
+the newest snapshot, loads it in bulk and replays only the log behind it.
+
+Data directory layout (N = generation):
+
+- snapshot-N.snap: every item written before wal-N.log was started
+- wal-N.log: writes since (generation 0 has no snapshot)
+"""
+
+import asyncio
+import itertools
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from functools import partial
+from itertools import accumulate, compress, repeat
+from operator import lshift, or_
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from shared.exceptions import AppError
+
+from .index import KeysetIndex, RangeIndex
+from .models import ExampleModel
+from .repository import InMemoryExampleRepository
+from .storage import Columns, CompactItemStore, from_micros, to_micros
+
+# Log: magic, then frames of (payload length, crc32(payload), payload). A
+# frame holds the records of one write call, so a batch is replayed whole
+# or not at all.
+_LOG_MAGIC = b"EXWAL001"
+_FRAME = struct.Struct("<II")
+# Records: op, seq, created, updated, len(id), len(name), len(status), then
+# the three utf-8 strings; removes carry op and len(id), then the id.
+_PUT = struct.Struct("<BqqqHHH")
+_DEL = struct.Struct("<BH")
+_ADD, _UPDATE, _REMOVE = 1, 2, 3
+_NONE = to_micros(None)
+
+# Snapshot: header, length-prefixed sections, crc32 of everything before it.
+_SNAP_MAGIC = b"EXSNP001"
+_SNAP_HEADER = struct.Struct("<8sIQQ")  # magic, flags, count, next seq
+_SECTION = struct.Struct("<Q")
+_CRC = struct.Struct("<I")
+_UUID_IDS = 1  # flag: ids are stored as uids, high and low 64 bits
+_LITTLE = sys.byteorder == "little"
+
+
+class DurabilityError(AppError):
+    """The log can no longer be written; reopen the repository to recover."""
+
+
+@dataclass(frozen=True)
+class DurabilityStats:
+    """Counters for one DurableExampleRepository."""
+
+    generation: int
+    records: int
+    commits: int
+    log_bytes: int
+    snapshots: int
+    last_error: Optional[str]
+
+
+class DurableExampleRepository(InMemoryExampleRepository):
+    """InMemoryExampleRepository persisted to a snapshot and a write-ahead log.
+
+    Args:
+        directory: Data directory, created if missing.
+        compact: Use the columnar CompactItemStore (UUID ids only). It
+            recovers large stores several times faster.
+        sync: fsync every commit. Turn off only where losing the last
+            writes on power loss is acceptable (tests, caches).
+        commit_delay: Seconds a commit waits for more writes to join it.
+            0 still groups every write made while the previous fsync runs.
+        snapshot_every: Log records after which a snapshot is written in
+            the background (None: only when snapshot() is called).
+
+    Use open(), which recovers off the event loop:
+
+        repo = await DurableExampleRepository.open("data/examples")
+        service = ExampleService(repo)
+        ...
+        await repo.close()
+
+    Writes return once their log records are on disk, so an acknowledged
+    write survives a crash. A crash can leave a torn record at the end of
+    the log; recovery drops it (its write was never acknowledged) and
+    truncates the log there. If a log write or fsync fails, that write and
+    every later one raise DurabilityError, but the failed change stays
+    visible in memory until the repository is reopened.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        compact: bool = False,
+        sync: bool = True,
+        commit_delay: float = 0.0,
+        snapshot_every: Optional[int] = 250_000,
+    ):
+        super().__init__(compact=compact)
+        self.directory = Path(directory)
+        self.sync = sync
+        self.commit_delay = commit_delay
+        self.snapshot_every = snapshot_every
+        self._generation = 0
+        self._log_generation = 0
+        self._snapshots = 0
+        self._closed_records = 0
+        self._closed_commits = 0
+        self._since_snapshot = 0
+        self._snapshotter: Optional[asyncio.Task] = None
+        self._snapshot_lock = asyncio.Lock()
+        self._last_error: Optional[BaseException] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._log = self._recover()
+
+    @classmethod
+    async def open(
+        cls, directory: Union[str, Path], **options
+    ) -> "DurableExampleRepository":
+        """Open (creating if needed) a data directory and recover its items."""
+        return await asyncio.to_thread(partial(cls, directory, **options))
+
+    async def close(self) -> None:
+        """Wait for pending commits and a running snapshot; close the log."""
+        if self._snapshotter is not None:
+            await asyncio.gather(self._snapshotter, return_exceptions=True)
+        await self._log.close()
+
+    # --- Writes --------------------------------------------------------------
+
+    async def add(self, item: ExampleModel) -> None:
+        self._log.check()
+        seq = self._insert(item)
+        await self._commit([_encode_put(_ADD, seq, item)])
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        self._log.check()
+        records: List[bytes] = []
+        try:
+            for item in items:
+                records.append(_encode_put(_ADD, self._insert(item), item))
+        except BaseException:
+            # Log what reached memory before the rejected item, and wait for
+            # it: the original error wins, a failed write stays on the log.
+            if records:
+                await asyncio.gather(self._commit(records), return_exceptions=True)
+            raise
+        if records:
+            await self._commit(records)
+
+    async def update(self, item: ExampleModel) -> bool:
+        return (await self.update_many([item]))[0]
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        self._log.check()
+        found = [self._replace(i) for i in items]
+        records = [
+            _encode_put(_UPDATE, 0, item)
+            for item, ok in zip(items, found, strict=True)
+            if ok
+        ]
+        if records:
+            await self._commit(records)
+        return found
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        return (await self.remove_many([item_id]))[0]
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        self._log.check()
+        removed = self._remove_many(item_ids)
+        records = [_encode_remove(i.id) for i in removed if i is not None]
+        if records:
+            await self._commit(records)
+        return removed
+
+    def _commit(self, records: List[bytes]) -> "asyncio.Future[None]":
+        """Queue records on the current log; the future resolves once they
+        are on disk. Called in the same step as the change they record, so
+        a snapshot switching logs never splits a change from its record."""
+        future = self._log.append(records)
+        self._since_snapshot += len(records)
+        if (
+            self.snapshot_every is not None
+            and self._since_snapshot >= self.snapshot_every
+            and self._snapshotter is None
+        ):
+            self._snapshotter = asyncio.ensure_future(self._background_snapshot())
+        return future
+
+    # --- Snapshots -----------------------------------------------------------
+
+    async def snapshot(self) -> None:
+        """Write every item to a new snapshot and start a fresh log.
+
+        Writes continue meanwhile (into the new log); the previous
+        generation's files are deleted once the snapshot is on disk.
+        """
+        async with self._snapshot_lock:
+            self._log.check()
+            generation = self._log_generation + 1
+            fd = await asyncio.to_thread(
+                _create_log, self._path("wal", generation), self.sync
+            )
+            # No await from here to the capture: the new log holds exactly
+            # the writes the snapshot does not.
+            old_log = self._log
+            self._log = _GroupCommitLog(fd, self.sync, self.commit_delay, old_log)
+            self._log_generation = generation
+            build = self._capture()
+            next_seq = next(self._seq)
+            self._seq = itertools.count(next_seq)
+            self._since_snapshot = 0
+            await old_log.close()
+            self._closed_records += old_log.records
+            self._closed_commits += old_log.commits
+            await asyncio.to_thread(
+                _write_snapshot, self._path("snapshot", generation), build, next_seq
+            )
+            self._generation = generation
+            self._snapshots += 1
+            await asyncio.to_thread(self._remove_before, generation)
+
+    async def _background_snapshot(self) -> None:
+        try:
+            await self.snapshot()
+        except Exception as exc:  # noqa: BLE001 - recorded; the old files stay valid
+            self._last_error = exc
+        finally:
+            self._snapshotter = None
+
+    def _capture(self) -> Callable[[], Columns]:
+        """Take the items (cheap copies, on the loop); the returned callable
+        converts them to columns (on the snapshot thread)."""
+        store = self._store
+        if isinstance(store, CompactItemStore):
+            columns = store.columns()
+            return lambda: columns
+        return partial(Columns.from_items, *store.rows())
+
+    def stats(self) -> DurabilityStats:
+        return DurabilityStats(
+            generation=self._generation,
+            records=self._closed_records + self._log.records,
+            commits=self._closed_commits + self._log.commits,
+            log_bytes=self._log.size,
+            snapshots=self._snapshots,
+            last_error=None if self._last_error is None else repr(self._last_error),
+        )
+
+    # --- Recovery (blocking; open() runs it on a worker thread) -------------
+
+    def _recover(self) -> "_GroupCommitLog":
+        snapshots = self._generations("snapshot")
+        generation = snapshots[-1] if snapshots else 0
+        next_seq = 1
+        if snapshots:
+            columns, next_seq = _read_snapshot(self._path("snapshot", generation))
+            self._load(columns)
+        logs = [g for g in self._generations("wal") if g >= generation]
+        for log_generation in logs:
+            for payload in _read_log(self._path("wal", log_generation)):
+                next_seq = max(next_seq, self._replay(payload) + 1)
+        self._seq = itertools.count(next_seq)
+        self._remove_before(generation)
+        self._generation = generation
+        self._log_generation = current = logs[-1] if logs else generation
+        path = self._path("wal", current)
+        fd = _open_log(path) if logs else _create_log(path, self.sync)
+        return _GroupCommitLog(fd, self.sync, self.commit_delay)
+
+    def _load(self, columns: Columns) -> None:
+        """Replace the contents with a snapshot's columns, indexes included."""
+        refs = self._store.load(columns)
+        # Indexes get copies: the store may have adopted these columns.
+        self._order = KeysetIndex.from_sorted(columns.seqs[:], refs[:])
+        self._by_created = _created_index(columns, refs)
+        self._status_created = {}
+        self._search = None
+        self._status_index = {}
+        names = columns.status_names
+        if len(names) == 1:
+            self._status_index[names[0]] = KeysetIndex.from_sorted(
+                columns.seqs[:], refs[:]
+            )
+            return
+        if len(names) <= 256:
+            # One C-speed pass per status: a 0/1 byte mask selects its rows.
+            codes = bytes(iter(columns.status))
+            for code, status in enumerate(names):
+                table = bytearray(256)
+                table[code] = 1
+                mask = codes.translate(table)
+                self._status_index[status] = KeysetIndex.from_sorted(
+                    array("q", compress(columns.seqs, mask)),
+                    list(compress(refs, mask)),
+                )
+            return
+        for seq, ref, code in zip(columns.seqs, refs, columns.status, strict=True):
+            self._index_add(seq, ref, names[code])
+
+    def _replay(self, payload: bytes) -> int:
+        """Apply the records of one frame; return the highest seq added."""
+        pos, end, last_seq = 0, len(payload), 0
+        while pos < end:
+            op = payload[pos]
+            if op == _REMOVE:
+                (_, size) = _DEL.unpack_from(payload, pos)
+                pos += _DEL.size + size
+                self._remove(payload[pos - size : pos].decode())
+                continue
+            pos, seq, item = _decode_put(payload, pos)
+            if op == _ADD:
+                self._insert(item, seq)
+                last_seq = seq
+            else:
+                self._replace(item)
+        return last_seq
+
+    def _generations(self, kind: str) -> List[int]:
+        suffix = ".snap" if kind == "snapshot" else ".log"
+        found = []
+        for path in self.directory.glob(f"{kind}-*{suffix}"):
+            number = path.name[len(kind) + 1 : -len(suffix)]
+            if number.isdigit():
+                found.append(int(number))
+        return sorted(found)
+
+    def _path(self, kind: str, generation: int) -> Path:
+        suffix = ".snap" if kind == "snapshot" else ".log"
+        return self.directory / f"{kind}-{generation:08d}{suffix}"
+
+    def _remove_before(self, generation: int) -> None:
+        """Delete files the snapshot of generation made obsolete."""
+        for kind in ("snapshot", "wal"):
+            for old in self._generations(kind):
+                if old < generation:
+                    self._path(kind, old).unlink(missing_ok=True)
+        for tmp in self.directory.glob("*.tmp"):
+            tmp.unlink(missing_ok=True)
+
+
+class _GroupCommitLog:
+    """An open log file; append() batches records into shared fsyncs."""
+
+    def __init__(
+        self,
+        fd: int,
+        sync: bool,
+        commit_delay: float,
+        after: Optional["_GroupCommitLog"] = None,
+    ):
+        self._fd: Optional[int] = fd
+        self._sync = sync
+        self._delay = commit_delay
+        # The log this one follows: nothing is written here before its
+        # pending commits are on disk.
+        self._after = after
+        self._buffer = bytearray()
+        self._waiters: List[asyncio.Future] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self.records = 0
+        self.commits = 0
+        self.size = os.fstat(fd).st_size
+
+    def check(self) -> None:
+        """Raise DurabilityError unless records can be appended."""
+        if self._error is not None:
+            raise DurabilityError("example log is not writable") from self._error
+        if self._closed:
+            raise DurabilityError("example log is closed")
+
+    def append(self, records: List[bytes]) -> "asyncio.Future[None]":
+        self.check()
+        payload = b"".join(records)
+        self._buffer += _FRAME.pack(len(payload), zlib.crc32(payload))
+        self._buffer += payload
+        self.records += len(records)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._run())
+        return future
+
+    async def close(self) -> None:
+        """Wait for pending commits, then close the file."""
+        self._closed = True
+        while self._writer is not None:
+            await asyncio.shield(self._writer)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    async def _run(self) -> None:
+        try:
+            if self._after is not None:
+                after, self._after = self._after, None
+                await after.close()
+                if after._error is not None:
+                    self._fail(after._error, self._waiters)
+                    return
+            while self._buffer:
+                if self._delay:
+                    await asyncio.sleep(self._delay)
+                data, waiters = bytes(self._buffer), self._waiters
+                self._buffer, self._waiters = bytearray(), []
+                try:
+                    await asyncio.to_thread(self._write, data)
+                except Exception as exc:  # noqa: BLE001 - reported to every writer
+                    self._fail(exc, waiters + self._waiters)
+                    return
+                self.size += len(data)
+                self.commits += 1
+                for future in waiters:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._writer = None
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view) :]
+        if self._sync:
+            _fdatasync(self._fd)
+
+    def _fail(self, exc: BaseException, waiters: List[asyncio.Future]) -> None:
+        self._error = exc
+        self._buffer.clear()
+        self._waiters = []
+        error = DurabilityError(f"example log write failed: {exc!r}")
+        for future in waiters:
+            if not future.done():
+                future.set_exception(error)
+
+
+# --- Record and file formats (blocking helpers) ----------------------------
+
+
+def _encode_put(op: int, seq: int, item: ExampleModel) -> bytes:
+    item_id, name, status = (
+        item.id.encode(),
+        item.name.encode(),
+        item.status.encode(),
+    )
+    return (
+        _PUT.pack(
+            op,
+            seq,
+            to_micros(item.created_at),
+            to_micros(item.updated_at),
+            len(item_id),
+            len(name),
+            len(status),
+        )
+        + item_id
+        + name
+        + status
+    )
+
+
+def _decode_put(payload: bytes, pos: int) -> Tuple[int, int, ExampleModel]:
+    """(end position, seq, item) of the put record at pos."""
+    _, seq, created, updated, id_size, name_size, status_size = _PUT.unpack_from(
+        payload, pos
+    )
+    start = pos + _PUT.size
+    name_at = start + id_size
+    status_at = name_at + name_size
+    end = status_at + status_size
+    return (
+        end,
+        seq,
+        ExampleModel(
+            id=payload[start:name_at].decode(),
+            name=payload[name_at:status_at].decode(),
+            status=payload[status_at:end].decode(),
+            created_at=from_micros(created),
+            updated_at=None if updated == _NONE else from_micros(updated),
+        ),
+    )
+
+
+def _encode_remove(item_id: str) -> bytes:
+    encoded = item_id.encode()
+    return _DEL.pack(_REMOVE, len(encoded)) + encoded
+
+
+def _fdatasync(fd: int) -> None:
+    getattr(os, "fdatasync", os.fsync)(fd)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make a create, rename or delete in directory durable (POSIX)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _create_log(path: Path, sync: bool) -> int:
+    """Create an empty log; return an append-only descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+    os.write(fd, _LOG_MAGIC)
+    if sync:
+        _fdatasync(fd)
+        _fsync_dir(path.parent)
+    return fd
+
+
+def _open_log(path: Path) -> int:
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    if os.fstat(fd).st_size < len(_LOG_MAGIC):
+        # Crashed while creating the file: start it over.
+        os.ftruncate(fd, 0)
+        os.write(fd, _LOG_MAGIC)
+    return fd
+
+
+def _created_index(columns: Columns, refs: List) -> RangeIndex:
+    """Build the created_at index; columns are in seq order, which is
+    usually created_at order too."""
+    created, seqs = columns.created, columns.seqs
+    if all(map(int.__le__, created, itertools.islice(created, 1, None))):
+        return RangeIndex.from_sorted(created[:], seqs[:], refs[:])
+    order = sorted(range(len(created)), key=created.__getitem__)
+    return RangeIndex.from_sorted(
+        array("q", map(created.__getitem__, order)),
+        array("q", map(seqs.__getitem__, order)),
+        list(map(refs.__getitem__, order)),
+    )
+
+
+def _read_log(path: Path) -> Iterator[bytes]:
+    """Yield the payload of every intact record, in order.
+
+    Reading stops at the first torn or corrupt frame, and the file is
+    truncated there so new records follow the last intact one.
+    """
+    with open(path, "r+b") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= len(_LOG_MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[: len(_LOG_MAGIC)] != _LOG_MAGIC:
+                raise DurabilityError(f"not an example log: {path}")
+            pos = len(_LOG_MAGIC)
+            while pos + _FRAME.size <= size:
+                length, crc = _FRAME.unpack_from(data, pos)
+                end = pos + _FRAME.size + length
+                if end > size:
+                    break
+                payload = data[pos + _FRAME.size : end]
+                if zlib.crc32(payload) != crc:
+                    break
+                yield payload
+                pos = end
+        if pos < size:
+            f.truncate(max(pos, len(_LOG_MAGIC)))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _write_snapshot(path: Path, build: Callable[[], Columns], next_seq: int) -> None:
+    """Write columns to path atomically (temp file, fsync, rename)."""
+    columns = build()
+    flags = 0
+    if columns.uids is not None:
+        flags = _UUID_IDS
+        mask = (1 << 64) - 1
+        ids = [
+            _little(array("Q", [u >> 64 for u in columns.uids])),
+            _little(array("Q", [u & mask for u in columns.uids])),
+        ]
+    else:
+        ids = _pack_strings(columns.ids)
+    sections = [
+        _little(columns.seqs),
+        _little(columns.status),
+        _little(columns.created),
+        _little(columns.updated),
+        *_pack_strings(columns.status_names),
+        *ids,
+        *_pack_strings(columns.names),
+    ]
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        header = _SNAP_HEADER.pack(_SNAP_MAGIC, flags, len(columns), next_seq)
+        f.write(header)
+        crc = zlib.crc32(header)
+        for section in sections:
+            size = _SECTION.pack(len(memoryview(section).cast("B")))
+            f.write(size)
+            f.write(section)
+            crc = zlib.crc32(section, zlib.crc32(size, crc))
+        f.write(_CRC.pack(crc))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _read_snapshot(path: Path) -> Tuple[Columns, int]:
+    """(columns, next seq) of a snapshot file, read through mmap."""
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        with memoryview(data) as view, view[: -_CRC.size] as body:
+            intact = zlib.crc32(body) == _CRC.unpack_from(data, len(body))[0]
+        magic, flags, count, next_seq = _SNAP_HEADER.unpack_from(data)
+        if not intact or magic != _SNAP_MAGIC:
+            raise DurabilityError(f"corrupt snapshot: {path}")
+        pos = _SNAP_HEADER.size
+
+        def section() -> bytes:
+            nonlocal pos
+            (size,) = _SECTION.unpack_from(data, pos)
+            pos += _SECTION.size + size
+            return data[pos - size : pos]
+
+        seqs = _array("q", section())
+        if len(seqs) != count:
+            raise DurabilityError(f"corrupt snapshot: {path}")
+        status = _array("H", section())
+        created = _array("q", section())
+        updated = _array("q", section())
+        status_names = _unpack_strings(section(), section())
+        if flags & _UUID_IDS:
+            high, low = _array("Q", section()), _array("Q", section())
+            ids, uids = None, list(map(or_, map(lshift, high, repeat(64)), low))
+        else:
+            ids, uids = _unpack_strings(section(), section()), None
+        names = _unpack_strings(section(), section())
+    columns = Columns(
+        seqs=seqs,
+        names=names,
+        status=status,
+        status_names=status_names,
+        created=created,
+        updated=updated,
+        ids=ids,
+        uids=uids,
+    )
+    return columns, next_seq
+
+
+def _little(values: array) -> array:
+    """values in little-endian byte order (the on-disk order)."""
+    if _LITTLE:
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+
+def _array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if not _LITTLE:
+        values.byteswap()
+    return values
+
+
+def _pack_strings(values: Sequence[str]) -> List[Union[array, bytes]]:
+    """[end offsets, utf-8 blob] of values. Offsets are left empty when no
+    value contains NUL: the blob is then NUL-terminated values, which
+    decode with one split()."""
+    blob = "\0".join(values) + "\0" if values else ""
+    if blob.count("\0") == len(values):
+        return [b"", blob.encode()]
+    encoded = [v.encode() for v in values]
+    offsets = array("q", accumulate(map(len, encoded)))
+    return [_little(offsets), b"".join(encoded)]
+
+
+def _unpack_strings(offsets_data: bytes, blob: bytes) -> List[str]:
+    if not offsets_data:
+        values = blob.decode().split("\0")
+        values.pop()
+        return values
+    ends = _array("q", offsets_data)
+    starts = itertools.chain((0,), ends)
+    return list(map(bytes.decode, map(blob.__getitem__, map(slice, starts, ends))))
@@ -0,0 +1,589 @@
+"""
+In-memory indexes for _example module.
+
+Helpers used by ExampleService to avoid full scans of the item store.
+KeysetIndex orders by seq (pagination, status buckets); RangeIndex by a
+non-unique key such as created_at; SearchIndex (built on PrefixIndex)
+answers name searches.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+# Compact once tombstones outnumber live entries (and the index is not tiny).
+_COMPACT_MIN_DEAD = 64
+# discard_many sweeps the whole index once the batch is 1/8 of it or more.
+_SWEEP_SHARE = 8
+
+
+class KeysetIndex:
+    """Store refs ordered by a unique, never-reused integer key.
+
+    Supports O(log N) seeks to "first key after K", which is what keyset
+    pagination needs. Keys live in a packed array; a ref is whatever the
+    item store resolves back to an item. Deletes leave a tombstone that is
+    skipped on reads and swept out in bulk, so positions may move but keys
+    never do.
+    """
+
+    __slots__ = ("_keys", "_refs", "_live", "_dead")
+
+    def __init__(self):
+        self._keys = array("q")
+        self._refs: List[Optional[Hashable]] = []
+        self._live = 0
+        self._dead = 0
+
+    @classmethod
+    def from_sorted(cls, keys: array, refs: List[Hashable]) -> "KeysetIndex":
+        """Build an index from strictly increasing keys and their refs
+        (adopted, not copied)."""
+        index = cls()
+        index._keys = keys
+        index._refs = refs
+        index._live = len(refs)
+        return index
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (r for r in self._refs if r is not None)
+
+    def add(self, key: int, ref: Hashable) -> None:
+        """Insert a ref under key. Appending (the common case) is O(1)."""
+        keys, refs = self._keys, self._refs
+        if not keys or key > keys[-1]:
+            keys.append(key)
+            refs.append(ref)
+        else:
+            pos = bisect_left(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                if refs[pos] is not None:
+                    refs[pos] = ref
+                    return
+                # Same key re-added after a discard: revive its tombstone.
+                refs[pos] = ref
+                self._dead -= 1
+            else:
+                keys.insert(pos, key)
+                refs.insert(pos, ref)
+        self._live += 1
+
+    def discard(self, key: int) -> None:
+        """Remove the entry for key if present."""
+        keys, refs = self._keys, self._refs
+        pos = bisect_left(keys, key)
+        if pos == len(keys) or keys[pos] != key or refs[pos] is None:
+            return
+        refs[pos] = None
+        self._live -= 1
+        self._dead += 1
+        if self._dead >= _COMPACT_MIN_DEAD and self._dead > self._live:
+            self._compact()
+
+    def discard_many(self, keys: Iterable[int]) -> None:
+        """Remove the entries for keys. A batch that is a sizeable share of
+        the index is dropped in one sweep rather than bisected key by key."""
+        doomed = set(keys)
+        if len(doomed) * _SWEEP_SHARE < self._live:
+            for key in doomed:
+                self.discard(key)
+            return
+        keys_, refs = self._keys, self._refs
+        live = [
+            pos
+            for pos, key in enumerate(keys_)
+            if refs[pos] is not None and key not in doomed
+        ]
+        self._keys = array("q", (keys_[p] for p in live))
+        self._refs = [refs[p] for p in live]
+        self._live = len(live)
+        self._dead = 0
+
+    def get(self, key: int) -> Optional[Hashable]:
+        """Return the ref stored under key, or None."""
+        keys = self._keys
+        pos = bisect_left(keys, key)
+        return self._refs[pos] if pos < len(keys) and keys[pos] == key else None
+
+    def after(self, key: int, limit: int) -> List[Tuple[int, Hashable]]:
+        """Return up to limit (key, ref) pairs with key strictly greater than key."""
+        keys, refs = self._keys, self._refs
+        out: List[Tuple[int, Hashable]] = []
+        pos = bisect_right(keys, key)
+        end = len(keys)
+        while pos < end and len(out) < limit:
+            ref = refs[pos]
+            if ref is not None:
+                out.append((keys[pos], ref))
+            pos += 1
+        return out
+
+    def snapshot(self) -> Tuple[array, List[Optional[Hashable]]]:
+        """Copies of the (keys, refs) columns; tombstoned refs are None."""
+        return self._keys[:], self._refs[:]
+
+    def _compact(self) -> None:
+        live = [pos for pos, ref in enumerate(self._refs) if ref is not None]
+        self._keys = array("q", (self._keys[p] for p in live))
+        self._refs = [self._refs[p] for p in live]
+        self._dead = 0
+
+
+class RangeIndex:
+    """Store refs ordered by a (key, seq) pair: keys may repeat, the unique
+    seq breaks ties.
+
+    Backs range scans over a non-unique sort key (created_at): O(log N) to
+    find either end of a key range, then O(1) per entry in either direction.
+    Storage works like KeysetIndex: packed columns, tombstoned deletes swept
+    in bulk. Entries arriving in order (the common case) are appended.
+    """
+
+    __slots__ = ("_keys", "_seqs", "_refs", "_live", "_dead")
+
+    def __init__(self):
+        self._keys = array("q")
+        self._seqs = array("q")
+        self._refs: List[Optional[Hashable]] = []
+        self._live = 0
+        self._dead = 0
+
+    @classmethod
+    def from_sorted(
+        cls, keys: array, seqs: array, refs: List[Hashable]
+    ) -> "RangeIndex":
+        """Build an index from entries sorted by (key, seq) (adopted, not
+        copied)."""
+        index = cls()
+        index._keys = keys
+        index._seqs = seqs
+        index._refs = refs
+        index._live = len(refs)
+        return index
+
+    def __len__(self) -> int:
+        return self._live
+
+    def add(self, key: int, seq: int, ref: Hashable) -> None:
+        """Insert a ref under (key, seq), replacing the ref already there."""
+        keys, seqs, refs = self._keys, self._seqs, self._refs
+        if not keys or key > keys[-1] or (key == keys[-1] and seq > seqs[-1]):
+            keys.append(key)
+            seqs.append(seq)
+            refs.append(ref)
+        else:
+            pos = self._find(key, seq)
+            if pos < len(keys) and keys[pos] == key and seqs[pos] == seq:
+                if refs[pos] is not None:
+                    refs[pos] = ref
+                    return
+                refs[pos] = ref
+                self._dead -= 1
+            else:
+                keys.insert(pos, key)
+                seqs.insert(pos, seq)
+                refs.insert(pos, ref)
+        self._live += 1
+
+    def discard(self, key: int, seq: int) -> None:
+        """Remove the entry for (key, seq) if present."""
+        keys, seqs, refs = self._keys, self._seqs, self._refs
+        pos = self._find(key, seq)
+        if (
+            pos == len(keys)
+            or keys[pos] != key
+            or seqs[pos] != seq
+            or refs[pos] is None
+        ):
+            return
+        refs[pos] = None
+        self._live -= 1
+        self._dead += 1
+        if self._dead >= _COMPACT_MIN_DEAD and self._dead > self._live:
+            self._compact()
+
+    def discard_many(self, entries: Iterable[Tuple[int, int]]) -> None:
+        """Remove the entries for (key, seq) pairs; like
+        KeysetIndex.discard_many, a large batch is one sweep on seq."""
+        entries = list(entries)
+        if len(entries) * _SWEEP_SHARE < self._live:
+            for key, seq in entries:
+                self.discard(key, seq)
+            return
+        doomed = {seq for _, seq in entries}
+        keys, seqs, refs = self._keys, self._seqs, self._refs
+        live = [
+            pos
+            for pos, seq in enumerate(seqs)
+            if refs[pos] is not None and seq not in doomed
+        ]
+        self._keys = array("q", (keys[p] for p in live))
+        self._seqs = array("q", (seqs[p] for p in live))
+        self._refs = [refs[p] for p in live]
+        self._live = len(live)
+        self._dead = 0
+
+    def scan(
+        self,
+        low: Optional[int] = None,
+        high: Optional[int] = None,
+        descending: bool = False,
+    ) -> Iterator[Tuple[int, int, Hashable]]:
+        """Yield (key, seq, ref) with low < key < high (either bound
+        optional), in (key, seq) order or its reverse.
+
+        Consume it before the index changes.
+        """
+        keys, seqs, refs = self._keys, self._seqs, self._refs
+        start = 0 if low is None else bisect_right(keys, low)
+        end = len(keys) if high is None else bisect_left(keys, high, start)
+        positions = range(end - 1, start - 1, -1) if descending else range(start, end)
+        for pos in positions:
+            ref = refs[pos]
+            if ref is not None:
+                yield keys[pos], seqs[pos], ref
+
+    def _find(self, key: int, seq: int) -> int:
+        """Position of (key, seq), or where it would be inserted."""
+        keys = self._keys
+        low = bisect_left(keys, key)
+        high = bisect_right(keys, key, low)
+        return bisect_left(self._seqs, seq, low, high)
+
+    def _compact(self) -> None:
+        live = [pos for pos, ref in enumerate(self._refs) if ref is not None]
+        self._keys = array("q", (self._keys[p] for p in live))
+        self._seqs = array("q", (self._seqs[p] for p in live))
+        self._refs = [self._refs[p] for p in live]
+        self._dead = 0
+
+
+# Search tokens: runs of letters and digits. Underscores separate words, as
+# in SQLite FTS5's unicode61 tokenizer.
+_TOKEN = re.compile(r"[^\W_]+")
+# Pending PrefixIndex entries are sorted into the tail this many at a time.
+_FOLD_AT = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded word tokens of text."""
+    return _TOKEN.findall(text.casefold())
+
+
+class PrefixIndex:
+    """(key, seq) entries ordered by a string key, listed by key prefix.
+
+    A sorted main run answers a prefix with one bisect. Inserts that do not
+    sort last are buffered, sorted into a small tail run in batches and
+    spliced into the main run once the tail reaches 1/32 of it, so inserts
+    in random key order cost O(log N) amortized rather than an O(N) shift.
+    Deletes from the main run are tombstoned and swept in bulk.
+    """
+
+    __slots__ = ("_keys", "_seqs", "_tail", "_pending", "_dead")
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._seqs = array("q")
+        self._tail: List[Tuple[str, int]] = []  # sorted
+        self._pending: List[Tuple[str, int]] = []  # unsorted
+        self._dead: Set[Tuple[str, int]] = set()  # tombstoned main entries
+
+    @classmethod
+    def from_columns(cls, keys: Sequence[str], seqs: Sequence[int]) -> "PrefixIndex":
+        """Build an index from keys in any order and their ascending seqs."""
+        index = cls()
+        # Stable, so equal keys stay in seq order.
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        index._keys = [keys[p] for p in order]
+        index._seqs = array("q", [seqs[p] for p in order])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._dead) + len(self._tail) + len(self._pending)
+
+    def add(self, key: str, seq: int) -> None:
+        """Insert (key, seq); it must not be present already."""
+        entry = (key, seq)
+        if entry in self._dead:
+            self._dead.remove(entry)
+            return
+        keys = self._keys
+        if not keys or key > keys[-1] or (key == keys[-1] and seq > self._seqs[-1]):
+            keys.append(key)
+            self._seqs.append(seq)
+            return
+        self._pending.append(entry)
+        if len(self._pending) >= _FOLD_AT:
+            self._fold()
+
+    def discard(self, key: str, seq: int) -> None:
+        """Remove (key, seq) if present."""
+        entry = (key, seq)
+        self._fold()
+        tail = self._tail
+        pos = bisect_left(tail, entry)
+        if pos < len(tail) and tail[pos] == entry:
+            del tail[pos]
+            return
+        pos = self._find(key, seq, 0)
+        if pos < len(self._keys) and self._seqs[pos] == seq and self._keys[pos] == key:
+            dead = self._dead
+            dead.add(entry)
+            if len(dead) >= _COMPACT_MIN_DEAD and 2 * len(dead) > len(self._keys):
+                self._compact()
+
+    def prefixed(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        """Yield (key, seq) for keys starting with prefix, in (key, seq)
+        order. Consume it before the index changes."""
+        self._fold()
+        main = self._scan_main(prefix)
+        if not self._tail:
+            return main
+        return heapq.merge(main, self._scan_tail(prefix))
+
+    def _scan_main(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        keys, seqs, dead = self._keys, self._seqs, self._dead
+        end = len(keys)
+        pos = bisect_left(keys, prefix)
+        while pos < end:
+            key = keys[pos]
+            if not key.startswith(prefix):
+                return
+            entry = (key, seqs[pos])
+            if not dead or entry not in dead:
+                yield entry
+            pos += 1
+
+    def _scan_tail(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        tail = self._tail
+        for entry in islice(tail, bisect_left(tail, (prefix,)), None):
+            if not entry[0].startswith(prefix):
+                return
+            yield entry
+
+    def _find(self, key: str, seq: int, start: int) -> int:
+        """Main-run position of (key, seq) at or after start, or where it
+        would be inserted."""
+        keys = self._keys
+        low = bisect_left(keys, key, start)
+        high = bisect_right(keys, key, low)
+        return bisect_left(self._seqs, seq, low, high)
+
+    def _fold(self) -> None:
+        """Sort pending entries into the tail; splice a large tail into the
+        main run."""
+        if self._pending:
+            self._tail += self._pending
+            self._tail.sort()
+            self._pending = []
+            if len(self._tail) > max(_FOLD_AT, len(self._keys) >> 5):
+                self._merge()
+
+    def _merge(self) -> None:
+        keys, seqs = self._keys, self._seqs
+        merged_keys: List[str] = []
+        merged_seqs = array("q")
+        start = 0
+        for key, seq in self._tail:
+            pos = self._find(key, seq, start)
+            merged_keys += keys[start:pos]
+            merged_seqs += seqs[start:pos]
+            merged_keys.append(key)
+            merged_seqs.append(seq)
+            start = pos
+        merged_keys += keys[start:]
+        merged_seqs += seqs[start:]
+        self._keys, self._seqs, self._tail = merged_keys, merged_seqs, []
+
+    def _compact(self) -> None:
+        dead = self._dead
+        live = [
+            pos
+            for pos, entry in enumerate(zip(self._keys, self._seqs, strict=True))
+            if entry not in dead
+        ]
+        self._keys = [self._keys[p] for p in live]
+        self._seqs = array("q", (self._seqs[p] for p in live))
+        dead.clear()
+
+
+# A search hit: (0, casefolded name, seq) for a name-prefix match, then
+# (1, "", seq) for a word match; hits sort in rank order.
+SearchHit = Tuple[int, str, int]
+
+
+class SearchIndex:
+    """Name search by whole-name prefix, then by words.
+
+    search() ranks names starting with the query first (alphabetically,
+    casefolded), then names holding every query word, the last one as a
+    word prefix (search-as-you-type), in seq order. Both parts are read in
+    rank order and stop after limit hits; at worst a multi-word query walks
+    the postings of its rarest word.
+
+    Names live in a PrefixIndex; words in an inverted index token -> seqs
+    (ascending; a bare int while there is only one) plus a PrefixIndex of
+    the tokens, which expands the last word. Only seqs are stored: callers
+    resolve them.
+    """
+
+    __slots__ = ("_names", "_tokens", "_postings")
+
+    def __init__(self):
+        self._names = PrefixIndex()
+        self._tokens = PrefixIndex()
+        self._postings: Dict[str, Union[int, array]] = {}
+
+    @classmethod
+    def build(cls, seqs: Sequence[int], names: Iterable[str]) -> "SearchIndex":
+        """Build an index over ascending seqs and their names in bulk."""
+        index = cls()
+        keys = list(map(str.casefold, names))
+        index._names = PrefixIndex.from_columns(keys, seqs)
+        grouped: Dict[str, List[int]] = defaultdict(list)
+        for seq, tokens in zip(seqs, map(_TOKEN.findall, keys), strict=True):
+            for token in set(tokens) if len(tokens) > 1 else tokens:
+                grouped[token].append(seq)
+        index._postings = {
+            token: posting[0] if len(posting) == 1 else array("q", posting)
+            for token, posting in grouped.items()
+        }
+        index._tokens = PrefixIndex.from_columns(list(grouped), [0] * len(grouped))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, seq: int, name: str) -> None:
+        key = name.casefold()
+        self._names.add(key, seq)
+        for token in set(_TOKEN.findall(key)):
+            if self._post(token, seq):
+                self._tokens.add(token, 0)
+
+    def discard(self, seq: int, name: str) -> None:
+        key = name.casefold()
+        self._names.discard(key, seq)
+        for token in set(_TOKEN.findall(key)):
+            if self._unpost(token, seq):
+                self._tokens.discard(token, 0)
+
+    def search(
+        self, query: str, limit: int, name_of: Callable[[int], str]
+    ) -> List[SearchHit]:
+        """Return up to limit hits in rank order.
+
+        name_of(seq) returns a stored name; it is called only to check the
+        last word of multi-word queries.
+        """
+        prefix = query.strip().casefold()
+        if not prefix:
+            return []
+        hits: List[SearchHit] = [
+            (0, key, seq) for key, seq in islice(self._names.prefixed(prefix), limit)
+        ]
+        words = _TOKEN.findall(prefix)
+        if len(hits) < limit and words:
+            # Fewer than limit prefix hits: all of them are in hits.
+            seen = {seq for _, _, seq in hits}
+            found = (s for s in self._word_matches(words, name_of) if s not in seen)
+            hits += [(1, "", seq) for seq in islice(found, limit - len(hits))]
+        return hits
+
+    def _word_matches(
+        self, words: List[str], name_of: Callable[[int], str]
+    ) -> Iterator[int]:
+        """Yield, in seq order, seqs of names holding every word, the last
+        as a prefix."""
+        *whole, last = words
+        postings = sorted((self._posting(w) for w in set(whole)), key=len)
+        # Walk the shorter side: the rarest whole word, or the postings of
+        # every token the last word is a prefix of.
+        bound = len(postings[0]) if postings else None
+        expanded, size = [], 0
+        for token, _ in self._tokens.prefixed(last):
+            expanded.append(self._posting(token))
+            size += len(expanded[-1])
+            if bound is not None and size > bound:
+                break
+        else:
+            for seq in _merged(expanded):
+                if all(_contains(p, seq) for p in postings):
+                    yield seq
+            return
+        driver, others = postings[0], postings[1:]
+        for seq in driver:
+            if all(_contains(p, seq) for p in others) and any(
+                t.startswith(last) for t in _TOKEN.findall(name_of(seq).casefold())
+            ):
+                yield seq
+
+    def _posting(self, token: str) -> Sequence[int]:
+        seqs = self._postings.get(token, ())
+        return (seqs,) if isinstance(seqs, int) else seqs
+
+    def _post(self, token: str, seq: int) -> bool:
+        """Add seq to token's posting; True if the token is new."""
+        postings = self._postings
+        seqs = postings.get(token)
+        if seqs is None:
+            postings[token] = seq
+            return True
+        if isinstance(seqs, int):
+            postings[token] = array("q", sorted((seqs, seq)))
+        elif seq > seqs[-1]:
+            seqs.append(seq)
+        else:
+            insort(seqs, seq)
+        return False
+
+    def _unpost(self, token: str, seq: int) -> bool:
+        """Remove seq from token's posting; True if the token is gone."""
+        postings = self._postings
+        seqs = postings.get(token)
+        if isinstance(seqs, int):
+            if seqs != seq:
+                return False
+            del postings[token]
+            return True
+        if seqs is not None:
+            pos = bisect_left(seqs, seq)
+            if pos < len(seqs) and seqs[pos] == seq:
+                del seqs[pos]
+                if len(seqs) == 1:
+                    postings[token] = seqs[0]
+        return False
+
+
+def _merged(postings: List[Sequence[int]]) -> Iterator[int]:
+    """Union of ascending postings, ascending."""
+    previous = None
+    for seq in heapq.merge(*postings):
+        if seq != previous:
+            yield seq
+            previous = seq
+
+
+def _contains(seqs: Sequence[int], seq: int) -> bool:
+    pos = bisect_left(seqs, seq)
+    return pos < len(seqs) and seqs[pos] == seq
@@ -6,15 +6,48 @@ Replace with your actual models.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Generic, List, Optional, TypeVar
 
+from shared.validation import Name, Slug, UUIDStr
 
-@dataclass
+T = TypeVar("T")
+
+# Field rules, enforced by shared.validation (validate(ExampleName, x), or
+# validate_many(ExampleModel, records) for whole records).
+ExampleId = UUIDStr
+ExampleName = Name
+ExampleStatus = Slug
+
+
+@dataclass(slots=True)
 class ExampleModel:
     """Example data model."""
 
-    id: str
-    name: str
-    status: str = "active"
+    id: ExampleId
+    name: ExampleName
+    status: ExampleStatus = "active"
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
+
+
+@dataclass
+class ExamplePage:
+    """One page of a keyset-paginated listing."""
+
+    items: List[ExampleModel]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class BulkResult(Generic[T]):
+    """Outcome of a bulk call, one slot per input in input order.
+
+    results[n] is None where input n failed; errors[n] says why.
+    """
+
+    results: List[Optional[T]]
+    errors: dict[int, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
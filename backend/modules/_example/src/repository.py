@@ -0,0 +1,1037 @@
+"""
+Persistence for _example module.
+
+ExampleService depends on the ExampleRepository protocol only. Three backends
+ship with the module:
+
+- InMemoryExampleRepository: process-local, the default
+- ShardedExampleRepository: process-local and thread-safe, lock-striped
+- SQLiteExampleRepository: durable, shareable across workers (WAL mode)
+
+Every backend assigns each item a creation sequence number (seq) that is
+never reused; list and page results are ordered by it. list_created()
+orders by (created_at, seq) instead, through a created_at index.
+search() ranks name-prefix matches, then word matches (see SearchIndex).
+"""
+
+import heapq
+import itertools
+import sqlite3
+import threading
+import zlib
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from shared.db import ConnectionPool, run_sync, sqlite_pool
+
+from .index import KeysetIndex, RangeIndex, SearchIndex, tokenize
+from .models import ExampleModel
+from .storage import CompactItemStore, ItemStore, from_micros, to_micros
+
+
+class ExampleRepository(Protocol):
+    """Storage contract ExampleService relies on."""
+
+    async def add(self, item: ExampleModel) -> None:
+        """Store a new item."""
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        """Store new items in one batch."""
+
+    async def get(self, item_id: str) -> Optional[ExampleModel]:
+        """Return an item by id, or None."""
+
+    async def get_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        """Return items by id in input order, None where missing."""
+
+    async def update(self, item: ExampleModel) -> bool:
+        """Replace a stored item; False if it does not exist."""
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        """Replace stored items in one batch; False where one does not exist."""
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        """Delete an item; return it, or None if it did not exist."""
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        """Delete items; return them in input order, None where missing."""
+
+    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
+        """Return all items (optionally one status) in seq order."""
+
+    async def page(
+        self, after: int, limit: int, status: Optional[str] = None
+    ) -> List[Tuple[int, ExampleModel]]:
+        """Return up to limit (seq, item) pairs with seq > after, in seq order."""
+
+    async def list_created(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        *,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[ExampleModel]:
+        """Return up to limit items with after < created_at < before (either
+        bound optional) in (created_at, seq) order, newest first if
+        descending."""
+
+    async def search(self, query: str, limit: int) -> List[ExampleModel]:
+        """Return up to limit items whose name starts with query, then items
+        whose name holds every query word (the last one as a prefix)."""
+
+
+class InMemoryExampleRepository:
+    """Process-local repository with a status index and keyset ordering.
+
+    Pass compact=True to keep items in a columnar CompactItemStore, which
+    uses far less memory per item at the cost of building a fresh
+    ExampleModel on every read.
+    """
+
+    def __init__(self, compact: bool = False):
+        self._store = CompactItemStore() if compact else ItemStore()
+        self._seq = itertools.count(1)
+        self._order = KeysetIndex()
+        # status -> store refs in seq order.
+        # Every write path must keep this in sync with self._store.
+        self._status_index: dict[str, KeysetIndex] = {}
+        # Store refs by (created_at micros, seq); kept in sync the same way.
+        self._by_created = RangeIndex()
+        # The same per status; a status's index is built by its first
+        # list_created(status=...), kept in sync after.
+        self._status_created: dict[str, RangeIndex] = {}
+        # Name search; built by the first search(), kept in sync after.
+        self._search: Optional[SearchIndex] = None
+
+    async def add(self, item: ExampleModel) -> None:
+        self._insert(item)
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        insert = self._insert
+        for item in items:
+            insert(item)
+
+    async def get(self, item_id: str) -> Optional[ExampleModel]:
+        return self._store.get(item_id)
+
+    async def get_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        get = self._store.get
+        return [get(i) for i in item_ids]
+
+    async def update(self, item: ExampleModel) -> bool:
+        return self._replace(item)
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        replace = self._replace
+        return [replace(i) for i in items]
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        return self._remove(item_id)
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        return self._remove_many(item_ids)
+
+    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
+        if status:
+            resolve = self._store.resolve
+            return [resolve(r) for r in self._status_index.get(status, ())]
+        return list(self._store.values())
+
+    async def page(
+        self, after: int, limit: int, status: Optional[str] = None
+    ) -> List[Tuple[int, ExampleModel]]:
+        index = self._status_index.get(status) if status else self._order
+        if index is None:
+            return []
+        resolve = self._store.resolve
+        return [(seq, resolve(r)) for seq, r in index.after(after, limit)]
+
+    async def list_created(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        *,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[ExampleModel]:
+        index = self._created_index(status) if status else self._by_created
+        if index is None:
+            return []
+        rows = index.scan(_micros(after), _micros(before), descending)
+        resolve = self._store.resolve
+        return [resolve(ref) for _, _, ref in islice(rows, limit)]
+
+    async def search(self, query: str, limit: int) -> List[ExampleModel]:
+        if self._search is None:
+            self._search = SearchIndex.build(*self._store.names())
+        resolve, ref_of = self._store.resolve, self._order.get
+
+        def name_of(seq: int) -> str:
+            return resolve(ref_of(seq)).name
+
+        hits = self._search.search(query, limit, name_of)
+        return [resolve(ref_of(seq)) for _, _, seq in hits]
+
+    def _insert(self, item: ExampleModel, seq: Optional[int] = None) -> int:
+        """Store a new item under seq (default: the next one) and register
+        it in every index. Returns the seq."""
+        if seq is None:
+            seq = next(self._seq)
+        ref = self._store.add(seq, item)
+        self._order.add(seq, ref)
+        self._index_add(seq, ref, item.status)
+        created = to_micros(item.created_at)
+        self._by_created.add(created, seq, ref)
+        self._created_add(item.status, created, seq, ref)
+        if self._search is not None:
+            self._search.add(seq, item.name)
+        return seq
+
+    def _replace(self, item: ExampleModel) -> bool:
+        """Replace a stored item, moving it between status buckets."""
+        found = self._store.find(item.id)
+        if found is None:
+            return False
+        seq, ref, old = found
+        if old.status != item.status:
+            self._index_discard(seq, old.status)
+            self._index_add(seq, ref, item.status)
+        if old.created_at != item.created_at or old.status != item.status:
+            before, created = to_micros(old.created_at), to_micros(item.created_at)
+            self._by_created.discard(before, seq)
+            self._by_created.add(created, seq, ref)
+            self._created_discard(old.status, before, seq)
+            self._created_add(item.status, created, seq, ref)
+        if self._search is not None and old.name != item.name:
+            self._search.discard(seq, old.name)
+            self._search.add(seq, item.name)
+        self._store.put(item)
+        return True
+
+    def _remove(self, item_id: str) -> Optional[ExampleModel]:
+        """Drop an item from the store and every index."""
+        removed = self._store.remove(item_id)
+        if removed is None:
+            return None
+        seq, item = removed
+        self._order.discard(seq)
+        self._index_discard(seq, item.status)
+        created = to_micros(item.created_at)
+        self._by_created.discard(created, seq)
+        self._created_discard(item.status, created, seq)
+        if self._search is not None:
+            self._search.discard(seq, item.name)
+        return item
+
+    def _remove_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        """Drop items from the store, then from each index in one batch."""
+        remove = self._store.remove
+        found = [remove(i) for i in item_ids]
+        removed = [r for r in found if r is not None]
+        if not removed:
+            return [None] * len(found)
+        by_status: dict[str, List[Tuple[int, int]]] = {}
+        for seq, item in removed:
+            by_status.setdefault(item.status, []).append(
+                (to_micros(item.created_at), seq)
+            )
+        self._order.discard_many(seq for seq, _ in removed)
+        for status, entries in by_status.items():
+            created = self._status_created.get(status)
+            if created is not None:
+                created.discard_many(entries)
+            index = self._status_index.get(status)
+            if index is not None:
+                index.discard_many(seq for _, seq in entries)
+                if not index:
+                    del self._status_index[status]
+                    self._status_created.pop(status, None)
+        self._by_created.discard_many(
+            e for entries in by_status.values() for e in entries
+        )
+        if self._search is not None:
+            for seq, item in removed:
+                self._search.discard(seq, item.name)
+        return [None if r is None else r[1] for r in found]
+
+    def _index_add(self, seq: int, ref: Hashable, status: str) -> None:
+        """Register an item in a status bucket."""
+        index = self._status_index.get(status)
+        if index is None:
+            index = self._status_index[status] = KeysetIndex()
+        index.add(seq, ref)
+
+    def _index_discard(self, seq: int, status: str) -> None:
+        """Remove an item from a status bucket."""
+        index = self._status_index.get(status)
+        if index is None:
+            return
+        index.discard(seq)
+        if not index:
+            del self._status_index[status]
+            self._status_created.pop(status, None)
+
+    def _created_index(self, status: str) -> Optional[RangeIndex]:
+        """The created_at index of one status, built on first use; None if
+        no item has the status."""
+        index = self._status_created.get(status)
+        if index is None:
+            bucket = self._status_index.get(status)
+            if bucket is None:
+                return None
+            resolve = self._store.resolve
+            seqs, refs = bucket.snapshot()
+            rows = sorted(
+                (to_micros(resolve(ref).created_at), seq, ref)
+                for seq, ref in zip(seqs, refs, strict=True)
+                if ref is not None
+            )
+            index = self._status_created[status] = RangeIndex.from_sorted(
+                array("q", [r[0] for r in rows]),
+                array("q", [r[1] for r in rows]),
+                [r[2] for r in rows],
+            )
+        return index
+
+    def _created_add(self, status: str, created: int, seq: int, ref: Hashable) -> None:
+        index = self._status_created.get(status)
+        if index is not None:
+            index.add(created, seq, ref)
+
+    def _created_discard(self, status: str, created: int, seq: int) -> None:
+        index = self._status_created.get(status)
+        if index is not None:
+            index.discard(created, seq)
+
+
+# --- Sharded (thread-safe) ------------------------------------------------
+
+
+class _SeqCounter:
+    """Thread-safe source of never-reused, increasing seqs."""
+
+    def __init__(self):
+        self._next = 1
+        self._lock = threading.Lock()
+
+    def reserve(self, count: int = 1) -> int:
+        """Claim count consecutive seqs; return the first."""
+        with self._lock:
+            first = self._next
+            self._next += count
+        return first
+
+
+class _Shard:
+    """One stripe of a ShardedExampleRepository. Callers hold .lock."""
+
+    __slots__ = (
+        "lock",
+        "items",
+        "seq_of",
+        "order",
+        "by_status",
+        "by_created",
+        "created_by_status",
+        "search",
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items: dict[str, ExampleModel] = {}
+        self.seq_of: dict[str, int] = {}
+        # Refs here are the items themselves, so a snapshot copies no
+        # lookups out of the lock.
+        self.order = KeysetIndex()
+        self.by_status: dict[str, KeysetIndex] = {}
+        self.by_created = RangeIndex()
+        # Per status; built by the first list_created(status=...) for it.
+        self.created_by_status: dict[str, RangeIndex] = {}
+        # Built by the first search, kept in sync after.
+        self.search: Optional[SearchIndex] = None
+
+    def insert(self, seq: int, item: ExampleModel) -> None:
+        self.items[item.id] = item
+        self.seq_of[item.id] = seq
+        self.order.add(seq, item)
+        created = to_micros(item.created_at)
+        self.by_created.add(created, seq, item)
+        if item.status in self.created_by_status:
+            self.created_by_status[item.status].add(created, seq, item)
+        if self.search is not None:
+            self.search.add(seq, item.name)
+        index = self.by_status.get(item.status)
+        if index is None:
+            index = self.by_status[item.status] = KeysetIndex()
+        index.add(seq, item)
+
+    def update(self, item: ExampleModel) -> bool:
+        old = self.items.get(item.id)
+        if old is None:
+            return False
+        seq = self.seq_of[item.id]
+        self.items[item.id] = item
+        self.order.add(seq, item)
+        before, created = to_micros(old.created_at), to_micros(item.created_at)
+        if before != created:
+            self.by_created.discard(before, seq)
+        self.by_created.add(created, seq, item)
+        by_status = self.created_by_status
+        if old.status in by_status and (old.status != item.status or before != created):
+            by_status[old.status].discard(before, seq)
+        if item.status in by_status:
+            by_status[item.status].add(created, seq, item)
+        if self.search is not None and old.name != item.name:
+            self.search.discard(seq, old.name)
+            self.search.add(seq, item.name)
+        if old.status != item.status:
+            self._unindex(seq, old.status)
+        index = self.by_status.get(item.status)
+        if index is None:
+            index = self.by_status[item.status] = KeysetIndex()
+        index.add(seq, item)
+        return True
+
+    def remove(self, item_id: str) -> Optional[ExampleModel]:
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return None
+        seq = self.seq_of.pop(item_id)
+        self.order.discard(seq)
+        created = to_micros(item.created_at)
+        if item.status in self.created_by_status:
+            self.created_by_status[item.status].discard(created, seq)
+        self._unindex(seq, item.status)
+        self.by_created.discard(created, seq)
+        if self.search is not None:
+            self.search.discard(seq, item.name)
+        return item
+
+    def find(self, query: str, limit: int) -> List[tuple]:
+        """Search hits in rank order, each with its item appended."""
+        if self.search is None:
+            self.search = SearchIndex.build(
+                list(self.seq_of.values()), [i.name for i in self.items.values()]
+            )
+        order = self.order
+        hits = self.search.search(query, limit, lambda seq: order.get(seq).name)
+        return [(*hit, order.get(hit[2])) for hit in hits]
+
+    def index(self, status: Optional[str]) -> Optional[KeysetIndex]:
+        return self.by_status.get(status) if status else self.order
+
+    def created(self, status: Optional[str]) -> Optional[RangeIndex]:
+        """The created_at index, of one status if given (built on first
+        use); None if no item has the status."""
+        if not status:
+            return self.by_created
+        index = self.created_by_status.get(status)
+        if index is None and status in self.by_status:
+            rows = sorted(
+                (to_micros(item.created_at), seq, item)
+                for seq, item in self.by_status[status].after(0, len(self.items))
+            )
+            index = self.created_by_status[status] = RangeIndex.from_sorted(
+                array("q", [r[0] for r in rows]),
+                array("q", [r[1] for r in rows]),
+                [r[2] for r in rows],
+            )
+        return index
+
+    def _unindex(self, seq: int, status: str) -> None:
+        index = self.by_status.get(status)
+        if index is not None:
+            index.discard(seq)
+            if not index:
+                del self.by_status[status]
+                self.created_by_status.pop(status, None)
+
+
+class ShardedExampleRepository:
+    """Thread-safe in-memory repository striped over N locked shards.
+
+    Items are spread over shards by a hash of their id, and each shard has
+    its own lock, so writers on different threads (a thread pool, or a
+    free-threaded build) rarely wait for each other. Single-item calls take
+    one shard lock. Bulk calls and listings take the locks they need in
+    shard order, so they apply, and read, atomically across shards.
+
+    list_items() and page() read a consistent snapshot: every write either
+    is in it completely or not at all. They merge per-shard results by
+    seq, which costs more than InMemoryExampleRepository's single-index
+    listing (a few hundred ms per million items). Prefer page() for large
+    listings.
+
+    Seqs are drawn from one counter. A create on another thread can take a
+    seq below one that is already visible, so a page read concurrently
+    with that create may miss it, as with concurrent SQL transactions.
+
+    Share one repository across threads. Give each thread or event loop its
+    own ExampleService, since its get_item cache is asyncio-only.
+    """
+
+    def __init__(self, shards: int = 16):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._shards = [_Shard() for _ in range(shards)]
+        self._seq = _SeqCounter()
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    async def add(self, item: ExampleModel) -> None:
+        shard = self._shard(item.id)
+        with shard.lock:
+            shard.insert(self._seq.reserve(), item)
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        if not items:
+            return
+        groups = self._group([i.id for i in items])
+        with self._locked(groups):
+            # Input order is seq order, as for the other backends.
+            first = self._seq.reserve(len(items))
+            for shard, positions in groups.items():
+                insert = self._shards[shard].insert
+                for n in positions:
+                    insert(first + n, items[n])
+
+    async def get(self, item_id: str) -> Optional[ExampleModel]:
+        shard = self._shard(item_id)
+        with shard.lock:
+            return shard.items.get(item_id)
+
+    async def get_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        results: List[Optional[ExampleModel]] = [None] * len(item_ids)
+        groups = self._group(item_ids)
+        with self._locked(groups):
+            for shard, positions in groups.items():
+                get = self._shards[shard].items.get
+                for n in positions:
+                    results[n] = get(item_ids[n])
+        return results
+
+    async def update(self, item: ExampleModel) -> bool:
+        shard = self._shard(item.id)
+        with shard.lock:
+            return shard.update(item)
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        results = [False] * len(items)
+        groups = self._group([i.id for i in items])
+        with self._locked(groups):
+            for shard, positions in groups.items():
+                update = self._shards[shard].update
+                for n in positions:
+                    results[n] = update(items[n])
+        return results
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        shard = self._shard(item_id)
+        with shard.lock:
+            return shard.remove(item_id)
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        results: List[Optional[ExampleModel]] = [None] * len(item_ids)
+        groups = self._group(item_ids)
+        with self._locked(groups):
+            for shard, positions in groups.items():
+                remove = self._shards[shard].remove
+                for n in positions:
+                    results[n] = remove(item_ids[n])
+        return results
+
+    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
+        with self._locked(range(len(self._shards))):
+            parts = [
+                index.snapshot()
+                for index in (s.index(status) for s in self._shards)
+                if index
+            ]
+        return [item for _, item in _merge_by_seq(parts)]
+
+    async def page(
+        self, after: int, limit: int, status: Optional[str] = None
+    ) -> List[Tuple[int, ExampleModel]]:
+        with self._locked(range(len(self._shards))):
+            rows = [
+                row
+                for index in (s.index(status) for s in self._shards)
+                if index
+                for row in index.after(after, limit)
+            ]
+        rows.sort(key=_first)
+        del rows[limit:]
+        return rows
+
+    async def list_created(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        *,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[ExampleModel]:
+        low, high = _micros(after), _micros(before)
+        parts = []
+        with self._locked(range(len(self._shards))):
+            for shard in self._shards:
+                index = shard.created(status)
+                if index is not None:
+                    rows = index.scan(low, high, descending)
+                    parts.append(list(islice(rows, limit)))
+        # Rows are (created, seq, item); seqs are unique, so items are never
+        # compared.
+        merged = heapq.merge(*parts, reverse=descending)
+        return [item for _, _, item in islice(merged, limit)]
+
+    async def search(self, query: str, limit: int) -> List[ExampleModel]:
+        with self._locked(range(len(self._shards))):
+            parts = [shard.find(query, limit) for shard in self._shards]
+        # Hits end in a unique seq, so items are never compared.
+        return [row[-1] for row in islice(heapq.merge(*parts), limit)]
+
+    def _shard(self, item_id: str) -> _Shard:
+        return self._shards[_shard_of(item_id, len(self._shards))]
+
+    def _group(self, item_ids: Sequence[str]) -> dict[int, List[int]]:
+        """Shard -> input positions of the ids that live there."""
+        count = len(self._shards)
+        groups: dict[int, List[int]] = {}
+        for n, item_id in enumerate(item_ids):
+            groups.setdefault(_shard_of(item_id, count), []).append(n)
+        return groups
+
+    @contextmanager
+    def _locked(self, shards: Iterable[int]) -> Iterator[None]:
+        """Hold the given shards' locks, always taken in shard order."""
+        locks = [self._shards[shard].lock for shard in sorted(shards)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in locks:
+                lock.release()
+
+
+def _shard_of(item_id: str, count: int) -> int:
+    # crc32, not hash(): stable across processes (PYTHONHASHSEED).
+    return zlib.crc32(item_id.encode()) % count
+
+
+def _first(row: tuple) -> int:
+    return row[0]
+
+
+def _micros(value: Optional[datetime]) -> Optional[int]:
+    return None if value is None else to_micros(value)
+
+
+def _merge_by_seq(
+    parts: List[Tuple[array, List[Optional[ExampleModel]]]],
+) -> Iterator[Tuple[int, ExampleModel]]:
+    """Merge per-shard (keys, refs) snapshots into one seq-ordered stream."""
+    if len(parts) == 1:
+        keys, refs = parts[0]
+        return ((k, r) for k, r in zip(keys, refs, strict=True) if r is not None)
+    keys = array("q")
+    refs: List[Optional[ExampleModel]] = []
+    for part_keys, part_refs in parts:
+        keys.extend(part_keys)
+        refs.extend(part_refs)
+    # One argsort over the concatenated runs (Timsort merges sorted runs).
+    keys_list = keys.tolist()
+    order = sorted(range(len(keys_list)), key=keys_list.__getitem__)
+    return ((keys_list[n], refs[n]) for n in order if refs[n] is not None)
+
+
+# --- SQLite ---------------------------------------------------------------
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS example_items (
+        seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+        id         TEXT    NOT NULL UNIQUE,
+        name       TEXT    NOT NULL,
+        name_key   TEXT    NOT NULL,  -- name.casefold(), for search()
+        status     TEXT    NOT NULL,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS example_items_status ON example_items (status, seq)",
+    "CREATE INDEX IF NOT EXISTS example_items_created"
+    " ON example_items (created_at, seq)",
+    "CREATE INDEX IF NOT EXISTS example_items_status_created"
+    " ON example_items (status, created_at, seq)",
+    # search() works on name_key, casefolded the way SearchIndex folds
+    # names, so both backends match and rank alike: prefixes ...
+    "CREATE INDEX IF NOT EXISTS example_items_name_key"
+    " ON example_items (name_key, seq)",
+    # ... and words, through an FTS5 index of the keys kept by triggers.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS example_items_fts USING fts5(
+        name_key, content='example_items', content_rowid='seq',
+        tokenize='unicode61 remove_diacritics 0'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS example_items_fts_insert
+    AFTER INSERT ON example_items BEGIN
+        INSERT INTO example_items_fts (rowid, name_key)
+        VALUES (new.seq, new.name_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS example_items_fts_delete
+    AFTER DELETE ON example_items BEGIN
+        INSERT INTO example_items_fts (example_items_fts, rowid, name_key)
+        VALUES ('delete', old.seq, old.name_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS example_items_fts_update
+    AFTER UPDATE OF name_key ON example_items BEGIN
+        INSERT INTO example_items_fts (example_items_fts, rowid, name_key)
+        VALUES ('delete', old.seq, old.name_key);
+        INSERT INTO example_items_fts (rowid, name_key)
+        VALUES (new.seq, new.name_key);
+    END
+    """,
+)
+# Databases created before name_key searched name: these objects are
+# dropped, and rebuilt on name_key, when the column is added.
+_SCHEMA_BEFORE_NAME_KEY = (
+    "DROP INDEX IF EXISTS example_items_name",
+    "DROP TRIGGER IF EXISTS example_items_fts_insert",
+    "DROP TRIGGER IF EXISTS example_items_fts_delete",
+    "DROP TRIGGER IF EXISTS example_items_fts_update",
+    "DROP TABLE IF EXISTS example_items_fts",
+)
+# Constant SQL text so sqlite3's per-connection statement cache reuses the
+# compiled statements. Timestamps are epoch microseconds.
+_COLUMNS = "seq, id, name, status, created_at, updated_at"
+_SQL_INSERT = (
+    "INSERT INTO example_items (id, name, name_key, status, created_at, updated_at)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_GET = f"SELECT {_COLUMNS} FROM example_items WHERE id = ?"
+_SQL_UPDATE = (
+    "UPDATE example_items"
+    " SET name = ?, name_key = ?, status = ?, created_at = ?, updated_at = ?"
+    " WHERE id = ?"
+)
+_SQL_DELETE = "DELETE FROM example_items WHERE id = ?"
+_SQL_SEARCH_PREFIX = (
+    f"SELECT {_COLUMNS} FROM example_items"
+    " WHERE name_key >= ? AND name_key < ?"
+    " ORDER BY name_key, seq LIMIT ?"
+)
+_SQL_SEARCH_WORDS = (
+    f"SELECT {_COLUMNS} FROM example_items WHERE seq IN ("
+    " SELECT rowid FROM example_items_fts WHERE example_items_fts MATCH ?"
+    " ORDER BY rowid LIMIT ?"
+    ") ORDER BY seq"
+)
+_SQL_LIST = f"SELECT {_COLUMNS} FROM example_items ORDER BY seq"
+_SQL_LIST_STATUS = f"SELECT {_COLUMNS} FROM example_items WHERE status = ? ORDER BY seq"
+_SQL_PAGE = f"SELECT {_COLUMNS} FROM example_items WHERE seq > ? ORDER BY seq LIMIT ?"
+_SQL_PAGE_STATUS = (
+    f"SELECT {_COLUMNS} FROM example_items"
+    " WHERE status = ? AND seq > ? ORDER BY seq LIMIT ?"
+)
+_ORDER_CREATED = " ORDER BY created_at, seq"
+_ORDER_CREATED_DESC = " ORDER BY created_at DESC, seq DESC"
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on old builds (999).
+_IN_CHUNK = 500
+
+
+class SQLiteExampleRepository:
+    """SQLite-backed repository running behind a shared/db ConnectionPool.
+
+    Use open() to create the pool and schema in one step:
+
+        repo = await SQLiteExampleRepository.open("examples.db")
+        service = ExampleService(repo)
+        ...
+        await repo.close()
+    """
+
+    def __init__(self, pool: ConnectionPool[sqlite3.Connection]):
+        self._pool = pool
+
+    @classmethod
+    async def open(
+        cls, path: Union[str, Path], max_connections: int = 4
+    ) -> "SQLiteExampleRepository":
+        """Open (creating if needed) a database file and its schema."""
+        pool = sqlite_pool(path, max_size=max_connections)
+        await pool.open()
+        repo = cls(pool)
+        await repo.initialize()
+        return repo
+
+    async def initialize(self) -> None:
+        """Create the table and status index if missing."""
+        async with self._pool.acquire() as conn:
+            await run_sync(conn, _create_schema)
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    async def add(self, item: ExampleModel) -> None:
+        async with self._pool.acquire() as conn:
+            await run_sync(conn, _insert_rows, [_to_row(item)])
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        if not items:
+            return
+        rows = [_to_row(i) for i in items]
+        async with self._pool.acquire() as conn:
+            await run_sync(conn, _insert_rows, rows)
+
+    async def get(self, item_id: str) -> Optional[ExampleModel]:
+        async with self._pool.acquire() as conn:
+            row = await run_sync(conn, _fetch_one, _SQL_GET, (item_id,))
+        return None if row is None else _from_row(row)
+
+    async def get_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        async with self._pool.acquire() as conn:
+            found = await run_sync(conn, _fetch_by_ids, item_ids)
+        return [found.get(i) for i in item_ids]
+
+    async def update(self, item: ExampleModel) -> bool:
+        return (await self.update_many([item]))[0]
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        if not items:
+            return []
+        rows = [_to_row(i) for i in items]
+        async with self._pool.acquire() as conn:
+            return await run_sync(conn, _update_rows, rows)
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        return (await self.remove_many([item_id]))[0]
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        async with self._pool.acquire() as conn:
+            found = await run_sync(conn, _delete_by_ids, item_ids)
+        # pop(): a repeated id is only reported deleted once.
+        return [found.pop(i, None) for i in item_ids]
+
+    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
+        sql, params = (_SQL_LIST_STATUS, (status,)) if status else (_SQL_LIST, ())
+        async with self._pool.acquire() as conn:
+            rows = await run_sync(conn, _fetch_all, sql, params)
+        return [_from_row(r) for r in rows]
+
+    async def page(
+        self, after: int, limit: int, status: Optional[str] = None
+    ) -> List[Tuple[int, ExampleModel]]:
+        if status:
+            sql, params = _SQL_PAGE_STATUS, (status, after, limit)
+        else:
+            sql, params = _SQL_PAGE, (after, limit)
+        async with self._pool.acquire() as conn:
+            rows = await run_sync(conn, _fetch_all, sql, params)
+        return [(r[0], _from_row(r)) for r in rows]
+
+    async def list_created(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        *,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[ExampleModel]:
+        where, params = [], []
+        for clause, value in (
+            ("created_at > ?", _micros(after)),
+            ("created_at < ?", _micros(before)),
+            ("status = ?", status or None),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = f"SELECT {_COLUMNS} FROM example_items"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += _ORDER_CREATED_DESC if descending else _ORDER_CREATED
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        async with self._pool.acquire() as conn:
+            rows = await run_sync(conn, _fetch_all, sql, tuple(params))
+        return [_from_row(r) for r in rows]
+
+    async def search(self, query: str, limit: int) -> List[ExampleModel]:
+        prefix = query.strip()
+        if not prefix:
+            return []
+        async with self._pool.acquire() as conn:
+            rows = await run_sync(conn, _search_rows, prefix, limit)
+        return [_from_row(r) for r in rows]
+
+
+def _to_row(item: ExampleModel) -> tuple:
+    return (
+        item.id,
+        item.name,
+        item.name.casefold(),
+        item.status,
+        to_micros(item.created_at),
+        None if item.updated_at is None else to_micros(item.updated_at),
+    )
+
+
+def _from_row(row: tuple) -> ExampleModel:
+    _, item_id, name, status, created_at, updated_at = row
+    return ExampleModel(
+        id=item_id,
+        name=name,
+        status=status,
+        created_at=from_micros(created_at),
+        updated_at=None if updated_at is None else from_micros(updated_at),
+    )
+
+
+# Blocking helpers: run on a worker thread via run_sync().
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(example_items)")}
+    if columns and "name_key" not in columns:
+        _add_name_key(conn)
+    had_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'example_items_fts'"
+    ).fetchone()
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    if not had_fts:
+        # Index names stored before search existed.
+        conn.execute(
+            "INSERT INTO example_items_fts (example_items_fts) VALUES ('rebuild')"
+        )
+
+
+def _add_name_key(conn: sqlite3.Connection) -> None:
+    """Add and fill name_key on a table from before it existed."""
+    conn.create_function("casefold", 1, str.casefold, deterministic=True)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "ALTER TABLE example_items ADD COLUMN name_key TEXT NOT NULL DEFAULT ''"
+        )
+        conn.execute("UPDATE example_items SET name_key = casefold(name)")
+        for statement in _SCHEMA_BEFORE_NAME_KEY:
+            conn.execute(statement)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _search_rows(conn: sqlite3.Connection, prefix: str, limit: int) -> List[tuple]:
+    """Name-prefix rows, then word-match rows, as SearchIndex ranks them."""
+    # The upper bound sorts after every key that starts with prefix.
+    prefix = prefix.casefold()
+    bounds = (prefix, prefix + "\U0010ffff")
+    rows = conn.execute(_SQL_SEARCH_PREFIX, (*bounds, limit)).fetchall()
+    words = tokenize(prefix)
+    if len(rows) < limit and words:
+        seen = {r[0] for r in rows}
+        match = " ".join(f'"{w}"' for w in words) + "*"
+        more = conn.execute(_SQL_SEARCH_WORDS, (match, limit + len(rows)))
+        rows += [r for r in more if r[0] not in seen][: limit - len(rows)]
+    return rows
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: List[tuple]) -> None:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_SQL_INSERT, rows)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _update_rows(conn: sqlite3.Connection, rows: List[tuple]) -> List[bool]:
+    """Apply updates in one transaction; True per row that matched."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        found = [
+            conn.execute(_SQL_UPDATE, (*values, item_id)).rowcount > 0
+            for item_id, *values in rows
+        ]
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return found
+
+
+def _fetch_one(conn: sqlite3.Connection, sql: str, params: tuple):
+    return conn.execute(sql, params).fetchone()
+
+
+def _fetch_all(conn: sqlite3.Connection, sql: str, params: tuple) -> List[tuple]:
+    return conn.execute(sql, params).fetchall()
+
+
+def _select_in_chunks(conn: sqlite3.Connection, item_ids: Sequence[str]):
+    unique = list(dict.fromkeys(item_ids))
+    for start in range(0, len(unique), _IN_CHUNK):
+        chunk = unique[start : start + _IN_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        sql = f"SELECT {_COLUMNS} FROM example_items WHERE id IN ({marks})"
+        yield from conn.execute(sql, chunk)
+
+
+def _fetch_by_ids(
+    conn: sqlite3.Connection, item_ids: Sequence[str]
+) -> dict[str, ExampleModel]:
+    return {row[1]: _from_row(row) for row in _select_in_chunks(conn, item_ids)}
+
+
+def _delete_by_ids(
+    conn: sqlite3.Connection, item_ids: Sequence[str]
+) -> dict[str, ExampleModel]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        found = _fetch_by_ids(conn, item_ids)
+        conn.executemany(_SQL_DELETE, [(i,) for i in found])
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return found
@@ -4,42 +4,288 @@ Business logic for _example module.
 Replace with your actual services.
 """
 
+import os
+import threading
 import uuid
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
 
-from .models import ExampleModel
+from shared.exceptions import NotFoundError
+from shared.instrumentation import instrument
+from shared.utils import async_cached, uuid4_strings
+from shared.validation import try_validate_many, validate
+
+from .models import BulkResult, ExampleModel, ExampleName, ExamplePage, ExampleStatus
+from .repository import ExampleRepository, InMemoryExampleRepository
+from .storage import to_micros
 
 
 class ExampleService:
-    """Example service with business logic."""
+    """Example service with business logic.
+
+    Storage is pluggable: pass any ExampleRepository. The default is a
+    process-local InMemoryExampleRepository (compact=True selects its
+    memory-optimized columnar layout).
+
+    get_item is cached per service (LRU, 30 s TTL) and concurrent lookups
+    of one id share a single repository call. Mutations made through this
+    service invalidate the entries they touch; writes by other processes
+    to a shared store can be served stale for up to the TTL.
+
+    Public methods are instrumented (shared.instrumentation); for get_item
+    that covers repository loads, cache hits show in get_item.stats().
+
+    time_ordered_ids=True issues time-ordered (version 7) UUIDs instead of
+    random ones: ids sort by creation time, so new rows land at the end of
+    a database's id index instead of at random pages.
+    """
 
-    def __init__(self):
-        # In real implementation: inject dependencies
-        self._items: dict[str, ExampleModel] = {}
+    def __init__(
+        self,
+        repository: Optional[ExampleRepository] = None,
+        *,
+        compact: bool = False,
+        time_ordered_ids: bool = False,
+    ):
+        self._repository: ExampleRepository = (
+            repository
+            if repository is not None
+            else InMemoryExampleRepository(compact=compact)
+        )
+        self._time_ordered_ids = time_ordered_ids
+
+    @instrument()
+    async def list_items(
+        self,
+        status: Optional[str] = None,
+        *,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        order: str = "asc",
+        limit: Optional[int] = None,
+    ) -> List[ExampleModel]:
+        """List items, optionally filtered by status.
+
+        Without further arguments items come in creation (seq) order. A
+        created_at window (both bounds exclusive), order="desc" or a limit
+        orders by created_at instead, served from the repository's
+        created_at index.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be >= 1")
+        if (
+            created_after is None
+            and created_before is None
+            and order == "asc"
+            and limit is None
+        ):
+            return await self._repository.list_items(status or None)
+        return await self._repository.list_created(
+            created_after,
+            created_before,
+            descending=order == "desc",
+            limit=limit,
+            status=status or None,
+        )
 
-    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
-        """List all items, optionally filtered by status."""
-        items = list(self._items.values())
-        if status:
-            items = [i for i in items if i.status == status]
-        return items
+    @instrument()
+    async def list_items_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+    ) -> ExamplePage:
+        """List one page of items in creation order.
 
+        Pass the returned next_cursor back to fetch the following page.
+        Items created or deleted between calls never cause another item
+        to be skipped or repeated.
+        """
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        after = _decode_cursor(cursor) if cursor else 0
+        rows = await self._repository.page(after, limit + 1, status or None)
+        next_cursor = _encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        return ExamplePage(
+            items=[item for _, item in rows[:limit]],
+            next_cursor=next_cursor,
+        )
+
+    async def iter_items(
+        self, status: Optional[str] = None, chunk_size: int = 500
+    ) -> AsyncIterator[List[ExampleModel]]:
+        """Yield all items in creation order, chunk_size items at a time."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        after = 0
+        while True:
+            rows = await self._repository.page(after, chunk_size, status or None)
+            if not rows:
+                return
+            yield [item for _, item in rows]
+            after = rows[-1][0]
+
+    @instrument()
+    async def search_items(self, query: str, limit: int = 20) -> List[ExampleModel]:
+        """Search items by name, for search-as-you-type.
+
+        Names starting with query come first (alphabetically, ignoring
+        case), then names holding every word of query, the last word as a
+        prefix (in creation order). Served from the repository's name
+        index; no full scan.
+        """
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        return await self._repository.search(query, limit)
+
+    @async_cached(maxsize=10_000, ttl=30.0)
+    @instrument("ExampleService.get_item.load")
     async def get_item(self, item_id: str) -> Optional[ExampleModel]:
         """Get a single item by ID."""
-        return self._items.get(item_id)
+        return await self._repository.get(item_id)
+
+    @instrument()
+    async def get_many(self, item_ids: Sequence[str]) -> BulkResult[ExampleModel]:
+        """Get items by ID; missing ids are reported in errors."""
+        results = await self._repository.get_many(item_ids)
+        return BulkResult(results, _missing(item_ids, results))
 
+    @instrument()
     async def create_item(self, name: str) -> ExampleModel:
-        """Create a new item."""
+        """Create a new item.
+
+        Raises:
+            ValidationError: name is not a 1-200 character string.
+        """
+        name = validate(ExampleName, name)
+        now = datetime.utcnow()
         item = ExampleModel(
-            id=str(uuid.uuid4()),
+            id=_new_time_ids(1, now)[0]
+            if self._time_ordered_ids
+            else str(uuid.uuid4()),
             name=name,
+            created_at=now,
         )
-        self._items[item.id] = item
+        await self._repository.add(item)
+        self.get_item.invalidate(item.id)
         return item
 
+    @instrument()
+    async def create_many(self, names: Sequence[str]) -> BulkResult[ExampleModel]:
+        """Create one item per name in a single pass.
+
+        Ids are generated in one batch and all items share one created_at.
+        Names are validated in one batched call; invalid ones are reported
+        in errors and the rest are still created.
+        """
+        valid, errors = try_validate_many(ExampleName, names)
+        count = len(names) - len(errors)
+        now = datetime.utcnow()
+        ids = iter(
+            _new_time_ids(count, now)
+            if self._time_ordered_ids
+            else uuid4_strings(count)
+        )
+        results: List[Optional[ExampleModel]] = [
+            None
+            if name is None
+            else ExampleModel(id=next(ids), name=name, created_at=now)
+            for name in valid
+        ]
+        created = [i for i in results if i is not None]
+        await self._repository.add_many(created)
+        for item in created:
+            self.get_item.invalidate(item.id)
+        return BulkResult(results, dict(errors))
+
+    @instrument()
+    async def update_status(self, item_id: str, status: str) -> Optional[ExampleModel]:
+        """Change an item's status. Returns None if the item does not exist.
+
+        Raises:
+            ValidationError: status is not a lower-case slug.
+        """
+        status = validate(ExampleStatus, status)
+        item = await self._repository.get(item_id)
+        if item is None:
+            return None
+        updated = replace(item, status=status, updated_at=datetime.utcnow())
+        stored = await self._repository.update(updated)
+        self.get_item.invalidate(item_id)
+        return updated if stored else None
+
+    @instrument()
     async def delete_item(self, item_id: str) -> bool:
         """Delete an item by ID."""
-        if item_id in self._items:
-            del self._items[item_id]
-            return True
-        return False
+        removed = await self._repository.remove(item_id)
+        self.get_item.invalidate(item_id)
+        return removed is not None
+
+    @instrument()
+    async def delete_many(self, item_ids: Sequence[str]) -> BulkResult[ExampleModel]:
+        """Delete items by ID; results hold the deleted items."""
+        results = await self._repository.remove_many(item_ids)
+        for item_id in item_ids:
+            self.get_item.invalidate(item_id)
+        return BulkResult(results, _missing(item_ids, results))
+
+
+# Version 7 layout: 48-bit unix ms | ver 7 | 12 + 30 counter bits | var 10
+# | 32 random bits. The 42-bit counter is seeded randomly below 2**41 each
+# new millisecond, so one process's ids strictly increase.
+_COUNTER_BITS = 42
+_time_id_lock = threading.Lock()
+_time_id_state = [0, 0]  # last ms used, next counter
+
+
+def _new_time_ids(count: int, now: datetime) -> List[str]:
+    """Generate count time-ordered (version 7) UUID strings stamped with now.
+
+    Ids from one process strictly increase, within a batch and across
+    calls; the stamp never goes backwards, so after a clock step back (or
+    a counter overflow) it runs slightly ahead of now.
+    """
+    ms = to_micros(now) // 1000
+    with _time_id_lock:
+        last_ms, counter = _time_id_state
+        if ms <= last_ms:
+            ms = last_ms
+            if counter + count > 1 << _COUNTER_BITS:
+                ms += 1
+        if ms > last_ms:
+            counter = int.from_bytes(os.urandom(6), "big") >> 7
+        _time_id_state[:] = [ms, counter + count]
+    rand = memoryview(os.urandom(4 * count)).cast("I")
+    high_ms = (ms << 16) | 0x7000
+    ids = []
+    for n in range(count):
+        c = counter + n
+        low = (2 << 62) | ((c & 0x3FFFFFFF) << 32) | rand[n]
+        h = f"{high_ms | (c >> 30):016x}{low:016x}"
+        ids.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return ids
+
+
+def _missing(item_ids: Sequence[str], results: list) -> dict[int, Exception]:
+    return {
+        n: NotFoundError("ExampleModel", item_ids[n])
+        for n, r in enumerate(results)
+        if r is None
+    }
+
+
+def _encode_cursor(key: int) -> str:
+    return format(key, "x")
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        key = int(cursor, 16)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if key < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key
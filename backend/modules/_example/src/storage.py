@@ -0,0 +1,328 @@
+"""
+Item storage for _example module.
+
+InMemoryExampleRepository keeps items in an ItemStore by default.
+CompactItemStore is a drop-in, memory-optimized replacement for very large
+resident stores.
+
+Both stores record the creation sequence number (seq) the repository assigns
+to each item, and hand out a "ref" per item: a small hashable the store can
+resolve back to the item. Indexes hold refs, never copies of items.
+
+Columns is the column-wise export both stores load in bulk (the layout of
+DurableExampleRepository snapshots).
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from operator import attrgetter
+from typing import Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import ExampleModel
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIMESTAMP = -(2**63)
+# Sweep deleted rows once they outnumber live ones (and the store is not tiny).
+_COMPACT_MIN_HOLES = 1024
+
+
+@dataclass
+class Columns:
+    """Live items column-wise, in seq order.
+
+    Exactly one of ids (strings) and uids (128-bit ints, CompactItemStore's
+    native form) is set. Timestamps are epoch microseconds (to_micros);
+    status holds codes into status_names.
+    """
+
+    seqs: array
+    names: List[str]
+    status: array
+    status_names: List[str]
+    created: array
+    updated: array
+    ids: Optional[List[str]] = None
+    uids: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.seqs)
+
+    @classmethod
+    def from_items(
+        cls, seqs: Sequence[int], items: Sequence[ExampleModel]
+    ) -> "Columns":
+        codes: dict[str, int] = {}
+        return cls(
+            seqs=array("q", seqs),
+            names=list(map(attrgetter("name"), items)),
+            status=array("H", [codes.setdefault(i.status, len(codes)) for i in items]),
+            status_names=list(codes),
+            created=array("q", map(to_micros, map(attrgetter("created_at"), items))),
+            updated=array("q", map(to_micros, map(attrgetter("updated_at"), items))),
+            ids=list(map(attrgetter("id"), items)),
+        )
+
+
+class ItemStore:
+    """ExampleModel instances in a dict keyed by id. Refs are the ids."""
+
+    def __init__(self):
+        self._items: dict[str, ExampleModel] = {}
+        self._seq_of: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, item_id: str) -> Optional[ExampleModel]:
+        return self._items.get(item_id)
+
+    def find(self, item_id: str) -> Optional[Tuple[int, Hashable, ExampleModel]]:
+        """Return (seq, ref, item) for an id, or None."""
+        item = self._items.get(item_id)
+        if item is None:
+            return None
+        return self._seq_of[item_id], item.id, item
+
+    def resolve(self, ref: Hashable) -> ExampleModel:
+        return self._items[ref]
+
+    def add(self, seq: int, item: ExampleModel) -> Hashable:
+        """Store a new item under seq and return its ref."""
+        self._items[item.id] = item
+        self._seq_of[item.id] = seq
+        return item.id
+
+    def put(self, item: ExampleModel) -> None:
+        """Persist changes to an item that is already stored."""
+        self._items[item.id] = item
+
+    def remove(self, item_id: str) -> Optional[Tuple[int, ExampleModel]]:
+        """Drop an item; return its (seq, item) or None."""
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return None
+        return self._seq_of.pop(item_id), item
+
+    def values(self) -> Iterator[ExampleModel]:
+        """All items in seq order."""
+        return iter(self._items.values())
+
+    def rows(self) -> Tuple[List[int], List[ExampleModel]]:
+        """(seqs, items) of all items in seq order: two list copies, cheap
+        enough to take on the event loop; Columns.from_items(*rows) does
+        the conversion."""
+        return list(self._seq_of.values()), list(self._items.values())
+
+    def names(self) -> Tuple[List[int], List[str]]:
+        """(seqs, names) of all items in seq order."""
+        return list(self._seq_of.values()), [i.name for i in self._items.values()]
+
+    def load(self, columns: Columns) -> List[Hashable]:
+        """Replace the contents with columns; return the refs in row order."""
+        ids = columns.ids
+        if ids is None:
+            ids = list(map(_format_id, columns.uids))
+        updated = [
+            None if u == _NO_TIMESTAMP else from_micros(u) for u in columns.updated
+        ]
+        items = map(
+            ExampleModel,
+            ids,
+            columns.names,
+            map(columns.status_names.__getitem__, columns.status),
+            map(from_micros, columns.created),
+            updated,
+        )
+        self._items = dict(zip(ids, items, strict=True))
+        self._seq_of = dict(zip(ids, columns.seqs, strict=True))
+        return ids
+
+
+class CompactItemStore:
+    """Columnar (struct-of-arrays) item store. Refs are 128-bit int ids.
+
+    Ids are stored as ints, timestamps as epoch microseconds and status as
+    a code into an interned status table. Reads hand out fresh ExampleModel
+    views, so changes to a returned item only stick once passed to put().
+
+    Only canonical (lowercase, hyphenated) UUID ids can be stored.
+    Timezone-aware datetimes are normalized to naive UTC.
+    """
+
+    def __init__(self):
+        self._row_of: dict[int, int] = {}
+        # Per-row columns, in seq order; a row whose uid is None is a hole
+        # left by a delete.
+        self._uids: List[Optional[int]] = []
+        self._names: List[Optional[str]] = []
+        self._seqs = array("q")
+        self._status = array("H")
+        self._created = array("q")
+        self._updated = array("q")
+        self._status_names: List[str] = []
+        self._status_codes: dict[str, int] = {}
+        self._holes = 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def get(self, item_id: str) -> Optional[ExampleModel]:
+        row = self._row_of.get(_parse_id(item_id))
+        return None if row is None else self._view(row, item_id)
+
+    def find(self, item_id: str) -> Optional[Tuple[int, Hashable, ExampleModel]]:
+        """Return (seq, ref, item) for an id, or None."""
+        row = self._row_of.get(_parse_id(item_id))
+        if row is None:
+            return None
+        return self._seqs[row], self._uids[row], self._view(row, item_id)
+
+    def resolve(self, ref: Hashable) -> ExampleModel:
+        return self._view(self._row_of[ref])
+
+    def add(self, seq: int, item: ExampleModel) -> Hashable:
+        """Store a new item under seq and return its ref.
+
+        seq must be greater than every seq added before.
+        """
+        uid = _parse_id(item.id)
+        if uid is None:
+            raise ValueError(f"CompactItemStore needs canonical UUID ids: {item.id!r}")
+        self._row_of[uid] = len(self._uids)
+        self._uids.append(uid)
+        self._names.append(item.name)
+        self._seqs.append(seq)
+        self._status.append(self._status_code(item.status))
+        self._created.append(to_micros(item.created_at))
+        self._updated.append(to_micros(item.updated_at))
+        return uid
+
+    def put(self, item: ExampleModel) -> None:
+        """Persist changes to an item that is already stored."""
+        row = self._row_of[_parse_id(item.id)]
+        self._names[row] = item.name
+        self._status[row] = self._status_code(item.status)
+        self._created[row] = to_micros(item.created_at)
+        self._updated[row] = to_micros(item.updated_at)
+
+    def remove(self, item_id: str) -> Optional[Tuple[int, ExampleModel]]:
+        """Drop an item; return its (seq, item) or None."""
+        row = self._row_of.pop(_parse_id(item_id), None)
+        if row is None:
+            return None
+        removed = self._seqs[row], self._view(row, item_id)
+        self._uids[row] = None
+        self._names[row] = None
+        self._holes += 1
+        if self._holes >= _COMPACT_MIN_HOLES and self._holes > len(self._row_of):
+            self._compact()
+        return removed
+
+    def values(self) -> Iterator[ExampleModel]:
+        """All items in seq order."""
+        view = self._view
+        return (view(row) for row, u in enumerate(self._uids) if u is not None)
+
+    def names(self) -> Tuple[List[int], List[str]]:
+        """(seqs, names) of all items in seq order."""
+        if self._holes:
+            self._compact()
+        return list(self._seqs), self._names[:]
+
+    def columns(self) -> Columns:
+        """Copies of the live columns (holes are swept first)."""
+        if self._holes:
+            self._compact()
+        return Columns(
+            seqs=self._seqs[:],
+            names=self._names[:],
+            status=self._status[:],
+            status_names=self._status_names[:],
+            created=self._created[:],
+            updated=self._updated[:],
+            uids=self._uids[:],
+        )
+
+    def load(self, columns: Columns) -> List[Hashable]:
+        """Replace the contents with columns (adopted, not copied); return
+        the refs in row order."""
+        uids = columns.uids
+        if uids is None:
+            uids = list(map(_parse_id, columns.ids))
+            if None in uids:
+                raise ValueError("CompactItemStore needs canonical UUID ids")
+        self._uids = uids
+        self._names = columns.names
+        self._seqs = columns.seqs
+        self._status = columns.status
+        self._created = columns.created
+        self._updated = columns.updated
+        self._status_names = columns.status_names
+        self._status_codes = {s: c for c, s in enumerate(columns.status_names)}
+        self._row_of = dict(zip(uids, range(len(uids)), strict=True))
+        self._holes = 0
+        return uids
+
+    def _view(self, row: int, item_id: Optional[str] = None) -> ExampleModel:
+        updated = self._updated[row]
+        return ExampleModel(
+            id=item_id or _format_id(self._uids[row]),
+            name=self._names[row],
+            status=self._status_names[self._status[row]],
+            created_at=_EPOCH + timedelta(microseconds=self._created[row]),
+            updated_at=(
+                None
+                if updated == _NO_TIMESTAMP
+                else _EPOCH + timedelta(microseconds=updated)
+            ),
+        )
+
+    def _status_code(self, status: str) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._status_names)
+            self._status_names.append(status)
+        return code
+
+    def _compact(self) -> None:
+        live = [row for row, u in enumerate(self._uids) if u is not None]
+        self._uids = [self._uids[r] for r in live]
+        self._names = [self._names[r] for r in live]
+        self._seqs = array("q", (self._seqs[r] for r in live))
+        self._status = array("H", (self._status[r] for r in live))
+        self._created = array("q", (self._created[r] for r in live))
+        self._updated = array("q", (self._updated[r] for r in live))
+        self._row_of = {u: row for row, u in enumerate(self._uids)}
+        self._holes = 0
+
+
+def _parse_id(item_id: str) -> Optional[int]:
+    """Return the 128-bit value of a canonical UUID string, else None."""
+    if len(item_id) != 36:
+        return None
+    try:
+        value = int(item_id.replace("-", ""), 16)
+    except ValueError:
+        return None
+    return value if _format_id(value) == item_id else None
+
+
+def _format_id(value: int) -> str:
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def to_micros(value: Optional[datetime]) -> int:
+    """Encode a datetime as epoch microseconds (naive UTC assumed)."""
+    if value is None:
+        return _NO_TIMESTAMP
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """Decode epoch microseconds into a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
@@ -0,0 +1,457 @@
+"""
+Write-behind batching in front of any ExampleRepository.
+
+WriteBehindRepository acknowledges mutations once they are buffered in
+memory and writes them to the wrapped repository in batches, so a burst of
+creates against a persistent backend pays one transaction per batch instead
+of one per call.
+"""
+
+import asyncio
+import sqlite3
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple, Union
+
+from shared.exceptions import AppError, InvalidInputError
+
+from .models import ExampleModel
+from .repository import ExampleRepository
+
+# Buffered operation kinds; consecutive operations of one kind are written
+# with one repository call.
+ADD = "add"
+UPDATE = "update"
+REMOVE = "remove"
+
+_Op = Tuple[str, List[Union[ExampleModel, str]]]
+_ABSENT = object()
+
+# Errors a flush retries: the repository may be reachable again later. Any
+# other error rejects the write for good (a constraint violation, bad data).
+TRANSIENT_ERRORS = (OSError, sqlite3.OperationalError)
+
+
+class WriteBehindClosedError(AppError):
+    """A write reached a WriteBehindRepository after aclose()."""
+
+
+class DuplicateIdError(InvalidInputError):
+    """add()/add_many() got an id that is already stored or buffered."""
+
+
+@dataclass(frozen=True)
+class WriteBehindStats:
+    """Counters for one WriteBehindRepository."""
+
+    pending: int
+    written: int
+    batches: int
+    failures: int
+    rejected: int
+    last_error: Optional[str]
+
+
+class WriteBehindRepository:
+    """Buffers writes and flushes them to another repository in batches.
+
+    Args:
+        repository: The repository writes are persisted to.
+        max_batch: Items per flush; a full buffer is flushed immediately.
+        max_delay: Seconds a buffered write may wait for its batch to fill.
+        max_pending: Buffered items at which writers wait for a flush
+            (backpressure).
+        retry_delay: First delay after a failed flush; doubles per failure
+            up to max_retry_delay.
+        max_retry_delay: Cap of the retry delay.
+
+    Reads see buffered writes immediately: get/get_many answer from the
+    buffer first, and list_items/page flush before reading. Writes are
+    persisted in the order they were made. A batch that fails with one of
+    TRANSIENT_ERRORS stays at the head of the buffer and is retried, so
+    those writes reach the repository once it is reachable again. Retries
+    assume a failed call had no effect, which holds for the transactional
+    bulk writes of SQLiteExampleRepository. Any other error is permanent:
+    the batch is rewritten one buffered call at a time, and a call that
+    still fails is dropped and counted in stats().rejected instead of
+    blocking every write behind it. Adds of an id that is already stored
+    or buffered raise DuplicateIdError before they are acknowledged.
+
+    Buffered writes live in process memory until flushed: call flush() when
+    a write must be durable and aclose() at shutdown.
+
+    Example:
+        >>> repo = WriteBehindRepository(await SQLiteExampleRepository.open(path))
+        >>> service = ExampleService(repo)
+        >>> ...
+        >>> await repo.aclose()
+    """
+
+    def __init__(
+        self,
+        repository: ExampleRepository,
+        *,
+        max_batch: int = 1000,
+        max_delay: float = 0.05,
+        max_pending: int = 10_000,
+        retry_delay: float = 0.1,
+        max_retry_delay: float = 5.0,
+    ):
+        if max_batch < 1 or max_pending < max_batch:
+            raise ValueError("need 1 <= max_batch <= max_pending")
+        self._repository = repository
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._ops: deque[_Op] = deque()
+        # id -> buffered state (None: deleted); refs counts buffered ops per id.
+        self._overlay: dict[str, Optional[ExampleModel]] = {}
+        self._refs: dict[str, int] = {}
+        self._pending = 0
+        self._enqueued_ops = 0
+        # Buffered ops written or rejected, in buffer order.
+        self._settled_ops = 0
+        self._written = 0
+        self._batches = 0
+        self._failures = 0
+        self._rejected = 0
+        self._last_error: Optional[BaseException] = None
+        self._closed = False
+        self._flusher: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Ids waiting for the next shared get_many, and its result.
+        self._lookup: Optional[Tuple[dict, asyncio.Future]] = None
+        self._read_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._space = asyncio.Condition()
+
+    @property
+    def repository(self) -> ExampleRepository:
+        return self._repository
+
+    # --- Writes --------------------------------------------------------------
+
+    async def add(self, item: ExampleModel) -> None:
+        await self.add_many([item])
+
+    async def add_many(self, items: Sequence[ExampleModel]) -> None:
+        """Buffer new items.
+
+        Raises:
+            DuplicateIdError: An id is already stored, buffered or repeated
+                in items; nothing is buffered.
+        """
+        if not items:
+            return
+        await self._reserve(len(items))
+        ids = [i.id for i in items]
+        current = await self._current(ids)
+        seen: set = set()
+        for item_id in ids:
+            if item_id in seen or current[item_id] is not None:
+                raise DuplicateIdError(f"example item already exists: {item_id!r}")
+            seen.add(item_id)
+        self._enqueue(ADD, list(items), items)
+
+    async def update(self, item: ExampleModel) -> bool:
+        return (await self.update_many([item]))[0]
+
+    async def update_many(self, items: Sequence[ExampleModel]) -> List[bool]:
+        await self._reserve(len(items))
+        current = await self._current([i.id for i in items])
+        found = [current[i.id] is not None for i in items]
+        updated = [i for i, ok in zip(items, found, strict=True) if ok]
+        if updated:
+            self._enqueue(UPDATE, updated, updated)
+        return found
+
+    async def remove(self, item_id: str) -> Optional[ExampleModel]:
+        return (await self.remove_many([item_id]))[0]
+
+    async def remove_many(
+        self, item_ids: Sequence[str]
+    ) -> List[Optional[ExampleModel]]:
+        await self._reserve(len(item_ids))
+        current = await self._current(item_ids)
+        results: List[Optional[ExampleModel]] = []
+        removed: dict[str, None] = {}
+        for item_id in item_ids:
+            # A repeated id is only reported deleted once.
+            item = None if item_id in removed else current[item_id]
+            if item is not None:
+                removed[item_id] = None
+            results.append(item)
+        if removed:
+            ids = list(removed)
+            self._enqueue(REMOVE, ids, [None] * len(ids), ids=ids)
+        return results
+
+    # --- Reads ---------------------------------------------------------------
+
+    async def get(self, item_id: str) -> Optional[ExampleModel]:
+        item = self._overlay.get(item_id, _ABSENT)
+        if item is _ABSENT:
+            return (await self._current([item_id]))[item_id]
+        return item
+
+    async def get_many(self, item_ids: Sequence[str]) -> List[Optional[ExampleModel]]:
+        current = await self._current(item_ids)
+        return [current[i] for i in item_ids]
+
+    async def list_items(self, status: Optional[str] = None) -> List[ExampleModel]:
+        await self.flush()
+        return await self._repository.list_items(status)
+
+    async def page(
+        self, after: int, limit: int, status: Optional[str] = None
+    ) -> List[Tuple[int, ExampleModel]]:
+        await self.flush()
+        return await self._repository.page(after, limit, status)
+
+    async def list_created(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        *,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[ExampleModel]:
+        await self.flush()
+        return await self._repository.list_created(
+            after, before, descending=descending, limit=limit, status=status
+        )
+
+    async def search(self, query: str, limit: int) -> List[ExampleModel]:
+        await self.flush()
+        return await self._repository.search(query, limit)
+
+    async def _current(
+        self, item_ids: Sequence[str]
+    ) -> dict[str, Optional[ExampleModel]]:
+        """Latest state per id: buffered if it is, else as stored.
+
+        The result is assembled without awaiting, so buffered state can't
+        change under it; an id flushed while the repository was being read
+        is read again.
+        """
+        unique = list(dict.fromkeys(item_ids))
+        stored: dict[str, Optional[ExampleModel]] = {}
+        while True:
+            overlay = self._overlay
+            missing = [i for i in unique if i not in overlay and i not in stored]
+            if not missing:
+                return {i: overlay[i] if i in overlay else stored[i] for i in unique}
+            found = await self._stored(missing)
+            stored.update((i, found[i]) for i in missing)
+
+    async def _stored(self, item_ids: List[str]) -> dict[str, Optional[ExampleModel]]:
+        """Read ids from the repository.
+
+        Concurrent callers share one get_many: while a read is in flight,
+        the ids asked for meanwhile are collected and read together next.
+        """
+        group = self._lookup
+        if group is not None:
+            group[0].update(dict.fromkeys(item_ids))
+            try:
+                return await asyncio.shield(group[1])
+            except asyncio.CancelledError:
+                if not group[1].cancelled():
+                    raise
+                # The caller reading for the group was cancelled: read again.
+                return await self._stored(item_ids)
+        wanted = dict.fromkeys(item_ids)
+        result = asyncio.get_running_loop().create_future()
+        group = self._lookup = (wanted, result)
+        try:
+            async with self._read_lock:
+                # Let callers woken by the previous read join this one.
+                await asyncio.sleep(0)
+                self._lookup = None
+                ids = list(wanted)
+                found = await self._repository.get_many(ids)
+        except asyncio.CancelledError:
+            result.cancel()
+            raise
+        except Exception as exc:
+            result.set_exception(exc)
+            result.exception()  # retrieved here in case no caller joined
+            raise
+        finally:
+            if self._lookup is group:
+                self._lookup = None
+        result.set_result(dict(zip(ids, found, strict=True)))
+        return result.result()
+
+    # --- Flushing ------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Persist every write buffered before this call.
+
+        Raises the repository's error if a batch fails with one of
+        TRANSIENT_ERRORS; the batch stays buffered and is retried. Writes
+        rejected for good are dropped, not raised: see stats().rejected.
+        """
+        target = self._enqueued_ops
+        if self._settled_ops >= target:
+            return
+        while self._settled_ops < target:
+            async with self._lock:
+                if self._settled_ops < target:
+                    await self._write_batch()
+
+    async def aclose(self) -> None:
+        """Flush everything and stop the background flusher.
+
+        Later writes raise WriteBehindClosedError. If the final flush fails,
+        the error propagates and the buffer is kept: call aclose() again.
+        """
+        self._closed = True
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+
+    def stats(self) -> WriteBehindStats:
+        return WriteBehindStats(
+            pending=self._pending,
+            written=self._written,
+            batches=self._batches,
+            failures=self._failures,
+            rejected=self._rejected,
+            last_error=None if self._last_error is None else repr(self._last_error),
+        )
+
+    async def _reserve(self, count: int) -> None:
+        """Wait (backpressure) until count more items fit in the buffer."""
+        if self._closed:
+            raise WriteBehindClosedError("write-behind repository is closed")
+        if self._pending + count <= self.max_pending or not self._pending:
+            return
+        self._full.set()
+        async with self._space:
+            await self._space.wait_for(
+                lambda: self._pending + count <= self.max_pending or not self._pending
+            )
+        if self._closed:
+            raise WriteBehindClosedError("write-behind repository is closed")
+
+    def _enqueue(
+        self,
+        kind: str,
+        payload: list,
+        states: Sequence[Optional[ExampleModel]],
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        ids = ids if ids is not None else [item.id for item in payload]
+        overlay, refs = self._overlay, self._refs
+        for item_id, state in zip(ids, states, strict=True):
+            overlay[item_id] = state
+            refs[item_id] = refs.get(item_id, 0) + 1
+        self._ops.append((kind, payload))
+        self._enqueued_ops += 1
+        self._pending += len(payload)
+        if self._pending >= self.max_batch:
+            self._full.set()
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        """Background flusher: drains the buffer, then exits until the next
+        write starts it again."""
+        full = self._full
+        delay = self.retry_delay
+        try:
+            while self._ops:
+                if not full.is_set():
+                    try:
+                        await asyncio.wait_for(full.wait(), self.max_delay)
+                    except TimeoutError:
+                        pass
+                try:
+                    async with self._lock:
+                        while self._ops:
+                            await self._write_batch()
+                except TRANSIENT_ERRORS:  # recorded; the batch is retried
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    continue
+                delay = self.retry_delay
+                full.clear()
+        finally:
+            self._flusher = None
+
+    async def _write_batch(self) -> None:
+        """Write the run of same-kind ops at the head of the buffer (caller
+        holds the lock)."""
+        kind = self._ops[0][0]
+        count, size, payload = 0, 0, []
+        for op_kind, op_payload in self._ops:
+            if op_kind != kind or (count and size + len(op_payload) > self.max_batch):
+                break
+            payload.extend(op_payload)
+            size += len(op_payload)
+            count += 1
+        if await self._write(kind, payload):
+            await self._settle(count, size, written=True)
+        elif count == 1:
+            await self._settle(1, size, written=False)
+        else:
+            # Rejected for good: write the run one buffered call at a time,
+            # so only the call(s) causing it are dropped.
+            for _ in range(count):
+                op_payload = self._ops[0][1]
+                written = await self._write(kind, op_payload)
+                await self._settle(1, len(op_payload), written=written)
+
+    async def _write(self, kind: str, payload: list) -> bool:
+        """Send one batch; False if the repository rejected it for good.
+
+        Errors in TRANSIENT_ERRORS propagate: the batch stays buffered.
+        """
+        try:
+            if kind == ADD:
+                await self._repository.add_many(payload)
+            elif kind == REMOVE:
+                await self._repository.remove_many(payload)
+            else:
+                await self._repository.update_many(payload)
+        except Exception as exc:
+            self._failures += 1
+            self._last_error = exc
+            if isinstance(exc, TRANSIENT_ERRORS):
+                raise
+            return False
+        return True
+
+    async def _settle(self, count: int, size: int, *, written: bool) -> None:
+        """Drop the first count ops (size items) from the buffer, as written
+        or as rejected."""
+        for _ in range(count):
+            kind, done = self._ops.popleft()
+            self._release(done if kind == REMOVE else [i.id for i in done])
+        self._settled_ops += count
+        self._pending -= size
+        if written:
+            self._written += size
+            self._batches += 1
+        else:
+            self._rejected += size
+        async with self._space:
+            self._space.notify_all()
+
+    def _release(self, ids: Sequence[str]) -> None:
+        """Drop buffered state for ids with no more buffered ops."""
+        overlay, refs = self._overlay, self._refs
+        for item_id in ids:
+            left = refs[item_id] - 1
+            if left:
+                refs[item_id] = left
+            else:
+                del refs[item_id]
+                del overlay[item_id]
@@ -0,0 +1,56 @@
+"""
+Benchmark: bulk operations vs looping over single-item calls.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import time
+
+import pytest
+
+from modules._example.src.services import ExampleService
+
+BATCH = 50_000
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_bulk_vs_single_item_calls():
+    """create_many/get_many/delete_many beat per-item loops at ingest sizes."""
+    names = [f"item-{n}" for n in range(BATCH)]
+    timings = {}
+
+    looped = ExampleService()
+    start = time.perf_counter()
+    ids = [(await looped.create_item(n)).id for n in names]
+    timings["create"] = [time.perf_counter() - start]
+    start = time.perf_counter()
+    for item_id in ids:
+        await looped.get_item(item_id)
+    timings["get"] = [time.perf_counter() - start]
+    start = time.perf_counter()
+    for item_id in ids:
+        await looped.delete_item(item_id)
+    timings["delete"] = [time.perf_counter() - start]
+
+    bulk = ExampleService()
+    start = time.perf_counter()
+    created = await bulk.create_many(names)
+    timings["create"].append(time.perf_counter() - start)
+    ids = [i.id for i in created.results]
+    start = time.perf_counter()
+    fetched = await bulk.get_many(ids)
+    timings["get"].append(time.perf_counter() - start)
+    start = time.perf_counter()
+    deleted = await bulk.delete_many(ids)
+    timings["delete"].append(time.perf_counter() - start)
+
+    assert created.ok and fetched.ok and deleted.ok
+    for op, (single_s, bulk_s) in timings.items():
+        print(
+            f"\n{op:>6} x{BATCH:,}: loop {single_s * 1e3:8.2f} ms"
+            f"  bulk {bulk_s * 1e3:8.2f} ms  ({single_s / bulk_s:.1f}x)"
+        )
+    assert timings["create"][1] < timings["create"][0]
+    assert timings["get"][1] < timings["get"][0]
+    assert timings["delete"][1] < timings["delete"][0]
@@ -0,0 +1,123 @@
+"""
+Benchmark: created_at range queries and time-ordered ids.
+
+Range: 1M items in the in-memory repository; windows of 100 and 10,000
+items and the newest 100 are read through the created_at index and, as a
+baseline, by scanning every item, filtering and sorting. Ids: version 4
+vs version 7 generation rate, and SQLite bulk inserts with each (v7 ids
+append to the UNIQUE id index instead of hitting random pages).
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules._example.src.repository import (
+    InMemoryExampleRepository,
+    SQLiteExampleRepository,
+)
+from modules._example.src.services import _new_time_ids
+from shared.utils import uuid4_strings
+
+ITEMS = 1_000_000
+CHUNK = 100_000
+QUERIES = 200
+SQL_ITEMS = 300_000
+START = datetime(2024, 1, 1)
+STEP = timedelta(milliseconds=1)
+
+
+def _created(item):
+    return item.created_at
+
+
+async def _scan(repo, after, before, descending=False, limit=None):
+    rows = [i for i in await repo.list_items() if after < i.created_at < before]
+    rows.sort(key=_created, reverse=descending)
+    return rows[:limit]
+
+
+async def _rate(query, windows) -> float:
+    start = time.perf_counter()
+    for after, before in windows:
+        await query(after, before)
+    return len(windows) / (time.perf_counter() - start)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_bench_created_range_1m(example_factory, compact):
+    """Report range queries/s via the index vs a scan-filter-sort."""
+    repo = InMemoryExampleRepository(compact=compact)
+    for offset in range(0, ITEMS, CHUNK):
+        await repo.add_many(
+            example_factory(
+                CHUNK, created_at=[START + STEP * (offset + n) for n in range(CHUNK)]
+            )
+        )
+    end = START + STEP * ITEMS
+
+    print(f"\n  {ITEMS:,} items, compact={compact}")
+    for size in (100, 10_000):
+        # QUERIES windows spread over the data, each holding size items.
+        lows = (START + STEP * ((ITEMS - size) * q // QUERIES) for q in range(QUERIES))
+        windows = [(low, low + STEP * (size + 1)) for low in lows]
+        indexed = await _rate(lambda a, b: repo.list_created(a, b), windows)
+        got = await repo.list_created(*windows[1])
+        assert got == await _scan(repo, *windows[1])
+        assert len(got) == size
+        scanned = await _rate(lambda a, b: _scan(repo, a, b), windows[:3])
+        print(
+            f"  window of {size:>6,}  index {indexed:>10,.0f} q/s"
+            f"  scan {scanned:>6.2f} q/s  ({indexed / scanned:,.0f}x)"
+        )
+        assert indexed > scanned * 10
+
+    newest = [(None, end)] * QUERIES
+    indexed = await _rate(
+        lambda a, b: repo.list_created(descending=True, limit=100), newest
+    )
+    scanned = await _rate(
+        lambda a, b: _scan(repo, START - STEP, b, descending=True, limit=100),
+        newest[:3],
+    )
+    assert await repo.list_created(descending=True, limit=100) == await _scan(
+        repo, START - STEP, end, descending=True, limit=100
+    )
+    print(
+        f"  newest 100         index {indexed:>10,.0f} q/s"
+        f"  scan {scanned:>6.2f} q/s  ({indexed / scanned:,.0f}x)"
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_time_ordered_ids(tmp_path, example_factory):
+    """Report id generation rates and SQLite insert rates per id version."""
+    now = datetime.utcnow()
+    generators = {
+        "v4": uuid4_strings,
+        "v7": lambda n: _new_time_ids(n, now),
+    }
+    print()
+    for version, generate in generators.items():
+        start = time.perf_counter()
+        generate(ITEMS)
+        rate = ITEMS / (time.perf_counter() - start)
+        print(f"  {version} ids        {rate:>12,.0f} ids/s")
+
+    for version, generate in generators.items():
+        repo = await SQLiteExampleRepository.open(tmp_path / f"{version}.db")
+        try:
+            items = example_factory(SQL_ITEMS, id=generate(SQL_ITEMS))
+            start = time.perf_counter()
+            for offset in range(0, SQL_ITEMS, CHUNK // 10):
+                await repo.add_many(items[offset : offset + CHUNK // 10])
+            rate = SQL_ITEMS / (time.perf_counter() - start)
+        finally:
+            await repo.close()
+        print(f"  sqlite add_many {version} {rate:>12,.0f} items/s")
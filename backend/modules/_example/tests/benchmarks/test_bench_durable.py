@@ -0,0 +1,103 @@
+"""
+Benchmark: DurableExampleRepository recovery time and group commit.
+
+Recovery: 5M items are written through the log, snapshotted and
+recovered: from the snapshot alone, then from the snapshot plus a log
+tail. Group commit: concurrent single-item writes with fsync on, reporting
+how many writes each fsync carried.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from modules._example.src.durable import DurableExampleRepository
+
+ITEMS = 5_000_000
+CHUNK = 500_000
+TAIL = 100_000
+WRITERS = 100
+WRITES_PER_WRITER = 20
+
+
+async def _timed_open(directory) -> tuple[float, DurableExampleRepository]:
+    start = time.perf_counter()
+    repo = await DurableExampleRepository.open(
+        directory, compact=True, snapshot_every=None
+    )
+    return time.perf_counter() - start, repo
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_recovery_of_5m_items(tmp_path, example_factory):
+    """Report snapshot write and recovery times for 5M items."""
+    repo = await DurableExampleRepository.open(
+        tmp_path, compact=True, sync=False, snapshot_every=None
+    )
+    start = time.perf_counter()
+    for _ in range(ITEMS // CHUNK):
+        await repo.add_many(example_factory(CHUNK))
+    logged_s = time.perf_counter() - start
+    log_mb = repo.stats().log_bytes / 1e6
+
+    start = time.perf_counter()
+    await repo.snapshot()
+    snapshot_s = time.perf_counter() - start
+    snapshot_mb = sum(p.stat().st_size for p in tmp_path.glob("*.snap")) / 1e6
+    await repo.close()
+    del repo
+
+    snapshot_only_s, repo = await _timed_open(tmp_path)
+    assert len(await repo.page(0, 10**9)) == ITEMS
+    await repo.add_many(example_factory(TAIL))
+    await repo.close()
+    del repo
+
+    with_tail_s, repo = await _timed_open(tmp_path)
+    assert len(await repo.page(ITEMS, 10**9)) == TAIL
+    await repo.close()
+    del repo
+
+    replay_rate = TAIL / max(with_tail_s - snapshot_only_s, 1e-9)
+    print(
+        f"\n  logged {ITEMS:,} items    {ITEMS / logged_s:>12,.0f} items/s"
+        f"  ({log_mb:,.0f} MB log)"
+    )
+    print(f"  snapshot write         {snapshot_s:>8.2f} s  ({snapshot_mb:,.0f} MB)")
+    print(f"  recover from snapshot  {snapshot_only_s:>8.2f} s")
+    print(
+        f"  + {TAIL:,} log records {with_tail_s:>8.2f} s"
+        f"  (replay ~{replay_rate:,.0f} records/s)"
+    )
+
+    assert snapshot_only_s < 10
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_group_commit(tmp_path, example_factory):
+    """Report fsynced write throughput and writes per commit."""
+    repo = await DurableExampleRepository.open(tmp_path)
+    items = example_factory(WRITERS * WRITES_PER_WRITER)
+
+    async def writer(batch):
+        for item in batch:
+            await repo.add(item)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(items[w::WRITERS]) for w in range(WRITERS)))
+    elapsed = time.perf_counter() - start
+    stats = repo.stats()
+    await repo.close()
+
+    print(
+        f"\n  {stats.records:,} fsynced writes from {WRITERS} writers: "
+        f"{stats.records / elapsed:,.0f} writes/s, {stats.commits:,} commits "
+        f"({stats.records / stats.commits:.1f} writes per fsync)"
+    )
+
+    assert stats.commits < stats.records / 10
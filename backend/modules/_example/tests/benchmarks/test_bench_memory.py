@@ -0,0 +1,97 @@
+"""
+Benchmark: resident memory per item for the ExampleService storage layouts.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from modules._example.src.services import ExampleService
+from modules._example.src.storage import CompactItemStore
+from shared.utils import uuid4_strings
+
+ITEMS = 100_000
+
+
+@dataclass
+class _LegacyModel:
+    """ExampleModel as it was before slots (per-instance __dict__)."""
+
+    id: str
+    name: str
+    status: str = "active"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+
+
+def _bytes_per_item(build) -> float:
+    """Measure memory retained by build() via tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (after - before) / ITEMS
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_memory_per_item():
+    """Compact storage needs far fewer bytes/item than the original layout."""
+
+    def legacy_store():
+        ids = uuid4_strings(ITEMS)
+        return {i: _LegacyModel(id=i, name=f"item-{n}") for n, i in enumerate(ids)}
+
+    def slotted_store():
+        ids = uuid4_strings(ITEMS)
+        return {i: ExampleModel(id=i, name=f"item-{n}") for n, i in enumerate(ids)}
+
+    def compact_store():
+        store = CompactItemStore()
+        for n, i in enumerate(uuid4_strings(ITEMS), 1):
+            store.add(n, ExampleModel(id=i, name=f"item-{n}"))
+        return store
+
+    store_bytes = {
+        "dict + __dict__ model (before)": _bytes_per_item(legacy_store),
+        "dict + slotted model": _bytes_per_item(slotted_store),
+        "CompactItemStore": _bytes_per_item(compact_store),
+    }
+
+    names = [f"item-{n}" for n in range(ITEMS)]
+    service_bytes = {}
+    for compact in (False, True):
+        service = ExampleService(compact=compact)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        await service.create_many(names)
+        gc.collect()
+        service_bytes[compact] = (tracemalloc.get_traced_memory()[0] - before) / ITEMS
+        tracemalloc.stop()
+        del service
+
+    print(f"\nstore only, {ITEMS:,} items:")
+    for label, per_item in store_bytes.items():
+        print(f"  {label:<32} {per_item:7.1f} B/item")
+    print("ExampleService incl. indexes (name strings preallocated):")
+    print(f"  {'compact=False':<32} {service_bytes[False]:7.1f} B/item")
+    print(f"  {'compact=True':<32} {service_bytes[True]:7.1f} B/item")
+
+    before = store_bytes["dict + __dict__ model (before)"]
+    assert store_bytes["dict + slotted model"] < before
+    assert store_bytes["CompactItemStore"] < before * 0.7
+    assert service_bytes[True] < service_bytes[False]
@@ -0,0 +1,65 @@
+"""
+Benchmark: ExampleService throughput on each repository backend.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import time
+
+import pytest
+
+from modules._example.src.repository import (
+    InMemoryExampleRepository,
+    SQLiteExampleRepository,
+)
+from modules._example.src.services import ExampleService
+
+ITEMS = 10_000
+
+
+async def _measure(service: ExampleService) -> dict[str, float]:
+    """Return ops/second for each operation."""
+    names = [f"item-{n}" for n in range(ITEMS)]
+    rates = {}
+
+    start = time.perf_counter()
+    ids = [(await service.create_item(n)).id for n in names[: ITEMS // 10]]
+    rates["create"] = len(ids) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    created = await service.create_many(names)
+    rates["create_many"] = ITEMS / (time.perf_counter() - start)
+    ids += [i.id for i in created.results]
+
+    start = time.perf_counter()
+    for item_id in ids[: ITEMS // 10]:
+        await service.get_item(item_id)
+    rates["get"] = (ITEMS // 10) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await service.get_many(ids)
+    rates["get_many"] = len(ids) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    listed = await service.list_items()
+    rates["list (items/s)"] = len(listed) / (time.perf_counter() - start)
+    return rates
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_repository_throughput(tmp_path):
+    """Report create/get/list throughput for in-memory and SQLite backends."""
+    results = {"memory": await _measure(ExampleService(InMemoryExampleRepository()))}
+    sqlite_repo = await SQLiteExampleRepository.open(tmp_path / "bench.db")
+    try:
+        results["sqlite"] = await _measure(ExampleService(sqlite_repo))
+    finally:
+        await sqlite_repo.close()
+
+    print(f"\n{'op':<16}{'memory ops/s':>16}{'sqlite ops/s':>16}")
+    for op in results["memory"]:
+        print(f"{op:<16}{results['memory'][op]:>16,.0f}{results['sqlite'][op]:>16,.0f}")
+
+    # Batched transactions must beat one transaction per insert by a wide margin.
+    assert results["sqlite"]["create_many"] > results["sqlite"]["create"] * 5
@@ -0,0 +1,123 @@
+"""
+Benchmark: name search over 1M items.
+
+Names are "<adjective> <material> <noun> <model number>". Reports the
+index build (first search) time and memory, search latency (p50/p99) for
+search-as-you-type prefixes and word queries against a full-scan
+baseline, and the cost of keeping the index in sync on create/delete.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+
+import pytest
+
+from modules._example.src.index import SearchIndex, tokenize
+from modules._example.src.repository import InMemoryExampleRepository
+
+ITEMS = 1_000_000
+CHUNK = 100_000
+ROUNDS = 50
+LIMIT = 10
+ADJECTIVES = "red blue green black white heavy light compact large small".split()
+MATERIALS = "steel brass copper oak pine nylon glass rubber carbon zinc".split()
+NOUNS = (
+    "bolt bracket hinge widget washer spring clamp gear valve pulley "
+    "bearing rivet flange gasket spindle lever socket coupling"
+).split()
+QUERIES = {
+    "1 char": ["r", "b", "s", "g"],
+    "as-you-type": ["red st", "red steel b", "compact oak hin", "blue brass gea"],
+    "one word": ["bolt", "valve", "oak", "4711"],
+    "word prefix": ["bol", "flan", "spi", "47"],
+    "two words": ["steel bolt", "oak 4711", "hinge copper", "valve 12"],
+}
+
+
+def _names(count: int) -> list[str]:
+    rng = random.Random(2024)  # noqa: S311
+    return [
+        f"{rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} "
+        f"{rng.choice(NOUNS)} {rng.randrange(10_000)}"
+        for _ in range(count)
+    ]
+
+
+def _scan(items, query, limit):
+    """Same ranking as SearchIndex, by scanning every item."""
+    prefix = query.strip().casefold()
+    *whole, last = tokenize(query)
+    hits = sorted(
+        (i.name.casefold(), n)
+        for n, i in enumerate(items)
+        if i.name.casefold().startswith(prefix)
+    )[:limit]
+    found = [n for _, n in hits]
+    for n, item in enumerate(items):
+        if len(found) >= limit:
+            break
+        tokens = tokenize(item.name)
+        if (
+            n not in found
+            and all(w in tokens for w in whole)
+            and any(t.startswith(last) for t in tokens)
+        ):
+            found.append(n)
+    return [items[n] for n in found]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_search_1m(example_factory):
+    """Report index build time/memory and search latency at 1M names."""
+    names = _names(ITEMS)
+    repo = InMemoryExampleRepository()
+    for offset in range(0, ITEMS, CHUNK):
+        await repo.add_many(example_factory(CHUNK, name=names[offset : offset + CHUNK]))
+
+    start = time.perf_counter()
+    await repo.search("warm-up", LIMIT)
+    build_s = time.perf_counter() - start
+
+    tracemalloc.start()
+    index = SearchIndex.build(range(1, ITEMS + 1), names)
+    index_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del index
+
+    print(
+        f"\n  {ITEMS:,} names: index built on first search in {build_s:.2f} s,"
+        f" {index_mb:,.0f} MB ({index_mb * 1e6 / ITEMS:,.0f} B/name)"
+    )
+    print(f"  {'query':<14}{'p50 ms':>10}{'p99 ms':>10}{'scan ms':>12}")
+    items = await repo.list_items()
+    for kind, queries in QUERIES.items():
+        timings = []
+        for _ in range(ROUNDS):
+            for query in queries:
+                start = time.perf_counter()
+                await repo.search(query, LIMIT)
+                timings.append((time.perf_counter() - start) * 1e3)
+        start = time.perf_counter()
+        expected = _scan(items, queries[0], LIMIT)
+        scan_ms = (time.perf_counter() - start) * 1e3
+        assert await repo.search(queries[0], LIMIT) == expected
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(
+            f"  {kind:<14}{statistics.median(timings):>10.3f}{p99:>10.3f}"
+            f"{scan_ms:>12,.0f}"
+        )
+        assert p99 < scan_ms / 10
+
+    extra = example_factory(CHUNK // 10, name=_names(CHUNK // 10))
+    start = time.perf_counter()
+    await repo.add_many(extra)
+    add_us = (time.perf_counter() - start) / len(extra) * 1e6
+    start = time.perf_counter()
+    await repo.remove_many([i.id for i in extra])
+    remove_us = (time.perf_counter() - start) / len(extra) * 1e6
+    print(f"  add {add_us:,.1f} us/item, remove {remove_us:,.1f} us/item (indexed)")
@@ -0,0 +1,112 @@
+"""
+Benchmark: ExampleService create/get/list/delete at 1k, 100k and 1M items.
+
+Tracked by the shared/testing benchmark plugin: results are compared with
+the stored baseline and a median slowdown beyond --bench-threshold fails.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+Save a baseline: add --bench-save
+"""
+
+import pytest
+
+from modules._example.src.services import ExampleService
+from shared.testing import sequential_names
+
+SIZES = [1_000, 100_000, 1_000_000]
+GETS = 500
+DELETES = 50
+
+_seeded: dict[int, tuple[ExampleService, list[str]]] = {}
+
+
+async def _seeded_service(count: int, example_factory):
+    """A service holding count items, built once per size and reused."""
+    if count not in _seeded:
+        items = example_factory(count)
+        service = ExampleService()
+        await service._repository.add_many(items)
+        _seeded[count] = service, [i.id for i in items]
+    return _seeded[count]
+
+
+def _rounds(count: int) -> dict:
+    return {"rounds": 3, "warmup": 0} if count >= 1_000_000 else {"rounds": 5}
+
+
+def _label(count: int) -> str:
+    return f"{count // 1000}k" if count < 1_000_000 else f"{count // 1_000_000}M"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", SIZES, ids=_label)
+async def test_bench_create(benchmark, count):
+    """create_many of count names into an empty service."""
+    names = sequential_names(count)
+    state = {}
+
+    def fresh():
+        state["service"] = ExampleService()
+
+    async def create():
+        await state["service"].create_many(names)
+
+    await benchmark.run_async(
+        f"example.create_many[{_label(count)}]",
+        create,
+        setup=fresh,
+        ops=count,
+        **_rounds(count),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", SIZES, ids=_label)
+async def test_bench_get(benchmark, example_factory, count):
+    """get_item of GETS ids (cache cleared each round) among count items."""
+    service, ids = await _seeded_service(count, example_factory)
+    sample = ids[:GETS]
+
+    async def get():
+        for item_id in sample:
+            await service.get_item(item_id)
+
+    await benchmark.run_async(
+        f"example.get_item[{_label(count)}]",
+        get,
+        setup=service.get_item.invalidate_all,
+        ops=GETS,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", SIZES, ids=_label)
+async def test_bench_list(benchmark, example_factory, count):
+    """list_items over all count items."""
+    service, _ = await _seeded_service(count, example_factory)
+
+    async def list_all():
+        await service.list_items()
+
+    await benchmark.run_async(
+        f"example.list_items[{_label(count)}]", list_all, **_rounds(count)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", SIZES, ids=_label)
+async def test_bench_delete(benchmark, example_factory, count):
+    """delete_item of DELETES ids per round among count items."""
+    service, ids = await _seeded_service(count, example_factory)
+    # One batch per round (1 warmup + 5), from the end: away from the ids
+    # test_bench_get reads.
+    tail = ids[-6 * DELETES :]
+    batches = iter([tail[n : n + DELETES] for n in range(0, len(tail), DELETES)])
+
+    async def delete():
+        for item_id in next(batches):
+            await service.delete_item(item_id)
+
+    await benchmark.run_async(
+        f"example.delete_item[{_label(count)}]", delete, ops=DELETES
+    )
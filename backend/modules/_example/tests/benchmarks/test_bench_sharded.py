@@ -0,0 +1,107 @@
+"""
+Benchmark: ShardedExampleRepository throughput against thread count.
+
+Each thread runs its own event loop and a mixed workload (add, get and
+remove, plus a first-page listing every 16th item) on one shared
+repository. A single shard (one lock) is the baseline and is only
+reported; 16 shards must keep throughput from collapsing as threads are
+added. With the GIL
+enabled, Python code runs on one core at a time, so the target is flat
+throughput, not linear scaling; on a free-threaded build (python3.13t+)
+the striped locks are what lets it scale.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from modules._example.src.repository import ShardedExampleRepository
+from shared.testing import build_many, sequential_names, uuid4_strings
+
+THREADS = [1, 2, 4, 8]
+ITEMS = 12_000  # per round, split across the threads
+OPS = 3 * ITEMS  # add/get/remove calls; pages are extra
+SEED = 100_000
+
+
+def _gil() -> str:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return "on" if is_enabled is None or is_enabled() else "off"
+
+
+def _repository(shards: int) -> ShardedExampleRepository:
+    repo = ShardedExampleRepository(shards=shards)
+    seed = build_many(
+        ExampleModel, SEED, id=uuid4_strings(SEED), name=sequential_names(SEED)
+    )
+    asyncio.run(repo.add_many(seed))
+    return repo
+
+
+def _worker(repo, items, ready, errors):
+    async def work():
+        for n, item in enumerate(items):
+            await repo.add(item)
+            await repo.get(item.id)
+            if n % 16 == 0:
+                await repo.page(0, 10)
+            await repo.remove(item.id)
+
+    ready.wait()
+    try:
+        asyncio.run(work())
+    except BaseException as exc:  # noqa: BLE001 - re-raised by the caller
+        errors.append(exc)
+
+
+def _run(repo, items, threads: int) -> None:
+    """Run the workload over items, split evenly across threads."""
+    ready = threading.Event()
+    errors: list[BaseException] = []
+    workers = [
+        threading.Thread(target=_worker, args=(repo, items[t::threads], ready, errors))
+        for t in range(threads)
+    ]
+    for w in workers:
+        w.start()
+    ready.set()
+    for w in workers:
+        w.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.parametrize("shards", [1, 16], ids=lambda s: f"{s}shard")
+def test_bench_threads(benchmark, shards):
+    """Mixed-workload ops/s at 1, 2, 4 and 8 threads on one repository."""
+    repo = _repository(shards)
+    # Every item is removed again, so the same batch serves each round.
+    items = build_many(
+        ExampleModel, ITEMS, id=uuid4_strings(ITEMS), name=sequential_names(ITEMS)
+    )
+    rates = {}
+    for threads in THREADS:
+        stats = benchmark(
+            f"example.sharded[{shards}shard,{threads}t]",
+            lambda threads=threads: _run(repo, items, threads),
+            ops=OPS,
+            rounds=3,
+        )
+        rates[threads] = stats.ops_per_second
+        print(
+            f"  {shards:>2} shards  {threads} threads  {rates[threads]:>10,.0f} ops/s"
+        )
+    print(f"  GIL {_gil()}")
+
+    assert sum(len(s.items) for s in repo._shards) == SEED
+    if shards == 1:
+        # The baseline: one lock is expected to convoy as threads are added.
+        return
+    # No lock convoy: more threads must not collapse throughput.
+    assert rates[4] >= 0.6 * rates[1]
+    assert rates[8] >= 0.5 * rates[1]
@@ -0,0 +1,70 @@
+"""
+Benchmark: status-filtered listing on ExampleService.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import random
+import time
+
+import pytest
+
+from modules._example.src.services import ExampleService
+
+RARE_MATCHES = 1_000
+
+
+async def _build_service(size: int) -> ExampleService:
+    """Populate a service with a skewed status distribution.
+
+    ~97% active, ~3% archived minus RARE_MATCHES items in "flagged".
+    """
+    rng = random.Random(size)  # noqa: S311
+    service = ExampleService()
+    ids = [(await service.create_item(name=f"item-{n}")).id for n in range(size)]
+    rng.shuffle(ids)
+    for item_id in ids[:RARE_MATCHES]:
+        await service.update_status(item_id, "flagged")
+    for item_id in ids[RARE_MATCHES : size // 33]:
+        await service.update_status(item_id, "archived")
+    return service
+
+
+async def _best_of(fn, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_filtered_listing_scales_with_matches_not_store_size():
+    """Filtered listing cost tracks the match count, not the store size."""
+    timings = {}
+    for size in (100_000, 1_000_000):
+        service = await _build_service(size)
+
+        async def indexed(service=service):
+            return await service.list_items("flagged")
+
+        async def full_scan(service=service):
+            store = service._repository._store
+            return [i for i in store.values() if i.status == "flagged"]
+
+        assert len(await indexed()) == RARE_MATCHES
+        timings[size] = (await _best_of(indexed), await _best_of(full_scan))
+
+    for size, (indexed_s, scan_s) in timings.items():
+        print(
+            f"\n{size:>9,} items: indexed {indexed_s * 1e3:7.3f} ms"
+            f"  full scan {scan_s * 1e3:8.2f} ms  ({scan_s / indexed_s:,.0f}x)"
+        )
+
+    small_indexed, _ = timings[100_000]
+    large_indexed, large_scan = timings[1_000_000]
+    # 10x more items, same number of matches: indexed time must stay flat.
+    assert large_indexed < small_indexed * 3
+    assert large_scan > large_indexed * 20
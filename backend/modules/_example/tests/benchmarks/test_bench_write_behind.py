@@ -0,0 +1,69 @@
+"""
+Benchmark: create_item throughput on SQLite, one transaction per call vs
+write-behind batches.
+
+Writers issue single create_item calls, the pattern a burst of API
+requests produces. Synchronously each call commits its own transaction;
+behind WriteBehindRepository the calls are acknowledged from the buffer
+once one id lookup (shared by concurrent writers) finds no duplicate, and
+persisted max_batch at a time. The timing includes the final flush,
+so both runs end with every item on disk.
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from modules._example.src.repository import SQLiteExampleRepository
+from modules._example.src.services import ExampleService
+from modules._example.src.write_behind import WriteBehindRepository
+
+ITEMS = 5_000
+WRITERS = 8
+
+
+async def _create_rate(service: ExampleService, finish=None) -> float:
+    """create_item calls/second from WRITERS concurrent writers."""
+    per_writer = ITEMS // WRITERS
+
+    async def writer(w):
+        for n in range(per_writer):
+            await service.create_item(f"writer-{w}-{n}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(WRITERS)))
+    if finish is not None:
+        await finish()
+    return per_writer * WRITERS / (time.perf_counter() - start)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_write_behind_create_throughput(tmp_path):
+    """Report create_item throughput synchronous vs write-behind."""
+    sync_repo = await SQLiteExampleRepository.open(tmp_path / "sync.db")
+    try:
+        sync_rate = await _create_rate(ExampleService(sync_repo))
+        assert len(await sync_repo.list_items()) == ITEMS
+    finally:
+        await sync_repo.close()
+
+    inner = await SQLiteExampleRepository.open(tmp_path / "write_behind.db")
+    repo = WriteBehindRepository(inner, max_batch=500)
+    try:
+        batched_rate = await _create_rate(ExampleService(repo), repo.flush)
+        stats = repo.stats()
+        assert len(await inner.list_items()) == ITEMS
+    finally:
+        await repo.aclose()
+        await inner.close()
+
+    print(f"\n{'backend':<14}{'creates/s':>12}")
+    print(f"{'sqlite':<14}{sync_rate:>12,.0f}")
+    print(f"{'write-behind':<14}{batched_rate:>12,.0f}")
+    print(f"  {stats.written} items in {stats.batches} batches")
+
+    assert batched_rate > sync_rate * 3
@@ -0,0 +1,23 @@
+"""
+Fixtures shared by _example unit tests and benchmarks.
+"""
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from shared.testing import build_many, sequential_names, timestamps, uuid4_strings
+
+
+def make_examples(count: int, **columns) -> list[ExampleModel]:
+    """count valid ExampleModels: random ids, names item-N, increasing
+    created_at. Pass columns (sequences or constants) to override fields."""
+    columns.setdefault("id", uuid4_strings(count))
+    columns.setdefault("name", sequential_names(count))
+    columns.setdefault("created_at", timestamps(count))
+    return build_many(ExampleModel, count, **columns)
+
+
+@pytest.fixture
+def example_factory():
+    """The make_examples factory, as a fixture."""
+    return make_examples
@@ -0,0 +1,234 @@
+"""
+Integration tests: ExampleService on the SQLite repository.
+"""
+
+import sqlite3
+from dataclasses import replace
+
+import pytest
+import pytest_asyncio
+
+from modules._example.src.repository import SQLiteExampleRepository
+from modules._example.src.services import ExampleService
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    repo = await SQLiteExampleRepository.open(tmp_path / "examples.db")
+    yield repo
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_crud_round_trip(repo):
+    """Create, read, update and delete go through SQLite."""
+    service = ExampleService(repo)
+
+    created = await service.create_item("a")
+    fetched = await service.get_item(created.id)
+    updated = await service.update_status(created.id, "archived")
+
+    assert fetched == created
+    assert updated.status == "archived"
+    assert updated.updated_at is not None
+    assert await service.get_item(created.id) == updated
+    assert await service.delete_item(created.id) is True
+    assert await service.get_item(created.id) is None
+    assert await service.delete_item(created.id) is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_and_status_listing(repo):
+    """Bulk calls keep input order; status listing uses creation order."""
+    service = ExampleService(repo)
+    items = (await service.create_many([f"n{n}" for n in range(1200)])).results
+    for item in items[::3]:
+        await service.update_status(item.id, "archived")
+
+    archived = await service.list_items("archived")
+    fetched = await service.get_many([items[5].id, "missing", items[0].id])
+    deleted = await service.delete_many([items[1].id, items[1].id])
+
+    assert [i.id for i in archived] == [i.id for i in items[::3]]
+    assert [i and i.id for i in fetched.results] == [items[5].id, None, items[0].id]
+    assert list(fetched.errors) == [1]
+    assert [i and i.id for i in deleted.results] == [items[1].id, None]
+    assert len(await service.list_items()) == 1199
+
+
+@pytest.mark.asyncio
+async def test_update_many_reports_missing_items(repo):
+    """update_many applies every found item and flags the missing ones."""
+    service = ExampleService(repo)
+    a, b = (await service.create_many(["a", "b"])).results
+    gone = (await service.create_many(["gone"])).results[0]
+    await repo.remove(gone.id)
+
+    found = await repo.update_many(
+        [replace(a, status="archived"), gone, replace(b, name="bee")]
+    )
+
+    assert found == [True, False, True]
+    assert [(i.name, i.status) for i in await repo.list_items()] == [
+        ("a", "archived"),
+        ("bee", "active"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pagination_stable_across_writes(repo):
+    """Cursors are SQLite seqs, so interleaved writes do not shift pages."""
+    service = ExampleService(repo)
+    ids = [i.id for i in (await service.create_many(["x"] * 10)).results]
+
+    first = await service.list_items_page(limit=4)
+    await service.delete_item(ids[5])
+    late = await service.create_item("late")
+    rest = []
+    cursor = first.next_cursor
+    while cursor:
+        page = await service.list_items_page(cursor, limit=4)
+        rest.extend(i.id for i in page.items)
+        cursor = page.next_cursor
+
+    assert [i.id for i in first.items] + rest == ids[:5] + ids[6:] + [late.id]
+
+
+@pytest.mark.asyncio
+async def test_data_survives_reopen(tmp_path):
+    """A second repository on the same file sees earlier writes."""
+    path = tmp_path / "examples.db"
+    first = await SQLiteExampleRepository.open(path)
+    created = await ExampleService(first).create_item("durable")
+    await first.close()
+
+    second = await SQLiteExampleRepository.open(path)
+    try:
+        assert await ExampleService(second).get_item(created.id) == created
+    finally:
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_connections_use_wal_mode(repo):
+    """Every pooled connection runs in WAL journal mode."""
+    async with repo._pool.acquire() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+@pytest.mark.asyncio
+async def test_created_range_uses_created_index(repo):
+    """Range listing is served by the (created_at, seq) index, not a sort."""
+    service = ExampleService(repo, time_ordered_ids=True)
+    items = (await service.create_many([f"n{n}" for n in range(20)])).results
+    late = await service.create_item("late")
+
+    newest = await service.list_items(order="desc", limit=2)
+    window = await service.list_items(
+        created_after=items[0].created_at, created_before=late.created_at
+    )
+
+    assert [i.id for i in newest] == [late.id, items[-1].id]
+    assert window == []
+    assert [i.id for i in await service.list_items(limit=25)] == sorted(
+        [i.id for i in items] + [late.id]
+    )
+    async with repo._pool.acquire() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM example_items"
+            " WHERE created_at > 0 ORDER BY created_at DESC, seq DESC LIMIT 2"
+        ).fetchall()
+        status_plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM example_items WHERE status = 'x'"
+            " AND created_at > 0 ORDER BY created_at DESC, seq DESC LIMIT 2"
+        ).fetchall()
+    assert "example_items_created" in str(plan)
+    assert "TEMP B-TREE" not in str(plan)
+    assert "example_items_status_created" in str(status_plan)
+    assert "TEMP B-TREE" not in str(status_plan)
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_prefixes_then_words(repo):
+    """Name prefixes come from the name_key index, words from FTS5."""
+    service = ExampleService(repo)
+    items = (
+        await service.create_many(["Red Widget", "blue widget", "Widget red"])
+    ).results
+    await service.update_status(items[0].id, "archived")
+    await service.delete_item(items[1].id)
+
+    assert [i.name for i in await service.search_items("wid")] == [
+        "Widget red",
+        "Red Widget",
+    ]
+    assert [i.name for i in await service.search_items("red w")] == [
+        "Red Widget",
+        "Widget red",
+    ]
+    assert await service.search_items("blue") == []
+
+
+@pytest.mark.asyncio
+async def test_search_folds_non_ascii_like_the_in_memory_index(repo):
+    """name_key holds str.casefold(), so SQLite matches and ranks as in memory."""
+    service = ExampleService(repo)
+    await service.create_many(["Straße Bolt", "STRASSE nut", "Éclair", "zinc"])
+
+    async def names(query):
+        return [i.name for i in await service.search_items(query)]
+
+    assert await names("strasse") == ["Straße Bolt", "STRASSE nut"]
+    assert await names("STRAẞE N") == ["STRASSE nut"]
+    assert await names("bolt") == ["Straße Bolt"]
+    assert await names("éCLAIR") == ["Éclair"]
+    assert await names("zi") == ["zinc"]
+
+
+@pytest.mark.asyncio
+async def test_tables_from_before_name_key_are_migrated(tmp_path):
+    """Opening a table without name_key adds it and re-indexes search."""
+    path = tmp_path / "examples.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE example_items (seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, status TEXT NOT NULL,"
+            " created_at INTEGER NOT NULL, updated_at INTEGER)"
+        )
+        conn.execute(
+            "INSERT INTO example_items (id, name, status, created_at)"
+            " VALUES ('a', 'Straße Bolt', 'active', 0)"
+        )
+    conn.close()
+
+    repo = await SQLiteExampleRepository.open(path)
+    try:
+        service = ExampleService(repo)
+        await service.create_item("strasse nut")
+        by_prefix = await service.search_items("STRASSE")
+        by_word = await service.search_items("bolt")
+    finally:
+        await repo.close()
+
+    assert [i.name for i in by_prefix] == ["Straße Bolt", "strasse nut"]
+    assert [i.name for i in by_word] == ["Straße Bolt"]
+
+
+@pytest.mark.asyncio
+async def test_search_indexes_rows_stored_before_it_existed(tmp_path):
+    """Opening a database without the FTS table indexes its names."""
+    path = tmp_path / "examples.db"
+    first = await SQLiteExampleRepository.open(path)
+    await ExampleService(first).create_item("old widget")
+    async with first._pool.acquire() as conn:
+        conn.execute("DROP TABLE example_items_fts")
+    await first.close()
+
+    second = await SQLiteExampleRepository.open(path)
+    try:
+        found = await ExampleService(second).search_items("widget")
+    finally:
+        await second.close()
+
+    assert [i.name for i in found] == ["old widget"]
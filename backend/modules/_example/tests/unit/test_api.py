@@ -0,0 +1,33 @@
+"""
+Unit tests for _example API helpers.
+"""
+
+import json
+
+import pytest
+
+from modules._example.src.api import stream_examples_ndjson
+from modules._example.src.services import ExampleService
+
+
+class TestStreamExamplesNdjson:
+    """Tests for the NDJSON streaming helper."""
+
+    @pytest.mark.asyncio
+    async def test_streams_one_line_per_item(self):
+        """Each item becomes one JSON line; chunks arrive incrementally."""
+        service = ExampleService()
+        created = [await service.create_item(name=f"n{n}") for n in range(5)]
+
+        chunks = [c async for c in stream_examples_ndjson(service, chunk_size=2)]
+        lines = b"".join(chunks).decode().splitlines()
+
+        assert len(chunks) == 3
+        assert [json.loads(line) for line in lines] == [
+            {"id": i.id, "name": i.name, "status": i.status} for i in created
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_service_streams_nothing(self):
+        """No items means no chunks."""
+        assert [c async for c in stream_examples_ndjson(ExampleService())] == []
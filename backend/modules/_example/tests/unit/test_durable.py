@@ -0,0 +1,289 @@
+"""
+Unit tests for DurableExampleRepository.
+
+Contract behaviour through ExampleService is covered in test_services.py;
+these tests cover recovery, snapshots, group commit and crash consistency.
+"""
+
+import asyncio
+import random
+import shutil
+import uuid
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from modules._example.src.durable import DurabilityError, DurableExampleRepository
+from modules._example.src.models import ExampleModel
+
+
+def _items(count, status="active", prefix="item"):
+    return [
+        ExampleModel(id=str(uuid.uuid4()), name=f"{prefix}-{n}", status=status)
+        for n in range(count)
+    ]
+
+
+async def _state(repo):
+    return [(seq, i.id, i.name, i.status) for seq, i in await repo.page(0, 10**9)]
+
+
+async def _reopen(repo, **options):
+    await repo.close()
+    return await DurableExampleRepository.open(repo.directory, **options)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_writes_survive_reopen_with_seqs_and_status_index(tmp_path, compact):
+    repo = await DurableExampleRepository.open(tmp_path, compact=compact)
+    items = _items(6) + _items(4, status="archived")
+    await repo.add_many(items[:5])
+    for item in items[5:]:
+        await repo.add(item)
+    await repo.update(replace(items[0], name="renamed", status="archived"))
+    await repo.remove_many([items[1].id, items[9].id, "missing"])
+    before = await _state(repo)
+
+    repo = await _reopen(repo, compact=compact)
+
+    assert await _state(repo) == before
+    assert [i.id for i in await repo.list_items("archived")] == [
+        items[0].id,
+        *(i.id for i in items[6:9]),
+    ]
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_replaces_older_files_and_recovers_with_log_tail(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    await repo.add_many(_items(20))
+    await repo.snapshot()
+    await repo.add_many(_items(3, prefix="tail"))
+    await repo.remove((await repo.list_items())[0].id)
+    before = await _state(repo)
+
+    repo = await _reopen(repo)
+
+    assert await _state(repo) == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "snapshot-00000001.snap",
+        "wal-00000001.log",
+    ]
+    assert repo.stats().generation == 1
+    await repo.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_snapshot_loads_into_either_layout(tmp_path, compact):
+    repo = await DurableExampleRepository.open(tmp_path, compact=not compact)
+    items = _items(5) + _items(5, status="draft") + _items(5)
+    await repo.add_many(items)
+    await repo.update(replace(items[3], updated_at=items[3].created_at))
+    await repo.snapshot()
+    before = await _state(repo)
+
+    repo = await _reopen(repo, compact=compact)
+
+    assert await _state(repo) == before
+    assert (await repo.get(items[3].id)).updated_at == items[3].created_at
+    assert len(await repo.list_items("draft")) == 5
+    await repo.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compact", [False, True])
+async def test_snapshot_rebuilds_created_index(tmp_path, compact):
+    repo = await DurableExampleRepository.open(tmp_path, compact=compact)
+    items = _items(12)
+    base = items[0].created_at
+    await repo.add_many(
+        [
+            replace(i, created_at=base - timedelta(seconds=n % 4))
+            for n, i in enumerate(items)
+        ]
+    )
+    await repo.snapshot()
+    before = await repo.list_created(descending=True)
+
+    repo = await _reopen(repo, compact=compact)
+
+    assert await repo.list_created(descending=True) == before
+    assert [i.created_at for i in await repo.list_created()] == sorted(
+        i.created_at for i in before
+    )
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_keeps_any_ids_and_names(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    odd = [
+        ExampleModel(id="not-a-uuid", name="nul\0inside"),
+        ExampleModel(id="ünïcode", name="名前"),
+    ]
+    await repo.add_many(odd)
+    await repo.snapshot()
+
+    repo = await _reopen(repo)
+
+    assert await repo.list_items() == odd
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_during_snapshot_land_in_the_new_log(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    await repo.add_many(_items(500))
+    snapshot = asyncio.ensure_future(repo.snapshot())
+    await asyncio.sleep(0)
+    concurrent = _items(10, prefix="during")
+    await asyncio.gather(*(repo.add(i) for i in concurrent))
+    await snapshot
+    before = await _state(repo)
+
+    repo = await _reopen(repo)
+
+    assert await _state(repo) == before
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_background_snapshot_after_snapshot_every_records(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path, snapshot_every=50)
+    for _ in range(3):
+        await repo.add_many(_items(30))
+    await repo.close()
+
+    assert repo.stats().snapshots >= 1
+    assert repo.stats().last_error is None
+    repo = await DurableExampleRepository.open(tmp_path)
+    assert len(await repo.list_items()) == 90
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    await asyncio.gather(*(repo.add(i) for i in _items(100)))
+
+    stats = repo.stats()
+    assert stats.records == 100
+    assert stats.commits < 10
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_item_in_add_many_keeps_and_logs_the_ones_before(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path, compact=True)
+    bad = ExampleModel(id="not-a-uuid", name="bad")
+
+    with pytest.raises(ValueError):
+        await repo.add_many([*_items(2), bad])
+
+    assert repo.stats().commits == 1
+    repo = await _reopen(repo, compact=True)
+    assert len(await repo.list_items()) == 2
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_seq_of_deleted_last_item_is_not_reused(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    first, last = _items(2)
+    await repo.add_many([first, last])
+    last_seq = (await repo.page(0, 10))[-1][0]
+    await repo.remove(last.id)
+
+    repo = await _reopen(repo)
+    await repo.add(_items(1)[0])
+
+    assert (await repo.page(last_seq - 1, 10))[0][0] > last_seq
+    await repo.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_after_close_raise_and_change_nothing(tmp_path):
+    repo = await DurableExampleRepository.open(tmp_path)
+    (item,) = _items(1)
+    await repo.add(item)
+    await repo.close()
+
+    with pytest.raises(DurabilityError):
+        await repo.add(_items(1)[0])
+    with pytest.raises(DurabilityError):
+        await repo.remove(item.id)
+    assert await repo.list_items() == [item]
+
+
+def _copy_with_log(source, target, log_bytes):
+    shutil.copytree(source, target)
+    (log,) = target.glob("wal-*.log")
+    log.write_bytes(log_bytes)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("snapshot_first", [False, True])
+async def test_recovery_from_log_truncated_at_random_offsets(tmp_path, snapshot_first):
+    """A crash can cut the log anywhere: recovery must return exactly the
+    writes whose records are complete, and keep appending after them."""
+    source = tmp_path / "source"
+    repo = await DurableExampleRepository.open(source, sync=False)
+    if snapshot_first:
+        await repo.add_many(_items(10, prefix="snap"))
+        await repo.snapshot()
+    (log_path,) = source.glob("wal-*.log")
+    # (log size, state) after each acknowledged write.
+    checkpoints = [(log_path.stat().st_size, await _state(repo))]
+    rng = random.Random(1234)  # noqa: S311
+    for n in range(40):
+        choice = rng.random()
+        current = await repo.list_items()
+        if choice < 0.6 or not current:
+            await repo.add_many(_items(rng.randint(1, 3), prefix=f"w{n}"))
+        elif choice < 0.8:
+            target = rng.choice(current)
+            await repo.update(replace(target, name=f"{target.name}!", status="done"))
+        else:
+            await repo.remove(rng.choice(current).id)
+        checkpoints.append((log_path.stat().st_size, await _state(repo)))
+    await repo.close()
+    log_bytes = log_path.read_bytes()
+
+    offsets = rng.sample(range(len(log_bytes) + 1), 30) + [0, 5, len(log_bytes)]
+    for case, offset in enumerate(offsets):
+        target = tmp_path / f"crash-{case}"
+        _copy_with_log(source, target, log_bytes[:offset])
+        expected = [state for size, state in checkpoints if size <= offset]
+        expected = expected[-1] if expected else checkpoints[0][1]
+
+        recovered = await DurableExampleRepository.open(target, sync=False)
+        assert await _state(recovered) == expected, f"truncated at {offset}"
+        (extra,) = _items(1, prefix="after-crash")
+        await recovered.add(extra)
+        recovered = await _reopen(recovered, sync=False)
+        assert (await recovered.list_items())[-1] == extra
+        await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_corrupt_record_ends_replay(tmp_path):
+    source = tmp_path / "source"
+    repo = await DurableExampleRepository.open(source, sync=False)
+    items = _items(3)
+    sizes = []
+    for item in items:
+        await repo.add(item)
+        sizes.append(next(source.glob("wal-*.log")).stat().st_size)
+    await repo.close()
+    log = bytearray(next(source.glob("wal-*.log")).read_bytes())
+    log[sizes[0] + 12] ^= 0xFF  # inside the second record's payload
+
+    _copy_with_log(source, tmp_path / "corrupt", bytes(log))
+    repo = await DurableExampleRepository.open(tmp_path / "corrupt")
+
+    assert await repo.list_items() == items[:1]
+    await repo.close()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the name search indexes.
+
+Both are checked against brute-force references under random writes, with
+the tail and tombstone thresholds lowered so merges and sweeps happen.
+"""
+
+import random
+
+import pytest
+
+from modules._example.src import index as index_module
+from modules._example.src.index import PrefixIndex, SearchIndex, tokenize
+
+WORDS = ["red", "reed", "rust", "blue", "bl", "widget", "wagon", "Ärger", "x_y"]
+
+
+@pytest.fixture(autouse=True)
+def small_thresholds(monkeypatch):
+    monkeypatch.setattr(index_module, "_FOLD_AT", 8)
+    monkeypatch.setattr(index_module, "_COMPACT_MIN_DEAD", 4)
+
+
+def _reference_search(names, query, limit):
+    """SearchIndex ranking by full scan: names is {seq: name}."""
+    prefix = query.strip().casefold()
+    if not prefix:
+        return []
+    hits = sorted(
+        (n.casefold(), s) for s, n in names.items() if n.casefold().startswith(prefix)
+    )
+    result = [s for _, s in hits]
+    *whole, last = tokenize(query) or [None]
+    if last is not None:
+        for seq in sorted(names):
+            tokens = tokenize(names[seq])
+            if (
+                seq not in result
+                and all(w in tokens for w in whole)
+                and any(t.startswith(last) for t in tokens)
+            ):
+                result.append(seq)
+    return result[:limit]
+
+
+def test_tokenize_casefolds_and_splits_on_underscores():
+    assert tokenize("Red-Widget_2 ÄRGER") == ["red", "widget", "2", "ärger"]
+
+
+def test_prefix_index_matches_sorted_reference_under_random_writes():
+    rng = random.Random(42)  # noqa: S311
+    index, live = PrefixIndex(), set()
+    for seq in range(3000):
+        if rng.random() < 0.7 or not live:
+            key = "".join(rng.choice("abc") for _ in range(rng.randint(1, 4)))
+            index.add(key, seq)
+            live.add((key, seq))
+        else:
+            entry = rng.choice(sorted(live))
+            index.discard(*entry)
+            live.discard(entry)
+            if rng.random() < 0.3:
+                index.add(*entry)
+                live.add(entry)
+        if seq % 97 == 0:
+            for prefix in ("", "a", "ab", "cba"):
+                expected = sorted(e for e in live if e[0].startswith(prefix))
+                assert list(index.prefixed(prefix)) == expected
+    for entry in rng.sample(sorted(live), len(live) * 9 // 10):
+        index.discard(*entry)
+        live.discard(entry)
+
+    assert not index._dead or len(index._dead) * 2 <= len(index._keys)
+    assert list(index.prefixed("")) == sorted(live)
+    assert len(index) == len(live)
+    keys, seqs = zip(*sorted(live, key=lambda e: e[1]), strict=True)
+    rebuilt = PrefixIndex.from_columns(keys, seqs)
+    assert list(rebuilt.prefixed("b")) == sorted(
+        e for e in live if e[0].startswith("b")
+    )
+
+
+def test_search_index_matches_reference_under_random_writes():
+    rng = random.Random(7)  # noqa: S311
+    names = {
+        seq: " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        for seq in range(200)
+    }
+    index = SearchIndex.build(list(names), list(names.values()))
+    for seq in range(200, 1200):
+        op = rng.random()
+        if op < 0.5 or not names:
+            names[seq] = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            index.add(seq, names[seq])
+        elif op < 0.7:
+            old = rng.choice(list(names))
+            index.discard(old, names[old])
+            names[old] = rng.choice(WORDS).upper()
+            index.add(old, names[old])
+        else:
+            old = rng.choice(list(names))
+            index.discard(old, names.pop(old))
+    for query in ["r", "re", "red", "Red w", "bl", "blue wid", "x", "ärg", " ", "zz"]:
+        for limit in (1, 5, 1000):
+            hits = index.search(query, limit, names.__getitem__)
+            assert [seq for _, _, seq in hits] == _reference_search(
+                names, query, limit
+            ), (query, limit)
+    assert len(index) == len(names)
@@ -4,75 +4,593 @@ Unit tests for _example services.
 Demonstrates test patterns. Replace with your actual tests.
 """
 
+import asyncio
+import random
+import shutil
+import tempfile
+import uuid
+from dataclasses import replace
+from datetime import datetime, timedelta
+
 import pytest
+import pytest_asyncio
 
 # Adjust import path based on your project structure
-# from modules._example.src.services import ExampleService
-# from modules._example.src.models import ExampleModel
+from modules._example.src.durable import DurableExampleRepository
+from modules._example.src.models import ExampleModel
+from modules._example.src.repository import (
+    InMemoryExampleRepository,
+    ShardedExampleRepository,
+)
+from modules._example.src.services import ExampleService
+from modules._example.src.write_behind import WriteBehindRepository
+from shared.exceptions import InvalidInputError, NotFoundError
+
+# Storage layouts every service contract test runs against.
+BACKENDS = {
+    "dict": lambda: ExampleService(),
+    "compact": lambda: ExampleService(compact=True),
+    "sharded": lambda: ExampleService(ShardedExampleRepository(shards=4)),
+    "write_behind": lambda: ExampleService(
+        WriteBehindRepository(InMemoryExampleRepository(), max_batch=64)
+    ),
+    "durable": lambda: ExampleService(
+        DurableExampleRepository(tempfile.mkdtemp(), sync=False)
+    ),
+}
+
+
+async def _open(param):
+    """Yield a service for one storage layout, closing what needs closing."""
+    service = BACKENDS[param]()
+    yield service
+    repo = service._repository
+    if isinstance(repo, WriteBehindRepository):
+        await repo.aclose()
+    elif isinstance(repo, DurableExampleRepository):
+        await repo.close()
+        shutil.rmtree(repo.directory)
 
 
 class TestExampleService:
     """Tests for ExampleService."""
 
-    # @pytest.fixture
-    # def service(self):
-    #     """Create service instance for testing."""
-    #     return ExampleService()
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        """Create service instance for testing, once per storage layout."""
+        async for service in _open(request.param):
+            yield service
 
     @pytest.mark.asyncio
-    async def test_list_items_empty_returns_empty_list(self):
+    async def test_list_items_empty_returns_empty_list(self, service):
         """List items when empty returns empty list."""
-        # service = ExampleService()
-        # result = await service.list_items()
-        # assert result == []
-        pass  # Placeholder - uncomment above when imports work
+        result = await service.list_items()
+        assert result == []
 
     @pytest.mark.asyncio
-    async def test_create_item_valid_returns_model(self):
+    async def test_create_item_valid_returns_model(self, service):
         """Create item with valid name returns ExampleModel."""
-        # service = ExampleService()
-        # result = await service.create_item(name="Test Item")
-        #
-        # assert isinstance(result, ExampleModel)
-        # assert result.name == "Test Item"
-        # assert result.status == "active"
-        # assert result.id is not None
-        pass  # Placeholder
+        result = await service.create_item(name="Test Item")
+
+        assert isinstance(result, ExampleModel)
+        assert result.name == "Test Item"
+        assert result.status == "active"
+        assert result.id is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", ["", "   ", None, 42, "x" * 201])
+    async def test_create_item_invalid_name_raises(self, service, name):
+        """Names must be 1-200 character strings; nothing is stored otherwise."""
+        with pytest.raises(InvalidInputError):
+            await service.create_item(name=name)
+        assert await service.list_items() == []
+
+    @pytest.mark.asyncio
+    async def test_create_item_strips_name(self, service):
+        """Surrounding whitespace is not part of the name."""
+        assert (await service.create_item(name="  Test  ")).name == "Test"
 
     @pytest.mark.asyncio
-    async def test_get_item_exists_returns_item(self):
+    async def test_update_status_rejects_invalid_status(self, service):
+        """Statuses are lower-case slugs."""
+        created = await service.create_item(name="Test")
+        with pytest.raises(InvalidInputError):
+            await service.update_status(created.id, "Not A Status")
+        assert (await service.get_item(created.id)).status == "active"
+
+    @pytest.mark.asyncio
+    async def test_get_item_exists_returns_item(self, service):
         """Get item that exists returns the item."""
-        # service = ExampleService()
-        # created = await service.create_item(name="Test")
-        # result = await service.get_item(created.id)
-        #
-        # assert result is not None
-        # assert result.id == created.id
-        pass  # Placeholder
+        created = await service.create_item(name="Test")
+        result = await service.get_item(created.id)
+
+        assert result is not None
+        assert result.id == created.id
 
     @pytest.mark.asyncio
-    async def test_get_item_not_exists_returns_none(self):
+    async def test_get_item_not_exists_returns_none(self, service):
         """Get item that doesn't exist returns None."""
-        # service = ExampleService()
-        # result = await service.get_item("nonexistent-id")
-        # assert result is None
-        pass  # Placeholder
+        result = await service.get_item("nonexistent-id")
+        assert result is None
 
     @pytest.mark.asyncio
-    async def test_delete_item_exists_returns_true(self):
+    async def test_delete_item_exists_returns_true(self, service):
         """Delete existing item returns True."""
-        # service = ExampleService()
-        # created = await service.create_item(name="Test")
-        # result = await service.delete_item(created.id)
-        #
-        # assert result is True
-        # assert await service.get_item(created.id) is None
-        pass  # Placeholder
+        created = await service.create_item(name="Test")
+        result = await service.delete_item(created.id)
+
+        assert result is True
+        assert await service.get_item(created.id) is None
 
     @pytest.mark.asyncio
-    async def test_delete_item_not_exists_returns_false(self):
+    async def test_delete_item_not_exists_returns_false(self, service):
         """Delete non-existing item returns False."""
-        # service = ExampleService()
-        # result = await service.delete_item("nonexistent-id")
-        # assert result is False
-        pass  # Placeholder
+        result = await service.delete_item("nonexistent-id")
+        assert result is False
+
+
+class TestStatusIndex:
+    """Tests for the status -> ids secondary index."""
+
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        async for service in _open(request.param):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_list_items_by_status_returns_only_matches(self, service):
+        """Filtered listing returns matching items in insertion order."""
+        a = await service.create_item(name="a")
+        b = await service.create_item(name="b")
+        c = await service.create_item(name="c")
+        await service.update_status(b.id, "archived")
+
+        assert [i.id for i in await service.list_items("active")] == [a.id, c.id]
+        assert [i.id for i in await service.list_items("archived")] == [b.id]
+        assert await service.list_items("missing") == []
+
+    @pytest.mark.asyncio
+    async def test_update_status_missing_item_returns_none(self, service):
+        """Updating an unknown id is a no-op."""
+        assert await service.update_status("nonexistent-id", "archived") is None
+
+    @pytest.mark.asyncio
+    async def test_index_consistent_after_random_operations(self, service):
+        """Index always equals a full scan, whatever the write sequence."""
+        rng = random.Random(1234)  # noqa: S311
+        statuses = ["active", "archived", "pending"]
+        ids: list[str] = []
+
+        for _ in range(2000):
+            op = rng.random()
+            if op < 0.5 or not ids:
+                ids.append((await service.create_item(name="x")).id)
+            elif op < 0.8:
+                await service.update_status(rng.choice(ids), rng.choice(statuses))
+            else:
+                item_id = ids.pop(rng.randrange(len(ids)))
+                assert await service.delete_item(item_id) is True
+
+        everything = await service.list_items()
+        for status in statuses:
+            expected = [i.id for i in everything if i.status == status]
+            assert [i.id for i in await service.list_items(status)] == expected
+        repo = service._repository
+        if isinstance(repo, WriteBehindRepository):
+            await repo.flush()
+            repo = repo.repository
+        if isinstance(repo, ShardedExampleRepository):
+            indexes = [s.by_status for s in repo._shards]
+        else:
+            indexes = [repo._status_index]
+        assert set().union(*indexes) <= set(statuses)
+        indexed = sum(len(v) for index in indexes for v in index.values())
+        assert indexed == len(everything)
+
+
+class TestPagination:
+    """Tests for keyset pagination and chunked iteration."""
+
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        async for service in _open(request.param):
+            yield service
+
+    async def _drain_pages(self, service, limit, status=None):
+        ids, cursor = [], None
+        while True:
+            page = await service.list_items_page(cursor, limit, status)
+            ids.extend(i.id for i in page.items)
+            if page.next_cursor is None:
+                return ids
+            cursor = page.next_cursor
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_all_items_in_order(self, service):
+        """Walking every page returns each item exactly once, in order."""
+        created = [(await service.create_item(name=f"n{n}")).id for n in range(25)]
+
+        assert await self._drain_pages(service, limit=10) == created
+        assert await self._drain_pages(service, limit=25) == created
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, service):
+        """An exactly-full final page does not hand out a dangling cursor."""
+        for n in range(4):
+            await service.create_item(name=f"n{n}")
+
+        first = await service.list_items_page(limit=2)
+        second = await service.list_items_page(first.next_cursor, limit=2)
+
+        assert first.next_cursor is not None
+        assert len(second.items) == 2
+        assert second.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_stable_under_concurrent_writes(self, service):
+        """Inserts and deletes between pages never skip or repeat survivors."""
+        created = [(await service.create_item(name=f"n{n}")).id for n in range(30)]
+
+        page = await service.list_items_page(limit=10)
+        seen = [i.id for i in page.items]
+        # Delete one already-seen item and one not-yet-seen item, add new ones.
+        await service.delete_item(created[0])
+        await service.delete_item(created[15])
+        added = [(await service.create_item(name="late")).id for _ in range(3)]
+
+        cursor = page.next_cursor
+        while cursor:
+            page = await service.list_items_page(cursor, limit=10)
+            seen.extend(i.id for i in page.items)
+            cursor = page.next_cursor
+
+        expected = created[:15] + created[16:] + added
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_page_filtered_by_status(self, service):
+        """Status filter applies to pages."""
+        ids = [(await service.create_item(name=f"n{n}")).id for n in range(10)]
+        for item_id in ids[::2]:
+            await service.update_status(item_id, "archived")
+
+        assert await self._drain_pages(service, 2, "archived") == ids[::2]
+        assert await self._drain_pages(service, 2, "missing") == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises(self, service):
+        """Garbage cursors are rejected."""
+        with pytest.raises(ValueError):
+            await service.list_items_page(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            await service.list_items_page(limit=0)
+
+    @pytest.mark.asyncio
+    async def test_iter_items_yields_chunks(self, service):
+        """iter_items yields bounded chunks covering every item."""
+        created = [(await service.create_item(name=f"n{n}")).id for n in range(7)]
+
+        chunks = [chunk async for chunk in service.iter_items(chunk_size=3)]
+
+        assert [len(c) for c in chunks] == [3, 3, 1]
+        assert [i.id for c in chunks for i in c] == created
+
+
+class TestCreatedRange:
+    """Tests for created_at range listing and time-ordered ids."""
+
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        async for service in _open(request.param):
+            yield service
+
+    BASE = datetime(2024, 1, 1)
+
+    async def _add_spread(self, service, count=40):
+        """Add items whose created_at is out of seq order and repeats."""
+        rng = random.Random(7)  # noqa: S311
+        items = [
+            ExampleModel(
+                id=str(uuid.uuid4()),
+                name=f"n{n}",
+                status=rng.choice(["active", "archived"]),
+                created_at=self.BASE + timedelta(minutes=rng.randrange(10)),
+            )
+            for n in range(count)
+        ]
+        await service._repository.add_many(items)
+        return items
+
+    @pytest.mark.asyncio
+    async def test_window_is_exclusive_and_ordered_by_created_then_seq(self, service):
+        """Bounds are exclusive; ties keep creation order, reversed for desc."""
+        items = await self._add_spread(service)
+        after = self.BASE + timedelta(minutes=2)
+        before = self.BASE + timedelta(minutes=7)
+        expected = sorted(
+            (i for i in items if after < i.created_at < before),
+            key=lambda i: i.created_at,
+        )
+
+        asc = await service.list_items(created_after=after, created_before=before)
+        desc = await service.list_items(
+            created_after=after, created_before=before, order="desc"
+        )
+
+        assert [i.id for i in asc] == [i.id for i in expected]
+        assert [i.id for i in desc] == [i.id for i in reversed(expected)]
+
+    @pytest.mark.asyncio
+    async def test_newest_with_limit_and_status(self, service):
+        """order="desc" with a limit returns the newest matches first."""
+        items = await self._add_spread(service)
+        archived = [i for i in items if i.status == "archived"]
+        newest = sorted(archived, key=lambda i: i.created_at)[::-1][:5]
+
+        result = await service.list_items("archived", order="desc", limit=5)
+        oldest = await service.list_items(limit=3)
+
+        assert [i.id for i in result] == [i.id for i in newest]
+        assert [i.id for i in oldest] == [
+            i.id for i in sorted(items, key=lambda i: i.created_at)[:3]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, service):
+        """Moved and deleted items leave the created_at index in step."""
+        items = await self._add_spread(service)
+        repo = service._repository
+        moved = replace(items[0], created_at=self.BASE + timedelta(hours=1))
+        await repo.update(moved)
+        await service.delete_many([i.id for i in items[1:10]])
+
+        result = await service.list_items(
+            created_after=self.BASE - timedelta(minutes=1)
+        )
+        remaining = sorted([moved, *items[10:]], key=lambda i: i.created_at)
+
+        assert [i.id for i in result] == [i.id for i in remaining]
+        assert (await service.list_items(order="desc", limit=1))[0].id == moved.id
+
+    @pytest.mark.asyncio
+    async def test_status_window_follows_writes_after_first_query(self, service):
+        """A status's created_at index, once built, tracks later writes."""
+        items = await self._add_spread(service)
+        repo = service._repository
+        assert await service.list_items("archived", order="desc", limit=1)
+
+        moved = [
+            replace(items[0], status="archived"),
+            replace(items[1], status="active"),
+            replace(items[2], created_at=self.BASE + timedelta(hours=1)),
+        ]
+        for item in moved:
+            await repo.update(item)
+        await service.delete_many([i.id for i in items[3:8]])
+        added = await self._add_spread(service, count=5)
+        current = [*moved, *items[8:], *added]
+
+        for status in ("active", "archived"):
+            expected = sorted(
+                (i for i in current if i.status == status),
+                key=lambda i: i.created_at,
+            )
+            result = await service.list_items(status, order="desc", limit=100)
+            assert [i.id for i in result] == [i.id for i in reversed(expected)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_order_or_limit_rejected(self, service):
+        with pytest.raises(ValueError):
+            await service.list_items(order="newest")
+        with pytest.raises(ValueError):
+            await service.list_items(limit=0)
+
+    @pytest.mark.asyncio
+    async def test_time_ordered_ids_sort_by_creation(self, service):
+        """Version 7 ids increase across single and batched creates."""
+        service._time_ordered_ids = True
+        ids = [(await service.create_item("first")).id]
+        ids += [i.id for i in (await service.create_many(["a", "b", "c"])).results]
+        ids.append((await service.create_item("last")).id)
+
+        assert ids == sorted(ids)
+        assert {uuid.UUID(i).version for i in ids} == {7}
+        stamp = uuid.UUID(ids[0]).int >> 80
+        created = (await service.get_item(ids[0])).created_at
+        assert stamp == (created - datetime(1970, 1, 1)) // timedelta(milliseconds=1)
+
+
+class TestSearch:
+    """Tests for name search."""
+
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        async for service in _open(request.param):
+            yield service
+
+    NAMES = ["Red Widget", "blue widget", "Redwood", "red wagon", "Widget red", "x"]
+
+    async def _names(self, service, query, limit=20):
+        return [i.name for i in await service.search_items(query, limit)]
+
+    @pytest.mark.asyncio
+    async def test_prefix_matches_first_then_word_matches(self, service):
+        """Name prefixes rank first (alphabetically), word matches follow."""
+        await service.create_many(self.NAMES)
+
+        assert await self._names(service, "red") == [
+            "red wagon",
+            "Red Widget",
+            "Redwood",
+            "Widget red",
+        ]
+        assert await self._names(service, "RED W") == [
+            "red wagon",
+            "Red Widget",
+            "Widget red",
+        ]
+        assert await self._names(service, "wid") == [
+            "Widget red",
+            "Red Widget",
+            "blue widget",
+        ]
+        assert await self._names(service, "red", limit=2) == ["red wagon", "Red Widget"]
+        assert await self._names(service, "  ") == []
+        assert await self._names(service, "green") == []
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_names_fold_and_sort_by_casefold(self, service):
+        """Case folding is full Unicode casefold, as in the SQLite backend."""
+        await service.create_many(["Straße Bolt", "STRASSE nut", "Éclair", "zinc"])
+
+        assert await self._names(service, "strasse") == ["Straße Bolt", "STRASSE nut"]
+        assert await self._names(service, "STRAẞE N") == ["STRASSE nut"]
+        assert await self._names(service, "bolt") == ["Straße Bolt"]
+        assert await self._names(service, "éCLAIR") == ["Éclair"]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_creates_renames_and_deletes(self, service):
+        """Writes after the first search are visible to the next one."""
+        items = (await service.create_many(self.NAMES)).results
+        assert await self._names(service, "blue") == ["blue widget"]
+
+        await service.delete_item(items[1].id)
+        await service._repository.update(replace(items[5], name="Bluebell"))
+        await service.create_item("navy blue")
+
+        assert await self._names(service, "blue") == ["Bluebell", "navy blue"]
+        assert await self._names(service, "x") == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_limit_rejected(self, service):
+        with pytest.raises(ValueError):
+            await service.search_items("red", limit=0)
+
+
+class TestBulkOperations:
+    """Tests for create_many / get_many / delete_many."""
+
+    @pytest_asyncio.fixture(params=list(BACKENDS))
+    async def service(self, request):
+        async for service in _open(request.param):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_create_many_returns_items_in_input_order(self, service):
+        """Bulk create keeps input order and indexes every item."""
+        result = await service.create_many(["a", "b", "c"])
+
+        assert result.ok
+        assert [i.name for i in result.results] == ["a", "b", "c"]
+        assert len({i.id for i in result.results}) == 3
+        assert await service.list_items("active") == result.results
+
+    @pytest.mark.asyncio
+    async def test_create_many_reports_invalid_names_per_item(self, service):
+        """A bad entry fails alone; the others are created."""
+        result = await service.create_many(["a", None, "c"])
+
+        assert not result.ok
+        assert result.results[1] is None
+        assert isinstance(result.errors[1], InvalidInputError)
+        assert [i.name for i in await service.list_items()] == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_create_many_rejects_input_that_is_not_a_list(self, service):
+        """A string or null instead of a list is invalid input, not a crash."""
+        for names in ("abc", None):
+            with pytest.raises(InvalidInputError):
+                await service.create_many(names)
+        assert await service.list_items() == []
+
+    @pytest.mark.asyncio
+    async def test_create_many_applies_name_rules(self, service):
+        """Each name gets the same rules as create_item."""
+        result = await service.create_many([" a ", "", "b", "x" * 201])
+
+        assert sorted(result.errors) == [1, 3]
+        assert [i and i.name for i in result.results] == ["a", None, "b", None]
+
+    @pytest.mark.asyncio
+    async def test_get_many_reports_missing_ids(self, service):
+        """Missing ids yield None plus a NotFoundError at the same index."""
+        created = (await service.create_many(["a", "b"])).results
+
+        result = await service.get_many([created[1].id, "nope", created[0].id])
+
+        assert result.results == [created[1], None, created[0]]
+        assert list(result.errors) == [1]
+        assert isinstance(result.errors[1], NotFoundError)
+
+    @pytest.mark.asyncio
+    async def test_delete_many_removes_and_reports(self, service):
+        """Deleted items are returned; unknown and repeated ids are errors."""
+        a, b = (await service.create_many(["a", "b"])).results
+
+        result = await service.delete_many([a.id, "nope", a.id])
+
+        assert result.results == [a, None, None]
+        assert sorted(result.errors) == [1, 2]
+        assert await service.list_items() == [b]
+        assert await service.list_items("active") == [b]
+
+    @pytest.mark.asyncio
+    async def test_delete_many_large_batch_keeps_indexes_in_sync(self, service):
+        """A batch big enough to sweep the indexes leaves every view agreeing."""
+        items = (await service.create_many([f"n{n}" for n in range(40)])).results
+        for item in items[::3]:
+            await service.update_status(item.id, "archived")
+        doomed = {i.id for n, i in enumerate(items) if n % 4}
+
+        await service.delete_many(list(doomed))
+
+        kept = await service.list_items()
+        assert [i.id for i in kept] == [i.id for i in items if i.id not in doomed]
+        for status in ("active", "archived"):
+            expected = [i for i in kept if i.status == status]
+            assert await service.list_items(status) == expected
+            page = await service.list_items_page(limit=100, status=status)
+            assert page.items == expected
+
+    @pytest.mark.asyncio
+    async def test_get_item_is_cached(self, service):
+        """Repeat and concurrent lookups of one id share a repository call."""
+        created = await service.create_item(name="Test")
+
+        results = await asyncio.gather(
+            *[service.get_item(created.id) for _ in range(50)]
+        )
+        await service.get_item(created.id)
+
+        assert results == [created] * 50
+        stats = service.get_item.stats()
+        assert stats.loads == 1
+        assert stats.coalesced + stats.hits == 50
+
+    @pytest.mark.asyncio
+    async def test_mutations_invalidate_cached_item(self, service):
+        """Updates and deletes are visible to the next get_item."""
+        a, b = (await service.create_many(["a", "b"])).results
+        assert await service.get_item(a.id) == a
+        assert await service.get_item(b.id) == b
+
+        await service.update_status(a.id, "archived")
+        assert (await service.get_item(a.id)).status == "archived"
+
+        assert await service.delete_item(a.id)
+        assert await service.get_item(a.id) is None
+        await service.delete_many([b.id])
+        assert await service.get_item(b.id) is None
+
+    @pytest.mark.asyncio
+    async def test_create_item_replaces_cached_miss(self, service, monkeypatch):
+        """A cached miss for an id does not hide the item created with it."""
+        monkeypatch.setattr(
+            "modules._example.src.services.uuid.uuid4",
+            lambda: "00000000-0000-4000-8000-000000000000",
+        )
+        assert await service.get_item("00000000-0000-4000-8000-000000000000") is None
+
+        created = await service.create_item(name="Test")
+
+        assert await service.get_item(created.id) == created
@@ -0,0 +1,116 @@
+"""
+Unit tests for ShardedExampleRepository.
+
+Contract behaviour (CRUD, ordering, status, pagination) is covered through
+ExampleService in test_services.py; these tests cover sharding and
+thread safety.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from modules._example.src.repository import ShardedExampleRepository
+
+
+def _items(prefix, count, status="active"):
+    return [
+        ExampleModel(id=f"{prefix}-{n}", name=f"{prefix}-{n}", status=status)
+        for n in range(count)
+    ]
+
+
+def test_rejects_zero_shards():
+    with pytest.raises(ValueError):
+        ShardedExampleRepository(shards=0)
+
+
+@pytest.mark.asyncio
+async def test_items_spread_over_shards_and_list_in_insertion_order():
+    repo = ShardedExampleRepository(shards=8)
+    items = _items("a", 200)
+    await repo.add_many(items[:100])
+    for item in items[100:]:
+        await repo.add(item)
+
+    assert sum(1 for s in repo._shards if s.items) == 8
+    assert [i.id for i in await repo.list_items()] == [i.id for i in items]
+    assert await repo.get_many(["a-5", "missing", "a-150"]) == [
+        items[5],
+        None,
+        items[150],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_page_merges_shards_by_seq():
+    repo = ShardedExampleRepository(shards=4)
+    items = _items("p", 50)
+    await repo.add_many(items)
+    await repo.remove_many([f"p-{n}" for n in range(0, 50, 3)])
+
+    seen, after = [], 0
+    while page := await repo.page(after, 7):
+        seen.extend(item.id for _, item in page)
+        after = page[-1][0]
+
+    assert seen == [i.id for i in await repo.list_items()]
+    assert len(seen) == 50 - 17
+
+
+def test_concurrent_writers_keep_snapshots_consistent():
+    """Threads bulk-write pairs while readers list; no reader sees half a pair.
+
+    Each writer adds and removes items two at a time (one add_many or
+    remove_many call), so any consistent snapshot holds both items of a
+    pair or neither. Every thread runs its own event loop against the one
+    shared repository.
+    """
+    repo = ShardedExampleRepository(shards=8)
+    writers, rounds = 4, 300
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    async def write(w):
+        for n in range(rounds):
+            pair = _items(f"w{w}-{n}", 2)
+            await repo.add_many(pair)
+            if n % 2:
+                await repo.remove_many([i.id for i in pair])
+
+    async def read():
+        while not stop.is_set():
+            ids = [i.id for i in await repo.list_items()]
+            assert len(ids) == len(set(ids))
+            prefixes = [i.rsplit("-", 1)[0] for i in ids]
+            for prefix in set(prefixes):
+                assert prefixes.count(prefix) == 2, prefix
+            page = await repo.page(0, 50)
+            seqs = [seq for seq, _ in page]
+            assert seqs == sorted(seqs) and len(set(seqs)) == len(seqs)
+
+    def run(coro_fn, *args):
+        try:
+            asyncio.run(coro_fn(*args))
+        except BaseException as exc:  # noqa: BLE001 - re-raised in main thread
+            errors.append(exc)
+            stop.set()
+
+    readers = [threading.Thread(target=run, args=(read,)) for _ in range(2)]
+    threads = [threading.Thread(target=run, args=(write, w)) for w in range(writers)]
+    for t in readers + threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    remaining = asyncio.run(repo.list_items())
+    assert len(remaining) == writers * rounds  # even rounds keep their pair
+    assert sum(len(s.items) for s in repo._shards) == len(remaining)
+    assert sum(len(s.seq_of) for s in repo._shards) == len(remaining)
@@ -0,0 +1,113 @@
+"""
+Unit tests for _example storage.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from modules._example.src.storage import CompactItemStore, ItemStore
+
+
+def _model(**overrides) -> ExampleModel:
+    fields = {"id": str(uuid.uuid4()), "name": "n"}
+    fields.update(overrides)
+    return ExampleModel(**fields)
+
+
+@pytest.fixture(params=[ItemStore, CompactItemStore])
+def store(request):
+    return request.param()
+
+
+class TestItemStores:
+    """Contract shared by every item store."""
+
+    def test_round_trips_every_field(self, store):
+        """Stored items come back equal, by id and by ref."""
+        item = _model(
+            status="archived",
+            created_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            updated_at=datetime(2024, 5, 2),
+        )
+
+        ref = store.add(1, item)
+
+        assert store.get(item.id) == item
+        assert store.resolve(ref) == item
+        assert store.find(item.id) == (1, ref, item)
+
+    def test_put_persists_changes(self, store):
+        """put() writes back a modified item."""
+        item = _model()
+        store.add(1, item)
+
+        changed = store.get(item.id)
+        changed.status = "archived"
+        store.put(changed)
+
+        assert store.get(item.id).status == "archived"
+
+    def test_remove_returns_seq_and_item(self, store):
+        """remove() reports what was dropped, once."""
+        item = _model()
+        store.add(7, item)
+
+        assert store.remove(item.id) == (7, item)
+        assert store.remove(item.id) is None
+        assert store.get(item.id) is None
+        assert store.find(item.id) is None
+        assert len(store) == 0
+
+    def test_values_in_seq_order_across_deletes(self, store):
+        """Iteration order survives deletes and hole sweeping."""
+        items = [_model(name=f"n{n}") for n in range(5000)]
+        for seq, item in enumerate(items, 1):
+            store.add(seq, item)
+
+        for item in items[:4000]:
+            store.remove(item.id)
+
+        assert len(store) == 1000
+        assert list(store.values()) == items[4000:]
+        assert store.find(items[-1].id)[0] == 5000
+
+
+class TestCompactItemStore:
+    """Tests specific to the columnar store."""
+
+    def test_views_are_copies(self):
+        """Mutating a view does not change the store until put()."""
+        store = CompactItemStore()
+        item = _model()
+        store.add(1, item)
+
+        view = store.get(item.id)
+        view.name = "changed"
+
+        assert view is not item
+        assert store.get(item.id).name == "n"
+
+    def test_aware_timestamps_normalized_to_naive_utc(self):
+        """Timezone-aware datetimes come back as naive UTC."""
+        store = CompactItemStore()
+        tz = timezone(timedelta(hours=2))
+        item = _model(created_at=datetime(2024, 1, 1, 2, 0, tzinfo=tz))
+
+        store.add(1, item)
+
+        assert store.get(item.id).created_at == datetime(2024, 1, 1, 0, 0)
+
+    def test_rejects_non_canonical_ids(self):
+        """Ids that cannot be stored as 128-bit ints are rejected."""
+        store = CompactItemStore()
+        upper = str(uuid.uuid4()).upper()
+
+        with pytest.raises(ValueError):
+            store.add(1, _model(id="not-a-uuid"))
+        with pytest.raises(ValueError):
+            store.add(2, _model(id=upper))
+        assert store.get("not-a-uuid") is None
+        assert store.get(upper) is None
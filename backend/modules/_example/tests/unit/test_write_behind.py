@@ -0,0 +1,298 @@
+"""
+Unit tests for WriteBehindRepository.
+
+Contract behaviour through ExampleService is covered in test_services.py;
+these tests cover batching, ordering, backpressure, failure and shutdown.
+"""
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from modules._example.src.models import ExampleModel
+from modules._example.src.repository import (
+    InMemoryExampleRepository,
+    SQLiteExampleRepository,
+)
+from modules._example.src.write_behind import (
+    DuplicateIdError,
+    WriteBehindClosedError,
+    WriteBehindRepository,
+)
+
+
+class RecordingRepository(InMemoryExampleRepository):
+    """Records write calls and get_many sizes; fails writes while
+    `failing`, blocks them until `gate` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.reads = []
+        self.failing = False
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def _write(self, name, size):
+        await self.gate.wait()
+        if self.failing:
+            raise ConnectionError("storage unavailable")
+        self.calls.append((name, size))
+
+    async def get_many(self, item_ids):
+        self.reads.append(len(item_ids))
+        await asyncio.sleep(0)
+        return await super().get_many(item_ids)
+
+    async def add_many(self, items):
+        await self._write("add_many", len(items))
+        await super().add_many(items)
+
+    async def update_many(self, items):
+        await self._write("update_many", len(items))
+        return await super().update_many(items)
+
+    async def remove_many(self, item_ids):
+        await self._write("remove_many", len(item_ids))
+        return await super().remove_many(item_ids)
+
+
+def _items(prefix, count):
+    return [
+        ExampleModel(id=f"{prefix}-{n}", name=f"{prefix}-{n}") for n in range(count)
+    ]
+
+
+def test_rejects_batch_larger_than_buffer():
+    with pytest.raises(ValueError):
+        WriteBehindRepository(InMemoryExampleRepository(), max_batch=10, max_pending=5)
+
+
+@pytest.mark.asyncio
+async def test_reads_see_buffered_writes_before_flush():
+    inner = RecordingRepository()
+    inner.gate.clear()
+    repo = WriteBehindRepository(inner, max_delay=60)
+    a, b = _items("a", 2)
+    await repo.add_many([a, b])
+    renamed = replace(a, name="renamed")
+    assert await repo.update(renamed) is True
+    assert await repo.remove("a-1") == b
+
+    assert inner.calls == []
+    assert await repo.get("a-0") == renamed
+    assert await repo.get_many(["a-1", "a-0", "missing"]) == [None, renamed, None]
+    assert await repo.update(b) is False
+    assert repo.stats().pending == 4
+
+    inner.gate.set()
+    await repo.aclose()
+    assert await inner.list_items() == [renamed]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_for_delay():
+    inner = RecordingRepository()
+    repo = WriteBehindRepository(inner, max_batch=10, max_delay=60)
+    items = _items("a", 15)
+    for item in items[:10]:
+        await repo.add(item)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    # The full batch went out at once; a partial one waits for max_delay.
+    assert inner.calls == [("add_many", 10)]
+
+    for item in items[10:]:
+        await repo.add(item)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert inner.calls == [("add_many", 10)]
+    await repo.flush()
+    assert inner.calls[-1] == ("add_many", 5)
+    assert repo.stats().batches == 2
+    await repo.aclose()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_flushes_after_delay():
+    inner = RecordingRepository()
+    repo = WriteBehindRepository(inner, max_batch=100, max_delay=0.01)
+    await repo.add_many(_items("a", 3))
+    await asyncio.sleep(0.05)
+
+    assert inner.calls == [("add_many", 3)]
+    assert repo.stats().pending == 0
+    assert repo._flusher is None  # idle: the flusher exits until the next write
+
+
+@pytest.mark.asyncio
+async def test_writes_reach_repository_in_order():
+    inner = RecordingRepository()
+    repo = WriteBehindRepository(inner, max_delay=60)
+    items = _items("a", 4)
+    await repo.add_many(items[:2])
+    await repo.add(items[2])
+    await repo.remove_many(["a-0", "a-0", "missing"])
+    await repo.add(items[3])
+    await repo.update(replace(items[1], status="archived"))
+
+    # list_items flushes first.
+    listed = await repo.list_items()
+    assert [(i.id, i.status) for i in listed] == [
+        ("a-1", "archived"),
+        ("a-2", "active"),
+        ("a-3", "active"),
+    ]
+    assert inner.calls == [
+        ("add_many", 3),
+        ("remove_many", 1),
+        ("add_many", 1),
+        ("update_many", 1),
+    ]
+    await repo.aclose()
+
+
+@pytest.mark.asyncio
+async def test_buffered_updates_are_written_in_one_call():
+    inner = RecordingRepository()
+    items = _items("a", 5)
+    await inner.add_many(items)
+    inner.calls.clear()
+    repo = WriteBehindRepository(inner, max_delay=60)
+
+    for item in items:
+        assert await repo.update(replace(item, status="archived")) is True
+    renamed = replace(items[0], name="x", status="archived")
+    missing = _items("b", 1)[0]
+    assert await repo.update_many([renamed, missing]) == [True, False]
+    await repo.flush()
+
+    assert inner.calls == [("update_many", 6)]
+    assert [i.status for i in await inner.list_items()] == ["archived"] * 5
+    assert (await inner.get("a-0")).name == "x"
+    await repo.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remove_many_reports_repeated_id_once():
+    repo = WriteBehindRepository(InMemoryExampleRepository())
+    (item,) = _items("a", 1)
+    await repo.add(item)
+
+    assert await repo.remove_many(["a-0", "a-0"]) == [item, None]
+    assert await repo.remove("a-0") is None
+    await repo.aclose()
+
+
+@pytest.mark.asyncio
+async def test_writers_wait_when_buffer_is_full():
+    inner = RecordingRepository()
+    inner.gate.clear()
+    repo = WriteBehindRepository(inner, max_batch=5, max_pending=10, max_delay=0)
+    await repo.add_many(_items("a", 10))
+
+    blocked = asyncio.ensure_future(repo.add(_items("b", 1)[0]))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert repo.stats().pending == 10
+
+    inner.gate.set()
+    await asyncio.wait_for(blocked, 1)
+    await repo.aclose()
+    assert len(await inner.list_items()) == 11
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_not_lost():
+    inner = RecordingRepository()
+    inner.failing = True
+    repo = WriteBehindRepository(inner, max_delay=0, retry_delay=0.005)
+    await repo.add_many(_items("a", 3))
+    await asyncio.sleep(0.03)
+
+    stats = repo.stats()
+    assert stats.failures >= 2
+    assert stats.pending == 3
+    assert "storage unavailable" in stats.last_error
+    with pytest.raises(ConnectionError):
+        await repo.flush()
+    assert await repo.get("a-2") is not None
+
+    inner.failing = False
+    await repo.aclose()
+    assert [i.id for i in await inner.list_items()] == ["a-0", "a-1", "a-2"]
+    assert repo.stats().pending == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_add_is_rejected_before_it_is_acknowledged(tmp_path):
+    inner = await SQLiteExampleRepository.open(tmp_path / "items.db")
+    stored, buffered, fresh = _items("a", 3)
+    await inner.add(stored)
+    repo = WriteBehindRepository(inner, max_delay=60)
+    await repo.add(buffered)
+
+    with pytest.raises(DuplicateIdError):
+        await repo.add(replace(stored, name="again"))
+    with pytest.raises(DuplicateIdError):
+        await repo.add_many([fresh, buffered])
+    with pytest.raises(DuplicateIdError):
+        await repo.add_many([fresh, fresh])
+
+    assert repo.stats().pending == 1
+    await repo.add(fresh)
+    await repo.aclose()
+    assert [i.id for i in await inner.list_items()] == ["a-0", "a-1", "a-2"]
+    assert (await inner.get("a-0")).name == "a-0"
+    await inner.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adds_share_one_id_lookup():
+    inner = RecordingRepository()
+    repo = WriteBehindRepository(inner, max_delay=60)
+
+    await asyncio.gather(*(repo.add(item) for item in _items("a", 8)))
+
+    assert inner.reads == [8]
+    assert repo.stats().pending == 8
+    await repo.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_write_is_dropped_not_retried(tmp_path):
+    inner = await SQLiteExampleRepository.open(tmp_path / "items.db")
+    repo = WriteBehindRepository(inner, max_delay=60, retry_delay=0.005)
+    clash, before, after = _items("a", 3)
+    await repo.add(before)
+    await repo.add(clash)
+    await repo.add(after)
+    # Stored behind the buffer's back: its buffered add now violates the key.
+    await inner.add(replace(clash, name="direct"))
+
+    await repo.flush()
+
+    stats = repo.stats()
+    assert (stats.pending, stats.written, stats.rejected) == (0, 2, 1)
+    assert "IntegrityError" in stats.last_error
+    assert (await repo.get("a-0")).name == "direct"
+    await repo.add(_items("b", 1)[0])
+    assert [i.id for i in await repo.list_items()] == ["a-0", "a-1", "a-2", "b-0"]
+    await repo.aclose()
+    await inner.close()
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_and_rejects_later_writes():
+    inner = RecordingRepository()
+    repo = WriteBehindRepository(inner, max_delay=60)
+    await repo.add_many(_items("a", 3))
+    await repo.aclose()
+
+    assert len(await inner.list_items()) == 3
+    assert repo._flusher is None
+    with pytest.raises(WriteBehindClosedError):
+        await repo.add(_items("b", 1)[0])
+    # Reads still work.
+    assert await repo.get("a-0") is not None
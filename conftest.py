@@ -0,0 +1,3 @@
+"""Repo-wide pytest setup: the benchmark plugin (see shared/testing)."""
+
+pytest_plugins = ["shared.testing.plugin"]
@@ -6,18 +6,32 @@ Checks project structure and stability against template requirements.
 Provides actionable feedback on missing files, mismatched structure, and compliance issues.
 
 Usage:
-    python scripts/audit_repo_structure.py [--fix] [--verbose]
+    python scripts/audit_repo_structure.py [--fix] [--verbose] [--incremental]
+                                           [--format text|json|ndjson|sarif]
+                                           [--watch [--interval SECONDS]]
 
 Options:
-    --fix       Attempt to create missing files with templates
-    --verbose   Show all checks, not just failures
+    --fix           Attempt to create missing files with templates
+    --verbose       Show all checks, not just failures
+    --incremental   Reuse per-file results cached in .cache/ for unchanged files
+    --format        Report format: text (default), json, ndjson (streamed), sarif
+    --watch         Keep running and re-check only what changed files affect
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
+import io
+import json
 import os
+import re
 import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal
@@ -55,29 +69,55 @@ class AuditResult:
     status: Literal["pass", "warn", "fail"]
     message: str
     fix_hint: str | None = None
+    # Key of the AUDIT_CHECKS entry that produced it.
+    check: str | None = None
 
 
 @dataclass
 class AuditReport:
-    """Complete audit report."""
+    """Complete audit report.
+
+    Counters are kept up to date as results are added. With a sink, every
+    result is passed to it as soon as it is added; with keep_results=False
+    results are only counted and streamed, never stored.
+    """
 
     results: list[AuditResult] = field(default_factory=list)
+    sink: Callable[[AuditResult], None] | None = field(
+        default=None, repr=False, compare=False
+    )
+    keep_results: bool = True
+    counts: dict[str, int] = field(
+        default_factory=lambda: {"pass": 0, "warn": 0, "fail": 0}
+    )
+
+    def add(self, result: AuditResult) -> None:
+        self.counts[result.status] += 1
+        if self.keep_results:
+            self.results.append(result)
+        if self.sink is not None:
+            self.sink(result)
+
+    def discard(self, results: list[AuditResult]) -> None:
+        """Uncount results that are being replaced (see RepoAuditor.run_check)."""
+        for result in results:
+            self.counts[result.status] -= 1
 
     @property
     def passed(self) -> int:
-        return sum(1 for r in self.results if r.status == "pass")
+        return self.counts["pass"]
 
     @property
     def warnings(self) -> int:
-        return sum(1 for r in self.results if r.status == "warn")
+        return self.counts["warn"]
 
     @property
     def failures(self) -> int:
-        return sum(1 for r in self.results if r.status == "fail")
+        return self.counts["fail"]
 
     @property
     def total(self) -> int:
-        return len(self.results)
+        return self.passed + self.warnings + self.failures
 
     @property
     def score(self) -> float:
@@ -85,6 +125,15 @@ class AuditReport:
             return 100.0
         return (self.passed / self.total) * 100
 
+    def summary(self) -> dict:
+        return {
+            "passed": self.passed,
+            "warnings": self.warnings,
+            "failures": self.failures,
+            "total": self.total,
+            "score": round(self.score, 1),
+        }
+
 
 def find_repo_root() -> Path:
     """Find the repository root by looking for AGENTS.md."""
@@ -97,22 +146,629 @@ def find_repo_root() -> Path:
     return Path.cwd()
 
 
+# Directories never descended into when snapshotting the tree.
+SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox", ".cache",
+})
+
+
+class TreeSnapshot:
+    """In-memory listing of a repository: relative POSIX paths of every
+    file and directory, taken with one os.scandir walk.
+
+    Top-level directories (backend, frontend, ml-ai-data, shared, docs, ...)
+    are walked in parallel on a thread pool. Existence checks against a
+    snapshot are set lookups instead of syscalls. Symlinked directories are
+    recorded but not descended into.
+    """
+
+    def __init__(self, root: Path, files: set[str], dirs: set[str],
+                 children: dict[str, list[str]]):
+        self.root = root
+        self.files = files
+        self.dirs = dirs
+        self._children = children
+
+    @classmethod
+    def build(cls, root: Path, descend: Callable[[str], bool] | None = None,
+              max_workers: int | None = None) -> TreeSnapshot:
+        """Walk root, one thread per top-level directory.
+
+        descend(rel_path) decides whether a directory's contents are listed;
+        directories it rejects are still recorded. None lists everything.
+        """
+        root = Path(root)
+        files: set[str] = set()
+        dirs: set[str] = set()
+        children: dict[str, list[str]] = {}
+        top = _scan_dir(str(root), "", files, dirs, children)
+        if descend is not None:
+            top = [rel for rel in top if descend(rel)]
+        workers = max_workers or min(8, len(top) or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(lambda rel: _walk(str(root), rel, descend), top))
+        for part_files, part_dirs, part_children in parts:
+            files |= part_files
+            dirs |= part_dirs
+            children.update(part_children)
+        return cls(root, files, dirs, children)
+
+    @classmethod
+    def build_cached(cls, root: Path, listing: dict[str, list]
+                     ) -> tuple[TreeSnapshot, dict[str, list]]:
+        """Like build(), but re-list only directories whose mtime changed.
+
+        listing maps each directory to [mtime_ns, file names, subdirectory
+        names, names descended into], as returned by an earlier call; the
+        returned listing is the one to pass next time. Unchanged
+        directories cost one stat instead of a scandir.
+        """
+        root = Path(root)
+        files: set[str] = set()
+        dirs: set[str] = set()
+        children: dict[str, list[str]] = {}
+        fresh: dict[str, list] = {}
+        top = _walk_cached(str(root), [""], listing, files, dirs, children, fresh,
+                           split=True)
+        workers = min(8, len(top) or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                lambda rel: _walk_cached_part(str(root), rel, listing), top
+            ))
+        for part_files, part_dirs, part_children, part_fresh in parts:
+            files |= part_files
+            dirs |= part_dirs
+            children.update(part_children)
+            fresh.update(part_fresh)
+        return cls(root, files, dirs, children), fresh
+
+    def exists(self, path: str) -> bool:
+        return path in self.files or path in self.dirs
+
+    def is_file(self, path: str) -> bool:
+        return path in self.files
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.dirs
+
+    def subdirs(self, path: str) -> list[str]:
+        """Names of the directories directly inside path, sorted."""
+        return self._children.get(path, [])
+
+    def listed(self) -> list[str]:
+        """Directories whose contents were listed (not skipped or pruned)."""
+        return list(self._children)
+
+    def rescan(self, rel: str) -> set[str]:
+        """Re-list one directory in place; return the paths added or removed.
+
+        New subdirectories are walked in full; removed ones are dropped with
+        everything under them.
+        """
+        if rel and rel not in self.dirs:
+            return set()
+        root = str(self.root)
+        prefix = f"{rel}/" if rel else ""
+        old_dirs = {prefix + name for name in self._children.get(rel, [])}
+        old_files = {
+            p for p in self.files
+            if p.startswith(prefix) and "/" not in p[len(prefix):]
+        }
+        files: set[str] = set()
+        dirs: set[str] = set()
+        children: dict[str, list[str]] = {}
+        descend = _scan_dir(root, rel, files, dirs, children)
+        if rel not in children:
+            return self._purge(rel) if rel else set()
+
+        changed = (old_files ^ files) | (old_dirs ^ dirs)
+        self.files -= old_files - files
+        self.files |= files
+        for gone in old_dirs - dirs:
+            changed |= self._purge(gone)
+        self.dirs |= dirs
+        self._children[rel] = children[rel]
+        for new in descend:
+            if new not in old_dirs:
+                sub_files, sub_dirs, sub_children = _walk(root, new, None)
+                self.files |= sub_files
+                self.dirs |= sub_dirs
+                self._children.update(sub_children)
+                changed |= sub_files | sub_dirs
+        return changed
+
+    def _purge(self, rel: str) -> set[str]:
+        """Drop a directory and everything under it; return what was dropped."""
+        prefix = f"{rel}/"
+        gone = {p for p in self.files if p.startswith(prefix)}
+        self.files -= gone
+        gone_dirs = {p for p in self.dirs if p == rel or p.startswith(prefix)}
+        self.dirs -= gone_dirs
+        for d in gone_dirs:
+            self._children.pop(d, None)
+        return gone | gone_dirs
+
+
+def _list_dir(path: str) -> tuple[list[str], list[str], list[str]] | None:
+    """(file names, sorted subdirectory names, subdirectories to descend
+    into) of one directory, or None if it cannot be listed."""
+    files = []
+    names = []
+    descend = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    names.append(name)
+                    if name not in SKIP_DIRS and not entry.is_symlink():
+                        descend.append(name)
+                else:
+                    files.append(name)
+    except OSError:
+        return None
+    names.sort()
+    return files, names, descend
+
+
+def _scan_dir(root: str, rel: str, files: set[str], dirs: set[str],
+              children: dict[str, list[str]]) -> list[str]:
+    """Record one directory's entries; return subdirectories to descend into."""
+    prefix = f"{rel}/" if rel else ""
+    descend = []
+    names = []
+    try:
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    dirs.add(prefix + name)
+                    names.append(name)
+                    if name not in SKIP_DIRS and not entry.is_symlink():
+                        descend.append(prefix + name)
+                else:
+                    files.add(prefix + name)
+    except OSError:
+        return []
+    names.sort()
+    children[rel] = names
+    return descend
+
+
+def _walk_cached(root: str, stack: list[str], listing: dict[str, list],
+                 files: set[str], dirs: set[str], children: dict[str, list[str]],
+                 fresh: dict[str, list], split: bool = False) -> list[str]:
+    """Walk from stack, reusing listing entries whose directory mtime is
+    unchanged. With split, only the stack itself is listed and the
+    subdirectories found are returned instead of walked."""
+    below = []
+    while stack:
+        rel = stack.pop()
+        full = os.path.join(root, rel) if rel else root
+        try:
+            # Stat before listing: a change in between is seen next time.
+            mtime = os.stat(full).st_mtime_ns
+        except OSError:
+            continue
+        entry = listing.get(rel)
+        if entry is None or entry[0] != mtime:
+            names = _list_dir(full)
+            if names is None:
+                continue
+            entry = [mtime, *names]
+        fresh[rel] = entry
+        _, file_names, dir_names, descend = entry
+        prefix = f"{rel}/" if rel else ""
+        files.update(prefix + name for name in file_names)
+        dirs.update(prefix + name for name in dir_names)
+        children[rel] = dir_names
+        (below if split else stack).extend(prefix + name for name in descend)
+    return below
+
+
+def _walk_cached_part(root: str, rel: str, listing: dict[str, list]):
+    files: set[str] = set()
+    dirs: set[str] = set()
+    children: dict[str, list[str]] = {}
+    fresh: dict[str, list] = {}
+    _walk_cached(root, [rel], listing, files, dirs, children, fresh)
+    return files, dirs, children, fresh
+
+
+def _walk(root: str, rel: str, descend: Callable[[str], bool] | None
+          ) -> tuple[set[str], set[str], dict[str, list[str]]]:
+    files: set[str] = set()
+    dirs: set[str] = set()
+    children: dict[str, list[str]] = {}
+    stack = [rel]
+    while stack:
+        found = _scan_dir(root, stack.pop(), files, dirs, children)
+        stack.extend(found if descend is None else filter(descend, found))
+    return files, dirs, children
+
+
+def audit_listing(rel: str) -> bool:
+    """Directories whose contents the audit checks inspect.
+
+    Everything down to <domain>/modules/<module>, plus each module's tests/
+    (for tests/unit). Module source trees are never listed.
+    """
+    depth = rel.count("/")
+    if depth < 3:
+        return True
+    parts = rel.split("/")
+    return depth == 3 and parts[1] == "modules" and parts[3] == "tests"
+
+
+# Incremental-mode cache, relative to the repo root.
+CACHE_FILE = Path(".cache") / "audit_repo_structure.json"
+
+# Template placeholders: {{VAR}} (no default) and {{VAR:default}}, found in
+# one pass. Defaults may not span lines, so every match lies within a line.
+TEMPLATE_VAR_PATTERN = re.compile(rb'\{\{([A-Z_][A-Z0-9_]*)(?::([^}\n]+))?\}\}')
+
+# Files scanned for template variables: markdown, YAML and env files.
+TEMPLATE_SUFFIXES = (".md", ".yml", ".yaml", ".env")
+
+# Files that show placeholders rather than use them: the templates under
+# docs/templates are copied and filled in by hand, and READMEs and changelogs
+# explain the {{VAR}} syntax with examples.
+TEMPLATE_EXEMPT_DIRS = ("docs/templates/",)
+TEMPLATE_EXEMPT_FILES = frozenset({"README.md", "CHANGELOG.md"})
+
+# Content checks: key -> (needles, any one of which marks the file;
+# whether to match case-insensitively, needles given in lower case).
+CONTENT_MARKERS = {
+    "python_min": ((b">=3.11",), False),
+    "python_max": ((b"<3.14",), False),
+    "mentions_python": ((b"python",), True),
+    "extraction_gates": ((b"Extraction vs Invention", b"Extract vs Invent"), False),
+    "async_subprocess_lower": ((b"async subprocess",), True),
+    "async_subprocess_exact": ((b"CLI/TUI",), False),
+}
+
+CHUNK_SIZE = 1 << 20
+# Locations kept per variable per file; the count is always exact.
+MAX_LOCATIONS = 20
+
+
+@dataclass(frozen=True)
+class TemplateVarHit:
+    """One {{VAR}} or {{VAR:default}} occurrence (1-based line and column)."""
+
+    name: str
+    default: str | None
+    line: int
+    column: int
+
+
+def is_template_file(name: str) -> bool:
+    """Whether a file (by repo-relative path) is scanned for template variables."""
+    if name.startswith(TEMPLATE_EXEMPT_DIRS):
+        return False
+    base = name.rsplit("/", 1)[-1]
+    if base in TEMPLATE_EXEMPT_FILES:
+        return False
+    return base.endswith(TEMPLATE_SUFFIXES) or base.startswith(".env.")
+
+
+def _line_blocks(fh, chunk_size: int = CHUNK_SIZE, digest=None):
+    """Yield a binary file as blocks of whole lines, chunk_size at a time.
+
+    Memory stays bounded by chunk_size plus the longest line. If digest is
+    given it is updated with every byte read.
+    """
+    pending: list[bytes] = []
+    while True:
+        chunk = fh.read(chunk_size)
+        if digest is not None:
+            digest.update(chunk)
+        if not chunk:
+            if pending:
+                yield b"".join(pending)
+            return
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        yield b"".join(pending)
+        pending = [chunk[cut:]] if cut < len(chunk) else []
+
+
+class _Locator:
+    """Line and column of increasing offsets within a block of whole lines."""
+
+    __slots__ = ("block", "line", "pos", "line_start")
+
+    def __init__(self, block: bytes, line: int):
+        self.block = block
+        self.line = line
+        self.pos = 0
+        self.line_start = 0
+
+    def __call__(self, offset: int) -> tuple[int, int]:
+        newlines = self.block.count(b"\n", self.pos, offset)
+        if newlines:
+            self.line += newlines
+            self.line_start = self.block.rfind(b"\n", self.pos, offset) + 1
+        self.pos = offset
+        text = self.block[self.line_start:offset].decode("utf-8", "replace")
+        return self.line, len(text) + 1
+
+
+def _block_hits(block: bytes, line: int):
+    """Template variable hits in a block of whole lines starting at line."""
+    locate = _Locator(block, line)
+    for match in TEMPLATE_VAR_PATTERN.finditer(block):
+        name, default = match.groups()
+        yield TemplateVarHit(
+            name.decode("ascii"),
+            None if default is None else default.decode("utf-8", "replace"),
+            *locate(match.start()),
+        )
+
+
+def scan_template_vars(path: str | Path, chunk_size: int = CHUNK_SIZE):
+    """Stream the template variable hits in a file, in file order."""
+    line = 1
+    with open(path, "rb") as fh:
+        for block in _line_blocks(fh, chunk_size):
+            yield from _block_hits(block, line)
+            line += block.count(b"\n")
+
+
+def rules_fingerprint() -> str:
+    """Hash of this script's source; editing any audit rule changes it."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def scan_file(path: str | Path, chunk_size: int = CHUNK_SIZE) -> tuple[str, dict]:
+    """SHA-256 and content-check facts for a file, in one streaming pass."""
+    digest = hashlib.sha256()
+    markers = dict(CONTENT_MARKERS)
+    found = set()
+    no_default: dict[bytes, list] = {}
+    defaulted: set[bytes] = set()
+    line = 1
+    with open(path, "rb") as fh:
+        for block in _line_blocks(fh, chunk_size, digest):
+            lowered = None
+            for key, (needles, ignore_case) in list(markers.items()):
+                if ignore_case and lowered is None:
+                    lowered = block.lower()
+                haystack = lowered if ignore_case else block
+                if any(needle in haystack for needle in needles):
+                    found.add(key)
+                    del markers[key]
+            # Count in C, then locate only the first MAX_LOCATIONS per name.
+            pending = 0
+            for (name, default), count in Counter(
+                TEMPLATE_VAR_PATTERN.findall(block)
+            ).items():
+                if default:
+                    defaulted.add(name)
+                    continue
+                var = no_default.setdefault(name, [0, []])
+                var[0] += count
+                pending += min(count, MAX_LOCATIONS - len(var[1]))
+            if pending:
+                locate = _Locator(block, line)
+                for match in TEMPLATE_VAR_PATTERN.finditer(block):
+                    name, default = match.groups()
+                    at = no_default[name][1] if default is None else None
+                    if at is not None and len(at) < MAX_LOCATIONS:
+                        at.append(list(locate(match.start())))
+                        pending -= 1
+                        if not pending:
+                            break
+            line += block.count(b"\n")
+    facts = {
+        "python_constraint": {"python_min", "python_max"} <= found,
+        "mentions_python": "mentions_python" in found,
+        "extraction_gates": "extraction_gates" in found,
+        "async_subprocess": bool(
+            {"async_subprocess_lower", "async_subprocess_exact"} & found
+        ),
+        # Name -> {"count", "at": [[line, column], ...]}, first seen first.
+        "template_vars": {
+            name.decode("ascii"): {"count": count, "at": at}
+            for name, (count, at) in no_default.items()
+        },
+        "default_vars": sorted(name.decode("ascii") for name in defaulted),
+    }
+    return digest.hexdigest(), facts
+
+
+class FileFactsCache:
+    """Per-file check inputs, keyed by (path, mtime, size, content hash).
+
+    A file whose mtime and size are unchanged is not read at all; otherwise
+    it is hashed and scanned in one streaming pass (a hit if only its stamp
+    changed). With a cache
+    path, entries persist between runs and are discarded whenever the
+    rules fingerprint changes. The directory listing persists alongside
+    them (see snapshot()).
+    """
+
+    def __init__(self, root: Path, path: Path | None = None):
+        self.root = root
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = {}
+        # Directory -> [mtime_ns, files, subdirs, descended], for snapshot().
+        self._listing: dict[str, list] = {}
+        self._dirty = False
+        self._rules = rules_fingerprint() if path is not None else ""
+        if path is not None:
+            self._load()
+
+    def facts(self, rel: str) -> dict | None:
+        """Facts for a file (see scan_file), or None if it cannot be read."""
+        full = os.path.join(self.root, rel)
+        try:
+            st = os.stat(full)
+        except OSError:
+            return None
+        entry = self._entries.get(rel)
+        if (entry is not None and entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size):
+            self.hits += 1
+            return entry["facts"]
+        try:
+            digest, facts = scan_file(full)
+        except OSError:
+            return None
+        if entry is not None and entry["sha256"] == digest:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._entries[rel] = {
+            "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "sha256": digest, "facts": facts,
+        }
+        self._dirty = True
+        return facts
+
+    def snapshot(self) -> TreeSnapshot:
+        """Full tree snapshot; with a cache path, only directories whose
+        mtime changed since the cached listing are re-listed."""
+        if self.path is None:
+            return TreeSnapshot.build(self.root)
+        snapshot, listing = TreeSnapshot.build_cached(self.root, self._listing)
+        if listing != self._listing:
+            self._listing = listing
+            self._dirty = True
+        return snapshot
+
+    def save(self) -> None:
+        """Write the cache file atomically (no-op without a cache path)."""
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({
+                "rules": self._rules, "files": self._entries,
+                "dirs": self._listing,
+            }),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("rules") == self._rules:
+            self._entries = data.get("files", {})
+            self._listing = data.get("dirs", {})
+
+
+def _locations(var: str, seen: dict) -> str:
+    """'VAR at 3:5, 9:1' (with '+N more' past MAX_LOCATIONS)."""
+    text = f"{var} at " + ", ".join(f"{line}:{col}" for line, col in seen["at"])
+    extra = seen["count"] - len(seen["at"])
+    return f"{text} (+{extra} more)" if extra else text
+
+
+def _under(*prefixes: str) -> Callable[[str], bool]:
+    """Predicate: path is one of prefixes or lies inside one of them."""
+    def affects(path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in prefixes)
+    return affects
+
+
+# The audit's checks, in report order:
+# (key, RepoAuditor method, args, predicate for paths that can change it).
+AUDIT_CHECKS: list[tuple[str, str, tuple, Callable[[str], bool]]] = [
+    ("root", "audit_root_structure", (),
+     lambda path: "/" not in path or path == ".windsurf/rules"),
+    ("rules", "audit_windsurf_rules", (), _under(".windsurf/rules")),
+    ("docs", "audit_docs_structure", (), _under("docs")),
+    ("backend", "audit_domain_structure", ("backend", "BE"), _under("backend")),
+    ("frontend", "audit_domain_structure", ("frontend", "FE"), _under("frontend")),
+    ("ml-ai-data", "audit_domain_structure", ("ml-ai-data", "ML"),
+     _under("ml-ai-data")),
+    ("shared", "audit_shared_modules", (), _under("shared")),
+    ("python", "audit_python_version", (), _under("pyproject.toml")),
+    ("extraction", "audit_extraction_gates", (),
+     _under(".windsurf/rules/00_synaptix_ops.md")),
+    ("async", "audit_async_subprocess_docs", (), _under("docs/04_TESTING.md")),
+    ("template_vars", "audit_unassigned_variables", (), is_template_file),
+]
+
+# Files whose content (not just existence) some check reads.
+CONTENT_FILES = ("pyproject.toml",)
+
+
+def affected_checks(paths) -> list[str]:
+    """Keys of the checks whose results may depend on any of paths."""
+    return [
+        key for key, _, _, affects in AUDIT_CHECKS
+        if any(affects(path) for path in paths)
+    ]
+
+
 class RepoAuditor:
     """Audits repository structure against template requirements."""
 
-    def __init__(self, root: Path, verbose: bool = False):
+    def __init__(self, root: Path, verbose: bool = False,
+                 snapshot: TreeSnapshot | None = None,
+                 cache_path: Path | None = None,
+                 report: AuditReport | None = None):
         self.root = root
         self.verbose = verbose
-        self.report = AuditReport()
+        self.report = report or AuditReport()
+        self._snapshot = snapshot
+        self.files = FileFactsCache(root, cache_path)
+        self._documents: TreeSnapshot | None = None
+        # Results of each check in AUDIT_CHECKS, by key (if results are kept).
+        self.sections: dict[str, list[AuditResult]] = {}
+        self._check: str | None = None
+        self._section: list[AuditResult] | None = None
+
+    @property
+    def snapshot(self) -> TreeSnapshot:
+        """Tree snapshot all existence checks run against (built on first use).
+
+        With a cache path this is the full, cached listing template_files()
+        uses too, so an incremental run walks the tree at most once.
+        """
+        if self._snapshot is None:
+            if self.files.path is not None:
+                self._snapshot = self._full_snapshot()
+            else:
+                self._snapshot = TreeSnapshot.build(self.root, descend=audit_listing)
+        return self._snapshot
+
+    def _full_snapshot(self) -> TreeSnapshot:
+        if self._documents is None:
+            self._documents = self.files.snapshot()
+        return self._documents
 
     def add_result(self, name: str, status: str, message: str, fix_hint: str | None = None):
         """Add an audit result."""
-        self.report.results.append(AuditResult(name, status, message, fix_hint))
+        result = AuditResult(name, status, message, fix_hint, self._check)
+        if self._section is not None:
+            self._section.append(result)
+        self.report.add(result)
 
     def check_file_exists(self, path: str, required: bool = True, description: str = "") -> bool:
         """Check if a file exists."""
-        full_path = self.root / path
-        exists = full_path.exists()
+        exists = self.snapshot.exists(path)
 
         if exists:
             self.add_result(
@@ -138,8 +794,7 @@ class RepoAuditor:
 
     def check_dir_exists(self, path: str, required: bool = True) -> bool:
         """Check if a directory exists."""
-        full_path = self.root / path
-        exists = full_path.is_dir()
+        exists = self.snapshot.is_dir(path)
 
         if exists:
             self.add_result(f"Dir: {path}", "pass", f"✓ Directory {path} exists")
@@ -239,8 +894,8 @@ class RepoAuditor:
         self.check_file_exists(f"{domain}/AGENTS.md", True, f"Tier-2 {domain} AGENTS")
 
         # Modules directory
-        modules_dir = self.root / domain / "modules"
-        if modules_dir.is_dir():
+        modules_dir = f"{domain}/modules"
+        if self.snapshot.is_dir(modules_dir):
             self.add_result(
                 f"Dir: {domain}/modules",
                 "pass",
@@ -248,9 +903,9 @@ class RepoAuditor:
             )
 
             # Check each module has required files
-            for module_dir in modules_dir.iterdir():
-                if module_dir.is_dir() and not module_dir.name.startswith("."):
-                    self.audit_module(domain, module_dir.name, domain_tag)
+            for module_name in self.snapshot.subdirs(modules_dir):
+                if not module_name.startswith("."):
+                    self.audit_module(domain, module_name, domain_tag)
         else:
             self.add_result(
                 f"Dir: {domain}/modules",
@@ -300,7 +955,7 @@ class RepoAuditor:
 
         for module in expected_shared:
             module_path = f"shared/{module}"
-            if (self.root / module_path).is_dir():
+            if self.snapshot.is_dir(module_path):
                 self.add_result(
                     f"Shared: {module}",
                     "pass",
@@ -323,16 +978,15 @@ class RepoAuditor:
         """Audit Python version configuration."""
         print(f"\n{BOLD}=== Python Version ==={RESET}")
 
-        pyproject = self.root / "pyproject.toml"
-        if pyproject.exists():
-            content = pyproject.read_text(encoding="utf-8")
-            if ">=3.11" in content and "<3.14" in content:
+        if self.snapshot.exists("pyproject.toml"):
+            facts = self.files.facts("pyproject.toml") or {}
+            if facts.get("python_constraint"):
                 self.add_result(
                     "Python version",
                     "pass",
                     "✓ Python version constraint is correct (>=3.11, <3.14)"
                 )
-            elif "python" in content.lower():
+            elif facts.get("mentions_python"):
                 self.add_result(
                     "Python version",
                     "warn",
@@ -351,10 +1005,10 @@ class RepoAuditor:
         """Audit extraction mode gates in ops rules."""
         print(f"\n{BOLD}=== Extraction Gates ==={RESET}")
 
-        ops_file = self.root / ".windsurf/rules/00_synaptix_ops.md"
-        if ops_file.exists():
-            content = ops_file.read_text(encoding="utf-8")
-            if "Extraction vs Invention" in content or "Extract vs Invent" in content:
+        ops_file = ".windsurf/rules/00_synaptix_ops.md"
+        if self.snapshot.exists(ops_file):
+            facts = self.files.facts(ops_file) or {}
+            if facts.get("extraction_gates"):
                 self.add_result(
                     "Extraction gates",
                     "pass",
@@ -378,10 +1032,10 @@ class RepoAuditor:
         """Audit async subprocess documentation."""
         print(f"\n{BOLD}=== Async Subprocess Docs ==={RESET}")
 
-        testing_file = self.root / "docs/04_TESTING.md"
-        if testing_file.exists():
-            content = testing_file.read_text(encoding="utf-8")
-            if "async subprocess" in content.lower() or "CLI/TUI" in content:
+        testing_file = "docs/04_TESTING.md"
+        if self.snapshot.exists(testing_file):
+            facts = self.files.facts(testing_file) or {}
+            if facts.get("async_subprocess"):
                 self.add_result(
                     "Async subprocess",
                     "pass",
@@ -401,76 +1055,47 @@ class RepoAuditor:
                 "✗ Cannot check - testing doc missing"
             )
 
+    def template_files(self) -> list[str]:
+        """Every markdown/YAML/env file in the repo, sorted."""
+        files = self._full_snapshot().files
+        return sorted(f for f in files if is_template_file(f))
+
     def audit_unassigned_variables(self):
-        """Audit for unassigned template variables in key files."""
+        """Audit for unassigned template variables in every md/yaml/env file."""
         print(f"\n{BOLD}=== Template Variables ==={RESET}")
 
-        import re
-
-        # Pattern to match {{VAR}} or {{VAR:default}} - we flag vars without defaults
-        var_pattern = re.compile(r'\{\{([A-Z_][A-Z0-9_]*)\}\}')
-        var_with_default_pattern = re.compile(r'\{\{([A-Z_][A-Z0-9_]*):([^}]+)\}\}')
-
-        # Files to check for unassigned variables
-        files_to_check = [
-            # Role files
-            ".windsurf/rules/role_cto.md",
-            ".windsurf/rules/role_cpo.md",
-            ".windsurf/rules/role_backend_dev.md",
-            ".windsurf/rules/role_frontend_dev.md",
-            ".windsurf/rules/role_ml_dev.md",
-            ".windsurf/rules/role_shared_dev.md",
-            # Doc files
-            "docs/0k_PRD.md",
-            "docs/01_ARCHITECTURE.md",
-            "docs/02_SETUP.md",
-            "docs/03_MODULES.md",
-            "docs/04_TESTING.md",
-            "docs/05_DEPLOYMENT.md",
-        ]
-
         # Required variables that MUST be set (no defaults allowed)
         required_vars = {"PROJECT_NAME"}
 
         total_unassigned = 0
-        required_missing = []
+        required_missing = {}
 
-        for file_path in files_to_check:
-            full_path = self.root / file_path
-            if not full_path.exists():
+        for file_path in self.template_files():
+            facts = self.files.facts(file_path)
+            if facts is None:
                 continue
 
-            try:
-                content = full_path.read_text(encoding="utf-8")
-            except Exception:
-                continue
-
-            # Find variables without defaults
-            vars_no_default = var_pattern.findall(content)
-            # Find variables with defaults
-            vars_with_default = var_with_default_pattern.findall(content)
-
-            # Check for required vars that are still templated
-            for var in vars_no_default:
+            # Variables without defaults, and names that do have a default
+            vars_with_default = set(facts["default_vars"])
+            for var, seen in facts["template_vars"].items():
+                if self.verbose:
+                    for line, column in seen["at"]:
+                        print(f"  {file_path}:{line}:{column}: {{{{{var}}}}}")
+                # Check for required vars that are still templated
                 if var in required_vars:
-                    required_missing.append((file_path, var))
-
-            # Count unassigned (vars without defaults)
-            unassigned = [v for v in vars_no_default if v not in [vd[0] for vd in vars_with_default]]
-            if unassigned:
-                total_unassigned += len(unassigned)
+                    required_missing.setdefault(file_path, []).append(
+                        _locations(var, seen)
+                    )
+                # Count unassigned (vars without defaults)
+                if var not in vars_with_default:
+                    total_unassigned += seen["count"]
 
         if required_missing:
-            # Group by file
-            by_file = {}
-            for file_path, var in required_missing:
-                by_file.setdefault(file_path, []).append(var)
-
-            for file_path, vars in by_file.items():
+            for file_path, vars in required_missing.items():
                 self.add_result(
                     f"Required vars: {file_path}",
                     "fail",
-                    f"✗ Required variables not set: {', '.join(vars)}",
+                    f"✗ Required variables not set: {'; '.join(vars)}",
                     f"Edit {file_path} and replace {{{{VAR}}}} with actual values"
                 )
         else:
@@ -485,7 +1110,7 @@ class RepoAuditor:
                 "Template variables",
                 "warn",
                 f"⚠ {total_unassigned} template variables without defaults found",
-                "Review and set project-specific values in role files"
+                "Set project-specific values; --verbose lists every location"
             )
         else:
             self.add_result(
@@ -501,20 +1126,36 @@ class RepoAuditor:
         print(f"{BOLD}{BLUE}============================================================{RESET}")
         print(f"Repository: {self.root}")
 
-        self.audit_root_structure()
-        self.audit_windsurf_rules()
-        self.audit_docs_structure()
-        self.audit_domain_structure("backend", "BE")
-        self.audit_domain_structure("frontend", "FE")
-        self.audit_domain_structure("ml-ai-data", "ML")
-        self.audit_shared_modules()
-        self.audit_python_version()
-        self.audit_extraction_gates()
-        self.audit_async_subprocess_docs()
-        self.audit_unassigned_variables()
-
+        for key, *_ in AUDIT_CHECKS:
+            self.run_check(key)
+        self.files.save()
         return self.report
 
+    def run_check(self, key: str) -> list[AuditResult]:
+        """Run one check from AUDIT_CHECKS, replacing its previous results.
+
+        The report keeps AUDIT_CHECKS order whichever checks are re-run.
+        """
+        _, method, args, _ = next(c for c in AUDIT_CHECKS if c[0] == key)
+        section: list[AuditResult] = []
+        self._check = key
+        self._section = section if self.report.keep_results else None
+        try:
+            getattr(self, method)(*args)
+        finally:
+            self._check = self._section = None
+        if not self.report.keep_results:
+            return section
+        previous = self.sections.get(key)
+        self.sections[key] = section
+        if previous is not None:
+            # add() appended the new results; restore AUDIT_CHECKS order.
+            self.report.discard(previous)
+            self.report.results = [
+                r for k, *_ in AUDIT_CHECKS for r in self.sections.get(k, ())
+            ]
+        return section
+
     def print_report(self):
         """Print the audit report."""
         report = self.report
@@ -569,6 +1210,241 @@ class RepoAuditor:
         return report.failures == 0
 
 
+def diff_results(old: list[AuditResult], new: list[AuditResult]) -> list[str]:
+    """Human-readable changes between two result lists, matched by name."""
+    before = {r.name: r for r in old}
+    after = {r.name: r for r in new}
+    lines = []
+    for name, r in after.items():
+        prev = before.get(name)
+        if prev is None:
+            lines.append(f"+ [{r.status}] {name}: {r.message}")
+        elif (prev.status, prev.message) != (r.status, r.message):
+            lines.append(f"~ [{prev.status} -> {r.status}] {name}: {r.message}")
+    lines.extend(f"- [{r.status}] {name}" for name, r in before.items()
+                 if name not in after)
+    return lines
+
+
+class AuditWatcher:
+    """Keeps a RepoAuditor and a full TreeSnapshot warm and re-runs only the
+    checks that changed paths can affect.
+
+    Changes are found by polling (stdlib only): the mtime of every
+    directory a check reads catches added, removed and renamed entries;
+    the mtime and size of every content-checked file catch edits. The
+    polled directories are those audit_listing() covers (down to the
+    module roots and their tests/) plus the parents of CONTENT_FILES and of
+    every template file, so source trees no check reads are never stat'ed.
+    A template file created in a directory that holds none yet is picked
+    up once a watched directory changes.
+    """
+
+    def __init__(self, auditor: RepoAuditor, interval: float = 0.5):
+        self.auditor = auditor
+        self.interval = interval
+        self.snapshot = TreeSnapshot.build(auditor.root)
+        # One full snapshot serves both existence checks and the file scan.
+        auditor._snapshot = auditor._documents = self.snapshot
+        # rel path -> (absolute path, last stamp)
+        self._dirs: dict[str, tuple[str, int | None]] = {}
+        self._files: dict[str, tuple[str, tuple[int, int] | None]] = {}
+        files = self._watched_files()
+        self._track(self._watched_dirs(files), files)
+
+    def start(self) -> AuditReport:
+        """Run the full audit (quietly) and return its report."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.auditor.run_full_audit()
+
+    def poll(self) -> set[str]:
+        """Paths added, removed or modified since the last poll."""
+        changed: set[str] = set()
+        for rel, (full, stamp) in list(self._dirs.items()):
+            if _dir_stamp(full) != stamp:
+                changed |= self.snapshot.rescan(rel)
+                self._dirs[rel] = (full, _dir_stamp(full))
+        for rel, (full, stamp) in self._files.items():
+            if _file_stamp(full) != stamp:
+                changed.add(rel)
+        if changed:
+            files = self._watched_files()
+            dirs = self._watched_dirs(files)
+            for rel in set(self._dirs) - set(dirs):
+                del self._dirs[rel]
+            for rel in set(self._files) - set(files):
+                del self._files[rel]
+            self._track(dirs, files, refresh=changed)
+        return changed
+
+    def recheck(self, paths: set[str]) -> tuple[list[str], list[str]]:
+        """Re-run the checks paths affect; return (check keys, result diff)."""
+        keys = affected_checks(paths)
+        old = list(self.auditor.report.results)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for key in keys:
+                self.auditor.run_check(key)
+        return keys, diff_results(old, self.auditor.report.results)
+
+    def watch(self) -> None:
+        """Poll forever, printing what changed after every affected re-run."""
+        report = self.start()
+        print(f"Watching {self.auditor.root} ({len(self._dirs)} dirs, "
+              f"{len(self._files)} files): {report.passed} passed, "
+              f"{report.warnings} warnings, {report.failures} failures")
+        while True:
+            time.sleep(self.interval)
+            started = time.perf_counter()
+            changed = self.poll()
+            if not changed:
+                continue
+            keys, lines = self.recheck(changed)
+            elapsed = (time.perf_counter() - started) * 1e3
+            report = self.auditor.report
+            print(f"\n{BOLD}{len(changed)} path(s) changed; re-ran "
+                  f"{', '.join(keys) or 'nothing'} in {elapsed:.1f} ms{RESET}")
+            for line in lines or ["(no result changes)"]:
+                print(f"  {line}")
+            print(f"  {report.passed} passed, {report.warnings} warnings, "
+                  f"{report.failures} failures")
+
+    def _watched_files(self) -> list[str]:
+        files = self.auditor.template_files()
+        files.extend(f for f in CONTENT_FILES if self.snapshot.is_file(f))
+        return files
+
+    def _watched_dirs(self, files: list[str]) -> list[str]:
+        dirs = {rel for rel in self.snapshot.listed() if audit_listing(rel)}
+        dirs.update(rel.rpartition("/")[0] for rel in files)
+        return sorted(dirs)
+
+    def _track(self, dirs, files, refresh: set[str] = frozenset()) -> None:
+        """Stamp newly watched (or just-changed) directories and files."""
+        root = str(self.auditor.root)
+        for rel in dirs:
+            if rel not in self._dirs or rel in refresh:
+                full = os.path.join(root, rel)
+                self._dirs[rel] = (full, _dir_stamp(full))
+        for rel in files:
+            if rel not in self._files or rel in refresh:
+                full = os.path.join(root, rel)
+                self._files[rel] = (full, _file_stamp(full))
+
+
+def _dir_stamp(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def result_to_dict(result: AuditResult) -> dict:
+    return {
+        "check": result.check,
+        "name": result.name,
+        "status": result.status,
+        "message": result.message,
+        "fix_hint": result.fix_hint,
+    }
+
+
+class NdjsonWriter:
+    """Report sink writing one JSON line per result as it is added."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __call__(self, result: AuditResult) -> None:
+        self.stream.write(json.dumps({"type": "result", **result_to_dict(result)},
+                                     ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def summary(self, report: AuditReport) -> None:
+        self.stream.write(json.dumps({"type": "summary", **report.summary()}) + "\n")
+        self.stream.flush()
+
+
+def report_to_json(report: AuditReport, root: Path) -> dict:
+    return {
+        "root": str(root),
+        "summary": report.summary(),
+        "results": [result_to_dict(r) for r in report.results],
+    }
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"fail": "error", "warn": "warning"}
+# Result names that start with a repo-relative path ("File: docs/x.md").
+_PATH_PREFIXES = ("File: ", "Dir: ", "Required vars: ")
+_POSITION = re.compile(r" at (\d+):(\d+)")
+
+
+def report_to_sarif(report: AuditReport, root: Path) -> dict:
+    """SARIF 2.1.0 log: one rule per AUDIT_CHECKS entry, warn/fail results."""
+    rules = [
+        {"id": key, "name": method,
+         "shortDescription": {"text": getattr(RepoAuditor, method).__doc__}}
+        for key, method, _, _ in AUDIT_CHECKS
+    ]
+    results = []
+    for r in report.results:
+        if r.status not in SARIF_LEVELS:
+            continue
+        entry = {
+            "ruleId": r.check,
+            "level": SARIF_LEVELS[r.status],
+            "message": {"text": f"{r.name}: {r.message}"
+                        + (f" (fix: {r.fix_hint})" if r.fix_hint else "")},
+        }
+        prefix = next((p for p in _PATH_PREFIXES if r.name.startswith(p)), None)
+        if prefix is not None:
+            location = {"artifactLocation": {"uri": r.name[len(prefix):],
+                                             "uriBaseId": "REPO_ROOT"}}
+            position = _POSITION.search(r.message)
+            if position:
+                location["region"] = {"startLine": int(position[1]),
+                                      "startColumn": int(position[2])}
+            entry["locations"] = [{"physicalLocation": location}]
+        results.append(entry)
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "audit_repo_structure", "rules": rules}},
+            "originalUriBaseIds": {"REPO_ROOT": {"uri": root.resolve().as_uri() + "/"}},
+            "results": results,
+        }],
+    }
+
+
+def _run_machine_readable(root: Path, fmt: str, cache_path: Path | None) -> int:
+    """Audit with the human-readable progress suppressed; return exit code."""
+    out = sys.stdout
+    if fmt == "ndjson":
+        writer = NdjsonWriter(out)
+        report = AuditReport(sink=writer, keep_results=False)
+    else:
+        report = AuditReport()
+    auditor = RepoAuditor(root, cache_path=cache_path, report=report)
+    with contextlib.redirect_stdout(io.StringIO()):
+        auditor.run_full_audit()
+    if fmt == "ndjson":
+        writer.summary(report)
+    else:
+        to_dict = report_to_sarif if fmt == "sarif" else report_to_json
+        json.dump(to_dict(report, root), out, indent=2, ensure_ascii=False)
+        out.write("\n")
+    return 0 if report.failures == 0 else 1
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Audit repository structure against template requirements"
@@ -583,6 +1459,28 @@ def main():
         action="store_true",
         help="Show all checks, not just failures"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Cache per-file results in {CACHE_FILE} and skip unchanged files"
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "ndjson", "sarif"),
+        default="text",
+        help="Report format on stdout; ndjson streams results as checks run"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running; re-check affected areas whenever files change"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds for --watch (default: 0.5)"
+    )
     parser.add_argument(
         "--root",
         type=Path,
@@ -591,10 +1489,22 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.watch and args.format != "text":
+        parser.error(f"--watch reports in text only, not --format {args.format}")
 
     root = args.root or find_repo_root()
 
-    auditor = RepoAuditor(root, verbose=args.verbose)
+    cache_path = root / CACHE_FILE if args.incremental else None
+    if args.format != "text":
+        sys.exit(_run_machine_readable(root, args.format, cache_path))
+
+    auditor = RepoAuditor(root, verbose=args.verbose, cache_path=cache_path)
+    if args.watch:
+        try:
+            AuditWatcher(auditor, interval=args.interval).watch()
+        except KeyboardInterrupt:
+            auditor.files.save()
+            sys.exit(0)
     auditor.run_full_audit()
     success = auditor.print_report()
 
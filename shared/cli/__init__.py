@@ -1 +1,13 @@
-"""Shared package placeholder."""
+"""CLI plugin registry for all modules."""
+
+from .commands import CLIPlugin, CommandSpec, register_command
+from .registry import PluginEntry, PluginLoadError, PluginRegistry
+
+__all__ = [
+    "CLIPlugin",
+    "CommandSpec",
+    "PluginEntry",
+    "PluginLoadError",
+    "PluginRegistry",
+    "register_command",
+]
@@ -0,0 +1,7 @@
+"""Allow ``python -m shared.cli``."""
+
+import sys
+
+from .main import main
+
+sys.exit(main())
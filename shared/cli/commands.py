@@ -0,0 +1,80 @@
+"""
+Command declarations for module CLI plugins.
+
+Kept import-light on purpose: every plugin module imports this, and plugin
+modules are only imported when one of their commands actually runs.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class CommandSpec:
+    """One command exposed by a plugin method."""
+
+    __slots__ = ("name", "description", "params", "attr")
+
+    def __init__(
+        self, name: str, description: str, params: list[dict[str, Any]], attr: str
+    ):
+        self.name = name
+        self.description = description
+        self.params = params
+        self.attr = attr
+
+    def __repr__(self) -> str:
+        return f"CommandSpec(name={self.name!r}, attr={self.attr!r})"
+
+
+def register_command(
+    name: str,
+    description: str = "",
+    params: list[dict[str, Any]] | None = None,
+):
+    """
+    Mark a plugin method as a CLI command.
+
+    Args:
+        name: Command name within the plugin's namespace.
+        description: One-line help text; defaults to the docstring.
+        params: Parameter specs, e.g.
+            ``{"name": "status", "type": "choice", "choices": [...]}``.
+            Types: string (default), int, float, bool, choice.
+
+    Example:
+        >>> class ExamplePlugin(CLIPlugin):
+        ...     namespace = "example"
+        ...
+        ...     @register_command(name="list", description="List examples")
+        ...     async def list_cmd(self, status: str = "active") -> dict: ...
+    """
+
+    def decorate(fn):
+        fn.__cli_command__ = CommandSpec(
+            name,
+            description or (fn.__doc__ or "").strip().split("\n")[0],
+            list(params or ()),
+            fn.__name__,
+        )
+        return fn
+
+    return decorate
+
+
+class CLIPlugin:
+    """Base class for module plugins; subclasses set namespace."""
+
+    namespace = ""
+    version = "0.0.0"
+    description = ""
+
+    @classmethod
+    def commands(cls) -> dict[str, CommandSpec]:
+        """Commands declared with @register_command, by name."""
+        found = {}
+        for attr in dir(cls):
+            spec = getattr(getattr(cls, attr, None), "__cli_command__", None)
+            if isinstance(spec, CommandSpec):
+                found[spec.name] = spec
+        return found
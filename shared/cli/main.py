@@ -0,0 +1,179 @@
+"""
+CLI entry point: ``python -m shared.cli <namespace> <command> [--param value]``.
+
+``--metrics`` before the namespace enables shared.instrumentation for the
+run and prints its snapshot as JSON to stderr afterwards.
+
+``--help`` output comes from the manifest alone; only the plugin that owns
+the invoked command is imported. argparse and asyncio are imported only
+when a command actually runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+
+from shared.exceptions import NotFoundError
+
+from .registry import PluginLoadError, PluginRegistry
+
+if TYPE_CHECKING:
+    from .commands import CommandSpec
+
+MANIFEST_ENV = "APP_CLI_MANIFEST"
+DEFAULT_MANIFEST = os.path.join(".cache", "cli_manifest.json")
+MODULES_DIR = os.path.join("backend", "modules")
+_HELP = ("-h", "--help")
+
+
+def default_registry(root: str | None = None) -> PluginRegistry:
+    """Registry from $APP_CLI_MANIFEST or ``.cache/cli_manifest.json``.
+
+    The manifest is built (without importing plugins) if it is missing or
+    older than any ``backend/modules/*/src/cli.py``.
+    """
+    root = os.path.abspath(root or os.getcwd())
+    path = os.environ.get(MANIFEST_ENV) or os.path.join(root, DEFAULT_MANIFEST)
+    modules_dir = os.path.join(root, MODULES_DIR)
+    if _manifest_is_stale(path, modules_dir):
+        from .manifest import build_manifest
+
+        build_manifest(
+            modules_dir,
+            path,
+            search_paths=[os.path.join(root, "backend")],
+        )
+    return PluginRegistry.from_manifest(path)
+
+
+def _manifest_is_stale(path: str, modules_dir: str) -> bool:
+    """Whether the manifest is missing or older than a plugin source.
+
+    The modules directory's own mtime counts too, so adding or removing a
+    module also triggers a rebuild. Only stats files; nothing is parsed.
+    """
+    try:
+        built = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return True
+    try:
+        if os.stat(modules_dir).st_mtime_ns > built:
+            return True
+        modules = os.scandir(modules_dir)
+    except FileNotFoundError:
+        return False
+    with modules:
+        for module in modules:
+            try:
+                source = os.stat(os.path.join(module.path, "src", "cli.py"))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            if source.st_mtime_ns > built:
+                return True
+    return False
+
+
+def main(argv: list[str] | None = None, registry: PluginRegistry | None = None) -> int:
+    args = sys.argv[1:] if argv is None else list(argv)
+    if args[:1] == ["--build-manifest"]:
+        return _build_manifest()
+    if args[:1] == ["--metrics"]:
+        return _with_metrics(args[1:], registry)
+    registry = registry or default_registry()
+    if not args or args[0] in _HELP:
+        _print_overview(registry, registry.namespaces())
+        return 0
+    namespace, rest = args[0], args[1:]
+    try:
+        if not rest or rest[0] in _HELP:
+            registry.entry(namespace)
+            _print_overview(registry, [namespace])
+            return 0
+        plugin, spec = registry.command(namespace, rest[0])
+    except NotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except PluginLoadError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    kwargs = _parse_params(namespace, spec, rest[1:])
+    result = getattr(plugin, spec.attr)(**kwargs)
+    if hasattr(result, "__await__"):
+        import asyncio
+
+        result = asyncio.run(_await(result))
+    if result is not None:
+        print(json.dumps(result, indent=2, default=str))
+    return 0
+
+
+def _print_overview(registry: PluginRegistry, namespaces: list[str]) -> None:
+    out = ["usage: cli [--metrics] <namespace> <command> [--param value ...]", ""]
+    for namespace in namespaces:
+        entry = registry.entry(namespace)
+        out.append(f"  {namespace:<14} {entry.description}")
+        if entry.commands is None:
+            out.append(f"    (run `cli {namespace} <command> --help`)")
+            continue
+        for name, description in sorted(entry.commands.items()):
+            out.append(f"    {name:<12} {description}")
+    print("\n".join(out))
+
+
+def _parse_params(namespace: str, spec: CommandSpec, argv: list[str]) -> dict[str, Any]:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=f"cli {namespace} {spec.name}", description=spec.description
+    )
+    for param in spec.params:
+        kind = param.get("type", "string")
+        options: dict[str, Any] = {"dest": param["name"], "help": param.get("help")}
+        if kind == "bool":
+            options["action"] = "store_true"
+        else:
+            options["type"] = {"int": int, "float": float}.get(kind, str)
+            if kind == "choice":
+                options["choices"] = param["choices"]
+            options["required"] = bool(param.get("required"))
+        if "default" in param:
+            options["default"] = param["default"]
+        parser.add_argument(f"--{param['name'].replace('_', '-')}", **options)
+    parsed = vars(parser.parse_args(argv))
+    # Leave unset optional params to the method's own defaults.
+    return {k: v for k, v in parsed.items() if v is not None}
+
+
+def _with_metrics(argv: list[str], registry: PluginRegistry | None) -> int:
+    from shared import instrumentation
+
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.enable()
+    try:
+        return main(argv, registry)
+    finally:
+        if not was_enabled:
+            instrumentation.disable()
+        snapshot = instrumentation.REGISTRY.to_dict()
+        print(json.dumps({"metrics": snapshot}, indent=2), file=sys.stderr)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _build_manifest() -> int:
+    from .manifest import build_manifest
+
+    root = os.getcwd()
+    path = os.environ.get(MANIFEST_ENV) or os.path.join(root, DEFAULT_MANIFEST)
+    manifest = build_manifest(
+        os.path.join(root, MODULES_DIR),
+        path,
+        search_paths=[os.path.join(root, "backend")],
+    )
+    print(f"wrote {len(manifest['plugins'])} plugin(s) to {path}")
+    return 0
@@ -0,0 +1,124 @@
+"""
+CLI manifest builder.
+
+Reads each ``<modules_dir>/*/src/cli.py`` with ast, so building the
+manifest never imports (or runs) plugin code.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from .registry import MANIFEST_VERSION, PluginEntry
+
+
+def scan_modules(
+    modules_dir: str | Path, package: str = "modules"
+) -> list[PluginEntry]:
+    """Describe every ``<modules_dir>/*/src/cli.py`` plugin without importing it."""
+    entries = []
+    for module_dir in sorted(Path(modules_dir).iterdir()):
+        source = module_dir / "src" / "cli.py"
+        if not source.is_file():
+            continue
+        entry = _entry_from_source(
+            source.read_text(encoding="utf-8"), f"{package}.{module_dir.name}.src.cli"
+        )
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def build_manifest(
+    modules_dir: str | Path,
+    out_path: str | Path,
+    package: str = "modules",
+    search_paths: list[str | Path] | tuple = (),
+) -> dict[str, Any]:
+    """Scan modules_dir and write the manifest JSON to out_path."""
+    plugins = {}
+    for entry in scan_modules(modules_dir, package):
+        if entry.namespace in plugins:
+            raise ValueError(f"duplicate CLI namespace: {entry.namespace!r}")
+        plugins[entry.namespace] = entry.to_dict()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "search_paths": [os.fspath(p) for p in search_paths],
+        "plugins": plugins,
+    }
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    out.write_text(text, encoding="utf-8")
+    return manifest
+
+
+def _entry_from_source(source: str, module: str) -> PluginEntry | None:
+    tree = ast.parse(source)
+    has_factory = any(
+        isinstance(node, ast.FunctionDef) and node.name == "get_plugin"
+        for node in tree.body
+    )
+    if not has_factory:
+        return None
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        attrs = _class_constants(node)
+        if "namespace" in attrs:
+            return PluginEntry(
+                namespace=attrs["namespace"],
+                module=module,
+                description=attrs.get("description", ""),
+                version=attrs.get("version", ""),
+                commands=_declared_commands(node),
+            )
+    return None
+
+
+def _class_constants(node: ast.ClassDef) -> dict[str, str]:
+    found = {}
+    for stmt in node.body:
+        if (
+            isinstance(stmt, ast.Assign)
+            and len(stmt.targets) == 1
+            and isinstance(stmt.targets[0], ast.Name)
+            and isinstance(stmt.value, ast.Constant)
+            and isinstance(stmt.value.value, str)
+        ):
+            found[stmt.targets[0].id] = stmt.value.value
+    return found
+
+
+def _declared_commands(node: ast.ClassDef) -> dict[str, str]:
+    commands = {}
+    for stmt in node.body:
+        if not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for deco in stmt.decorator_list:
+            if not isinstance(deco, ast.Call):
+                continue
+            if _called_name(deco) != "register_command":
+                continue
+            kwargs = {
+                kw.arg: kw.value.value
+                for kw in deco.keywords
+                if isinstance(kw.value, ast.Constant)
+            }
+            if deco.args and isinstance(deco.args[0], ast.Constant):
+                kwargs.setdefault("name", deco.args[0].value)
+            if "name" in kwargs:
+                doc = (ast.get_docstring(stmt) or "").split("\n")[0]
+                commands[kwargs["name"]] = kwargs.get("description") or doc
+    return commands
+
+
+def _called_name(call: ast.Call) -> str:
+    func = call.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return func.id if isinstance(func, ast.Name) else ""
@@ -0,0 +1,151 @@
+"""
+Lazy plugin registry.
+
+Plugins are described by a manifest (namespace → module, factory and
+command summaries) or by entry points, so listing namespaces and commands
+never imports plugin code. A plugin module is imported the first time one
+of its commands is looked up.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+
+from shared.exceptions import AppError, NotFoundError
+
+from .commands import CLIPlugin, CommandSpec
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MANIFEST_VERSION = 1
+ENTRY_POINT_GROUP = "app.cli_plugins"
+
+
+class PluginLoadError(AppError):
+    """A plugin module could not be imported or did not yield a plugin."""
+
+
+class PluginEntry:
+    """What the registry knows about a plugin before importing it."""
+
+    __slots__ = ("namespace", "module", "factory", "description", "version", "commands")
+
+    def __init__(
+        self,
+        namespace: str,
+        module: str,
+        factory: str = "get_plugin",
+        description: str = "",
+        version: str = "",
+        commands: dict[str, str] | None = None,
+    ):
+        self.namespace = namespace
+        self.module = module
+        self.factory = factory
+        self.description = description
+        self.version = version
+        # Command name → one-line description; None when unknown until load
+        # (entry-point plugins).
+        self.commands = commands
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "module": self.module,
+            "factory": self.factory,
+            "description": self.description,
+            "version": self.version,
+            "commands": self.commands,
+        }
+
+
+class PluginRegistry:
+    """Namespace → plugin, importing each plugin on first use.
+
+    Args:
+        search_paths: Directories added to sys.path before importing a
+            plugin (e.g. ``backend`` so ``modules.x.src.cli`` resolves).
+    """
+
+    def __init__(self, search_paths: list[str | Path] | tuple = ()):
+        self._entries: dict[str, PluginEntry] = {}
+        self._plugins: dict[str, CLIPlugin] = {}
+        self._search_paths = [os.fspath(p) for p in search_paths]
+
+    @classmethod
+    def from_manifest(
+        cls, path: str | Path, search_paths: list[str | Path] | tuple = ()
+    ) -> PluginRegistry:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != MANIFEST_VERSION:
+            raise PluginLoadError(f"unsupported CLI manifest version in {path}")
+        registry = cls(search_paths or data.get("search_paths", ()))
+        for namespace, raw in data["plugins"].items():
+            registry.add(PluginEntry(namespace, **raw))
+        return registry
+
+    def add(self, entry: PluginEntry) -> None:
+        if entry.namespace in self._entries:
+            raise ValueError(f"duplicate CLI namespace: {entry.namespace!r}")
+        self._entries[entry.namespace] = entry
+
+    def add_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Register installed ``name = module:factory`` entry points."""
+        from importlib.metadata import entry_points
+
+        for ep in entry_points(group=group):
+            if ep.name not in self._entries:
+                module, _, factory = ep.value.partition(":")
+                self.add(PluginEntry(ep.name, module, factory or "get_plugin"))
+
+    def namespaces(self) -> list[str]:
+        return sorted(self._entries)
+
+    def entry(self, namespace: str) -> PluginEntry:
+        try:
+            return self._entries[namespace]
+        except KeyError:
+            raise NotFoundError("CLI namespace", namespace) from None
+
+    def is_loaded(self, namespace: str) -> bool:
+        return namespace in self._plugins
+
+    def load(self, namespace: str) -> CLIPlugin:
+        """Import the namespace's plugin module (once) and build the plugin."""
+        plugin = self._plugins.get(namespace)
+        if plugin is not None:
+            return plugin
+        entry = self.entry(namespace)
+        for path in self._search_paths:
+            if path not in sys.path:
+                sys.path.insert(0, path)
+        try:
+            # __import__ (unlike importlib.import_module) goes through the
+            # C import path, so the plugin shows up in -X importtime.
+            __import__(entry.module)
+            plugin = getattr(sys.modules[entry.module], entry.factory)()
+        except (ImportError, AttributeError) as exc:
+            raise PluginLoadError(
+                f"cannot load CLI plugin {namespace!r} from {entry.module}: {exc}"
+            ) from exc
+        self._plugins[namespace] = plugin
+        return plugin
+
+    def command(self, namespace: str, name: str) -> tuple[CLIPlugin, CommandSpec]:
+        plugin = self.load(namespace)
+        spec = type(plugin).commands().get(name)
+        if spec is None:
+            raise NotFoundError(f"{namespace} command", name)
+        return plugin, spec
+
+    async def invoke(self, namespace: str, name: str, **kwargs: Any) -> Any:
+        """Run a command, importing its plugin if needed."""
+        plugin, spec = self.command(namespace, name)
+        result = getattr(plugin, spec.attr)(**kwargs)
+        if hasattr(result, "__await__"):
+            result = await result
+        return result
@@ -0,0 +1,75 @@
+"""Fixtures: synthetic module trees with CLI plugins."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PLUGIN_TEMPLATE = '''"""CLI plugin for {module}."""
+
+from shared.cli import CLIPlugin, register_command
+
+LOADED = True
+
+
+class Plugin(CLIPlugin):
+    namespace = "{namespace}"
+    version = "1.0.0"
+    description = "{namespace} commands"
+
+    @register_command(name="ping", description="Reply with pong")
+    def ping(self) -> dict:
+        return {{"pong": "{namespace}"}}
+
+    @register_command(
+        name="add",
+        params=[
+            {{"name": "a", "type": "int", "required": True}},
+            {{"name": "b", "type": "int", "default": 1}},
+        ],
+    )
+    async def add(self, a: int, b: int = 1) -> dict:
+        """Add two numbers."""
+        return {{"sum": a + b}}
+
+
+def get_plugin():
+    return Plugin()
+'''
+
+
+def write_modules(root: Path, count: int, package: str) -> Path:
+    """Create root/backend/<package>/mod_N/src/cli.py for N in range(count)."""
+    modules = root / "backend" / package
+    for n in range(count):
+        src = modules / f"mod_{n:04d}" / "src"
+        src.mkdir(parents=True)
+        (src / "__init__.py").write_text("")
+        (src.parent / "__init__.py").write_text("")
+        (src / "cli.py").write_text(
+            PLUGIN_TEMPLATE.format(module=f"mod_{n:04d}", namespace=f"ns{n}")
+        )
+    (modules / "__init__.py").write_text("")
+    return modules
+
+
+@pytest.fixture
+def module_tree(tmp_path, request):
+    """Factory: module_tree(count) -> (modules_dir, package name).
+
+    Each test gets its own top-level package name so imports never leak
+    between tests. Trees built with another package or root (to mirror
+    backend/modules, or one tree per benchmark size) are not unloaded
+    afterwards: only read their manifests, never import them.
+    """
+    package = f"cli_fixture_{request.node.name.replace('[', '_').replace(']', '')}"
+
+    def build(count: int = 3, package: str = package, root: Path = tmp_path):
+        return write_modules(root, count, package), package
+
+    yield build
+    for name in [m for m in sys.modules if m.split(".")[0] == package]:
+        del sys.modules[name]
+    backend = str(tmp_path / "backend")
+    if backend in sys.path:
+        sys.path.remove(backend)
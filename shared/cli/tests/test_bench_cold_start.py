@@ -0,0 +1,73 @@
+"""
+Benchmark: CLI cold start vs number of modules, via ``python -X importtime``.
+
+Run with: pytest shared/cli/tests -m slow -s
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from shared.cli.manifest import build_manifest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+SIZES = (10, 300)
+RUNS = 5
+
+
+def _import_profile(args: list[str], manifest: Path) -> tuple[float, list[str]]:
+    """Total top-level import time (ms) and plugin modules imported."""
+    env = dict(os.environ, APP_CLI_MANIFEST=str(manifest), PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-m", "shared.cli", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    total_us, plugins = 0, []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # top-level imports only
+            total_us += int(cumulative)
+        if name.strip().endswith(".src.cli"):
+            plugins.append(name.strip())
+    return total_us / 1000, plugins
+
+
+@pytest.mark.slow
+def test_bench_cold_start_flat_in_module_count(module_tree, tmp_path):
+    """--help imports no plugins; a command imports exactly one."""
+    results = {}
+    for size in SIZES:
+        modules, package = module_tree(
+            size, package=f"bench_cli_{size}", root=tmp_path / str(size)
+        )
+        manifest = tmp_path / f"manifest_{size}.json"
+        build_manifest(
+            modules, manifest, package=package, search_paths=[modules.parent]
+        )
+
+        help_ms = min(_import_profile(["--help"], manifest)[0] for _ in range(RUNS))
+        cmd_ms = min(_import_profile(["ns0", "ping"], manifest)[0] for _ in range(RUNS))
+        _, help_plugins = _import_profile(["--help"], manifest)
+        _, cmd_plugins = _import_profile(["ns0", "ping"], manifest)
+        assert help_plugins == []
+        assert cmd_plugins == [f"{package}.mod_0000.src.cli"]
+        results[size] = help_ms, cmd_ms
+
+    print("\nimport time (python -X importtime, best of 5):")
+    for size, (help_ms, cmd_ms) in results.items():
+        print(
+            f"  {size:>4} modules: --help {help_ms:6.1f} ms   ns0 ping {cmd_ms:6.1f} ms"
+        )
+
+    small, large = results[SIZES[0]], results[SIZES[-1]]
+    # 30x more modules: import cost must not grow with the module count.
+    assert large[0] < small[0] * 1.5 + 5
+    assert large[1] < small[1] * 1.5 + 5
@@ -0,0 +1,169 @@
+"""Unit tests for shared.cli plugin registry."""
+
+import os
+import sys
+
+import pytest
+
+from shared.cli import (
+    CLIPlugin,
+    PluginEntry,
+    PluginLoadError,
+    PluginRegistry,
+    register_command,
+)
+from shared.cli.main import MANIFEST_ENV, default_registry, main
+from shared.cli.manifest import build_manifest, scan_modules
+from shared.exceptions import NotFoundError
+
+
+def _registry(modules, package, tmp_path):
+    path = tmp_path / "manifest.json"
+    build_manifest(modules, path, package=package, search_paths=[modules.parent])
+    return PluginRegistry.from_manifest(path)
+
+
+def _imported(package):
+    return sorted(
+        m for m in sys.modules if m.startswith(package) and m.endswith(".cli")
+    )
+
+
+def test_register_command_attaches_spec():
+    class Plugin(CLIPlugin):
+        namespace = "demo"
+
+        @register_command(name="go")
+        def go(self):
+            """Go somewhere."""
+
+    (spec,) = Plugin.commands().values()
+    assert (spec.name, spec.attr, spec.description) == ("go", "go", "Go somewhere.")
+
+
+def test_scan_reads_plugins_without_importing(module_tree):
+    modules, package = module_tree(3)
+
+    entries = scan_modules(modules, package=package)
+
+    assert [e.namespace for e in entries] == ["ns0", "ns1", "ns2"]
+    assert entries[0].module == f"{package}.mod_0000.src.cli"
+    assert entries[0].commands == {"add": "Add two numbers.", "ping": "Reply with pong"}
+    assert _imported(package) == []
+
+
+def test_scan_skips_modules_without_plugin(module_tree):
+    modules, package = module_tree(1)
+    (modules / "mod_0000" / "src" / "cli.py").write_text("# no plugin yet\n")
+    assert scan_modules(modules, package=package) == []
+
+
+def test_listing_does_not_import_plugins(module_tree, tmp_path):
+    modules, package = module_tree(5)
+    registry = _registry(modules, package, tmp_path)
+
+    assert registry.namespaces() == ["ns0", "ns1", "ns2", "ns3", "ns4"]
+    assert registry.entry("ns3").commands["ping"] == "Reply with pong"
+    assert _imported(package) == []
+
+
+@pytest.mark.asyncio
+async def test_invoke_imports_only_that_namespace(module_tree, tmp_path):
+    modules, package = module_tree(5)
+    registry = _registry(modules, package, tmp_path)
+
+    assert await registry.invoke("ns2", "ping") == {"pong": "ns2"}
+    assert await registry.invoke("ns2", "add", a=2, b=3) == {"sum": 5}
+
+    assert _imported(package) == [f"{package}.mod_0002.src.cli"]
+    assert registry.is_loaded("ns2") and not registry.is_loaded("ns0")
+
+
+def test_unknown_namespace_and_command(module_tree, tmp_path):
+    modules, package = module_tree(1)
+    registry = _registry(modules, package, tmp_path)
+
+    with pytest.raises(NotFoundError):
+        registry.entry("missing")
+    with pytest.raises(NotFoundError):
+        registry.command("ns0", "missing")
+
+
+def test_broken_plugin_raises_load_error():
+    registry = PluginRegistry()
+    registry.add(PluginEntry("broken", "no_such_module_for_cli_tests"))
+    with pytest.raises(PluginLoadError):
+        registry.load("broken")
+
+
+def test_duplicate_namespace_rejected():
+    registry = PluginRegistry()
+    registry.add(PluginEntry("dup", "a"))
+    with pytest.raises(ValueError):
+        registry.add(PluginEntry("dup", "b"))
+
+
+def test_entry_points_are_registered_lazily(monkeypatch):
+    class EntryPoint:
+        name = "ep"
+        value = "some.module:make_plugin"
+
+    monkeypatch.setattr("importlib.metadata.entry_points", lambda group: [EntryPoint()])
+    registry = PluginRegistry()
+    registry.add_entry_points()
+
+    entry = registry.entry("ep")
+    assert (entry.module, entry.factory, entry.commands) == (
+        "some.module",
+        "make_plugin",
+        None,
+    )
+    assert not registry.is_loaded("ep")
+
+
+def test_main_help_and_command(module_tree, tmp_path, capsys):
+    modules, package = module_tree(2)
+    registry = _registry(modules, package, tmp_path)
+
+    assert main(["--help"], registry) == 0
+    assert "ns1" in capsys.readouterr().out
+    assert _imported(package) == []
+
+    assert main(["ns1", "add", "--a", "4"], registry) == 0
+    assert '"sum": 5' in capsys.readouterr().out
+    assert main(["ns1", "nope"], registry) == 2
+
+
+def test_main_metrics_dumps_snapshot(module_tree, tmp_path, capsys):
+    from shared.instrumentation import REGISTRY, instrument, is_enabled
+
+    modules, package = module_tree(1)
+    registry = _registry(modules, package, tmp_path)
+    plugin = registry.load("ns0")
+    plugin.ping = instrument("test.cli.ping")(plugin.ping)
+
+    assert main(["--metrics", "ns0", "ping"], registry) == 0
+
+    out, err = capsys.readouterr()
+    assert '"pong"' in out
+    assert '"test.cli.ping"' in err and '"calls": 1' in err
+    assert not is_enabled()
+    REGISTRY.metric("test.cli.ping").reset()
+
+
+def test_default_registry_rebuilds_stale_manifest(module_tree, tmp_path, monkeypatch):
+    monkeypatch.delenv(MANIFEST_ENV, raising=False)
+    modules, _ = module_tree(2, package="modules")
+    manifest = tmp_path / ".cache" / "cli_manifest.json"
+    assert default_registry(str(tmp_path)).namespaces() == ["ns0", "ns1"]
+    built = manifest.stat().st_mtime_ns
+
+    assert default_registry(str(tmp_path)).namespaces() == ["ns0", "ns1"]
+    assert manifest.stat().st_mtime_ns == built
+
+    source = modules / "mod_0001" / "src" / "cli.py"
+    source.write_text(source.read_text().replace('= "ns1"', '= "renamed"'))
+    later = built + 1_000_000_000
+    os.utime(source, ns=(later, later))
+
+    assert default_registry(str(tmp_path)).namespaces() == ["ns0", "renamed"]
@@ -1 +1,17 @@
-"""Shared package placeholder."""
+"""Configuration utilities for all modules."""
+
+from .settings import (
+    ConfigurationError,
+    Settings,
+    SettingsCache,
+    clear_settings_cache,
+    get_settings,
+)
+
+__all__ = [
+    "ConfigurationError",
+    "Settings",
+    "SettingsCache",
+    "clear_settings_cache",
+    "get_settings",
+]
@@ -0,0 +1,207 @@
+"""
+Application settings.
+
+Settings are parsed from the process environment and the env files for the
+active tier (``.env`` < ``.env.{APP_ENV}`` < ``.env.local``), once per
+process. get_settings() returns the memoized instance and only re-parses
+when one of those files changes on disk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError, field_validator
+from pydantic_core import PydanticUseDefault
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from shared.exceptions import AppError
+
+DEFAULT_ENV = "development"
+# Minimum seconds between env file stat() checks on the get_settings() path.
+CHECK_INTERVAL = 1.0
+
+
+class ConfigurationError(AppError):
+    """Settings could not be loaded from the environment."""
+
+
+class Settings(BaseSettings):
+    """Typed view of the variables documented in ``.env.example``."""
+
+    model_config = SettingsConfigDict(
+        env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
+    )
+
+    app_name: str = "app"
+    app_version: str = "0.1.0"
+    app_env: str = DEFAULT_ENV
+    debug: bool = False
+    log_level: str = "info"
+
+    secret_key: str = ""
+    allowed_origins: str = ""
+
+    database_url: str = "sqlite:///./app.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    host: str = "localhost"
+    port: int | None = None
+    public_url: str | None = None
+
+    llm_model: str | None = None
+    storage_backend: str = "local"
+    storage_local_path: str = "./data/uploads"
+    sentry_dsn: str | None = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _unrendered_placeholder_is_unset(cls, value: Any) -> Any:
+        # Template env files ship values like PORT={{DEV_PORT}}; treat them
+        # as not set (the field default applies) instead of failing to parse.
+        if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
+            raise PydanticUseDefault()
+        return value
+
+    @field_validator("log_level")
+    @classmethod
+    def _lowercase_level(cls, value: str) -> str:
+        return value.lower()
+
+    @property
+    def origins(self) -> list[str]:
+        """ALLOWED_ORIGINS split on commas."""
+        return [o.strip() for o in self.allowed_origins.split(",") if o.strip()]
+
+
+def env_files(env: str, env_dir: Path) -> tuple[Path, ...]:
+    """Env files for a tier, lowest precedence first."""
+    return (env_dir / ".env", env_dir / f".env.{env}", env_dir / ".env.local")
+
+
+class _CachedSettings:
+    __slots__ = ("settings", "files", "stamp", "checked_at")
+
+    def __init__(
+        self,
+        settings: Settings,
+        files: tuple[Path, ...],
+        stamp: tuple,
+        checked_at: float,
+    ):
+        self.settings = settings
+        self.files = files
+        self.stamp = stamp
+        self.checked_at = checked_at
+
+
+class SettingsCache:
+    """Per-(env, directory) memo of parsed Settings.
+
+    Env files are stat()ed at most once per check_interval; a changed mtime
+    or size triggers a re-parse. Process environment variables are read
+    when the settings are parsed, so later os.environ edits need clear().
+    A directory of None means the working directory at first load.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Settings] = Settings,
+        check_interval: float = CHECK_INTERVAL,
+    ):
+        self._factory = factory
+        self.check_interval = check_interval
+        self._entries: dict[tuple[str, str | None], _CachedSettings] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, env: str, env_dir: str | Path | None = None) -> Settings:
+        # Key on the plain string: hashing Path objects is comparatively slow.
+        if env_dir is not None:
+            env_dir = os.fspath(env_dir)
+        entry = self._entries.get((env, env_dir))
+        if entry is not None:
+            now = time.monotonic()
+            if now - entry.checked_at < self.check_interval:
+                return entry.settings
+            if _stamp(entry.files) == entry.stamp:
+                entry.checked_at = now
+                return entry.settings
+        return self._load(env, env_dir)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, env: str, env_dir: str | None) -> Settings:
+        with self._lock:
+            files = env_files(env, Path.cwd() if env_dir is None else Path(env_dir))
+            stamp = _stamp(files)
+            entry = self._entries.get((env, env_dir))
+            # Another thread may have reloaded while we waited for the lock.
+            if entry is not None and entry.stamp == stamp:
+                return entry.settings
+            try:
+                settings = self._factory(_env_file=files)
+            except ValidationError as exc:
+                raise ConfigurationError(
+                    f"invalid settings for environment {env!r}: {exc}"
+                ) from exc
+            self._entries[(env, env_dir)] = _CachedSettings(
+                settings, files, stamp, time.monotonic()
+            )
+            self.loads += 1
+            return settings
+
+
+def _stamp(files: tuple[Path, ...]) -> tuple:
+    stamp = []
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamp.append(None)
+        else:
+            stamp.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+_cache = SettingsCache()
+
+
+def get_settings(env: str | None = None, env_dir: str | Path | None = None) -> Settings:
+    """
+    Get the application settings instance.
+
+    Parsed once per process and environment; later calls return the same
+    object until one of the tier's env files changes. Cheap enough to call
+    on hot paths (``get_settings().debug``).
+
+    Args:
+        env: Tier name; defaults to $APP_ENV, then "development".
+        env_dir: Directory holding the .env files; defaults to the working
+            directory at first load.
+
+    Returns:
+        Settings: Configured settings from environment and env files.
+
+    Raises:
+        ConfigurationError: If a value fails validation.
+
+    Example:
+        >>> settings = get_settings()
+        >>> print(settings.database_url)
+    """
+    env = env or os.environ.get("APP_ENV") or DEFAULT_ENV
+    return _cache.get(env, env_dir)
+
+
+def clear_settings_cache() -> None:
+    """Forget all memoized settings (e.g. after editing os.environ in tests)."""
+    _cache.clear()
@@ -0,0 +1,40 @@
+"""
+Benchmark: memoized get_settings() vs re-instantiating BaseSettings.
+
+Run with: pytest shared/config/tests -m slow -s
+"""
+
+import timeit
+
+import pytest
+
+from shared.config import Settings, clear_settings_cache, get_settings
+
+CALLS = 2_000
+
+
+@pytest.mark.slow
+def test_bench_get_settings_vs_reinstantiation(tmp_path):
+    """Cached reads are orders of magnitude cheaper than parsing env files."""
+    (tmp_path / ".env").write_text("APP_NAME=bench\nLOG_LEVEL=info\n")
+    (tmp_path / ".env.development").write_text("DEBUG=true\nPORT=8000\n")
+    files = (tmp_path / ".env", tmp_path / ".env.development")
+    clear_settings_cache()
+
+    def reinstantiate():
+        return Settings(_env_file=files).debug
+
+    def cached():
+        return get_settings("development", tmp_path).debug
+
+    assert reinstantiate() == cached()
+    fresh = min(timeit.repeat(reinstantiate, number=CALLS, repeat=3)) / CALLS
+    memo = min(timeit.repeat(cached, number=CALLS * 50, repeat=3)) / (CALLS * 50)
+    clear_settings_cache()
+
+    print(
+        f"\nSettings() per call:        {fresh * 1e6:9.2f} µs"
+        f"\nget_settings().debug:       {memo * 1e6:9.2f} µs"
+        f"  ({fresh / memo:,.0f}x)"
+    )
+    assert memo * 50 < fresh
@@ -0,0 +1,139 @@
+"""Unit tests for shared.config settings loading."""
+
+import os
+
+import pytest
+
+from shared.config import (
+    ConfigurationError,
+    Settings,
+    SettingsCache,
+    clear_settings_cache,
+    get_settings,
+)
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """A directory with tiered env files and no leaking process env."""
+    for name in ("APP_ENV", "DEBUG", "LOG_LEVEL", "PORT", "DB_POOL_SIZE"):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / ".env").write_text("APP_NAME=demo\nLOG_LEVEL=INFO\nPORT=8000\n")
+    (tmp_path / ".env.development").write_text("DEBUG=true\nLOG_LEVEL=debug\n")
+    (tmp_path / ".env.staging").write_text("DB_POOL_SIZE=10\n")
+    clear_settings_cache()
+    yield tmp_path
+    clear_settings_cache()
+
+
+def _touch(path, text):
+    """Rewrite a file and move its mtime forward so the change is visible."""
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_get_settings_returns_settings_instance(env_dir):
+    """Contract: get_settings() must return Settings instance."""
+    result = get_settings(env_dir=env_dir)
+    assert isinstance(result, Settings)
+
+
+def test_tier_file_overrides_base_file(env_dir):
+    """.env.{env} wins over .env; .env.local wins over both."""
+    (env_dir / ".env.local").write_text("PORT=9000\n")
+
+    settings = get_settings("development", env_dir)
+
+    assert settings.app_name == "demo"
+    assert settings.debug is True
+    assert settings.log_level == "debug"
+    assert settings.port == 9000
+
+
+def test_process_env_overrides_files(env_dir, monkeypatch):
+    monkeypatch.setenv("PORT", "7000")
+    assert get_settings("development", env_dir).port == 7000
+
+
+def test_app_env_selects_tier(env_dir, monkeypatch):
+    monkeypatch.setenv("APP_ENV", "staging")
+    settings = get_settings(env_dir=env_dir)
+    assert settings.db_pool_size == 10
+    assert settings.debug is False
+
+
+def test_memoized_per_environment(env_dir):
+    """Same env returns the same object; different envs are cached apart."""
+    dev = get_settings("development", env_dir)
+    staging = get_settings("staging", env_dir)
+
+    assert get_settings("development", env_dir) is dev
+    assert get_settings("staging", env_dir) is staging
+    assert dev is not staging
+
+
+def test_unchanged_files_are_not_reparsed(env_dir):
+    cache = SettingsCache(check_interval=0)
+    first = cache.get("development", env_dir)
+    for _ in range(10):
+        assert cache.get("development", env_dir) is first
+    assert cache.loads == 1
+
+
+def test_reloads_when_env_file_changes(env_dir):
+    cache = SettingsCache(check_interval=0)
+    first = cache.get("development", env_dir)
+
+    _touch(env_dir / ".env.development", "DEBUG=false\n")
+    second = cache.get("development", env_dir)
+
+    assert second is not first
+    assert second.debug is False
+    assert cache.loads == 2
+
+
+def test_reloads_when_env_file_appears(env_dir):
+    cache = SettingsCache(check_interval=0)
+    assert cache.get("development", env_dir).port == 8000
+
+    (env_dir / ".env.local").write_text("PORT=9100\n")
+
+    assert cache.get("development", env_dir).port == 9100
+
+
+def test_check_interval_throttles_stat_calls(env_dir):
+    """Within check_interval a changed file is not yet picked up."""
+    cache = SettingsCache(check_interval=3600)
+    first = cache.get("development", env_dir)
+    _touch(env_dir / ".env.development", "DEBUG=false\n")
+    assert cache.get("development", env_dir) is first
+
+
+def test_unrendered_placeholder_treated_as_unset(env_dir):
+    """Template values like {{DEV_PORT}} fall back to the default."""
+    (env_dir / ".env.development").write_text("PORT={{DEV_PORT}}\n")
+    (env_dir / ".env").write_text("")
+    assert get_settings("development", env_dir).port is None
+
+
+def test_placeholder_for_field_with_default_uses_default(env_dir, monkeypatch):
+    """A copied .env.example (APP_NAME={{PROJECT_NAME}}) still loads."""
+    monkeypatch.delenv("APP_NAME", raising=False)
+    (env_dir / ".env").write_text("APP_NAME={{PROJECT_NAME}}\nDB_POOL_SIZE={{N}}\n")
+
+    settings = get_settings("development", env_dir)
+
+    assert settings.app_name == "app"
+    assert settings.db_pool_size == 5
+
+
+def test_invalid_value_raises_configuration_error(env_dir):
+    (env_dir / ".env.development").write_text("DB_POOL_SIZE=lots\n")
+    with pytest.raises(ConfigurationError, match="development"):
+        get_settings("development", env_dir)
+
+
+def test_origins_split_on_commas():
+    settings = Settings(allowed_origins="http://a, http://b,,")
+    assert settings.origins == ["http://a", "http://b"]
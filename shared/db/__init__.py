@@ -1 +1,14 @@
-"""Shared package placeholder."""
+"""Database connection pooling for all modules."""
+
+from .pool import ConnectionPool, PoolClosedError, PoolMetrics, PoolTimeoutError
+from .sqlite import open_sqlite, run_sync, sqlite_pool
+
+__all__ = [
+    "ConnectionPool",
+    "PoolClosedError",
+    "PoolMetrics",
+    "PoolTimeoutError",
+    "open_sqlite",
+    "run_sync",
+    "sqlite_pool",
+]
@@ -0,0 +1,280 @@
+"""
+Asyncio connection pool.
+
+Driver-agnostic: the pool only needs an async factory that opens a
+connection and an async callable that closes one. Optional health checks,
+acquire timeouts and idle reaping are configured per pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from shared.exceptions import AppError
+
+T = TypeVar("T")
+
+# acquire() timeout meaning "use the pool's acquire_timeout".
+_DEFAULT_TIMEOUT = float("nan")
+
+
+class PoolClosedError(AppError):
+    """The pool was used after close()."""
+
+
+class PoolTimeoutError(AppError):
+    """No connection became available within the acquire timeout."""
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """Point-in-time counters for one pool."""
+
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    created: int
+    destroyed: int
+    acquired: int
+    timeouts: int
+    failed_checks: int
+    wait_time_total: float
+    wait_time_max: float
+
+    @property
+    def wait_time_avg(self) -> float:
+        return self.wait_time_total / self.acquired if self.acquired else 0.0
+
+
+class ConnectionPool(Generic[T]):
+    """Bounded pool of reusable connections.
+
+    Args:
+        connect: Opens a new connection.
+        close: Closes a connection.
+        min_size: Connections kept open even when idle.
+        max_size: Upper bound on open connections.
+        acquire_timeout: Default seconds acquire() waits; None waits forever.
+        health_check: Returns False (or raises) for a dead connection. Run
+            on checkout of an idle connection; dead ones are replaced.
+        check_idle_after: Skip the health check for connections idle less
+            than this many seconds.
+        max_idle_time: Close idle connections above min_size after this many
+            seconds; None disables reaping.
+        reap_interval: Seconds between reaper runs.
+
+    Example:
+        >>> pool = ConnectionPool(connect, close, max_size=4)
+        >>> await pool.open()
+        >>> async with pool.acquire() as conn:
+        ...     ...
+        >>> await pool.close()
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[T]],
+        close: Callable[[T], Awaitable[None]],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        acquire_timeout: float | None = 30.0,
+        health_check: Callable[[T], Awaitable[bool]] | None = None,
+        check_idle_after: float = 0.0,
+        max_idle_time: float | None = 300.0,
+        reap_interval: float = 30.0,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("need 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self._close = close
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._health_check = health_check
+        self._check_idle_after = check_idle_after
+        self._max_idle_time = max_idle_time
+        self._reap_interval = reap_interval
+        # (connection, monotonic time it was released); newest on the right.
+        self._idle: deque[tuple[T, float]] = deque()
+        self._slots = asyncio.Semaphore(max_size)
+        self._reaper: asyncio.Task[None] | None = None
+        self._closed = False
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._destroyed = 0
+        self._acquired = 0
+        self._timeouts = 0
+        self._failed_checks = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def size(self) -> int:
+        """Open connections, idle or in use."""
+        return self._size
+
+    def metrics(self) -> PoolMetrics:
+        """Snapshot of the pool's counters."""
+        return PoolMetrics(
+            size=self._size,
+            in_use=self._in_use,
+            idle=len(self._idle),
+            waiting=self._waiting,
+            created=self._created,
+            destroyed=self._destroyed,
+            acquired=self._acquired,
+            timeouts=self._timeouts,
+            failed_checks=self._failed_checks,
+            wait_time_total=self._wait_total,
+            wait_time_max=self._wait_max,
+        )
+
+    async def open(self) -> None:
+        """Pre-open min_size connections and start the idle reaper."""
+        await self._fill_to_min()
+        if self._max_idle_time is not None and self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    @asynccontextmanager
+    async def acquire(
+        self, timeout: float | None = _DEFAULT_TIMEOUT
+    ) -> AsyncIterator[T]:
+        """Check out a connection for the duration of the block.
+
+        Raises:
+            PoolTimeoutError: No connection freed up within timeout
+                (defaults to the pool's acquire_timeout).
+            PoolClosedError: The pool is closed.
+        """
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.acquire_timeout
+        conn = await self._checkout(timeout)
+        try:
+            yield conn
+        except BaseException:
+            # The connection may be mid-transaction; do not hand it out again.
+            await self._checkin(conn, broken=True)
+            raise
+        else:
+            await self._checkin(conn)
+
+    async def reap(self) -> int:
+        """Close idle connections past max_idle_time; return how many."""
+        if self._max_idle_time is None:
+            return 0
+        cutoff = time.monotonic() - self._max_idle_time
+        reaped = 0
+        # Oldest idle connections sit on the left.
+        while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.popleft()
+            await self._destroy(conn)
+            reaped += 1
+        return reaped
+
+    async def close(self) -> None:
+        """Close idle connections; in-use ones are closed on release."""
+        self._closed = True
+        reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.cancel()
+            # Let it finish a _destroy() it was in before closing the rest.
+            with contextlib.suppress(asyncio.CancelledError):
+                await reaper
+        while self._idle:
+            await self._destroy(self._idle.pop()[0])
+
+    async def _checkout(self, timeout: float | None) -> T:
+        if self._closed:
+            raise PoolClosedError("connection pool is closed")
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeoutError(
+                f"no connection available within {timeout}s "
+                f"({self._in_use}/{self.max_size} in use)"
+            ) from None
+        finally:
+            self._waiting -= 1
+        if self._closed:
+            # Closed while this caller waited for a slot.
+            self._slots.release()
+            raise PoolClosedError("connection pool is closed")
+        waited = time.monotonic() - start
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        try:
+            conn = await self._take_healthy()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._acquired += 1
+        self._in_use += 1
+        return conn
+
+    async def _take_healthy(self) -> T:
+        """Pop the most recently used idle connection that passes its check."""
+        while self._idle:
+            conn, released_at = self._idle.pop()
+            if await self._is_healthy(conn, released_at):
+                return conn
+            self._failed_checks += 1
+            await self._destroy(conn)
+        return await self._create()
+
+    async def _is_healthy(self, conn: T, released_at: float) -> bool:
+        if self._health_check is None:
+            return True
+        if time.monotonic() - released_at < self._check_idle_after:
+            return True
+        try:
+            return bool(await self._health_check(conn))
+        except Exception:
+            return False
+
+    async def _checkin(self, conn: T, broken: bool = False) -> None:
+        self._in_use -= 1
+        try:
+            if broken or self._closed:
+                await self._destroy(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    async def _create(self) -> T:
+        conn = await self._connect()
+        self._size += 1
+        self._created += 1
+        return conn
+
+    async def _destroy(self, conn: T) -> None:
+        self._size -= 1
+        self._destroyed += 1
+        try:
+            await self._close(conn)
+        except Exception:  # noqa: S110 - a failing close must not leak the slot
+            pass
+
+    async def _fill_to_min(self) -> None:
+        while self._size < self.min_size and not self._closed:
+            self._idle.append((await self._create(), time.monotonic()))
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._reap_interval)
+            await self.reap()
+            await self._fill_to_min()
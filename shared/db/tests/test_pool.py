@@ -0,0 +1,302 @@
+"""Unit tests for shared.db.ConnectionPool."""
+
+import asyncio
+import itertools
+
+import pytest
+
+from shared.db import (
+    ConnectionPool,
+    PoolClosedError,
+    PoolTimeoutError,
+    run_sync,
+    sqlite_pool,
+)
+
+
+class FakeConnection:
+    """In-process stand-in for a driver connection."""
+
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self.ids)
+        self.closed = False
+
+
+async def _connect() -> FakeConnection:
+    return FakeConnection()
+
+
+async def _close(conn: FakeConnection) -> None:
+    conn.closed = True
+
+
+def _pool(**kwargs) -> ConnectionPool:
+    return ConnectionPool(_connect, _close, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_open_prefills_min_size():
+    """Contract: open() creates min_size connections."""
+    pool = _pool(min_size=2, max_size=4)
+    await pool.open()
+    assert pool.size == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_released_connection_is_reused():
+    """A released connection is handed out again instead of a new one."""
+    pool = _pool(min_size=0, max_size=2)
+
+    async with pool.acquire() as first:
+        pass
+    async with pool.acquire() as second:
+        pass
+
+    assert first is second
+    assert pool.size == 1
+
+
+@pytest.mark.asyncio
+async def test_never_exceeds_max_size():
+    """Concurrent acquirers beyond max_size wait for a free connection."""
+    pool = _pool(min_size=0, max_size=3)
+    in_use = peak = 0
+
+    async def worker():
+        nonlocal in_use, peak
+        async with pool.acquire():
+            in_use += 1
+            peak = max(peak, in_use)
+            await asyncio.sleep(0.001)
+            in_use -= 1
+
+    await asyncio.gather(*(worker() for _ in range(20)))
+
+    assert peak == 3
+    assert pool.size == 3
+
+
+@pytest.mark.asyncio
+async def test_error_in_block_discards_connection():
+    """A connection whose user raised is closed, not returned to the pool."""
+    pool = _pool(min_size=0, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        async with pool.acquire() as conn:
+            raise RuntimeError("boom")
+
+    assert conn.closed
+    assert pool.size == 0
+    async with pool.acquire() as replacement:
+        assert replacement is not conn
+
+
+@pytest.mark.asyncio
+async def test_close_closes_idle_and_rejects_new_acquires():
+    """close() shuts idle connections; later acquire() fails."""
+    pool = _pool(min_size=2, max_size=2)
+    await pool.open()
+    idle = [conn for conn, _ in pool._idle]
+
+    await pool.close()
+
+    assert all(c.closed for c in idle)
+    with pytest.raises(PoolClosedError):
+        async with pool.acquire():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_waiter_parked_across_close_is_rejected():
+    """A caller waiting for a slot when close() runs gets PoolClosedError,
+    not a new connection."""
+    pool = _pool(min_size=0, max_size=1)
+
+    async def wait_for_slot():
+        async with pool.acquire(timeout=1):
+            pass
+
+    async with pool.acquire():
+        waiter = asyncio.ensure_future(wait_for_slot())
+        await asyncio.sleep(0)
+        await pool.close()
+
+    with pytest.raises(PoolClosedError):
+        await waiter
+    assert pool.metrics().created == 1
+    assert pool.size == 0
+
+
+def test_invalid_sizes_rejected():
+    """min_size must not exceed max_size."""
+    with pytest.raises(ValueError):
+        _pool(min_size=3, max_size=2)
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_when_exhausted():
+    """acquire() gives up after the timeout and counts it."""
+    pool = _pool(min_size=0, max_size=1, acquire_timeout=0.01)
+
+    async with pool.acquire():
+        with pytest.raises(PoolTimeoutError):
+            async with pool.acquire():
+                pass
+        with pytest.raises(PoolTimeoutError):
+            async with pool.acquire(timeout=0):
+                pass
+
+    assert pool.metrics().timeouts == 2
+    # The slot is still usable after the timeouts.
+    async with pool.acquire(timeout=0.01):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_waiter_gets_connection_when_released():
+    """A blocked acquirer is served as soon as a connection is released."""
+    pool = _pool(min_size=0, max_size=1)
+
+    async def holder():
+        async with pool.acquire() as conn:
+            await asyncio.sleep(0.01)
+            return conn
+
+    async def waiter():
+        await asyncio.sleep(0)
+        async with pool.acquire(timeout=1) as conn:
+            return conn
+
+    first, second = await asyncio.gather(holder(), waiter())
+
+    assert first is second
+    metrics = pool.metrics()
+    assert metrics.wait_time_max >= 0.005
+    assert metrics.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_health_check_replaces_connection():
+    """Idle connections failing the health check are closed and replaced."""
+    dead = set()
+
+    async def check(conn):
+        return conn.id not in dead
+
+    pool = _pool(min_size=0, max_size=2, health_check=check)
+    async with pool.acquire() as stale:
+        pass
+    dead.add(stale.id)
+
+    async with pool.acquire() as fresh:
+        assert fresh is not stale
+
+    assert stale.closed
+    metrics = pool.metrics()
+    assert metrics.failed_checks == 1
+    assert (metrics.created, metrics.destroyed, metrics.size) == (2, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_health_check_raising_counts_as_failure():
+    """An exception from the health check marks the connection dead."""
+
+    async def check(conn):
+        raise OSError("connection reset")
+
+    pool = _pool(min_size=0, max_size=1, health_check=check)
+    async with pool.acquire() as first:
+        pass
+    async with pool.acquire() as second:
+        assert second is not first
+    assert pool.metrics().failed_checks == 1
+
+
+@pytest.mark.asyncio
+async def test_recently_used_connections_skip_health_check():
+    """check_idle_after skips the check for hot connections."""
+    calls = 0
+
+    async def check(conn):
+        nonlocal calls
+        calls += 1
+        return True
+
+    pool = _pool(min_size=0, max_size=1, health_check=check, check_idle_after=60)
+    for _ in range(5):
+        async with pool.acquire():
+            pass
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_reap_closes_idle_connections_above_min_size():
+    """reap() drops connections idle past max_idle_time, keeping min_size."""
+    pool = _pool(min_size=1, max_size=4, max_idle_time=0.01)
+
+    async def hold():
+        async with pool.acquire():
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(hold() for _ in range(4)))
+    assert pool.size == 4
+    await asyncio.sleep(0.02)
+
+    assert await pool.reap() == 3
+    assert pool.size == 1
+    assert pool.metrics().destroyed == 3
+
+
+@pytest.mark.asyncio
+async def test_background_reaper_runs_after_open():
+    """open() starts a reaper that trims idle connections periodically."""
+    pool = _pool(min_size=0, max_size=2, max_idle_time=0.01, reap_interval=0.01)
+    await pool.open()
+    async with pool.acquire():
+        pass
+    assert pool.size == 1
+
+    await asyncio.sleep(0.05)
+
+    assert pool.size == 0
+    reaper = pool._reaper
+    await pool.close()
+    assert reaper.done()
+
+
+@pytest.mark.asyncio
+async def test_metrics_track_in_use_and_idle():
+    """metrics() reports in-use, idle and lifetime counters."""
+    pool = _pool(min_size=1, max_size=3)
+    await pool.open()
+
+    async with pool.acquire(), pool.acquire():
+        during = pool.metrics()
+    after = pool.metrics()
+
+    assert (during.in_use, during.idle, during.size) == (2, 0, 2)
+    assert (after.in_use, after.idle, after.size) == (0, 2, 2)
+    assert after.acquired == 2
+    assert after.created == 2
+    assert after.wait_time_avg >= 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pool_round_trip_and_health_check(tmp_path):
+    """sqlite_pool connections run queries and pass their SELECT 1 check."""
+    pool = sqlite_pool(tmp_path / "pool.db", max_size=2, check_idle_after=0)
+    await pool.open()
+
+    async with pool.acquire() as conn:
+        await run_sync(conn, lambda c: c.execute("CREATE TABLE t (x)"))
+    async with pool.acquire() as conn:
+        rows = await run_sync(conn, lambda c: c.execute("SELECT 1").fetchall())
+
+    assert rows == [(1,)]
+    assert pool.metrics().failed_checks == 0
+    await pool.close()
+    assert pool.size == 0
@@ -1 +1,5 @@
-"""Shared package placeholder."""
+"""Base exceptions for all modules."""
+
+from .errors import AppError, InvalidInputError, NotFoundError
+
+__all__ = ["AppError", "InvalidInputError", "NotFoundError"]
@@ -0,0 +1,25 @@
+"""
+Base exception hierarchy shared by all modules.
+
+Modules subclass these instead of defining their own root errors, so API
+and CLI layers can map any module's failures with one set of handlers.
+"""
+
+from __future__ import annotations
+
+
+class AppError(Exception):
+    """Root of all application errors."""
+
+
+class NotFoundError(AppError):
+    """A requested resource does not exist."""
+
+    def __init__(self, resource: str, key: object):
+        super().__init__(f"{resource} not found: {key!r}")
+        self.resource = resource
+        self.key = key
+
+
+class InvalidInputError(AppError):
+    """Caller-supplied input failed validation."""
@@ -0,0 +1,18 @@
+"""Contract tests for shared.exceptions."""
+
+from shared.exceptions import AppError, InvalidInputError, NotFoundError
+
+
+def test_all_errors_derive_from_app_error():
+    """Contract: every shared error is an AppError."""
+    assert issubclass(NotFoundError, AppError)
+    assert issubclass(InvalidInputError, AppError)
+
+
+def test_not_found_error_keeps_resource_and_key():
+    """NotFoundError exposes what was missing."""
+    err = NotFoundError("ExampleModel", "abc")
+
+    assert err.resource == "ExampleModel"
+    assert err.key == "abc"
+    assert "abc" in str(err)
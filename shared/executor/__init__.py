@@ -0,0 +1,25 @@
+"""Process-pool offload of CPU-bound work for async services."""
+
+from .buffers import SharedPayload
+from .offload import (
+    OffloadClosedError,
+    OffloadPool,
+    OffloadStats,
+    configure_offload,
+    get_offload_pool,
+    offload,
+    offload_map,
+    shutdown_offload,
+)
+
+__all__ = [
+    "OffloadClosedError",
+    "OffloadPool",
+    "OffloadStats",
+    "SharedPayload",
+    "configure_offload",
+    "get_offload_pool",
+    "offload",
+    "offload_map",
+    "shutdown_offload",
+]
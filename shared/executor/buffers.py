@@ -0,0 +1,89 @@
+"""
+Shared-memory transfer of large byte payloads between processes.
+
+A bytes, bytearray or memoryview argument above a threshold is copied once
+into a SharedMemory segment and sent to the worker as a small handle,
+instead of being pickled through the pool's pipe. Segments are owned (and
+unlinked) by the side that created them once the other side is done.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Literal
+
+BytesLike = bytes | bytearray | memoryview
+Kind = Literal["bytes", "bytearray", "memoryview"]
+
+# Payloads smaller than this go through the pipe: creating and mapping a
+# segment costs more than copying them.
+DEFAULT_THRESHOLD = 1 << 20
+
+
+@dataclass(frozen=True)
+class SharedPayload:
+    """Picklable handle to a payload parked in a SharedMemory segment."""
+
+    name: str
+    size: int
+    kind: Kind
+
+
+def is_large(value: Any, threshold: int) -> bool:
+    """True for bytes-like values that should travel via shared memory."""
+    return isinstance(value, BytesLike) and memoryview(value).nbytes >= threshold
+
+
+def share(value: BytesLike) -> tuple[SharedPayload, shared_memory.SharedMemory]:
+    """Copy value into a new segment; the caller owns (must unlink) it."""
+    view = memoryview(value).cast("B")
+    segment = shared_memory.SharedMemory(create=True, size=max(view.nbytes, 1))
+    segment.buf[: view.nbytes] = view
+    kind: Kind = (
+        "bytes"
+        if isinstance(value, bytes)
+        else "bytearray"
+        if isinstance(value, bytearray)
+        else "memoryview"
+    )
+    return SharedPayload(segment.name, view.nbytes, kind), segment
+
+
+def attach(payload: SharedPayload) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(name=payload.name)
+
+
+def restore(
+    payload: SharedPayload, segment: shared_memory.SharedMemory, *, copy: bool
+) -> Any:
+    """The payload as its original type.
+
+    bytes and bytearray are always copied out of the segment. A memoryview
+    is a zero-copy view (valid until the segment is closed) unless copy.
+    """
+    view = segment.buf[: payload.size]
+    if payload.kind == "memoryview" and not copy:
+        return view
+    try:
+        if payload.kind == "bytes":
+            return bytes(view)
+        data = bytearray(view)
+        return data if payload.kind == "bytearray" else memoryview(data)
+    finally:
+        view.release()
+
+
+def release(segment: shared_memory.SharedMemory, *, unlink: bool = False) -> None:
+    """Close (and optionally unlink) a segment, tolerating live views."""
+    try:
+        segment.close()
+    except BufferError:
+        # A view escaped (e.g. kept by the callee); the mapping is freed
+        # when that view is collected.
+        pass
+    if unlink:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,353 @@
+"""
+Process-pool offload for CPU-bound work.
+
+Services are async and share one event loop, so a CPU-heavy step (a bulk
+transform, encoding a large listing) stalls every other request. Awaiting
+offload(fn, *args) runs fn in a worker process instead and the loop keeps
+serving. offload_map() splits a large batch into chunks and keeps a bounded
+number of them in flight.
+
+fn and its arguments must be picklable: fn is a module-level function.
+Large bytes-like arguments and results travel through shared memory (see
+buffers.py) rather than the pool's pipe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from shared.exceptions import AppError
+
+from . import buffers
+from .buffers import SharedPayload
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+WORKERS_ENV = "APP_OFFLOAD_WORKERS"
+CHUNK_SIZE_ENV = "APP_OFFLOAD_CHUNK_SIZE"
+START_METHOD_ENV = "APP_OFFLOAD_START_METHOD"
+DEFAULT_CHUNK_SIZE = 10_000
+# spawn: workers never inherit the parent's threads or open sockets.
+DEFAULT_START_METHOD = "spawn"
+
+
+class OffloadClosedError(AppError):
+    """The pool was used after shutdown."""
+
+
+@dataclass(frozen=True)
+class OffloadStats:
+    """Counters for one OffloadPool."""
+
+    workers: int
+    calls: int
+    chunks: int
+    items: int
+    failed: int
+    in_flight: int
+    shared_bytes: int
+
+
+class OffloadPool:
+    """A process pool that event-loop code awaits.
+
+    Args:
+        max_workers: Worker processes (default: os.cpu_count()).
+        chunk_size: Items per task in map() unless overridden per call.
+        max_chunks_in_flight: Chunks submitted ahead of the results being
+            consumed (default 2 per worker); bounds parent-side memory.
+        start_method: multiprocessing start method ("spawn", "forkserver",
+            "fork").
+        shm_threshold: Bytes-like arguments and results at least this
+            large go through shared memory.
+
+    Workers start on first use. Call aclose() (or shutdown()) when the app
+    stops; the module-level pool is also shut down at interpreter exit.
+
+    Example:
+        >>> pool = OffloadPool(max_workers=4)
+        >>> body = await pool.run(encode_listing, rows)
+        >>> names = await pool.map(normalize_name, raw_names, chunk_size=5_000)
+        >>> await pool.aclose()
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunks_in_flight: int | None = None,
+        start_method: str = DEFAULT_START_METHOD,
+        shm_threshold: int = buffers.DEFAULT_THRESHOLD,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_chunks_in_flight = max_chunks_in_flight or 2 * self.max_workers
+        self.start_method = start_method
+        self.shm_threshold = shm_threshold
+        self._executor: ProcessPoolExecutor | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._chunks = 0
+        self._items = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._shared_bytes = 0
+
+    @classmethod
+    def from_env(cls) -> OffloadPool:
+        workers = os.environ.get(WORKERS_ENV)
+        return cls(
+            int(workers) if workers else None,
+            chunk_size=int(os.environ.get(CHUNK_SIZE_ENV) or DEFAULT_CHUNK_SIZE),
+            start_method=os.environ.get(START_METHOD_ENV) or DEFAULT_START_METHOD,
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """fn(*args, **kwargs) in a worker process."""
+        self._calls += 1
+        segments: list = []
+        args = tuple(self._share(a, segments) for a in args)
+        kwargs = {k: self._share(v, segments) for k, v in kwargs.items()}
+        return await self._submit(_call, (fn, args, kwargs), segments)
+
+    async def map(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        *,
+        chunk_size: int | None = None,
+    ) -> list[R]:
+        """[fn(item) for item in items], computed chunk by chunk in workers.
+
+        Results keep input order. At most max_chunks_in_flight chunks are
+        submitted ahead of the first unfinished one; the first failing
+        chunk's exception is raised and the chunks behind it are cancelled.
+        """
+        size = chunk_size or self.chunk_size
+        if size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        iterator = iter(items)
+        pending: deque[asyncio.Future] = deque()
+        results: list[R] = []
+        try:
+            while chunk := list(itertools.islice(iterator, size)):
+                if len(pending) >= self.max_chunks_in_flight:
+                    results.extend(await pending.popleft())
+                self._chunks += 1
+                self._items += len(chunk)
+                pending.append(asyncio.ensure_future(self._submit(_apply, (fn, chunk))))
+            while pending:
+                results.extend(await pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers; queued tasks are cancelled, running ones finish."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        """shutdown() without blocking the event loop while workers exit."""
+        await asyncio.to_thread(self.shutdown)
+
+    def stats(self) -> OffloadStats:
+        return OffloadStats(
+            workers=self.max_workers,
+            calls=self._calls,
+            chunks=self._chunks,
+            items=self._items,
+            failed=self._failed,
+            in_flight=self._in_flight,
+            shared_bytes=self._shared_bytes,
+        )
+
+    async def _submit(
+        self, task: Callable[..., Any], args: tuple, segments: list | tuple = ()
+    ) -> Any:
+        self._in_flight += 1
+        try:
+            future = self._pool().submit(task, *args, self.shm_threshold)
+        except BaseException:
+            self._in_flight -= 1
+            _unlink(segments)
+            raise
+        try:
+            result = await asyncio.wrap_future(future)
+        except BaseException:
+            self._failed += 1
+            # A cancelled caller may leave the task running; its result
+            # segment (if any) is freed when it lands.
+            future.add_done_callback(_discard_result)
+            raise
+        finally:
+            self._in_flight -= 1
+            if segments:
+                if future.done():
+                    _unlink(segments)
+                else:
+                    future.add_done_callback(lambda _: _unlink(segments))
+        if isinstance(result, SharedPayload):
+            self._shared_bytes += result.size
+            return _receive(result)
+        return result
+
+    def _share(self, value: Any, segments: list) -> Any:
+        """value, or a shared-memory handle if it is a large bytes-like."""
+        if not buffers.is_large(value, self.shm_threshold):
+            return value
+        payload, segment = buffers.share(value)
+        segments.append(segment)
+        self._shared_bytes += payload.size
+        return payload
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise OffloadClosedError("offload pool is shut down")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+            return self._executor
+
+
+# --- Worker side -------------------------------------------------------------
+
+
+def _call(fn: Callable, args: tuple, kwargs: dict, threshold: int) -> Any:
+    attached: list = []
+
+    def restore(value: Any) -> Any:
+        if not isinstance(value, SharedPayload):
+            return value
+        segment = buffers.attach(value)
+        attached.append(segment)
+        return buffers.restore(value, segment, copy=False)
+
+    args = tuple(restore(a) for a in args)
+    kwargs = {k: restore(v) for k, v in kwargs.items()}
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        for value in (*args, *kwargs.values()):
+            if isinstance(value, memoryview):
+                value.release()
+        del args, kwargs
+        for segment in attached:
+            buffers.release(segment)
+    return _send(result, threshold)
+
+
+def _apply(fn: Callable, chunk: list, threshold: int) -> list:
+    return [fn(item) for item in chunk]
+
+
+def _send(result: Any, threshold: int) -> Any:
+    if not buffers.is_large(result, threshold):
+        return result
+    payload, segment = buffers.share(result)
+    buffers.release(segment)  # the parent unlinks it after reading
+    return payload
+
+
+# --- Parent side -------------------------------------------------------------
+
+
+def _receive(payload: SharedPayload) -> Any:
+    segment = buffers.attach(payload)
+    try:
+        return buffers.restore(payload, segment, copy=True)
+    finally:
+        buffers.release(segment, unlink=True)
+
+
+def _discard_result(future: Future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, SharedPayload):
+        buffers.release(buffers.attach(result), unlink=True)
+
+
+def _unlink(segments: list) -> None:
+    for segment in segments:
+        buffers.release(segment, unlink=True)
+
+
+# --- Module-level pool -------------------------------------------------------
+
+_default: OffloadPool | None = None
+_default_lock = threading.Lock()
+
+
+def configure_offload(**options: Any) -> OffloadPool:
+    """Replace the shared pool with OffloadPool(**options).
+
+    Without options, settings come from APP_OFFLOAD_WORKERS,
+    APP_OFFLOAD_CHUNK_SIZE and APP_OFFLOAD_START_METHOD.
+    """
+    global _default
+    pool = OffloadPool(**options) if options else OffloadPool.from_env()
+    with _default_lock:
+        previous, _default = _default, pool
+    if previous is not None:
+        previous.shutdown()
+    return pool
+
+
+def get_offload_pool() -> OffloadPool:
+    """The shared pool, created from the environment on first use."""
+    global _default
+    with _default_lock:
+        if _default is None or _default.closed:
+            _default = OffloadPool.from_env()
+        return _default
+
+
+async def offload(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Await fn(*args, **kwargs) run in the shared process pool."""
+    return await get_offload_pool().run(fn, *args, **kwargs)
+
+
+async def offload_map(
+    fn: Callable[[T], R], items: Iterable[T], *, chunk_size: int | None = None
+) -> list[R]:
+    """Await [fn(item) for item in items] computed in chunks by the shared pool."""
+    return await get_offload_pool().map(fn, items, chunk_size=chunk_size)
+
+
+def shutdown_offload(wait: bool = True) -> None:
+    """Shut the shared pool down (also runs at interpreter exit)."""
+    global _default
+    with _default_lock:
+        pool, _default = _default, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+atexit.register(shutdown_offload)
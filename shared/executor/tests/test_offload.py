@@ -0,0 +1,170 @@
+"""Unit tests for shared.executor process-pool offload."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from shared.executor import (
+    OffloadClosedError,
+    OffloadPool,
+    SharedPayload,
+    configure_offload,
+    offload,
+    offload_map,
+    shutdown_offload,
+)
+
+MB = 1 << 20
+SHM_DIR = "/dev/shm"  # noqa: S108 - POSIX shared memory, listed read-only
+
+
+# Worker functions live at module level so spawned workers can import them.
+
+
+def add(a, b=0):
+    return a + b
+
+
+def square(x):
+    return x * x
+
+
+def fail_on(x):
+    if x == 13:
+        raise ValueError("unlucky")
+    return x
+
+
+def describe(data):
+    return type(data).__name__, len(data), bytes(data[:4]), bytes(data[-4:])
+
+
+def make_blob(size):
+    return bytearray(b"x" * size)
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return seconds
+
+
+def _segments():
+    return set(os.listdir(SHM_DIR)) if os.path.isdir(SHM_DIR) else set()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = OffloadPool(max_workers=2, chunk_size=100, shm_threshold=MB)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result(pool):
+    assert await pool.run(add, 2, b=3) == 5
+    assert await asyncio.gather(*(pool.run(square, n) for n in range(10))) == [
+        n * n for n in range(10)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_map_chunks_and_keeps_order(pool):
+    before = pool.stats()
+
+    result = await pool.map(square, range(1050))
+
+    stats = pool.stats()
+    assert result == [n * n for n in range(1050)]
+    assert stats.chunks - before.chunks == 11
+    assert stats.items - before.items == 1050
+    assert stats.in_flight == 0
+    assert await pool.map(square, [], chunk_size=7) == []
+
+
+@pytest.mark.asyncio
+async def test_worker_exception_propagates(pool):
+    failed = pool.stats().failed
+
+    with pytest.raises(ValueError, match="unlucky"):
+        await pool.run(fail_on, 13)
+    with pytest.raises(ValueError, match="unlucky"):
+        await pool.map(fail_on, range(50), chunk_size=5)
+
+    assert pool.stats().failed > failed
+    assert await pool.run(fail_on, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_large_payloads_use_shared_memory(pool):
+    segments = _segments()
+    shared = pool.stats().shared_bytes
+    data = b"head" + b"." * (2 * MB) + b"tail"
+
+    assert await pool.run(describe, data) == ("bytes", len(data), b"head", b"tail")
+    # memoryview arguments arrive as zero-copy views of the segment.
+    view = memoryview(bytearray(data))
+    assert (await pool.run(describe, view))[0] == "memoryview"
+    blob = await pool.run(make_blob, 3 * MB)
+
+    assert isinstance(blob, bytearray) and len(blob) == 3 * MB
+    assert pool.stats().shared_bytes - shared == 2 * len(data) + 3 * MB
+    assert _segments() == segments
+
+
+@pytest.mark.asyncio
+async def test_small_payloads_stay_in_band(pool):
+    shared = pool.stats().shared_bytes
+    assert (await pool.run(describe, b"abcdefgh"))[1] == 8
+    assert pool.stats().shared_bytes == shared
+    assert not isinstance(await pool.run(make_blob, 10), SharedPayload)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_during_offload(pool):
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(tick())
+    await pool.run(spin, 0.3)
+    ticker.cancel()
+    await asyncio.gather(ticker, return_exceptions=True)
+
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_shutdown_rejects_new_work():
+    pool = OffloadPool(max_workers=1)
+    assert await pool.run(add, 1, 1) == 2
+
+    await pool.aclose()
+
+    assert pool.closed
+    with pytest.raises(OffloadClosedError):
+        await pool.run(add, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_module_level_pool():
+    pool = configure_offload(max_workers=1, chunk_size=4)
+    try:
+        assert await offload(add, 20, 22) == 42
+        assert await offload_map(square, range(10)) == [n * n for n in range(10)]
+        assert pool.stats().chunks == 3
+    finally:
+        shutdown_offload()
+    assert pool.closed
+
+
+def test_rejects_bad_chunk_size():
+    with pytest.raises(ValueError):
+        OffloadPool(chunk_size=0)
@@ -0,0 +1,37 @@
+"""Latency histograms, call metrics and sampled profiling for all modules."""
+
+from .histogram import LatencyHistogram
+from .metrics import (
+    REGISTRY,
+    Metric,
+    MetricSnapshot,
+    MetricsRegistry,
+    disable,
+    enable,
+    get_profiler,
+    instrument,
+    is_enabled,
+    measure,
+    reset,
+    set_profiler,
+    snapshot,
+)
+from .profiling import SamplingProfiler
+
+__all__ = [
+    "REGISTRY",
+    "LatencyHistogram",
+    "Metric",
+    "MetricSnapshot",
+    "MetricsRegistry",
+    "SamplingProfiler",
+    "disable",
+    "enable",
+    "get_profiler",
+    "instrument",
+    "is_enabled",
+    "measure",
+    "reset",
+    "set_profiler",
+    "snapshot",
+]
@@ -0,0 +1,97 @@
+"""
+Fixed-memory latency histogram.
+
+Log-linear buckets in the style of HdrHistogram: values below 32 get one
+bucket each, larger values get 16 buckets per power of two. Every value up
+to 2**64 is recorded with at most 1/16 (6.25%) relative error in 976
+counters, so memory does not grow with the number of samples. Only the
+counters are kept; count, mean, percentiles and max are all derived from
+them, with the same error bound.
+"""
+
+from __future__ import annotations
+
+SUB_BITS = 5
+_HALF = 1 << (SUB_BITS - 1)
+BUCKETS = (64 - SUB_BITS) * _HALF + (1 << SUB_BITS)
+
+
+def bucket_index(value: int) -> int:
+    if value < 1 << SUB_BITS:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BITS
+    return (shift << (SUB_BITS - 1)) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Smallest and largest value that land in bucket index."""
+    if index < 1 << SUB_BITS:
+        return index, index
+    shift = (index >> (SUB_BITS - 1)) - 1
+    mantissa = (index & (_HALF - 1)) | _HALF
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+def _midpoint(index: int) -> int:
+    low, high = bucket_bounds(index)
+    return (low + high) // 2
+
+
+class LatencyHistogram:
+    """Counts of integer values (e.g. nanoseconds) in log-linear buckets."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+
+    def record(self, value: int) -> None:
+        self.counts[bucket_index(value)] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def total(self) -> int:
+        """Approximate sum of recorded values (bucket midpoints)."""
+        return sum(n * _midpoint(i) for i, n in enumerate(self.counts) if n)
+
+    @property
+    def max(self) -> int:
+        """Upper bound of the highest non-empty bucket; 0 when empty."""
+        counts = self.counts
+        for index in range(BUCKETS - 1, -1, -1):
+            if counts[index]:
+                return bucket_bounds(index)[1]
+        return 0
+
+    def mean(self) -> float:
+        count = self.count
+        return self.total / count if count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """Approximate q-th percentile (0-100); 0 when empty.
+
+        Returns the midpoint of the bucket holding the rank.
+        """
+        count = self.count
+        if not count:
+            return 0
+        rank = max(1, -(-count * q // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _midpoint(index)
+        return 0
+
+    def merge(self, other: LatencyHistogram) -> None:
+        counts = self.counts
+        for index, n in enumerate(other.counts):
+            if n:
+                counts[index] += n
+
+    def clear(self) -> None:
+        # In place: instrumented wrappers hold a reference to counts.
+        self.counts[:] = [0] * BUCKETS
@@ -0,0 +1,322 @@
+"""
+Per-name call metrics: latency histogram, call/error counts, in-flight gauge.
+
+Wrap hot paths with @instrument() or ``with measure(name):``. Recording is
+off until enable() is called (or APP_METRICS=1 is set at import); while off,
+a wrapped call costs one extra function call and a flag check. snapshot()
+reads every metric in process; ``python -m shared.cli --metrics ...`` dumps
+it after a command.
+
+Counters are plain attributes updated without locks. Under the GIL a
+concurrent update can very occasionally be lost, which is acceptable for
+monitoring and keeps recording well under a microsecond.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from time import perf_counter_ns
+from typing import Any, TypeVar
+
+from .histogram import SUB_BITS, LatencyHistogram
+from .profiling import SamplingProfiler
+
+METRICS_ENV = "APP_METRICS"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_LINEAR = 1 << SUB_BITS
+_SHIFT = SUB_BITS - 1
+
+# _mode is the single flag wrappers check per call.
+_OFF, _RECORD, _PROFILE = 0, 1, 2
+_enabled = os.environ.get(METRICS_ENV, "").strip().lower() in ("1", "true", "yes")
+_profiler: SamplingProfiler | None = SamplingProfiler.from_env()
+_mode = _OFF
+
+
+@dataclass(frozen=True)
+class MetricSnapshot:
+    """Point-in-time view of one metric.
+
+    Latencies are in seconds, at histogram resolution (within 6.25%).
+    """
+
+    name: str
+    calls: int
+    errors: int
+    in_flight: int
+    total: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Metric:
+    """Live counters for one instrumented name."""
+
+    __slots__ = ("name", "histogram", "errors", "in_flight", "_countdown")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.in_flight = 0
+        self._countdown = 0
+
+    def sample_due(self, every: int) -> bool:
+        """True on every `every`-th call, starting with the first."""
+        if self._countdown <= 0:
+            self._countdown = every
+        self._countdown -= 1
+        return self._countdown == every - 1
+
+    def snapshot(self) -> MetricSnapshot:
+        h = self.histogram
+        return MetricSnapshot(
+            name=self.name,
+            calls=h.count,
+            errors=self.errors,
+            in_flight=self.in_flight,
+            total=h.total / 1e9,
+            mean=h.mean() / 1e9,
+            p50=h.percentile(50) / 1e9,
+            p90=h.percentile(90) / 1e9,
+            p99=h.percentile(99) / 1e9,
+            max=h.max / 1e9,
+        )
+
+    def reset(self) -> None:
+        self.histogram.clear()
+        self.errors = 0
+
+
+class MetricsRegistry:
+    """Name → Metric. The module-level REGISTRY is the process default."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def metric(self, name: str) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Metric(name))
+        return metric
+
+    def names(self) -> list[str]:
+        return sorted(self._metrics)
+
+    def snapshot(self) -> dict[str, MetricSnapshot]:
+        """Snapshots of every metric that has been called, by name."""
+        return {
+            name: metric.snapshot()
+            for name, metric in sorted(self._metrics.items())
+            if metric.histogram.count or metric.in_flight
+        }
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """snapshot() as plain JSON-serializable dicts."""
+        return {name: snap.to_dict() for name, snap in self.snapshot().items()}
+
+    def reset(self) -> None:
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _update_mode() -> None:
+    global _mode
+    if not _enabled:
+        _mode = _OFF
+    else:
+        _mode = _RECORD if _profiler is None else _PROFILE
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+    _update_mode()
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+    _update_mode()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_profiler(profiler: SamplingProfiler | None) -> SamplingProfiler | None:
+    """Install (or with None, remove) the sampling profiler; returns the old one."""
+    global _profiler
+    old, _profiler = _profiler, profiler
+    _update_mode()
+    return old
+
+
+def get_profiler() -> SamplingProfiler | None:
+    return _profiler
+
+
+_update_mode()
+
+
+def snapshot() -> dict[str, MetricSnapshot]:
+    return REGISTRY.snapshot()
+
+
+def reset() -> None:
+    REGISTRY.reset()
+
+
+def instrument(
+    name: str | None = None, *, registry: MetricsRegistry | None = None
+) -> Callable[[F], F]:
+    """
+    Record latency, calls, errors and in-flight count for a function.
+
+    Works on plain and coroutine functions (and methods). The metric is
+    named after the function's qualified name unless name is given.
+
+    Example:
+        >>> class ExampleService:
+        ...     @instrument()
+        ...     async def list_items(self, status=None): ...
+        >>> snapshot()["ExampleService.list_items"].p99
+    """
+
+    def decorate(fn: F) -> F:
+        metric = (registry or REGISTRY).metric(name or fn.__qualname__)
+        counts = metric.histogram.counts
+        clock = perf_counter_ns
+
+        # Recording is inlined (including histogram.bucket_index): it runs
+        # on every call, and lookups and calls are most of its cost.
+        # Profiled calls take the slower path through Measure.
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _mode != _RECORD:
+                    if _mode == _OFF:
+                        return await fn(*args, **kwargs)
+                    async with Measure(metric):
+                        return await fn(*args, **kwargs)
+                metric.in_flight += 1
+                start = clock()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    metric.errors += 1
+                    raise
+                finally:
+                    ns = clock() - start
+                    metric.in_flight -= 1
+                    if ns < _LINEAR:
+                        counts[ns] += 1
+                    else:
+                        shift = ns.bit_length() - SUB_BITS
+                        counts[(shift << _SHIFT) + (ns >> shift)] += 1
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _mode != _RECORD:
+                if _mode == _OFF:
+                    return fn(*args, **kwargs)
+                with Measure(metric):
+                    return fn(*args, **kwargs)
+            metric.in_flight += 1
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                metric.errors += 1
+                raise
+            finally:
+                ns = clock() - start
+                metric.in_flight -= 1
+                if ns < _LINEAR:
+                    counts[ns] += 1
+                else:
+                    shift = ns.bit_length() - SUB_BITS
+                    counts[(shift << _SHIFT) + (ns >> shift)] += 1
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def measure(name: str, *, registry: MetricsRegistry | None = None) -> Measure:
+    """
+    Context manager form of instrument() for a block of code.
+
+    Example:
+        >>> with measure("example.serialize"):
+        ...     body = encode(items)
+        >>> async with measure("example.fetch"):
+        ...     rows = await repo.page(0, 100)
+    """
+    return Measure((registry or REGISTRY).metric(name))
+
+
+class Measure:
+    """One timed block of a metric (see measure())."""
+
+    __slots__ = ("_metric", "_start", "_token", "_profiler")
+
+    def __init__(self, metric: Metric):
+        self._metric = metric
+        self._start = 0
+        self._token = None
+        self._profiler: SamplingProfiler | None = None
+
+    def __enter__(self) -> Measure:
+        if _mode == _OFF:
+            self._start = 0
+            return self
+        metric = self._metric
+        profiler = _profiler
+        if _mode == _PROFILE and metric.sample_due(profiler.every):
+            self._profiler = profiler
+            self._token = profiler.start()
+        metric.in_flight += 1
+        self._start = perf_counter_ns() or 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._start:
+            return
+        ns = perf_counter_ns() - self._start
+        self._start = 0
+        metric = self._metric
+        metric.in_flight -= 1
+        metric.histogram.record(ns)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            metric.errors += 1
+        if self._token is not None:
+            token, self._token = self._token, None
+            self._profiler.stop(token, metric.name)
+
+    async def __aenter__(self) -> Measure:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
@@ -0,0 +1,110 @@
+"""
+Sampled profile capture for instrumented calls.
+
+Set APP_PROFILE=cpu (cProfile) or APP_PROFILE=memory (tracemalloc) and
+every APP_PROFILE_EVERY-th call (default 1000) of each instrumented name is
+captured to APP_PROFILE_DIR (default .cache/profiles). One capture runs at a
+time; calls that come due meanwhile are not captured.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+PROFILE_ENV = "APP_PROFILE"
+PROFILE_EVERY_ENV = "APP_PROFILE_EVERY"
+PROFILE_DIR_ENV = "APP_PROFILE_DIR"
+DEFAULT_EVERY = 1000
+DEFAULT_DIR = os.path.join(".cache", "profiles")
+MODES = ("cpu", "memory")
+TOP_ALLOCATIONS = 25
+
+
+class SamplingProfiler:
+    """Captures one call in every `every` per name.
+
+    Args:
+        mode: "cpu" writes a cProfile ``.prof`` file (open with pstats or
+            snakeviz); "memory" writes the top tracemalloc allocation
+            deltas of the call as text.
+        every: Sampling period, in calls per instrumented name.
+        directory: Where capture files go (created on first capture).
+
+    A CPU capture of a coroutine spans its awaits, so it also includes
+    whatever else the event loop ran in between.
+    """
+
+    def __init__(
+        self, mode: str, every: int = DEFAULT_EVERY, directory: str = DEFAULT_DIR
+    ):
+        if mode not in MODES:
+            raise ValueError(f"profile mode must be one of {MODES}, got {mode!r}")
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        self.mode = mode
+        self.every = every
+        self.directory = directory
+        self.captures: list[str] = []
+        self._busy = threading.Lock()
+        self._seq = 0
+
+    @classmethod
+    def from_env(cls) -> SamplingProfiler | None:
+        mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+        if not mode:
+            return None
+        every = int(os.environ.get(PROFILE_EVERY_ENV) or DEFAULT_EVERY)
+        return cls(mode, every, os.environ.get(PROFILE_DIR_ENV) or DEFAULT_DIR)
+
+    def start(self) -> Any:
+        """Begin a capture; None if another capture is running."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        if self.mode == "cpu":
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        import tracemalloc
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        return started, tracemalloc.take_snapshot()
+
+    def stop(self, token: Any, name: str) -> str:
+        """Finish the capture started by start() and write it; returns the path."""
+        try:
+            path = self._path(name)
+            if self.mode == "cpu":
+                token.disable()
+                token.dump_stats(path)
+            else:
+                import tracemalloc
+
+                started, before = token
+                after = tracemalloc.take_snapshot()
+                if started:
+                    tracemalloc.stop()
+                stats = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+                with open(path, "w", encoding="utf-8") as fh:
+                    fh.write(f"# {name}: top allocation deltas\n")
+                    fh.writelines(f"{stat}\n" for stat in stats)
+            self.captures.append(path)
+            return path
+        finally:
+            self._busy.release()
+
+    def _path(self, name: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        self._seq += 1
+        safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+        suffix = "prof" if self.mode == "cpu" else "txt"
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(
+            self.directory, f"{safe}-{stamp}-{os.getpid()}-{self._seq}.{suffix}"
+        )
@@ -0,0 +1,71 @@
+"""
+Benchmark: per-call cost of @instrument on a trivial function.
+
+Overhead = time per instrumented call minus time per bare call, best of
+many short runs (the minimum filters out scheduler noise). Enabled
+recording must stay under 1 µs per call, for sync and async functions.
+
+Run with: pytest shared/instrumentation/tests -m slow -s
+"""
+
+import asyncio
+import time
+import timeit
+
+import pytest
+
+from shared.instrumentation import MetricsRegistry, disable, enable, instrument
+
+CALLS = 50_000
+REPEAT = 30
+BUDGET = 1e-6
+
+
+def _per_call(fn) -> float:
+    return min(timeit.repeat(fn, number=CALLS, repeat=REPEAT)) / CALLS
+
+
+def _per_await(factory) -> float:
+    async def run():
+        for _ in range(CALLS):
+            await factory()
+
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        asyncio.run(run())
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS
+
+
+@pytest.mark.slow
+def test_instrument_overhead_under_budget(capsys):
+    registry = MetricsRegistry()
+
+    def bare(x):
+        return x
+
+    async def bare_async():
+        return 1
+
+    wrapped = instrument("bench.sync", registry=registry)(bare)
+    wrapped_async = instrument("bench.async", registry=registry)(bare_async)
+
+    results = {}
+    try:
+        for state, toggle in (("disabled", disable), ("enabled", enable)):
+            toggle()
+            results["sync", state] = _per_call(lambda: wrapped(1)) - _per_call(
+                lambda: bare(1)
+            )
+            results["async", state] = _per_await(wrapped_async) - _per_await(bare_async)
+    finally:
+        disable()
+
+    with capsys.disabled():
+        print()
+        for (kind, state), overhead in results.items():
+            print(f"  {kind:>5} {state:>8}: +{overhead * 1e9:6.0f} ns/call")
+    assert registry.snapshot()["bench.sync"].calls == CALLS * REPEAT
+    assert results["sync", "enabled"] < BUDGET
+    assert results["async", "enabled"] < BUDGET
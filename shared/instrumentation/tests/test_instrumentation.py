@@ -0,0 +1,179 @@
+"""Tests for shared.instrumentation."""
+
+import asyncio
+import pstats
+import random
+
+import pytest
+
+from shared.instrumentation import (
+    LatencyHistogram,
+    MetricsRegistry,
+    SamplingProfiler,
+    disable,
+    enable,
+    instrument,
+    measure,
+    set_profiler,
+)
+from shared.instrumentation.histogram import BUCKETS, bucket_bounds, bucket_index
+
+
+@pytest.fixture
+def registry():
+    enable()
+    yield MetricsRegistry()
+    disable()
+
+
+def test_buckets_cover_values_with_bounded_error():
+    previous = 0
+    for value in [*range(5000), 10**6, 10**9, 2**40 + 12345, 2**64 - 1]:
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value <= high
+        assert high - low <= max(low, 1) / 16
+        assert previous <= index < BUCKETS
+        previous = index
+
+
+def test_percentiles_are_within_bucket_error():
+    rng = random.Random(7)  # noqa: S311
+    values = [rng.randint(1_000, 10_000_000) for _ in range(20_000)]
+    hist = LatencyHistogram()
+    for value in values:
+        hist.record(value)
+    values.sort()
+
+    assert hist.count == len(values)
+    for q in (50, 90, 99):
+        exact = values[int(len(values) * q / 100) - 1]
+        assert abs(hist.percentile(q) - exact) <= exact / 16
+    assert values[-1] <= hist.max <= values[-1] * 17 / 16
+    assert abs(hist.mean() - sum(values) / len(values)) <= hist.mean() / 16
+
+
+def test_histogram_memory_is_fixed():
+    hist = LatencyHistogram()
+    for value in range(0, 10**9, 997):
+        hist.record(value)
+    assert len(hist.counts) == BUCKETS
+    hist.clear()
+    assert hist.count == 0 and hist.max == 0 and hist.percentile(99) == 0
+
+
+def test_instrument_counts_calls_and_errors(registry):
+    @instrument(registry=registry)
+    def parse(value):
+        return int(value)
+
+    assert parse("1") == 1
+    with pytest.raises(ValueError):
+        parse("x")
+
+    snap = registry.snapshot()["test_instrument_counts_calls_and_errors.<locals>.parse"]
+    assert (snap.calls, snap.errors, snap.in_flight) == (2, 1, 0)
+    assert 0 < snap.p50 <= snap.max
+
+
+@pytest.mark.asyncio
+async def test_instrument_tracks_in_flight_coroutines(registry):
+    release = asyncio.Event()
+
+    class Service:
+        @instrument("svc.wait", registry=registry)
+        async def wait(self):
+            await release.wait()
+            return "done"
+
+    service = Service()
+    tasks = [asyncio.ensure_future(service.wait()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert registry.metric("svc.wait").in_flight == 5
+
+    release.set()
+    assert await asyncio.gather(*tasks) == ["done"] * 5
+    snap = registry.snapshot()["svc.wait"]
+    assert (snap.calls, snap.in_flight) == (5, 0)
+
+
+def test_disabled_records_nothing(registry):
+    disable()
+
+    @instrument("quiet", registry=registry)
+    def quiet():
+        return 1
+
+    assert quiet() == 1
+    with measure("quiet.block", registry=registry):
+        pass
+    assert registry.snapshot() == {}
+
+
+@pytest.mark.asyncio
+async def test_measure_blocks(registry):
+    with measure("block", registry=registry):
+        pass
+    with pytest.raises(KeyError), measure("block", registry=registry):
+        raise KeyError("x")
+    async with measure("block", registry=registry):
+        await asyncio.sleep(0)
+
+    snap = registry.to_dict()["block"]
+    assert (snap["calls"], snap["errors"]) == (3, 1)
+
+
+def test_reset_clears_counts(registry):
+    @instrument("r", registry=registry)
+    def r():
+        pass
+
+    r()
+    registry.reset()
+    assert registry.snapshot() == {}
+    r()
+    assert registry.snapshot()["r"].calls == 1
+
+
+@pytest.mark.parametrize("mode", ["cpu", "memory"])
+def test_profiler_samples_every_nth_call(registry, tmp_path, mode):
+    profiler = SamplingProfiler(mode, every=10, directory=str(tmp_path))
+    set_profiler(profiler)
+    try:
+
+        @instrument("work", registry=registry)
+        def work():
+            return [str(n) for n in range(100)]
+
+        for _ in range(25):
+            work()
+    finally:
+        set_profiler(None)
+
+    assert len(profiler.captures) == 3
+    assert registry.snapshot()["work"].calls == 25
+    if mode == "cpu":
+        stats = pstats.Stats(profiler.captures[0])
+        assert any(name == "work" for _, _, name in stats.stats)
+    else:
+        text = open(profiler.captures[0], encoding="utf-8").read()
+        assert text.startswith("# work: top allocation deltas")
+
+
+def test_profiler_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_PROFILE", raising=False)
+    assert SamplingProfiler.from_env() is None
+
+    monkeypatch.setenv("APP_PROFILE", "memory")
+    monkeypatch.setenv("APP_PROFILE_EVERY", "50")
+    monkeypatch.setenv("APP_PROFILE_DIR", str(tmp_path))
+    profiler = SamplingProfiler.from_env()
+    assert (profiler.mode, profiler.every, profiler.directory) == (
+        "memory",
+        50,
+        str(tmp_path),
+    )
+
+    monkeypatch.setenv("APP_PROFILE", "gpu")
+    with pytest.raises(ValueError):
+        SamplingProfiler.from_env()
@@ -1 +1,21 @@
-"""Shared package placeholder."""
+"""Structured, non-blocking logging for all modules."""
+
+from .formatters import JsonFormatter
+from .pipeline import (
+    BatchingHandler,
+    BoundedQueueHandler,
+    LoggingPipeline,
+    LoggingStats,
+    setup_logging,
+    shutdown_logging,
+)
+
+__all__ = [
+    "BatchingHandler",
+    "BoundedQueueHandler",
+    "JsonFormatter",
+    "LoggingPipeline",
+    "LoggingStats",
+    "setup_logging",
+    "shutdown_logging",
+]
@@ -0,0 +1,66 @@
+"""
+Structured log formatting.
+
+JsonFormatter renders one JSON object per record. It runs on the listener
+thread, so message %-formatting and JSON encoding never happen inside
+request coroutines, and never at all for records below the logger's level.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+
+# Attributes every LogRecord carries; anything else came in via extra=.
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_encode = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=str
+).encode
+
+
+class JsonFormatter(logging.Formatter):
+    """One-line JSON: ts, level, logger, msg, any extra= fields, exc.
+
+    Example:
+        >>> handler.setFormatter(JsonFormatter())
+        >>> log.info("user %s logged in", uid, extra={"request_id": rid})
+        {"ts":"2026-01-01T12:00:00.123Z","level":"info","logger":"auth",
+         "msg":"user 42 logged in","request_id":"…"}
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._second = -1
+        self._second_text = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        doc = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                doc[key] = value
+        if record.exc_info:
+            doc["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            doc["exc"] = record.exc_text
+        if record.stack_info:
+            doc["stack"] = record.stack_info
+        return _encode(doc)
+
+    def _timestamp(self, created: float) -> str:
+        # Records arrive in time order, so the per-second prefix is reused.
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_text}.{int((created - second) * 1000):03d}Z"
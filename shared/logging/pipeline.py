@@ -0,0 +1,254 @@
+"""
+Non-blocking logging pipeline.
+
+Loggers hand records to a BoundedQueueHandler, which only enqueues them.
+A QueueListener thread drains the queue into a BatchingHandler that
+formats records and writes them to the sink in batches. A full queue
+either drops the record or blocks the caller, per the overflow policy.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import IO, Literal
+
+from .formatters import JsonFormatter
+
+Overflow = Literal["drop", "block"]
+
+
+@dataclass(frozen=True)
+class LoggingStats:
+    """Counters for one pipeline."""
+
+    queued: int
+    dropped: int
+    written: int
+    batches: int
+    queue_depth: int
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue with an explicit overflow policy.
+
+    Args:
+        log_queue: A queue.Queue created with a maxsize.
+        overflow: "drop" discards the record when the queue is full;
+            "block" waits for space (up to block_timeout, then drops).
+        block_timeout: Seconds to wait under "block"; None waits forever.
+
+    Records are enqueued as-is: message formatting happens on the listener
+    thread. Pass immutable log arguments (the usual case) or format them
+    yourself before logging.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        overflow: Overflow = "drop",
+        block_timeout: float | None = None,
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"overflow must be 'drop' or 'block', not {overflow!r}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        # Updated under the handler lock (Handler.handle holds it for emit).
+        self.queued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.overflow == "drop":
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.queued += 1
+
+
+class BatchingHandler(logging.Handler):
+    """Formats records and writes them to a stream in batches.
+
+    A batch is written once batch_size lines are buffered, or as soon as
+    the source queue runs dry, so a quiet logger never holds lines back.
+    """
+
+    terminator = "\n"
+
+    def __init__(
+        self,
+        stream: IO[str],
+        source: queue.Queue | None = None,
+        batch_size: int = 256,
+    ):
+        super().__init__()
+        self.stream = stream
+        self.source = source
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+        self.written = 0
+        self.batches = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.batch_size or (
+            self.source is None or self.source.empty()
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            self.stream.write(self.terminator.join(lines) + self.terminator)
+            self.stream.flush()
+            self.written += len(lines)
+            self.batches += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for room, never drop it.
+        self.queue.put(self._sentinel)
+
+
+class LoggingPipeline:
+    """A running QueueHandler → QueueListener → BatchingHandler chain."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        handler: BoundedQueueHandler,
+        listener: _Listener,
+        sink: BatchingHandler,
+        owned_stream: IO[str] | None = None,
+    ):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self.sink = sink
+        self._owned_stream = owned_stream
+        self._stopped = False
+
+    def stats(self) -> LoggingStats:
+        return LoggingStats(
+            queued=self.handler.queued,
+            dropped=self.handler.dropped,
+            written=self.sink.written,
+            batches=self.sink.batches,
+            queue_depth=self.handler.queue.qsize(),
+        )
+
+    def stop(self) -> None:
+        """Detach from the logger, drain the queue and flush the sink."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+        self.sink.flush()
+        if self._owned_stream is not None:
+            self._owned_stream.close()
+
+
+_lock = threading.Lock()
+_active: LoggingPipeline | None = None
+
+
+def setup_logging(
+    level: str | int | None = None,
+    *,
+    logger: str | None = None,
+    stream: IO[str] | None = None,
+    path: str | Path | None = None,
+    formatter: logging.Formatter | None = None,
+    queue_size: int = 10_000,
+    overflow: Overflow = "drop",
+    block_timeout: float | None = None,
+    batch_size: int = 256,
+) -> LoggingPipeline:
+    """
+    Route a logger through a bounded queue to a batching sink thread.
+
+    Calling it again replaces the previous pipeline (which is drained
+    first). The pipeline is also stopped at interpreter exit.
+
+    Args:
+        level: Logger level; defaults to LOG_LEVEL from shared.config.
+        logger: Logger name; None configures the root logger.
+        stream: Sink stream; defaults to stderr. Ignored if path is set.
+        path: Append log lines to this file instead of a stream.
+        formatter: Defaults to JsonFormatter.
+        queue_size: Max records waiting for the sink thread.
+        overflow: "drop" or "block" when the queue is full.
+        block_timeout: Max seconds a "block" caller waits before dropping.
+        batch_size: Max lines per sink write.
+
+    Returns:
+        LoggingPipeline: Use .stats() for counters and .stop() to flush.
+
+    Example:
+        >>> pipeline = setup_logging("info", overflow="drop")
+        >>> logging.getLogger(__name__).info("ready", extra={"port": 8080})
+        >>> pipeline.stats().dropped
+        0
+    """
+    global _active
+    if level is None:
+        from shared.config import get_settings
+
+        level = get_settings().log_level
+    if isinstance(level, str):
+        level = level.upper()
+
+    owned = None
+    if path is not None:
+        stream = owned = open(path, "a", encoding="utf-8")  # noqa: SIM115
+    elif stream is None:
+        stream = sys.stderr
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    sink = BatchingHandler(stream, source=log_queue, batch_size=batch_size)
+    sink.setFormatter(formatter or JsonFormatter())
+    handler = BoundedQueueHandler(log_queue, overflow, block_timeout)
+    listener = _Listener(log_queue, sink, respect_handler_level=False)
+
+    target = logging.getLogger(logger)
+    with _lock:
+        if _active is not None:
+            _active.stop()
+        target.setLevel(level)
+        target.addHandler(handler)
+        listener.start()
+        _active = LoggingPipeline(target, handler, listener, sink, owned)
+        return _active
+
+
+def shutdown_logging() -> None:
+    """Stop the active pipeline, flushing queued records."""
+    global _active
+    with _lock:
+        if _active is not None:
+            _active.stop()
+            _active = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,108 @@
+"""
+Benchmark: p99 latency of a logging-heavy async handler.
+
+Before: a stdlib StreamHandler formatting and writing inside the coroutine.
+After: setup_logging() queue pipeline with a batching sink thread.
+
+Both write to the same sink: a file whose flush() blocks briefly, standing
+in for a pipe, a slow disk or a log shipper applying backpressure.
+
+Run with: pytest shared/logging/tests -m slow -s
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+
+import pytest
+
+from shared.logging import JsonFormatter, setup_logging, shutdown_logging
+
+REQUESTS = 1_000
+CONCURRENCY = 10
+LOGS_PER_REQUEST = 20
+FLUSH_LATENCY = 50e-6
+
+
+class SlowSink:
+    """Text file whose flush() blocks for FLUSH_LATENCY seconds."""
+
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8")  # noqa: SIM115
+
+    def write(self, text: str) -> int:
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+        time.sleep(FLUSH_LATENCY)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def _handler(log: logging.Logger, request_id: int) -> float:
+    start = time.perf_counter()
+    for step in range(LOGS_PER_REQUEST):
+        log.info("step %d of request %d", step, request_id, extra={"rid": request_id})
+        if step % 5 == 0:
+            await asyncio.sleep(0)
+    log.debug("never emitted %s", request_id)
+    return time.perf_counter() - start
+
+
+async def _latencies(log: logging.Logger) -> list[float]:
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(n):
+        async with sem:
+            return await _handler(log, n)
+
+    return sorted(await asyncio.gather(*(one(n) for n in range(REQUESTS))))
+
+
+def _p(latencies: list[float], pct: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * pct))]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_bench_handler_p99_sync_vs_queued(tmp_path):
+    """Queued logging cuts handler p99 versus synchronous stream writes."""
+    log = logging.getLogger("bench.handler")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+
+    sync_sink = SlowSink(tmp_path / "sync.log")
+    sync_handler = logging.StreamHandler(sync_sink)
+    sync_handler.setFormatter(JsonFormatter())
+    log.addHandler(sync_handler)
+    before = await _latencies(log)
+    log.removeHandler(sync_handler)
+    sync_sink.close()
+
+    queued_sink = SlowSink(tmp_path / "queued.log")
+    pipeline = setup_logging("info", logger=log.name, stream=queued_sink)
+    after = await _latencies(log)
+    shutdown_logging()
+    queued_sink.close()
+    log.propagate = True
+
+    stats = pipeline.stats()
+    lines = (tmp_path / "queued.log").read_text().count("\n")
+    print(f"\n{REQUESTS:,} requests x {LOGS_PER_REQUEST} records:")
+    for label, lat in (("StreamHandler (sync)", before), ("setup_logging()", after)):
+        print(
+            f"  {label:<22} p50 {_p(lat, 0.5) * 1e3:7.3f} ms"
+            f"  p99 {_p(lat, 0.99) * 1e3:7.3f} ms"
+            f"  mean {statistics.fmean(lat) * 1e3:7.3f} ms"
+        )
+    print(
+        f"  queued={stats.queued:,} dropped={stats.dropped:,}"
+        f" written={stats.written:,} batches={stats.batches:,}"
+    )
+
+    assert stats.written == lines == stats.queued
+    assert stats.queued + stats.dropped == REQUESTS * LOGS_PER_REQUEST
+    assert _p(after, 0.99) < _p(before, 0.99)
@@ -0,0 +1,182 @@
+"""Unit tests for shared.logging."""
+
+import io
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+from shared.logging import (
+    BatchingHandler,
+    BoundedQueueHandler,
+    JsonFormatter,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def log():
+    logger = logging.getLogger("shared.logging.tests")
+    logger.propagate = False
+    yield logger
+    shutdown_logging()
+    logger.propagate = True
+
+
+def _lines(buf: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in buf.getvalue().splitlines()]
+
+
+def test_setup_logging_writes_json_lines(log):
+    """Contract: records reach the sink as one JSON object per line."""
+    buf = io.StringIO()
+    pipeline = setup_logging("info", logger=log.name, stream=buf)
+
+    log.info("hello %s", "world", extra={"request_id": "r-1"})
+    pipeline.stop()
+
+    (line,) = _lines(buf)
+    assert line["msg"] == "hello world"
+    assert line["level"] == "info"
+    assert line["logger"] == log.name
+    assert line["request_id"] == "r-1"
+    assert line["ts"].endswith("Z")
+
+
+def test_exceptions_are_rendered(log):
+    buf = io.StringIO()
+    pipeline = setup_logging("info", logger=log.name, stream=buf)
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        log.exception("failed")
+    pipeline.stop()
+
+    (line,) = _lines(buf)
+    assert "ValueError: bad" in line["exc"]
+
+
+def test_disabled_level_never_formats_arguments(log):
+    """Records below the level are neither queued nor %-formatted."""
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted a disabled record")
+
+    buf = io.StringIO()
+    pipeline = setup_logging("warning", logger=log.name, stream=buf)
+    log.debug("value %s", Exploding())
+    log.info("value %s", Exploding())
+    pipeline.stop()
+
+    assert buf.getvalue() == ""
+    assert pipeline.stats().queued == 0
+
+
+def test_caller_does_not_format(log):
+    """Formatting happens on the listener thread, not the logging caller."""
+    formatted_on = []
+
+    class Probe:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "probe"
+
+    pipeline = setup_logging("info", logger=log.name, stream=io.StringIO())
+    log.info("%s", Probe())
+    pipeline.stop()
+
+    assert formatted_on and threading.current_thread() not in formatted_on
+
+
+def test_drop_policy_counts_dropped_records():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow="drop")
+    record = logging.makeLogRecord({"msg": "x"})
+
+    for _ in range(5):
+        handler.handle(record)
+
+    assert (handler.queued, handler.dropped) == (2, 3)
+
+
+def test_block_policy_waits_then_drops_on_timeout():
+    handler = BoundedQueueHandler(
+        queue.Queue(maxsize=1), overflow="block", block_timeout=0.01
+    )
+    record = logging.makeLogRecord({"msg": "x"})
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert (handler.queued, handler.dropped) == (1, 1)
+
+
+def test_block_policy_loses_nothing_under_load(log):
+    """With overflow="block" every record is written, even with a tiny queue."""
+    buf = io.StringIO()
+    pipeline = setup_logging(
+        "info", logger=log.name, stream=buf, queue_size=4, overflow="block"
+    )
+    for n in range(2_000):
+        log.info("n=%d", n)
+    pipeline.stop()
+
+    stats = pipeline.stats()
+    assert stats.dropped == 0
+    assert stats.written == 2_000
+    assert [line["msg"] for line in _lines(buf)] == [f"n={n}" for n in range(2_000)]
+
+
+def test_invalid_overflow_policy_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(1), overflow="spill")
+
+
+def test_sink_writes_in_batches():
+    """A backlog of records is written with far fewer stream writes."""
+
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            self.writes += 1
+            return super().write(s)
+
+    source = queue.Queue()
+    for _ in range(10):
+        source.put(None)
+    stream = CountingStream()
+    sink = BatchingHandler(stream, source=source, batch_size=4)
+    sink.setFormatter(JsonFormatter())
+
+    for n in range(10):
+        source.get()
+        sink.handle(logging.makeLogRecord({"msg": f"m{n}"}))
+
+    assert len(stream.getvalue().splitlines()) == 10
+    assert stream.writes == sink.batches == 3
+
+
+def test_setup_twice_replaces_previous_pipeline(log):
+    first_buf, second_buf = io.StringIO(), io.StringIO()
+    first = setup_logging("info", logger=log.name, stream=first_buf)
+    setup_logging("info", logger=log.name, stream=second_buf)
+
+    log.info("once")
+    shutdown_logging()
+
+    assert first.handler not in log.handlers
+    assert first_buf.getvalue() == ""
+    assert len(_lines(second_buf)) == 1
+
+
+def test_path_sink_appends_to_file(log, tmp_path):
+    target = tmp_path / "app.log"
+    pipeline = setup_logging("info", logger=log.name, path=target)
+    log.warning("to file")
+    pipeline.stop()
+
+    assert json.loads(target.read_text())["msg"] == "to file"
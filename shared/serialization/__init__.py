@@ -0,0 +1,13 @@
+"""Precompiled JSON, NDJSON and MessagePack encoders for models."""
+
+from .encoders import ModelEncoder, clear_encoder_cache, get_encoder, iter_ndjson
+from .msgpack import packb, unpackb
+
+__all__ = [
+    "ModelEncoder",
+    "clear_encoder_cache",
+    "get_encoder",
+    "iter_ndjson",
+    "packb",
+    "unpackb",
+]
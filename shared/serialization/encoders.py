@@ -0,0 +1,205 @@
+"""
+Precompiled per-model encoders.
+
+get_encoder(Model, fields) compiles, once per (model, fields), a
+pydantic-core serializer for one item and for a list of items, plus a
+generated MessagePack packer. Encoding a listing is then one call that
+reads attributes straight off the instances: no per-item dict, no generic
+json.dumps walk.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import types
+import typing
+from collections.abc import AsyncIterable, Callable, Sequence
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic_core import SchemaSerializer
+from pydantic_core import core_schema as cs
+
+from . import msgpack
+
+_SCHEMAS: dict[type, Callable[[], cs.CoreSchema]] = {
+    str: cs.str_schema,
+    bool: cs.bool_schema,
+    int: cs.int_schema,
+    float: cs.float_schema,
+    datetime: cs.datetime_schema,
+    date: cs.date_schema,
+    UUID: cs.uuid_schema,
+}
+
+_encoders: dict[tuple[type, tuple[str, ...]], ModelEncoder] = {}
+_lock = threading.Lock()
+
+
+class ModelEncoder:
+    """Encoders for one dataclass model, restricted to the given fields.
+
+    Fields must be scalars (str, bool, int, float, datetime, date, UUID,
+    optionally None). datetime, date and UUID are written as ISO 8601 /
+    canonical strings in every format.
+
+    Build through get_encoder(), which caches one encoder per model and
+    field selection.
+    """
+
+    def __init__(self, model: type, fields: Sequence[str] | None = None):
+        if not dataclasses.is_dataclass(model):
+            raise TypeError(f"{model.__name__} is not a dataclass")
+        hints = typing.get_type_hints(model)
+        names = tuple(fields or (f.name for f in dataclasses.fields(model)))
+        unknown = [n for n in names if n not in hints]
+        if unknown:
+            raise ValueError(f"{model.__name__} has no fields {unknown}")
+        self.model = model
+        self.fields = names
+        kinds = {name: _scalar(model, name, hints[name]) for name in names}
+        schema = cs.dataclass_schema(
+            model,
+            cs.dataclass_args_schema(
+                model.__name__,
+                [cs.dataclass_field(n, _schema(*kinds[n])) for n in names],
+            ),
+            list(names),
+            slots=hasattr(model, "__slots__"),
+        )
+        self._one = SchemaSerializer(schema)
+        self._many = SchemaSerializer(cs.list_schema(schema))
+        self._pack = _compile_packer(model.__name__, names, kinds)
+
+    def json(self, items: Sequence[Any]) -> bytes:
+        """A JSON array of the items, in one pydantic-core call."""
+        return self._many.to_json(items)
+
+    def json_one(self, item: Any) -> bytes:
+        return self._one.to_json(item)
+
+    def ndjson(self, items: Sequence[Any]) -> bytes:
+        """One JSON object per line, each line newline-terminated."""
+        if not items:
+            return b""
+        return b"\n".join(map(self._one.to_json, items)) + b"\n"
+
+    def msgpack(self, items: Sequence[Any]) -> bytes:
+        """A MessagePack array of maps, one per item."""
+        return self._pack(items)
+
+    def msgpack_one(self, item: Any) -> bytes:
+        return self._pack((item,))[1:]
+
+    def to_dicts(self, items: Sequence[Any]) -> list[dict[str, Any]]:
+        """Plain dicts of the selected fields (JSON-compatible values)."""
+        return self._many.to_python(items, mode="json")
+
+
+def get_encoder(model: type, fields: Sequence[str] | None = None) -> ModelEncoder:
+    """The ModelEncoder for model and fields, compiled on first use."""
+    key = (model, tuple(fields) if fields else ())
+    encoder = _encoders.get(key)
+    if encoder is None:
+        with _lock:
+            encoder = _encoders.get(key)
+            if encoder is None:
+                encoder = _encoders[key] = ModelEncoder(model, fields)
+    return encoder
+
+
+def clear_encoder_cache() -> None:
+    with _lock:
+        _encoders.clear()
+
+
+async def iter_ndjson(
+    encoder: ModelEncoder, chunks: AsyncIterable[Sequence[Any]]
+) -> AsyncIterable[bytes]:
+    """NDJSON bytes, one piece per non-empty chunk of items."""
+    async for chunk in chunks:
+        if chunk:
+            yield encoder.ndjson(chunk)
+
+
+def _scalar(model: type, name: str, hint: Any) -> tuple[type, bool]:
+    """(scalar type, nullable) of a field annotation."""
+    nullable = False
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(hint) if a is not type(None)]
+        nullable = len(args) < len(typing.get_args(hint))
+        hint = args[0] if len(args) == 1 else hint
+    if hint not in _SCHEMAS:
+        raise TypeError(
+            f"{model.__name__}.{name}: cannot encode {hint!r}; "
+            "fields must be str, bool, int, float, datetime, date or UUID"
+        )
+    return hint, nullable
+
+
+def _schema(tp: type, nullable: bool) -> cs.CoreSchema:
+    schema = _SCHEMAS[tp]()
+    return cs.nullable_schema(schema) if nullable else schema
+
+
+# Expression packing `v` for each scalar type in generated packers.
+_PACKERS = {
+    str: "_str(v)",
+    bool: "(_TRUE if v else _FALSE)",
+    int: "_int(v)",
+    float: "_float(v)",
+    datetime: "_str(v.isoformat())",
+    date: "_str(v.isoformat())",
+    UUID: "_str(str(v))",
+}
+
+
+def _compile_packer(
+    model_name: str, names: tuple[str, ...], kinds: dict[str, tuple[type, bool]]
+) -> Callable[[Sequence[Any]], bytes]:
+    """Generate `pack(items) -> bytes` with the field loop unrolled."""
+    lines = [
+        "def pack(items):",
+        "    out = bytearray(_array_header(len(items)))",
+        "    for item in items:",
+        "        out += _MAP",
+    ]
+    for n, name in enumerate(names):
+        tp, nullable = kinds[name]
+        lines.append(f"        out += _K{n}")
+        lines.append(f"        v = item.{name}")
+        if tp is str and not nullable:
+            # Inline the common case: short strings take a one-byte header.
+            lines += [
+                "        b = v.encode()",
+                "        out += _FIXSTR[len(b)] if len(b) < 32 else _header(len(b))",
+                "        out += b",
+            ]
+            continue
+        value = _PACKERS[tp]
+        if nullable:
+            lines.append(f"        out += _NIL if v is None else {value}")
+        else:
+            lines.append(f"        out += {value}")
+    lines.append("    return bytes(out)")
+    namespace: dict[str, Any] = {
+        "_array_header": msgpack.array_header,
+        "_MAP": msgpack.map_header(len(names)),
+        "_FIXSTR": msgpack.FIXSTR,
+        "_header": msgpack.str_header,
+        "_str": msgpack.pack_str,
+        "_int": msgpack.pack_int,
+        "_float": msgpack.pack_float,
+        "_NIL": msgpack.NIL,
+        "_TRUE": msgpack.TRUE,
+        "_FALSE": msgpack.FALSE,
+    }
+    for n, name in enumerate(names):
+        namespace[f"_K{n}"] = msgpack.pack_str(name)
+    exec(  # noqa: S102 - source built above from validated field names
+        compile("\n".join(lines), f"<msgpack packer for {model_name}>", "exec"),
+        namespace,
+    )
+    return namespace["pack"]
@@ -0,0 +1,216 @@
+"""
+Minimal MessagePack codec (no third-party dependency).
+
+packb() encodes None, bool, int, float, str, bytes, list/tuple and dict
+(plus datetime, date and UUID, written as strings the way the JSON
+encoders write them). unpackb() decodes that same subset. Model encoders
+generate specialised packers on top of these primitives (see encoders.py).
+"""
+
+from __future__ import annotations
+
+import struct
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+NIL = b"\xc0"
+FALSE = b"\xc2"
+TRUE = b"\xc3"
+
+_double = struct.Struct(">d").pack
+_u8 = struct.Struct(">B").pack
+_u16 = struct.Struct(">H").pack
+_u32 = struct.Struct(">I").pack
+_u64 = struct.Struct(">Q").pack
+_i8 = struct.Struct(">b").pack
+_i16 = struct.Struct(">h").pack
+_i32 = struct.Struct(">i").pack
+_i64 = struct.Struct(">q").pack
+
+# Single-byte headers for strings shorter than 32 bytes.
+FIXSTR = [bytes([0xA0 | n]) for n in range(32)]
+
+
+def str_header(size: int) -> bytes:
+    if size < 32:
+        return FIXSTR[size]
+    if size < 0x100:
+        return b"\xd9" + _u8(size)
+    if size < 0x10000:
+        return b"\xda" + _u16(size)
+    return b"\xdb" + _u32(size)
+
+
+def pack_str(value: str) -> bytes:
+    data = value.encode()
+    return str_header(len(data)) + data
+
+
+def pack_int(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return _u8(value)
+    if -32 <= value < 0:
+        return _i8(value)
+    if value >= 0:
+        if value < 0x100:
+            return b"\xcc" + _u8(value)
+        if value < 0x10000:
+            return b"\xcd" + _u16(value)
+        if value < 0x100000000:
+            return b"\xce" + _u32(value)
+        return b"\xcf" + _u64(value)
+    if value >= -0x80:
+        return b"\xd0" + _i8(value)
+    if value >= -0x8000:
+        return b"\xd1" + _i16(value)
+    if value >= -0x80000000:
+        return b"\xd2" + _i32(value)
+    return b"\xd3" + _i64(value)
+
+
+def pack_float(value: float) -> bytes:
+    return b"\xcb" + _double(value)
+
+
+def array_header(size: int) -> bytes:
+    if size < 16:
+        return _u8(0x90 | size)
+    if size < 0x10000:
+        return b"\xdc" + _u16(size)
+    return b"\xdd" + _u32(size)
+
+
+def map_header(size: int) -> bytes:
+    if size < 16:
+        return _u8(0x80 | size)
+    if size < 0x10000:
+        return b"\xde" + _u16(size)
+    return b"\xdf" + _u32(size)
+
+
+def bin_header(size: int) -> bytes:
+    if size < 0x100:
+        return b"\xc4" + _u8(size)
+    if size < 0x10000:
+        return b"\xc5" + _u16(size)
+    return b"\xc6" + _u32(size)
+
+
+def packb(value: Any) -> bytes:
+    """Encode one value (recursively for lists, tuples and dicts)."""
+    out = bytearray()
+    _pack_into(out, value)
+    return bytes(out)
+
+
+def _pack_into(out: bytearray, value: Any) -> None:
+    if value is None:
+        out += NIL
+    elif value is True:
+        out += TRUE
+    elif value is False:
+        out += FALSE
+    elif isinstance(value, int):
+        out += pack_int(value)
+    elif isinstance(value, float):
+        out += pack_float(value)
+    elif isinstance(value, str):
+        out += pack_str(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        out += bin_header(len(data))
+        out += data
+    elif isinstance(value, (list, tuple)):
+        out += array_header(len(value))
+        for item in value:
+            _pack_into(out, item)
+    elif isinstance(value, dict):
+        out += map_header(len(value))
+        for key, item in value.items():
+            _pack_into(out, key)
+            _pack_into(out, item)
+    elif isinstance(value, (datetime, date)):
+        out += pack_str(value.isoformat())
+    elif isinstance(value, UUID):
+        out += pack_str(str(value))
+    else:
+        raise TypeError(f"cannot pack {type(value).__name__} as MessagePack")
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode one MessagePack value (the subset packb() writes)."""
+    value, end = _unpack(memoryview(data), 0)
+    if end != len(data):
+        raise ValueError(f"{len(data) - end} trailing bytes after MessagePack value")
+    return value
+
+
+_FIXED = {0xC0: None, 0xC2: False, 0xC3: True}
+# code -> (struct format, size) for scalar types with fixed-width payloads.
+_SCALARS = {
+    0xCA: (">f", 4),
+    0xCB: (">d", 8),
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+# code -> length-prefix width for str (0xd9-0xdb) and bin (0xc4-0xc6).
+_SIZED = {0xD9: 1, 0xDA: 2, 0xDB: 4, 0xC4: 1, 0xC5: 2, 0xC6: 4}
+_CONTAINERS = {0xDC: 2, 0xDD: 4, 0xDE: 2, 0xDF: 4}
+
+
+def _length(data: memoryview, pos: int, width: int) -> tuple[int, int]:
+    return int.from_bytes(data[pos : pos + width], "big"), pos + width
+
+
+def _unpack(data: memoryview, pos: int) -> tuple[Any, int]:
+    code = data[pos]
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= 0xE0:
+        return code - 0x100, pos
+    if 0xA0 <= code <= 0xBF:
+        end = pos + (code & 0x1F)
+        return str(data[pos:end], "utf-8"), end
+    if 0x90 <= code <= 0x9F:
+        return _unpack_array(data, pos, code & 0x0F)
+    if 0x80 <= code <= 0x8F:
+        return _unpack_map(data, pos, code & 0x0F)
+    if code in _FIXED:
+        return _FIXED[code], pos
+    if code in _SCALARS:
+        fmt, size = _SCALARS[code]
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+    if code in _SIZED:
+        size, pos = _length(data, pos, _SIZED[code])
+        raw = data[pos : pos + size]
+        return (str(raw, "utf-8") if code >= 0xD9 else bytes(raw)), pos + size
+    if code in _CONTAINERS:
+        size, pos = _length(data, pos, _CONTAINERS[code])
+        if code <= 0xDD:
+            return _unpack_array(data, pos, size)
+        return _unpack_map(data, pos, size)
+    raise ValueError(f"unsupported MessagePack type 0x{code:02x}")
+
+
+def _unpack_array(data: memoryview, pos: int, size: int) -> tuple[list, int]:
+    items = []
+    for _ in range(size):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(data: memoryview, pos: int, size: int) -> tuple[dict, int]:
+    result = {}
+    for _ in range(size):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
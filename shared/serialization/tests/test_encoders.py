@@ -0,0 +1,185 @@
+"""Unit tests for shared.serialization."""
+
+import asyncio
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Optional
+from uuid import UUID
+
+import pytest
+
+from shared.serialization import (
+    ModelEncoder,
+    clear_encoder_cache,
+    get_encoder,
+    iter_ndjson,
+    packb,
+    unpackb,
+)
+from shared.validation import Name
+
+
+@dataclass(slots=True)
+class Row:
+    id: str
+    name: Name
+    count: int = 0
+    ratio: float = 0.5
+    flag: bool = False
+    day: date = date(2024, 1, 2)
+    uid: UUID = UUID(int=7)
+    at: datetime = datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+    note: str | None = None
+    rank: Optional[int] = None  # noqa: UP045 - typing.Union form is supported too
+
+
+@dataclass
+class Nested:
+    id: str
+    tags: list[str] = field(default_factory=list)
+
+
+ROWS = [
+    Row("a", "plain"),
+    Row("b", 'quote " and },{"x" inside', count=-40, ratio=-1e300, flag=True),
+    Row("c", "ünïcode ✓ " * 10, count=2**40, note="long " * 20, rank=3),
+]
+
+
+def _as_json(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "count": row.count,
+        "ratio": row.ratio,
+        "flag": row.flag,
+        "day": row.day.isoformat(),
+        "uid": str(row.uid),
+        "at": "2024-01-02T03:04:05Z",
+        "note": row.note,
+        "rank": row.rank,
+    }
+
+
+def test_json_matches_model_fields():
+    encoder = get_encoder(Row)
+    assert json.loads(encoder.json(ROWS)) == [_as_json(r) for r in ROWS]
+    assert json.loads(encoder.json_one(ROWS[1])) == _as_json(ROWS[1])
+    assert encoder.json([]) == b"[]"
+
+
+def test_field_selection_and_order():
+    encoder = get_encoder(Row, ("name", "id"))
+    assert encoder.json(ROWS[:1]) == b'[{"name":"plain","id":"a"}]'
+    assert encoder.to_dicts(ROWS[:1]) == [{"name": "plain", "id": "a"}]
+
+
+def test_ndjson_splits_objects_not_strings():
+    encoder = get_encoder(Row, ("id", "name", "note"))
+    data = encoder.ndjson(ROWS)
+
+    lines = data.decode().splitlines()
+    assert data.endswith(b"\n")
+    assert [json.loads(line) for line in lines] == json.loads(encoder.json(ROWS))
+    assert encoder.ndjson([]) == b""
+
+
+def test_ndjson_keeps_braces_and_commas_inside_strings():
+    encoder = get_encoder(Row, ("id", "name", "note"))
+    rows = [
+        Row("a", "x},{", note='},{"id":"b"}'),
+        Row("b", "{,}", note="}\n{"),
+    ]
+
+    lines = encoder.ndjson(rows).decode().splitlines()
+
+    assert [json.loads(line) for line in lines] == encoder.to_dicts(rows)
+
+
+def test_msgpack_round_trips_like_json():
+    encoder = get_encoder(Row)
+    decoded = unpackb(encoder.msgpack(ROWS))
+    for row in decoded:
+        row["at"] = row["at"].replace("+00:00", "Z")
+    assert decoded == json.loads(encoder.json(ROWS))
+    assert unpackb(encoder.msgpack_one(ROWS[0]))["id"] == "a"
+
+
+def test_msgpack_long_strings_and_many_items():
+    encoder = get_encoder(Row, ("id", "name"))
+    rows = [Row(str(n), "x" * (n * 37 % 70_000 + 1)) for n in range(40)]
+    assert unpackb(encoder.msgpack(rows)) == encoder.to_dicts(rows)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        0,
+        127,
+        128,
+        -1,
+        -32,
+        -33,
+        255,
+        65_536,
+        2**63 - 1,
+        -(2**63),
+        1.5,
+        "",
+        "s" * 31,
+        "s" * 300,
+        b"\x00\x01",
+        list(range(20)),
+        {"k": [1, {"n": None}]},
+        {str(n): n for n in range(20)},
+    ],
+)
+def test_packb_unpackb_round_trip(value):
+    assert unpackb(packb(value)) == value
+
+
+def test_packb_rejects_unknown_types_and_unpackb_trailing_bytes():
+    with pytest.raises(TypeError):
+        packb(object())
+    with pytest.raises(ValueError):
+        unpackb(packb(1) + b"\x00")
+    assert math.isnan(unpackb(packb(float("nan"))))
+
+
+def test_encoders_are_cached_per_model_and_fields():
+    assert get_encoder(Row, ("id",)) is get_encoder(Row, ["id"])
+    assert get_encoder(Row, ("id",)) is not get_encoder(Row, ("id", "name"))
+    first = get_encoder(Row)
+    clear_encoder_cache()
+    assert get_encoder(Row) is not first
+
+
+def test_rejects_unsupported_models_and_fields():
+    with pytest.raises(TypeError, match="tags"):
+        ModelEncoder(Nested)
+    with pytest.raises(ValueError):
+        ModelEncoder(Row, ("id", "missing"))
+    with pytest.raises(TypeError):
+        ModelEncoder(dict)
+    assert json.loads(ModelEncoder(Nested, ("id",)).json([Nested("n")])) == [
+        {"id": "n"}
+    ]
+
+
+def test_iter_ndjson_encodes_each_chunk():
+    encoder = get_encoder(Row, ("id",))
+
+    async def chunks():
+        yield ROWS[:2]
+        yield []
+        yield ROWS[2:]
+
+    async def collect():
+        return [c async for c in iter_ndjson(encoder, chunks())]
+
+    assert asyncio.run(collect()) == [b'{"id":"a"}\n{"id":"b"}\n', b'{"id":"c"}\n']
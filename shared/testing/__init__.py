@@ -1 +1,24 @@
-"""Shared package placeholder."""
+"""Test utilities: benchmark harness and bulk data factories."""
+
+from shared.utils import uuid4_strings
+
+from .bench import (
+    Baseline,
+    BenchmarkRegressionError,
+    BenchStats,
+    arun_benchmark,
+    run_benchmark,
+)
+from .factories import build_many, sequential_names, timestamps
+
+__all__ = [
+    "Baseline",
+    "BenchStats",
+    "BenchmarkRegressionError",
+    "arun_benchmark",
+    "build_many",
+    "run_benchmark",
+    "sequential_names",
+    "timestamps",
+    "uuid4_strings",
+]
@@ -0,0 +1,194 @@
+"""
+Benchmark harness: warmup, repeated timed rounds, summary statistics and a
+JSON baseline to compare runs against.
+
+Each round optionally runs an untimed setup first, then times one call of
+the benchmarked function. A round can stand for many operations (ops), in
+which case statistics are per operation.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from shared.exceptions import AppError
+
+BASELINE_VERSION = 1
+
+
+class BenchmarkRegressionError(AppError):
+    """A benchmark's median is slower than its baseline beyond the threshold."""
+
+    def __init__(self, name: str, ratio: float, message: str):
+        super().__init__(message)
+        self.name = name
+        self.ratio = ratio
+
+
+@dataclass(frozen=True)
+class BenchStats:
+    """Timings of one benchmark, in seconds per operation."""
+
+    name: str
+    rounds: int
+    ops: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stdev: float
+
+    @classmethod
+    def from_samples(cls, name: str, samples: list[float], ops: int = 1) -> BenchStats:
+        per_op = [s / ops for s in samples]
+        return cls(
+            name=name,
+            rounds=len(per_op),
+            ops=ops,
+            min=min(per_op),
+            max=max(per_op),
+            mean=statistics.fmean(per_op),
+            median=statistics.median(per_op),
+            stdev=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        )
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.median if self.median else float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def describe(self) -> str:
+        return (
+            f"{self.name}: median {_fmt(self.median)}/op"
+            f" (min {_fmt(self.min)}, stdev {_fmt(self.stdev)},"
+            f" {self.rounds} rounds x {self.ops:,} ops)"
+        )
+
+
+def run_benchmark(
+    name: str,
+    fn: Callable[[], Any],
+    *,
+    rounds: int = 5,
+    warmup: int = 1,
+    ops: int = 1,
+    setup: Callable[[], Any] | None = None,
+) -> BenchStats:
+    """Time fn() over warmup + rounds calls; only the rounds are kept."""
+    _check(rounds, warmup, ops)
+    samples = []
+    for n in range(warmup + rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if n >= warmup:
+            samples.append(elapsed)
+    return BenchStats.from_samples(name, samples, ops)
+
+
+async def arun_benchmark(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    rounds: int = 5,
+    warmup: int = 1,
+    ops: int = 1,
+    setup: Callable[[], Awaitable[Any] | Any] | None = None,
+) -> BenchStats:
+    """run_benchmark for coroutine functions (setup may be sync or async)."""
+    _check(rounds, warmup, ops)
+    samples = []
+    for n in range(warmup + rounds):
+        if setup is not None:
+            result = setup()
+            if hasattr(result, "__await__"):
+                await result
+        start = time.perf_counter()
+        await fn()
+        elapsed = time.perf_counter() - start
+        if n >= warmup:
+            samples.append(elapsed)
+    return BenchStats.from_samples(name, samples, ops)
+
+
+class Baseline:
+    """Stored medians by benchmark name, in a JSON file.
+
+    Missing or unreadable files load as empty: the first run has nothing
+    to compare against.
+    """
+
+    def __init__(self, path: str | os.PathLike, entries: dict[str, dict] | None = None):
+        self.path = os.fspath(path)
+        self.entries: dict[str, dict] = entries or {}
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Baseline:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != BASELINE_VERSION:
+            return cls(path)
+        return cls(path, data.get("benchmarks", {}))
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"version": BASELINE_VERSION, "benchmarks": self.entries},
+                fh,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp, self.path)
+
+    def record(self, stats: BenchStats) -> None:
+        self.entries[stats.name] = stats.to_dict()
+
+    def ratio(self, stats: BenchStats) -> float | None:
+        """Current median / baseline median; None without a baseline."""
+        entry = self.entries.get(stats.name)
+        if not entry or not entry.get("median"):
+            return None
+        return stats.median / entry["median"]
+
+    def check(self, stats: BenchStats, threshold: float) -> float | None:
+        """Raise BenchmarkRegressionError if stats regressed beyond threshold.
+
+        threshold is the allowed slowdown, e.g. 0.25 allows 25%.
+        """
+        ratio = self.ratio(stats)
+        if ratio is not None and ratio > 1 + threshold:
+            raise BenchmarkRegressionError(
+                stats.name,
+                ratio,
+                f"{stats.name} regressed {ratio:.2f}x: median {_fmt(stats.median)}"
+                f" vs baseline {_fmt(self.entries[stats.name]['median'])}"
+                f" (threshold {threshold:.0%})",
+            )
+        return ratio
+
+
+def _check(rounds: int, warmup: int, ops: int) -> None:
+    if rounds < 1 or warmup < 0 or ops < 1:
+        raise ValueError("need rounds >= 1, warmup >= 0 and ops >= 1")
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
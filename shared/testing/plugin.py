@@ -0,0 +1,123 @@
+"""
+pytest plugin: the ``benchmark`` fixture and baseline regression checks.
+
+Enabled for the whole repo by the root conftest.py. Tests that use the
+fixture are marked ``slow`` automatically, so default runs skip them
+(``addopts`` in pyproject.toml passes ``-m "not slow"``; ``-m slow`` on
+the command line overrides it).
+
+Options:
+    --bench-baseline PATH   Baseline JSON (default .cache/benchmarks.json)
+    --bench-threshold F     Allowed median slowdown before failing (0.25)
+    --bench-save            Write this run's results into the baseline
+
+Run with: pytest backend/modules/_example/tests/benchmarks -m slow -s
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from .bench import (
+    Baseline,
+    BenchmarkRegressionError,
+    BenchStats,
+    arun_benchmark,
+    run_benchmark,
+)
+
+DEFAULT_BASELINE = os.path.join(".cache", "benchmarks.json")
+DEFAULT_THRESHOLD = 0.25
+
+_RESULTS = pytest.StashKey[list]()
+_BASELINE = pytest.StashKey[Baseline]()
+
+
+class BenchmarkFixture:
+    """Runs benchmarks for one test and checks them against the baseline."""
+
+    def __init__(self, config: pytest.Config):
+        self._config = config
+        self._baseline = config.stash[_BASELINE]
+        self._threshold = config.getoption("bench_threshold")
+        self.results: list[BenchStats] = []
+
+    def __call__(self, name: str, fn: Callable[[], Any], **options: Any) -> BenchStats:
+        """Benchmark a sync callable (options: rounds, warmup, ops, setup)."""
+        return self._finish(run_benchmark(name, fn, **options))
+
+    async def run_async(
+        self, name: str, fn: Callable[[], Awaitable[Any]], **options: Any
+    ) -> BenchStats:
+        """Benchmark a coroutine function."""
+        return self._finish(await arun_benchmark(name, fn, **options))
+
+    def _finish(self, stats: BenchStats) -> BenchStats:
+        self.results.append(stats)
+        self._config.stash[_RESULTS].append(stats)
+        try:
+            self._baseline.check(stats, self._threshold)
+        except BenchmarkRegressionError as exc:
+            pytest.fail(str(exc), pytrace=False)
+        return stats
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--bench-baseline",
+        default=DEFAULT_BASELINE,
+        help=f"benchmark baseline JSON file (default {DEFAULT_BASELINE})",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed median slowdown vs baseline, e.g. 0.25 for 25%%",
+    )
+    group.addoption(
+        "--bench-save",
+        action="store_true",
+        help="store this run's benchmark results as the new baseline",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption("bench_baseline")
+    if not os.path.isabs(path):
+        path = os.path.join(str(config.rootpath), path)
+    config.stash[_BASELINE] = Baseline.load(path)
+    config.stash[_RESULTS] = []
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.slow)
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> BenchmarkFixture:
+    return BenchmarkFixture(request.config)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    results = config.stash.get(_RESULTS, [])
+    if not results:
+        return
+    baseline = config.stash[_BASELINE]
+    terminalreporter.section("benchmarks")
+    for stats in results:
+        ratio = baseline.ratio(stats)
+        versus = f"  {ratio:.2f}x baseline" if ratio is not None else ""
+        terminalreporter.write_line(stats.describe() + versus)
+    if config.getoption("bench_save"):
+        for stats in results:
+            baseline.record(stats)
+        baseline.save()
+        terminalreporter.write_line(f"baseline saved to {baseline.path}")
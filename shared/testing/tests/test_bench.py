@@ -0,0 +1,154 @@
+"""Tests for shared.testing: harness, baseline, factories and pytest plugin."""
+
+import dataclasses
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from shared.testing import (
+    Baseline,
+    BenchmarkRegressionError,
+    BenchStats,
+    arun_benchmark,
+    build_many,
+    run_benchmark,
+    sequential_names,
+    timestamps,
+    uuid4_strings,
+)
+
+pytest_plugins = ["pytester"]
+
+
+def test_run_benchmark_warms_up_and_sets_up_each_round():
+    calls = []
+    stats = run_benchmark(
+        "append",
+        lambda: calls.append("run"),
+        rounds=3,
+        warmup=2,
+        ops=10,
+        setup=lambda: calls.append("setup"),
+    )
+
+    assert calls == ["setup", "run"] * 5
+    assert (stats.name, stats.rounds, stats.ops) == ("append", 3, 10)
+    assert 0 <= stats.min <= stats.median <= stats.max
+
+
+@pytest.mark.asyncio
+async def test_arun_benchmark_accepts_async_setup():
+    calls = []
+
+    async def setup():
+        calls.append("setup")
+
+    async def fn():
+        calls.append("run")
+
+    stats = await arun_benchmark("a", fn, rounds=2, warmup=0, setup=setup)
+    assert calls == ["setup", "run"] * 2
+    assert stats.rounds == 2
+
+
+def test_stats_are_per_op():
+    stats = BenchStats.from_samples("x", [2.0, 4.0, 6.0], ops=2)
+    assert (stats.min, stats.median, stats.max, stats.mean) == (1.0, 2.0, 3.0, 2.0)
+    assert stats.stdev == 1.0
+    assert stats.ops_per_second == 0.5
+
+
+def test_baseline_round_trip_and_regression(tmp_path):
+    path = tmp_path / "sub" / "baseline.json"
+    assert Baseline.load(path).entries == {}
+
+    baseline = Baseline(path)
+    baseline.record(BenchStats.from_samples("op", [1.0, 1.0]))
+    baseline.save()
+    loaded = Baseline.load(path)
+
+    assert loaded.check(BenchStats.from_samples("op", [1.2]), 0.25) == 1.2
+    assert loaded.check(BenchStats.from_samples("new", [9.0]), 0.25) is None
+    with pytest.raises(BenchmarkRegressionError) as exc:
+        loaded.check(BenchStats.from_samples("op", [1.3]), 0.25)
+    assert exc.value.name == "op" and exc.value.ratio == pytest.approx(1.3)
+
+
+def test_baseline_ignores_unreadable_files(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text("{not json")
+    assert Baseline.load(path).entries == {}
+    path.write_text(json.dumps({"version": 99, "benchmarks": {"a": {}}}))
+    assert Baseline.load(path).entries == {}
+
+
+@dataclasses.dataclass(slots=True)
+class Row:
+    id: str
+    name: str
+    status: str = "active"
+    created_at: datetime = dataclasses.field(default_factory=datetime.utcnow)
+
+
+def test_build_many_uses_columns_constants_and_defaults():
+    rows = build_many(Row, 3, id=uuid4_strings(3), name=sequential_names(3, "r"))
+
+    assert [r.name for r in rows] == ["r-0", "r-1", "r-2"]
+    assert {r.status for r in rows} == {"active"}
+    assert all(isinstance(r.created_at, datetime) for r in rows)
+    assert build_many(Row, 2, id="x", name="y", status="archived")[1].status == (
+        "archived"
+    )
+
+
+def test_build_many_rejects_bad_columns():
+    with pytest.raises(ValueError):
+        build_many(Row, 3, id=["a"], name="n")
+    with pytest.raises(TypeError):
+        build_many(Row, 1, id="a", name="n", colour="red")
+    with pytest.raises(TypeError):
+        build_many(Row, 1, id="a")
+
+
+def test_uuid4_strings_are_valid_and_unique():
+    ids = uuid4_strings(1000)
+    assert len(set(ids)) == 1000
+    assert all(uuid.UUID(i).version == 4 and str(uuid.UUID(i)) == i for i in ids)
+
+
+def test_timestamps_increase():
+    stamps = timestamps(5)
+    assert stamps == sorted(stamps) and len(set(stamps)) == 5
+
+
+PLUGIN_TEST = """
+import time
+
+def test_sleep(benchmark):
+    benchmark("sleep", lambda: time.sleep(SECONDS), rounds=3, warmup=0)
+"""
+
+
+def test_plugin_saves_baseline_and_fails_on_regression(pytester):
+    pytester.makeconftest('pytest_plugins = ["shared.testing.plugin"]')
+    baseline = pytester.path / "baseline.json"
+    pytester.makepyfile(test_sleepy=PLUGIN_TEST.replace("SECONDS", "0.001"))
+
+    # Benchmark tests are marked slow: deselected by -m "not slow".
+    result = pytester.runpytest("-m", "not slow", f"--bench-baseline={baseline}")
+    result.assert_outcomes(deselected=1)
+
+    result = pytester.runpytest(f"--bench-baseline={baseline}", "--bench-save")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*sleep: median*", "baseline saved to*"])
+    assert "sleep" in json.loads(baseline.read_text())["benchmarks"]
+
+    pytester.makepyfile(test_sleepy=PLUGIN_TEST.replace("SECONDS", "0.02"))
+    result = pytester.runpytest(f"--bench-baseline={baseline}")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*sleep regressed*"])
+
+    result = pytester.runpytest(f"--bench-baseline={baseline}", "--bench-threshold=50")
+    result.assert_outcomes(passed=1)
@@ -1 +1,12 @@
-"""Shared package placeholder."""
+"""General-purpose helpers for all modules."""
+
+from .cache import AsyncTTLCache, CachedFunction, CacheStats, async_cached
+from .ids import uuid4_strings
+
+__all__ = [
+    "AsyncTTLCache",
+    "CacheStats",
+    "CachedFunction",
+    "async_cached",
+    "uuid4_strings",
+]
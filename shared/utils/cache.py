@@ -0,0 +1,296 @@
+"""
+Async caching: LRU + TTL with single-flight loads.
+
+AsyncTTLCache maps keys to values with least-recently-used eviction, an
+optional time-to-live and an optional byte budget. Concurrent misses for
+the same key share one load. @async_cached wraps a coroutine function (or
+method, one cache per instance) in such a cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for one cache."""
+
+    hits: int
+    misses: int
+    loads: int
+    coalesced: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AsyncTTLCache(Generic[V]):
+    """LRU cache with optional TTL and byte budget, safe for asyncio.
+
+    Args:
+        maxsize: Max entries; the least recently used is evicted first.
+        ttl: Seconds an entry stays valid after it is stored; None never
+            expires.
+        max_bytes: Optional budget over sizeof(value) summed across entries.
+        sizeof: Size estimate used with max_bytes (default sys.getsizeof,
+            which is shallow: pass a deep estimate for nested values).
+        clock: Monotonic time source (injectable for tests).
+
+    A miss that arrives while the same key is already loading awaits that
+    load instead of starting another (single flight). A key invalidated
+    mid-load is not stored when the load finishes.
+
+    Example:
+        >>> cache = AsyncTTLCache(maxsize=10_000, ttl=30.0)
+        >>> item = await cache.get_or_load(item_id, lambda: repo.get(item_id))
+        >>> cache.invalidate(item_id)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        *,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        # key -> (value, expires_at or None, nbytes); oldest first.
+        self._entries: OrderedDict[Hashable, tuple[V, float | None, int]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        """The cached value, or default if absent or expired (no load)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at, _ = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            self._drop(key)
+            self._expirations += 1
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store a value (replacing any entry) and evict down to the limits."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        nbytes = self._sizeof(value) if self.max_bytes is not None else 0
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        self._entries[key] = (value, expires_at, nbytes)
+        self._bytes += nbytes
+        self._evict()
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[V]]) -> V:
+        """The cached value for key, loading it (once) on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self._hits += 1
+            return value
+        self._misses += 1
+        future = self._inflight.get(key)
+        if future is None:
+            self._loads += 1
+            future = asyncio.ensure_future(load())
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._loaded, key))
+        else:
+            self._coalesced += 1
+        # Shielded: a cancelled caller must not cancel the shared load.
+        return await asyncio.shield(future)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop key (and discard any in-flight load for it)."""
+        self._inflight.pop(key, None)
+        if key in self._entries:
+            self._drop(key)
+            self._invalidations += 1
+            return True
+        return False
+
+    def invalidate_all(self) -> None:
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._inflight.clear()
+        self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            loads=self._loads,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+            bytes=self._bytes,
+        )
+
+    def _loaded(self, key: Hashable, future: asyncio.Future) -> None:
+        # Only the load still registered for key may fill it; an
+        # invalidation during the load unregistered it.
+        if self._inflight.get(key) is not future:
+            return
+        del self._inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.set(key, future.result())
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while len(entries) > self.maxsize or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, _, nbytes) = entries.popitem(last=False)
+            self._bytes -= nbytes
+            self._evictions += 1
+
+
+class CachedFunction:
+    """A coroutine function wrapped in an AsyncTTLCache (see async_cached).
+
+    On a class, each instance gets its own cache the first time the method
+    is looked up on it.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        options: dict[str, Any],
+        instance: Any = None,
+    ):
+        self.fn = fn
+        self.options = options
+        self.cache: AsyncTTLCache = AsyncTTLCache(**options)
+        self._instance = instance
+        self._signature = inspect.signature(fn)
+        # Positional parameters a call must pass to skip key normalization.
+        self._arity = sum(
+            p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+            for p in self._signature.parameters.values()
+        ) - (instance is not None)
+        self._name = fn.__name__
+        functools.update_wrapper(self, fn)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> CachedFunction:
+        if instance is None or self._instance is not None:
+            return self
+        bound = CachedFunction(self.fn, self.options, instance)
+        # Later lookups find the bound wrapper in the instance dict directly.
+        instance.__dict__[self._name] = bound
+        return bound
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = self._key(args, kwargs)
+        if self._instance is not None:
+            args = (self._instance, *args)
+        return await self.cache.get_or_load(key, lambda: self.fn(*args, **kwargs))
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> bool:
+        """Drop the entry for these call arguments."""
+        return self.cache.invalidate(self._key(args, kwargs))
+
+    def invalidate_all(self) -> None:
+        self.cache.invalidate_all()
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
+
+    def _key(self, args: tuple, kwargs: dict) -> Hashable:
+        if kwargs or len(args) != self._arity:
+            # Normalize to the all-positional form (defaults applied), so
+            # f(1), f(1, b=2) and f(a=1) share an entry when b defaults to 2.
+            if self._instance is not None:
+                args = (self._instance, *args)
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            args = bound.args[1:] if self._instance is not None else bound.args
+            if bound.kwargs:
+                return args + tuple(sorted(bound.kwargs.items()))
+        return args[0] if len(args) == 1 else args
+
+
+def async_cached(
+    maxsize: int = 1024,
+    ttl: float | None = None,
+    *,
+    max_bytes: int | None = None,
+    sizeof: Callable[[Any], int] = sys.getsizeof,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[..., Awaitable[V]]], CachedFunction]:
+    """
+    Cache an async function's results by its arguments.
+
+    Options are those of AsyncTTLCache. The wrapper exposes .invalidate(*args),
+    .invalidate_all(), .stats() and .cache. Exceptions are never cached.
+
+    Example:
+        >>> class ExampleService:
+        ...     @async_cached(maxsize=10_000, ttl=30.0)
+        ...     async def get_item(self, item_id: str): ...
+        ...
+        ...     async def delete_item(self, item_id: str):
+        ...         ...
+        ...         self.get_item.invalidate(item_id)
+    """
+    options = {
+        "maxsize": maxsize,
+        "ttl": ttl,
+        "max_bytes": max_bytes,
+        "sizeof": sizeof,
+        "clock": clock,
+    }
+
+    def decorate(fn: Callable[..., Awaitable[V]]) -> CachedFunction:
+        return CachedFunction(fn, options)
+
+    return decorate
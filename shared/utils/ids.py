@@ -0,0 +1,24 @@
+"""
+Bulk id generation.
+
+uuid4_strings draws the random bits for a whole batch from one urandom
+call and formats them from a single hex string, instead of one
+uuid.uuid4() object per id.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def uuid4_strings(count: int) -> list[str]:
+    """count random (version 4) UUID strings from one urandom call."""
+    raw = bytearray(os.urandom(16 * count))
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+    h = raw.hex()
+    return [
+        f"{h[i : i + 8]}-{h[i + 8 : i + 12]}-{h[i + 12 : i + 16]}"
+        f"-{h[i + 16 : i + 20]}-{h[i + 20 : i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
@@ -0,0 +1,182 @@
+"""Tests for shared.utils.cache."""
+
+import asyncio
+
+import pytest
+
+from shared.utils import AsyncTTLCache, async_cached
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Backend:
+    """Counts loads; each load yields to the loop so callers overlap."""
+
+    def __init__(self):
+        self.calls: list = []
+
+    async def load(self, key):
+        self.calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"value-{key}"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_under_gather():
+    """1000 concurrent misses for one key cause exactly one backend call."""
+    backend = Backend()
+
+    @async_cached(maxsize=16)
+    async def get(key):
+        return await backend.load(key)
+
+    results = await asyncio.gather(*[get("k") for _ in range(1000)])
+
+    assert results == ["value-k"] * 1000
+    assert backend.calls == ["k"]
+    stats = get.stats()
+    assert (stats.loads, stats.coalesced, stats.misses) == (1, 999, 1000)
+    assert await get("k") == "value-k"
+    assert get.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_is_per_key():
+    backend = Backend()
+
+    @async_cached()
+    async def get(key):
+        return await backend.load(key)
+
+    await asyncio.gather(*[get(n % 10) for n in range(1000)])
+
+    assert sorted(backend.calls) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = AsyncTTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_reloads():
+    clock = FakeClock()
+    backend = Backend()
+
+    @async_cached(ttl=5.0, clock=clock)
+    async def get(key):
+        return await backend.load(key)
+
+    await get("k")
+    clock.now = 4.9
+    await get("k")
+    clock.now = 5.0
+    await get("k")
+
+    assert backend.calls == ["k", "k"]
+    assert get.stats().expirations == 1
+
+
+def test_max_bytes_budget():
+    cache = AsyncTTLCache(maxsize=100, max_bytes=10, sizeof=len)
+    cache.set("a", "x" * 4)
+    cache.set("b", "x" * 4)
+    cache.set("c", "x" * 4)
+
+    assert "a" not in cache._entries
+    assert cache.stats().bytes == 8
+    cache.invalidate("b")
+    assert cache.stats().bytes == 4
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_is_not_stored():
+    """A load that started before an invalidation cannot repopulate the key."""
+    backend = Backend()
+
+    @async_cached()
+    async def get(key):
+        return await backend.load(key)
+
+    pending = asyncio.ensure_future(get("k"))
+    await asyncio.sleep(0)
+    get.invalidate("k")
+    assert await pending == "value-k"
+
+    assert len(get.cache) == 0
+    await get("k")
+    assert backend.calls == ["k", "k"]
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_not_cached():
+    calls = []
+
+    @async_cached()
+    async def get(key):
+        calls.append(key)
+        if len(calls) == 1:
+            raise RuntimeError("backend down")
+        return key
+
+    results = await asyncio.gather(get(1), get(1), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await get(1) == 1
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    backend = Backend()
+
+    @async_cached()
+    async def get(key):
+        return await backend.load(key)
+
+    first = asyncio.ensure_future(get("k"))
+    second = asyncio.ensure_future(get("k"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value-k"
+    assert backend.calls == ["k"]
+
+
+@pytest.mark.asyncio
+async def test_methods_get_one_cache_per_instance():
+    class Service:
+        def __init__(self, prefix):
+            self.prefix = prefix
+            self.calls = 0
+
+        @async_cached()
+        async def get(self, key, suffix=""):
+            self.calls += 1
+            return f"{self.prefix}{key}{suffix}"
+
+    a, b = Service("a-"), Service("b-")
+
+    assert await a.get(1) == "a-1"
+    assert await b.get(1) == "b-1"
+    assert a.get is a.get and a.get is not b.get
+    # Keyword and default-filled calls share the positional entry.
+    assert await a.get(key=1) == await a.get(1, "") == "a-1"
+    assert (a.calls, b.calls) == (1, 1)
+
+    assert a.get.invalidate(key=1)
+    assert await a.get(1) == "a-1"
+    assert a.calls == 2
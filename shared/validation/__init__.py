@@ -1 +1,24 @@
-"""Shared package placeholder."""
+"""Common validators for all modules."""
+
+from .types import UUID_PATTERN, Name, Slug, UUIDStr
+from .validators import (
+    ValidationError,
+    clear_adapter_cache,
+    get_adapter,
+    try_validate_many,
+    validate,
+    validate_many,
+)
+
+__all__ = [
+    "UUID_PATTERN",
+    "Name",
+    "Slug",
+    "UUIDStr",
+    "ValidationError",
+    "clear_adapter_cache",
+    "get_adapter",
+    "try_validate_many",
+    "validate",
+    "validate_many",
+]
@@ -0,0 +1,59 @@
+"""
+Benchmark: per-item vs batched validation of 100k ExampleModel records.
+
+Run with: pytest shared/validation/tests -m slow -s
+"""
+
+import time
+import uuid
+
+import pytest
+
+from modules._example.src.models import ExampleModel, ExampleName
+from shared.validation import get_adapter, validate, validate_many
+
+N = 100_000
+
+
+def _records(n: int) -> list[dict]:
+    return [
+        {"id": str(uuid.uuid4()), "name": f"item {i}", "status": "active"}
+        for i in range(n)
+    ]
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("kind", ["names", "records"])
+def test_bench_per_item_vs_batched(kind, capsys):
+    """Names are what create_many validates; records build ExampleModels."""
+    if kind == "names":
+        tp, values = ExampleName, [f"item {i}" for i in range(N)]
+    else:
+        tp, values = ExampleModel, _records(N)
+
+    start = time.perf_counter()
+    get_adapter(tp)
+    compile_s = time.perf_counter() - start
+
+    per_item_s = _best(lambda: [validate(tp, v) for v in values])
+    batched_s = _best(lambda: validate_many(tp, values))
+
+    with capsys.disabled():
+        print(
+            f"\n{N:,} {kind}:"
+            f"\n  adapter compile (once)  {compile_s * 1e3:8.2f} ms"
+            f"\n  per-item validate()     {per_item_s * 1e3:8.1f} ms"
+            f"  ({per_item_s / N * 1e9:.0f} ns/item)"
+            f"\n  validate_many()         {batched_s * 1e3:8.1f} ms"
+            f"  ({batched_s / N * 1e9:.0f} ns/item, {per_item_s / batched_s:.1f}x)"
+        )
+    assert batched_s < per_item_s
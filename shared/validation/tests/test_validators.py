@@ -0,0 +1,102 @@
+"""Unit tests for shared.validation."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+from shared.exceptions import InvalidInputError
+from shared.validation import (
+    Name,
+    Slug,
+    UUIDStr,
+    ValidationError,
+    clear_adapter_cache,
+    get_adapter,
+    try_validate_many,
+    validate,
+    validate_many,
+)
+
+UUID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+@dataclass
+class Record:
+    id: UUIDStr
+    name: Name
+    status: Slug = "active"
+    created_at: datetime | None = None
+
+
+def test_adapters_are_built_once_per_type():
+    clear_adapter_cache()
+    first = get_adapter(Record)
+    assert get_adapter(Record) is first
+    assert get_adapter(Name) is not first
+
+
+@pytest.mark.parametrize(
+    ("tp", "value", "expected"),
+    [
+        (Name, "  Widget  ", "Widget"),
+        (Slug, "in_review", "in_review"),
+        (UUIDStr, UUID, UUID),
+    ],
+)
+def test_validate_accepts(tp, value, expected):
+    assert validate(tp, value) == expected
+
+
+@pytest.mark.parametrize(
+    ("tp", "value"),
+    [
+        (Name, ""),
+        (Name, " \t"),
+        (Name, "x" * 201),
+        (Name, 42),
+        (Slug, "Active"),
+        (Slug, "with space"),
+        (UUIDStr, UUID.upper()),
+        (UUIDStr, "not-a-uuid"),
+    ],
+)
+def test_validate_rejects(tp, value):
+    with pytest.raises(ValidationError) as exc_info:
+        validate(tp, value)
+    assert isinstance(exc_info.value, InvalidInputError)
+    assert exc_info.value.errors
+
+
+def test_validate_many_builds_dataclasses():
+    records = validate_many(
+        Record,
+        [{"id": UUID, "name": " a "}, {"id": UUID, "name": "b", "status": "done"}],
+    )
+    assert records == [Record(UUID, "a"), Record(UUID, "b", "done")]
+
+
+def test_validate_many_reports_every_failing_index():
+    with pytest.raises(ValidationError) as exc_info:
+        validate_many(Record, [{"id": UUID, "name": "ok"}, {"id": "x"}, {"name": ""}])
+    failing = {error["loc"][0] for error in exc_info.value.errors}
+    assert failing == {1, 2}
+
+
+def test_try_validate_many_keeps_valid_items():
+    results, errors = try_validate_many(Name, ["a", "", None, " d "])
+
+    assert results == ["a", None, None, "d"]
+    assert sorted(errors) == [1, 2]
+    assert all(e["loc"] == () for e in errors[2].errors)
+
+
+@pytest.mark.parametrize("values", ["abc", None, {"a": 1}, 42])
+def test_try_validate_many_rejects_non_list_input(values):
+    with pytest.raises(ValidationError) as info:
+        try_validate_many(Name, values)
+    assert info.value.errors[0]["loc"] == ()
+
+
+def test_try_validate_many_all_valid():
+    assert try_validate_many(Slug, ["a", "b"]) == (["a", "b"], {})
@@ -0,0 +1,26 @@
+"""
+Reusable constrained types.
+
+Use them as field annotations (dataclasses, pydantic models) or pass them
+to validate()/validate_many() directly.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+UUID_PATTERN = r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+
+# Canonical lower-case hyphenated UUID string.
+UUIDStr = Annotated[str, StringConstraints(strict=True, pattern=UUID_PATTERN)]
+
+# Human-readable name: surrounding whitespace stripped, 1-200 characters.
+Name = Annotated[
+    str,
+    StringConstraints(strict=True, strip_whitespace=True, min_length=1, max_length=200),
+]
+
+# Lower-case identifier such as a status: "active", "in_review".
+Slug = Annotated[str, StringConstraints(strict=True, pattern=r"^[a-z][a-z0-9_]{0,31}$")]
@@ -0,0 +1,127 @@
+"""
+Cached pydantic validators.
+
+Building a TypeAdapter compiles a pydantic-core validator, which costs far
+more than running it, so adapters are built once per type and reused.
+validate_many() hands a whole list to pydantic-core's list validator in
+one call instead of looping over items in Python.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+import pydantic
+from pydantic import TypeAdapter
+
+from shared.exceptions import InvalidInputError
+
+T = TypeVar("T")
+
+_adapters: dict[Any, TypeAdapter] = {}
+_list_adapters: dict[Any, TypeAdapter] = {}
+_lock = threading.Lock()
+
+
+class ValidationError(InvalidInputError):
+    """Input failed validation.
+
+    errors holds pydantic's error dicts (type, loc, msg, input); for
+    validate_many() each loc starts with the failing item's index.
+    """
+
+    def __init__(self, message: str, errors: list[dict[str, Any]] | None = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+    @classmethod
+    def from_pydantic(cls, exc: pydantic.ValidationError) -> ValidationError:
+        errors = exc.errors(include_url=False)
+        return cls(_describe(errors), errors)
+
+
+def get_adapter(tp: Any) -> TypeAdapter:
+    """The TypeAdapter for tp, compiled on first use. tp must be hashable."""
+    return _cached(_adapters, tp, tp)
+
+
+def validate(tp: type[T], value: Any) -> T:
+    """Validate one value against tp.
+
+    Raises:
+        ValidationError: value does not satisfy tp.
+    """
+    try:
+        return get_adapter(tp).validate_python(value)
+    except pydantic.ValidationError as exc:
+        raise ValidationError.from_pydantic(exc) from None
+
+
+def validate_many(tp: type[T], values: Sequence[Any]) -> list[T]:
+    """Validate a list of values against tp in one pydantic-core call.
+
+    Raises:
+        ValidationError: listing every failing item (loc[0] is its index).
+    """
+    try:
+        return _cached(_list_adapters, tp, list[tp]).validate_python(values)
+    except pydantic.ValidationError as exc:
+        raise ValidationError.from_pydantic(exc) from None
+
+
+def try_validate_many(
+    tp: type[T], values: Sequence[Any]
+) -> tuple[list[T | None], dict[int, ValidationError]]:
+    """Validate a list, keeping the valid items when some fail.
+
+    Returns:
+        (results, errors): results[n] is None where item n failed and
+        errors[n] says why. Costs one batched call, or two if any item fails.
+
+    Raises:
+        ValidationError: values as a whole is not a list (no item index
+            to report the error under).
+    """
+    adapter = _cached(_list_adapters, tp, list[tp])
+    try:
+        return adapter.validate_python(values), {}
+    except pydantic.ValidationError as exc:
+        by_index: dict[int, list[dict[str, Any]]] = {}
+        for error in exc.errors(include_url=False):
+            if not error["loc"]:
+                raise ValidationError.from_pydantic(exc) from None
+            index, *loc = error["loc"]
+            by_index.setdefault(index, []).append({**error, "loc": tuple(loc)})
+    errors = {n: ValidationError(_describe(e), e) for n, e in by_index.items()}
+    good = iter(
+        adapter.validate_python([v for n, v in enumerate(values) if n not in errors])
+    )
+    return [None if n in errors else next(good) for n in range(len(values))], errors
+
+
+def clear_adapter_cache() -> None:
+    """Drop every cached adapter (e.g. after redefining a model in tests)."""
+    with _lock:
+        _adapters.clear()
+        _list_adapters.clear()
+
+
+def _cached(cache: dict[Any, TypeAdapter], key: Any, tp: Any) -> TypeAdapter:
+    adapter = cache.get(key)
+    if adapter is None:
+        with _lock:
+            adapter = cache.get(key)
+            if adapter is None:
+                adapter = cache[key] = TypeAdapter(tp)
+    return adapter
+
+
+def _describe(errors: list[dict[str, Any]], limit: int = 3) -> str:
+    parts = [
+        f"{'.'.join(map(str, e['loc'])) or 'value'}: {e['msg']}" for e in errors[:limit]
+    ]
+    if len(errors) > limit:
+        parts.append(f"... {len(errors) - limit} more")
+    return "; ".join(parts)
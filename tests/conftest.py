@@ -0,0 +1,66 @@
+"""Fixtures for scripts/ tests: synthetic repositories."""
+
+from pathlib import Path
+
+import pytest
+
+ROOT_FILES = ("AGENTS.md", "README.md", "pyproject.toml", ".gitignore")
+RULES = (
+    "00_repo_entrypoint.md",
+    "00_synaptix_ops.md",
+    "01_artifact_paths.md",
+    "10_module_agent_permissions.md",
+    "20_context_router.md",
+    "role_cto.md",
+    "role_cpo.md",
+    "role_backend_dev.md",
+)
+DOCS = (
+    "00_INDEX.md",
+    "0k_PRD.md",
+    "01_ARCHITECTURE.md",
+    "02_SETUP.md",
+    "03_MODULES.md",
+    "04_TESTING.md",
+    "05_DEPLOYMENT.md",
+    "0l_DECISIONS.md",
+)
+SHARED = ("cli", "config", "db", "exceptions", "logging", "utils")
+
+
+def make_repo(root: Path, modules_per_domain: int = 3) -> Path:
+    """Write a template-shaped repo; every 7th module is missing files."""
+    root.mkdir(parents=True, exist_ok=True)
+    for name in ROOT_FILES:
+        (root / name).write_text('python = ">=3.11,<3.14"\n')
+    rules = root / ".windsurf" / "rules"
+    rules.mkdir(parents=True)
+    for name in RULES:
+        (rules / name).write_text("# rule\n\n## Extraction vs Invention\n")
+    (rules / "role_cto.md").write_text("Project: {{PROJECT_NAME}} {{TEAM:core}}\n")
+    docs = root / "docs"
+    for sub in ("templates/sprints", "sprints"):
+        (docs / sub).mkdir(parents=True)
+    for name in DOCS:
+        (docs / name).write_text("# doc\n\nCLI/TUI async subprocess testing\n")
+    for domain in ("backend", "frontend", "ml-ai-data"):
+        (root / domain).mkdir()
+        (root / domain / "AGENTS.md").write_text("# agents\n")
+        for n in range(modules_per_domain):
+            module = root / domain / "modules" / f"mod_{n:05d}"
+            (module / "src").mkdir(parents=True)
+            (module / "tests" / "unit").mkdir(parents=True)
+            (module / "README.md").write_text("# module\n")
+            if n % 7:
+                (module / "AGENTS.md").write_text("# agents\n")
+    for name in SHARED:
+        (root / "shared" / name).mkdir(parents=True)
+        (root / "shared" / name / "__init__.py").write_text("")
+    (root / "shared" / "AGENTS.md").write_text("# agents\n")
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    return root
+
+
+@pytest.fixture
+def synthetic_repo(tmp_path):
+    return make_repo(tmp_path / "repo")
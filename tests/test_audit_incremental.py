@@ -0,0 +1,95 @@
+"""Tests for the --incremental per-file cache in scripts/audit_repo_structure.py."""
+
+import os
+
+from scripts import audit_repo_structure
+from scripts.audit_repo_structure import CACHE_FILE, FileFactsCache, RepoAuditor
+
+from .test_audit_repo_structure import _results
+
+ROLE = ".windsurf/rules/role_cto.md"
+
+
+def _audit(root, incremental=True) -> tuple[RepoAuditor, list[tuple]]:
+    auditor = RepoAuditor(root, cache_path=root / CACHE_FILE if incremental else None)
+    return auditor, _results(auditor)
+
+
+def test_incremental_results_match_full_audit(synthetic_repo, capsys):
+    _, expected = _audit(synthetic_repo, incremental=False)
+    _, cold = _audit(synthetic_repo)
+    _, warm = _audit(synthetic_repo)
+
+    assert cold == expected
+    assert warm == expected
+    assert (synthetic_repo / CACHE_FILE).is_file()
+
+
+def test_warm_run_reads_nothing(synthetic_repo, capsys):
+    cold, _ = _audit(synthetic_repo)
+    warm, _ = _audit(synthetic_repo)
+
+    assert cold.files.misses > 0
+    assert warm.files.misses == 0
+    assert warm.files.hits == cold.files.hits + cold.files.misses
+
+
+def test_touched_file_with_same_content_is_a_hit(synthetic_repo):
+    cache = FileFactsCache(synthetic_repo, synthetic_repo / CACHE_FILE)
+    before = cache.facts(ROLE)
+    cache.save()
+    st = os.stat(synthetic_repo / ROLE)
+    os.utime(synthetic_repo / ROLE, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    cache = FileFactsCache(synthetic_repo, synthetic_repo / CACHE_FILE)
+    assert cache.facts(ROLE) == before
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_modified_file_is_rescanned(synthetic_repo, capsys):
+    _audit(synthetic_repo)
+    (synthetic_repo / ROLE).write_text("Project: {{PROJECT_NAME:demo}}\n")
+
+    auditor, results = _audit(synthetic_repo)
+    status = {name: s for name, s, *_ in results}
+
+    assert auditor.files.misses == 1
+    assert status["Required variables"] == "pass"
+    assert f"Required vars: {ROLE}" not in status
+
+
+def test_warm_run_relists_only_changed_directories(synthetic_repo, monkeypatch, capsys):
+    _audit(synthetic_repo)  # creates .cache/ in the root: the root changes once
+    _audit(synthetic_repo)
+    listed = []
+    list_dir = audit_repo_structure._list_dir
+    monkeypatch.setattr(
+        audit_repo_structure,
+        "_list_dir",
+        lambda path: listed.append(path) or list_dir(path),
+    )
+
+    _audit(synthetic_repo)
+    assert listed == []
+
+    (synthetic_repo / "docs" / "NEW.md").write_text("{{PROJECT_NAME}}\n")
+    _, results = _audit(synthetic_repo)
+    assert listed == [os.path.join(synthetic_repo, "docs")]
+    assert "Required vars: docs/NEW.md" in {name for name, *_ in results}
+
+
+def test_rules_change_invalidates_cache(synthetic_repo, monkeypatch, capsys):
+    cold, _ = _audit(synthetic_repo)
+    monkeypatch.setattr(audit_repo_structure, "rules_fingerprint", lambda: "edited")
+
+    auditor, _ = _audit(synthetic_repo)
+    assert auditor.files.misses == cold.files.misses
+
+
+def test_corrupt_cache_is_ignored(synthetic_repo, capsys):
+    (synthetic_repo / CACHE_FILE).parent.mkdir()
+    (synthetic_repo / CACHE_FILE).write_text("{not json")
+
+    _, expected = _audit(synthetic_repo, incremental=False)
+    _, actual = _audit(synthetic_repo)
+    assert actual == expected
@@ -0,0 +1,80 @@
+"""Tests for scripts/audit_repo_structure.py."""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.audit_repo_structure import RepoAuditor, TreeSnapshot
+
+
+class SyscallTree:
+    """Reference: answers existence queries with per-path syscalls, as the
+    auditor did before snapshots."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def exists(self, path: str) -> bool:
+        return (self.root / path).exists()
+
+    def is_dir(self, path: str) -> bool:
+        return (self.root / path).is_dir()
+
+    def subdirs(self, path: str) -> list[str]:
+        base = self.root / path
+        return sorted(p.name for p in base.iterdir() if p.is_dir())
+
+
+def _results(auditor: RepoAuditor) -> list[tuple]:
+    auditor.run_full_audit()
+    return [(r.name, r.status, r.message, r.fix_hint) for r in auditor.report.results]
+
+
+def test_snapshot_records_files_and_dirs(synthetic_repo):
+    snap = TreeSnapshot.build(synthetic_repo)
+
+    assert snap.is_file("AGENTS.md")
+    assert snap.is_dir(".windsurf/rules")
+    assert snap.is_file("backend/modules/mod_00001/AGENTS.md")
+    assert snap.is_dir("backend/modules/mod_00002/tests/unit")
+    assert snap.exists("docs") and not snap.is_file("docs")
+    assert not snap.exists("backend/modules/mod_00000/AGENTS.md")
+    assert snap.subdirs("backend/modules") == ["mod_00000", "mod_00001", "mod_00002"]
+
+
+def test_snapshot_skips_vendored_dirs(synthetic_repo):
+    snap = TreeSnapshot.build(synthetic_repo)
+    assert snap.is_dir("node_modules")
+    assert not snap.exists("node_modules/pkg")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_snapshot_results_match_syscall_checks(synthetic_repo, workers, capsys):
+    """The snapshot auditor reports exactly what per-path syscalls report."""
+    snapshot = TreeSnapshot.build(synthetic_repo, max_workers=workers)
+
+    reference = SyscallTree(synthetic_repo)
+    expected = _results(RepoAuditor(synthetic_repo, snapshot=reference))
+    actual = _results(RepoAuditor(synthetic_repo, snapshot=snapshot))
+
+    assert actual == expected
+    assert any(status == "fail" for _, status, _, _ in actual)
+
+
+def test_results_are_deterministically_ordered(synthetic_repo, capsys):
+    first = _results(RepoAuditor(synthetic_repo))
+    second = _results(RepoAuditor(synthetic_repo))
+    modules = [
+        n.split("/")[2] for n, *_ in first if n.startswith("File: backend/modules/")
+    ]
+
+    assert first == second
+    assert modules == sorted(modules)
+
+
+def test_missing_required_file_fails(synthetic_repo, capsys):
+    (synthetic_repo / "README.md").unlink()
+    auditor = RepoAuditor(synthetic_repo)
+    results = {name: status for name, status, *_ in _results(auditor)}
+    assert results["File: README.md"] == "fail"
+    assert results["File: AGENTS.md"] == "pass"
@@ -0,0 +1,164 @@
+"""Tests for AuditReport counters and the json/ndjson/sarif output formats."""
+
+import io
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from scripts import audit_repo_structure
+from scripts.audit_repo_structure import (
+    AuditReport,
+    AuditResult,
+    NdjsonWriter,
+    RepoAuditor,
+    TreeSnapshot,
+)
+
+MODULES = 20_000  # x 5 checks per module = 100k checks
+
+
+def _run_main(monkeypatch, capsys, root, *args) -> tuple[int, str]:
+    monkeypatch.setattr(sys, "argv", ["audit", "--root", str(root), *args])
+    with pytest.raises(SystemExit) as exit_info:
+        audit_repo_structure.main()
+    return exit_info.value.code, capsys.readouterr().out
+
+
+def _synthetic_snapshot(root: Path, modules: int) -> TreeSnapshot:
+    """An in-memory tree: `modules` backend modules, no disk access."""
+    files, dirs = set(), {"backend", "backend/modules"}
+    names = [f"mod_{n:06d}" for n in range(modules)]
+    for name in names:
+        base = f"backend/modules/{name}"
+        dirs |= {base, f"{base}/src", f"{base}/tests", f"{base}/tests/unit"}
+        files |= {f"{base}/README.md", f"{base}/AGENTS.md"}
+    children = {"": ["backend"], "backend": ["modules"], "backend/modules": names}
+    return TreeSnapshot(root, files, dirs, children)
+
+
+def test_counters_track_adds_and_discards():
+    report = AuditReport()
+    results = [
+        AuditResult("a", "pass", ""),
+        AuditResult("b", "fail", ""),
+        AuditResult("c", "warn", ""),
+        AuditResult("d", "pass", ""),
+    ]
+    for result in results:
+        report.add(result)
+    assert (report.passed, report.warnings, report.failures, report.total) == (
+        2,
+        1,
+        1,
+        4,
+    )
+    report.discard(results[:2])
+    assert (report.passed, report.failures, report.total) == (1, 0, 2)
+
+
+def test_rerun_keeps_counters_consistent(synthetic_repo, capsys):
+    auditor = RepoAuditor(synthetic_repo)
+    auditor.run_full_audit()
+    before = auditor.report.summary()
+    auditor.run_check("backend")
+    auditor.run_check("template_vars")
+
+    statuses = [r.status for r in auditor.report.results]
+    assert auditor.report.summary() == before
+    assert auditor.report.failures == statuses.count("fail")
+    assert auditor.report.total == len(statuses)
+
+
+def test_ndjson_streams_each_result_as_it_is_added(synthetic_repo, capsys):
+    seen_while_running = []
+    stream = io.StringIO()
+    writer = NdjsonWriter(stream)
+
+    def sink(result):
+        writer(result)
+        seen_while_running.append(stream.getvalue().count("\n"))
+
+    report = AuditReport(sink=sink, keep_results=False)
+    RepoAuditor(synthetic_repo, report=report).run_full_audit()
+    writer.summary(report)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert report.results == []
+    assert seen_while_running == list(range(1, report.total + 1))
+    assert lines[-1] == {"type": "summary", **report.summary()}
+    assert {line["check"] for line in lines[:-1]} >= {"root", "backend"}
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "sarif"])
+def test_watch_rejects_machine_formats(monkeypatch, capsys, fmt):
+    monkeypatch.setattr(sys, "argv", ["audit", "--watch", "--format", fmt])
+    with pytest.raises(SystemExit) as exit_info:
+        audit_repo_structure.main()
+
+    assert exit_info.value.code == 2
+    assert "--watch reports in text only" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "sarif"])
+def test_machine_formats_keep_stdout_clean(synthetic_repo, monkeypatch, capsys, fmt):
+    code, out = _run_main(monkeypatch, capsys, synthetic_repo, "--format", fmt)
+
+    if fmt == "ndjson":
+        docs = [json.loads(line) for line in out.splitlines()]
+        summary = docs[-1]
+    else:
+        doc = json.loads(out)
+        summary = doc.get("summary")
+    assert code == 1  # the synthetic repo has missing module files
+    if fmt == "json":
+        assert summary["failures"] == sum(r["status"] == "fail" for r in doc["results"])
+    if fmt == "ndjson":
+        assert summary["total"] == len(docs) - 1
+    if fmt == "sarif":
+        run = doc["runs"][0]
+        assert doc["version"] == "2.1.0"
+        assert {r["level"] for r in run["results"]} == {"error", "warning"}
+        located = [
+            r
+            for r in run["results"]
+            if r["ruleId"] == "template_vars" and "locations" in r
+        ]
+        assert located[0]["locations"][0]["physicalLocation"] == {
+            "artifactLocation": {
+                "uri": ".windsurf/rules/role_cto.md",
+                "uriBaseId": "REPO_ROOT",
+            },
+            "region": {"startLine": 1, "startColumn": 10},
+        }
+
+
+@pytest.mark.slow
+def test_streaming_100k_checks_in_bounded_memory(tmp_path, capsys):
+    snapshot = _synthetic_snapshot(tmp_path, MODULES)
+    sink = NdjsonWriter(io.StringIO())
+    sink.stream.write = len  # count bytes, keep nothing
+
+    def run(report: AuditReport) -> int:
+        auditor = RepoAuditor(tmp_path, snapshot=snapshot, report=report)
+        auditor._documents = snapshot
+        tracemalloc.start()
+        try:
+            auditor.run_full_audit()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    streamed = AuditReport(sink=sink, keep_results=False)
+    streamed_peak = run(streamed)
+    retained = AuditReport()
+    retained_peak = run(retained)
+
+    assert streamed.total == retained.total >= 5 * MODULES
+    assert streamed.summary() == retained.summary()
+    # The module listing and sorted template file list are the only
+    # per-run allocations; no result is kept.
+    assert streamed_peak < 4 * 2**20
+    assert retained_peak > 5 * streamed_peak
@@ -0,0 +1,113 @@
+"""Tests for --watch: in-place snapshot updates and affected-check re-runs."""
+
+import os
+import shutil
+
+from scripts.audit_repo_structure import (
+    AuditWatcher,
+    RepoAuditor,
+    TreeSnapshot,
+    affected_checks,
+)
+
+from .test_audit_repo_structure import _results
+
+MODULE = "backend/modules/mod_00001"
+
+
+def _bump(path):
+    """Advance mtime so the change is seen even on coarse-mtime filesystems."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _watcher(root) -> AuditWatcher:
+    watcher = AuditWatcher(RepoAuditor(root))
+    watcher.start()
+    return watcher
+
+
+def _fresh(root) -> list[tuple]:
+    return _results(RepoAuditor(root, snapshot=TreeSnapshot.build(root)))
+
+
+def _as_tuples(report) -> list[tuple]:
+    return [(r.name, r.status, r.message, r.fix_hint) for r in report.results]
+
+
+def test_rescan_matches_fresh_snapshot(synthetic_repo):
+    snap = TreeSnapshot.build(synthetic_repo)
+    (synthetic_repo / "docs" / "new.md").write_text("x\n")
+    shutil.rmtree(synthetic_repo / MODULE / "tests")
+    (synthetic_repo / "docs" / "extra" / "deep").mkdir(parents=True)
+    (synthetic_repo / "docs" / "extra" / "deep" / "a.md").write_text("x\n")
+
+    changed = snap.rescan("docs") | snap.rescan(MODULE)
+    fresh = TreeSnapshot.build(synthetic_repo)
+
+    assert snap.files == fresh.files and snap.dirs == fresh.dirs
+    assert snap.subdirs(MODULE) == ["src"]
+    assert {"docs/new.md", "docs/extra/deep/a.md", f"{MODULE}/tests/unit"} <= changed
+
+
+def test_affected_checks():
+    assert affected_checks({f"{MODULE}/AGENTS.md"}) == ["backend", "template_vars"]
+    assert affected_checks({"pyproject.toml"}) == ["root", "python"]
+    assert affected_checks({"shared/db/pool.py"}) == ["shared"]
+    assert affected_checks({".windsurf/rules/00_synaptix_ops.md"}) == [
+        "rules",
+        "extraction",
+        "template_vars",
+    ]
+
+
+def test_polls_only_directories_checks_read(synthetic_repo, capsys):
+    package = synthetic_repo / MODULE / "src" / "pkg"
+    package.mkdir(parents=True)
+    (package / "core.py").write_text("x = 1\n")
+    (package / "NOTES.md").write_text("{{OWNER}}\n")
+
+    watcher = _watcher(synthetic_repo)
+
+    assert {"", MODULE, f"{MODULE}/tests", f"{MODULE}/src/pkg"} <= set(watcher._dirs)
+    assert f"{MODULE}/src" not in watcher._dirs
+    (package / "core.py").unlink()
+    _bump(package / "NOTES.md")
+    assert watcher.poll() == {f"{MODULE}/src/pkg/core.py", f"{MODULE}/src/pkg/NOTES.md"}
+
+
+def test_poll_without_changes_is_empty(synthetic_repo, capsys):
+    watcher = _watcher(synthetic_repo)
+    assert watcher.poll() == set()
+
+
+def test_content_edit_reruns_only_affected_checks(synthetic_repo, capsys):
+    watcher = _watcher(synthetic_repo)
+    role = synthetic_repo / ".windsurf" / "rules" / "role_cto.md"
+    role.write_text("Project: Acme {{TEAM:core}}\n")
+    _bump(role)
+
+    changed = watcher.poll()
+    keys, diff = watcher.recheck(changed)
+
+    assert changed == {".windsurf/rules/role_cto.md"}
+    assert keys == ["rules", "template_vars"]
+    assert any(line.startswith("- [fail] Required vars:") for line in diff)
+    assert any(line.startswith("+ [pass] Required variables") for line in diff)
+    assert _as_tuples(watcher.auditor.report) == _fresh(synthetic_repo)
+
+
+def test_structure_changes_are_diffed(synthetic_repo, capsys):
+    watcher = _watcher(synthetic_repo)
+    (synthetic_repo / MODULE / "AGENTS.md").unlink()
+    new = synthetic_repo / "frontend" / "modules" / "mod_new"
+    (new / "src").mkdir(parents=True)
+    (new / "README.md").write_text("# new\n")
+
+    keys, diff = watcher.recheck(watcher.poll())
+
+    assert keys == ["backend", "frontend", "template_vars"]
+    assert f"~ [pass -> fail] File: {MODULE}/AGENTS.md: " in "\n".join(diff)
+    assert "+ [fail] Dir: frontend/modules/mod_new/tests: " in "\n".join(diff)
+    assert _as_tuples(watcher.auditor.report) == _fresh(synthetic_repo)
+    assert watcher.poll() == set()
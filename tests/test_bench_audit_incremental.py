@@ -0,0 +1,56 @@
+"""
+Benchmark: cold vs warm --incremental audit.
+
+Run with: pytest tests -m slow -s
+"""
+
+import time
+
+import pytest
+
+from scripts.audit_repo_structure import CACHE_FILE, RepoAuditor, TreeSnapshot
+
+from .conftest import DOCS, make_repo
+
+# Large rule/doc files, so content checks dominate the audit.
+DOC_LINES = 100_000
+
+
+def _timed_audit(root, snapshot) -> tuple[float, RepoAuditor]:
+    start = time.perf_counter()
+    auditor = RepoAuditor(root, snapshot=snapshot, cache_path=root / CACHE_FILE)
+    auditor.run_full_audit()
+    return time.perf_counter() - start, auditor
+
+
+@pytest.mark.slow
+def test_bench_incremental_warm_vs_cold(tmp_path, capsys):
+    root = make_repo(tmp_path / "repo")
+    filler = "Some {{PROJECT_NAME}} text with a {{TEAM:core}} default.\n" * DOC_LINES
+    for name in DOCS:
+        (root / "docs" / name).write_text("CLI/TUI\n" + filler)
+    (root / ".windsurf/rules/00_synaptix_ops.md").write_text(
+        "Extraction vs Invention\n" + filler
+    )
+    snapshot = TreeSnapshot.build(root)
+
+    cold_s = []
+    for _ in range(3):
+        (root / CACHE_FILE).unlink(missing_ok=True)
+        elapsed, cold = _timed_audit(root, snapshot)
+        cold_s.append(elapsed)
+    warm_s, warm = min(_timed_audit(root, snapshot) for _ in range(5))
+    cold_best = min(cold_s)
+    size_mb = sum(len(filler) for _ in range(len(DOCS) + 1)) / 1e6
+
+    with capsys.disabled():
+        print(
+            f"\n{cold.files.misses} files (~{size_mb:.0f} MB of content):"
+            f"\n  cold   {cold_best * 1e3:8.1f} ms"
+            f"\n  warm   {warm_s * 1e3:8.1f} ms  ({cold_best / warm_s:.0f}x)"
+        )
+    assert warm.files.misses == 0
+    assert [(r.name, r.status) for r in warm.report.results] == [
+        (r.name, r.status) for r in cold.report.results
+    ]
+    assert warm_s * 10 < cold_best
@@ -0,0 +1,44 @@
+"""
+Benchmark: snapshot-based RepoAuditor vs per-path syscalls.
+
+Run with: pytest tests -m slow -s
+"""
+
+import time
+
+import pytest
+
+from scripts.audit_repo_structure import RepoAuditor, TreeSnapshot
+
+from .conftest import make_repo
+from .test_audit_repo_structure import SyscallTree
+
+MODULES_PER_DOMAIN = 1_500
+
+
+def _timed_audit(root, tree_factory) -> tuple[float, list]:
+    start = time.perf_counter()
+    auditor = RepoAuditor(root, snapshot=tree_factory(root))
+    auditor.run_full_audit()
+    elapsed = time.perf_counter() - start
+    return elapsed, [(r.name, r.status) for r in auditor.report.results]
+
+
+@pytest.mark.slow
+def test_bench_snapshot_vs_syscalls(tmp_path, capsys):
+    """One scandir walk beats thousands of exists()/is_dir() calls."""
+    root = make_repo(tmp_path / "repo", MODULES_PER_DOMAIN)
+
+    legacy_s, legacy = min(_timed_audit(root, SyscallTree) for _ in range(3))
+    snap_s, snap = min(_timed_audit(root, TreeSnapshot.build) for _ in range(3))
+    checks = len(snap)
+
+    with capsys.disabled():
+        print(
+            f"\n{3 * MODULES_PER_DOMAIN:,} modules, {checks:,} checks:"
+            f"\n  per-path syscalls   {legacy_s * 1e3:8.1f} ms"
+            f"\n  TreeSnapshot        {snap_s * 1e3:8.1f} ms"
+            f"  ({legacy_s / snap_s:.1f}x)"
+        )
+    assert snap == legacy
+    assert snap_s < legacy_s
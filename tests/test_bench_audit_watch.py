@@ -0,0 +1,50 @@
+"""
+Benchmark: --watch re-check latency after a single-file edit.
+
+Run with: pytest tests -m slow -s
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+
+from scripts.audit_repo_structure import AuditWatcher, RepoAuditor
+
+from .conftest import make_repo
+
+MODULES_PER_DOMAIN = 167  # ~500 modules
+EDITS = 20
+
+
+@pytest.mark.slow
+def test_bench_watch_recheck_latency(tmp_path, capsys):
+    root = make_repo(tmp_path / "repo", MODULES_PER_DOMAIN)
+    start = time.perf_counter()
+    watcher = AuditWatcher(RepoAuditor(root))
+    watcher.start()
+    startup_s = time.perf_counter() - start
+
+    target = root / "backend" / "modules" / "mod_00042" / "AGENTS.md"
+    latencies = []
+    for n in range(EDITS):
+        target.write_text(f"# module {{{{PROJECT_NAME}}}} edit {n}\n")
+        st = os.stat(target)
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + (n + 1) * 10**9))
+        begin = time.perf_counter()
+        keys, diff = watcher.recheck(watcher.poll())
+        latencies.append(time.perf_counter() - begin)
+        assert keys == ["backend", "template_vars"]
+
+    p50 = statistics.median(latencies)
+    worst = max(latencies)
+    with capsys.disabled():
+        print(
+            f"\n{3 * MODULES_PER_DOMAIN} modules, {len(watcher._dirs)} dirs and "
+            f"{len(watcher._files)} files polled:"
+            f"\n  cold start (full audit)   {startup_s * 1e3:7.1f} ms"
+            f"\n  edit -> diff  p50         {p50 * 1e3:7.1f} ms"
+            f"\n  edit -> diff  max         {worst * 1e3:7.1f} ms"
+        )
+    assert p50 < 0.1
@@ -0,0 +1,58 @@
+"""
+Benchmark: template variable scan time vs docs tree size.
+
+Run with: pytest tests -m slow -s
+"""
+
+import time
+
+import pytest
+
+from scripts.audit_repo_structure import RepoAuditor, TreeSnapshot
+
+from .conftest import make_repo
+
+LINE = "Deploy {{PROJECT_NAME}} to {{REGION:eu}} as {{OWNER}}; plain text here.\n"
+LINES_PER_FILE = 1_000
+FILES_PER_DIR = 40
+SCALES = (1, 2, 4, 8)
+
+
+def _docs_tree(root, dirs: int):
+    make_repo(root)
+    body = LINE * LINES_PER_FILE
+    for d in range(dirs):
+        folder = root / "docs" / "generated" / f"part_{d:03d}"
+        folder.mkdir(parents=True)
+        for n in range(FILES_PER_DIR):
+            (folder / f"page_{n:03d}.md").write_text(body)
+    return root
+
+
+def _timed_scan(root) -> tuple[float, str]:
+    auditor = RepoAuditor(root, snapshot=TreeSnapshot.build(root))
+    start = time.perf_counter()
+    auditor.audit_unassigned_variables()
+    elapsed = time.perf_counter() - start
+    return elapsed, auditor.report.results[-1].message
+
+
+@pytest.mark.slow
+def test_bench_scanner_scales_linearly(tmp_path, capsys):
+    rows = []
+    for scale in SCALES:
+        root = _docs_tree(tmp_path / f"x{scale}", scale)
+        elapsed, message = min(_timed_scan(root) for _ in range(3))
+        mb = scale * FILES_PER_DIR * len(LINE) * LINES_PER_FILE / 1e6
+        rows.append((scale, mb, elapsed, message))
+
+    per_mb = [elapsed / mb for _, mb, elapsed, _ in rows]
+    with capsys.disabled():
+        print("\nscale      MB      ms   ms/MB")
+        for (scale, mb, elapsed, _), rate in zip(rows, per_mb, strict=True):
+            print(f"{scale:>5} {mb:7.1f} {elapsed * 1e3:7.1f} {rate * 1e3:7.2f}")
+    for scale, _, _, message in rows:
+        hits = 2 * LINES_PER_FILE * FILES_PER_DIR * scale + 1  # + role_cto.md
+        assert f"{hits} template variables" in message
+    # Linear: cost per MB at 8x the size stays within 1.5x of the smallest.
+    assert per_mb[-1] < 1.5 * per_mb[0]
@@ -0,0 +1,110 @@
+"""Tests for the streaming template variable scanner."""
+
+import pytest
+
+from scripts.audit_repo_structure import (
+    RepoAuditor,
+    TemplateVarHit,
+    is_template_file,
+    scan_file,
+    scan_template_vars,
+)
+
+from .test_audit_repo_structure import _results
+
+TEXT = (
+    "# {{PROJECT_NAME}} setup\n"
+    "port: {{PORT:8000}} and {{PORT}}\n"
+    "\n"
+    "café {{OWNER}} {{lower}} {{ NOT_A_VAR }} {{EMPTY:}}\n"
+    "{{PROJECT_NAME}}"
+)
+
+
+def test_hits_report_line_and_column(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(TEXT, encoding="utf-8")
+
+    assert list(scan_template_vars(path)) == [
+        TemplateVarHit("PROJECT_NAME", None, 1, 3),
+        TemplateVarHit("PORT", "8000", 2, 7),
+        TemplateVarHit("PORT", None, 2, 25),
+        TemplateVarHit("OWNER", None, 4, 6),
+        TemplateVarHit("PROJECT_NAME", None, 5, 1),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 17, 64])
+def test_small_chunks_find_the_same_hits(tmp_path, chunk_size):
+    path = tmp_path / "doc.md"
+    path.write_text(TEXT * 50, encoding="utf-8")
+
+    expected = list(scan_template_vars(path))
+    assert list(scan_template_vars(path, chunk_size)) == expected
+    assert scan_file(path, chunk_size) == scan_file(path)
+
+
+def test_scan_file_facts(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(TEXT, encoding="utf-8")
+
+    _, facts = scan_file(path)
+
+    assert facts["template_vars"] == {
+        "PROJECT_NAME": {"count": 2, "at": [[1, 3], [5, 1]]},
+        "PORT": {"count": 1, "at": [[2, 25]]},
+        "OWNER": {"count": 1, "at": [[4, 6]]},
+    }
+    assert facts["default_vars"] == ["PORT"]
+
+
+@pytest.mark.parametrize(
+    ("name", "scanned"),
+    [
+        ("docs/a.md", True),
+        (".github/workflows/ci.yml", True),
+        ("deploy.yaml", True),
+        (".env", True),
+        (".env.staging", True),
+        ("config/prod.env", True),
+        ("scripts/audit.py", False),
+        ("environment.txt", False),
+        ("docs/templates/SECURITY_TEMPLATE.md", False),
+        ("README.md", False),
+        ("shared/config/README.md", False),
+        ("CHANGELOG.md", False),
+    ],
+)
+def test_template_file_selection(name, scanned):
+    assert is_template_file(name) is scanned
+
+
+def test_audit_scans_workflows_and_env_files(synthetic_repo, capsys):
+    workflows = synthetic_repo / ".github" / "workflows"
+    workflows.mkdir(parents=True)
+    (workflows / "ci.yml").write_text("name: {{PROJECT_NAME}} CI\n")
+    (synthetic_repo / ".env.staging").write_text("APP={{APP_NAME}}\n")
+
+    auditor = RepoAuditor(synthetic_repo)
+    results = {name: message for name, _, message, _ in _results(auditor)}
+
+    assert "PROJECT_NAME at 1:7" in results["Required vars: .github/workflows/ci.yml"]
+    assert ".env.staging" in auditor.template_files()
+    # role_cto.md {{PROJECT_NAME}}, ci.yml {{PROJECT_NAME}}, .env.staging {{APP_NAME}}
+    assert "3 template variables" in results["Template variables"]
+
+
+def test_audit_skips_templates_and_documented_examples(synthetic_repo, capsys):
+    templates = synthetic_repo / "docs" / "templates"
+    templates.mkdir(parents=True, exist_ok=True)
+    (templates / "ROLE_TEMPLATE.md").write_text("# {{ROLE_NAME}}\n")
+    (synthetic_repo / "README.md").write_text("Set `{{PROJECT_NAME}}` first.\n")
+    (synthetic_repo / "CHANGELOG.md").write_text("- e.g. `{{DEV_PORT}}`\n")
+
+    auditor = RepoAuditor(synthetic_repo)
+    results = {name: message for name, _, message, _ in _results(auditor)}
+
+    flagged = [name for name in results if name.startswith("Required vars")]
+
+    assert "docs/templates/ROLE_TEMPLATE.md" not in auditor.template_files()
+    assert not [name for name in flagged if "README" in name or "CHANGELOG" in name]